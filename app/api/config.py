@@ -22,6 +22,104 @@ class Settings(BaseSettings):
 
     # Face Detection Configuration
     min_detection_confidence: float = 0.5
+    detector_backend: str = "mediapipe"
+    detector_pool_size: int = 4
+    max_image_side: int = 1024
+
+    # Upload Guard Configuration
+    upload_max_bytes: int = 32 * 1024 * 1024
+    upload_max_pixels: int = 50_000_000
+
+    # Process Pool Backend Configuration
+    process_pool_workers: int = 0
+    process_pool_task_timeout: float = 30.0
+
+    # Micro-Batching Backend Configuration
+    micro_batch_max_size: int = 8
+    micro_batch_max_wait_ms: float = 2.0
+
+    # Cascade Backend Configuration
+    cascade_thumbnail_side: int = 256
+    cascade_accept_above: float = 0.8
+    cascade_reject_below: float = 0.3
+    cascade_final_model: str = "short_range"
+
+    # Tiled Backend Configuration
+    tile_min_pixels: int = 20_000_000
+    tile_size: int = 640
+    tile_overlap: int = 160
+    tile_nms_iou: float = 0.3
+    tile_early_exit: bool = False
+    tile_early_exit_score: float = 0.8
+
+    # Result Cache Configuration
+    result_cache_enabled: bool = True
+    result_cache_max_bytes: int = 16 * 1024 * 1024
+    result_cache_ttl_seconds: float = 3600.0
+    result_cache_shared_backend: str = "none"
+    result_cache_sqlite_path: str = "result_cache.sqlite3"
+
+    # Near-Duplicate Cache Configuration
+    near_duplicate_cache_enabled: bool = False
+    near_duplicate_max_distance: int = 4
+    near_duplicate_max_entries: int = 10000
+
+    # Request Coalescing Configuration
+    coalescing_enabled: bool = True
+
+    # Inference Executor Configuration
+    inference_workers: int = 4
+    inference_queue_size: int = 16
+
+    # Admission Control Configuration
+    rate_limit_enabled: bool = False
+    rate_limit_per_second: float = 10.0
+    rate_limit_burst: int = 20
+    rate_limit_max_clients: int = 10000
+
+    # Batch Endpoint Configuration
+    batch_max_files: int = 64
+    batch_max_total_bytes: int = 64 * 1024 * 1024
+
+    # URL Fetch Configuration
+    url_fetch_allowed_hosts: str = ""
+    url_fetch_max_urls: int = 64
+    url_fetch_max_in_flight: int = 0
+    url_fetch_max_connections: int = 32
+    url_fetch_max_per_host: int = 8
+    url_fetch_connect_timeout: float = 5.0
+    url_fetch_timeout: float = 30.0
+
+    # Bulk Job Configuration
+    jobs_enabled: bool = False
+    job_store_path: str = "jobs.sqlite3"
+    job_image_root: str = ""
+    job_max_items: int = 10_000_000
+    job_max_manifest_bytes: int = 1024 * 1024 * 1024
+    job_max_in_flight: int = 0
+    job_checkpoint_items: int = 256
+    job_checkpoint_seconds: float = 2.0
+
+    # Archive Endpoint Configuration
+    archive_max_member_bytes: int = 32 * 1024 * 1024
+    archive_max_in_flight: int = 0
+
+    # Video Endpoint Configuration
+    video_max_bytes: int = 256 * 1024 * 1024
+    video_sample_fps: float = 2.0
+    video_frame_stride: int = 0
+    video_max_samples: int = 600
+
+    # Live WebSocket Configuration
+    websocket_max_sessions: int = 2
+    websocket_max_frame_bytes: int = 4 * 1024 * 1024
+
+    # Metrics Configuration
+    metrics_enabled: bool = True
+
+    # Warm-up Configuration
+    warmup_enabled: bool = True
+    warmup_rounds: int = 2
 
     # Logging Configuration
     log_level: str = "INFO"
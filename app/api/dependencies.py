@@ -1,26 +1,211 @@
 """Dependency injection for API layer."""
 
 from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, cast
 
 from app.application.face_detection_service import FaceDetectionService
-from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+from app.application.inference_executor import InferenceExecutor
+from app.application.job_runner import JobRunner
+from app.application.live_session import LiveSessionLimiter
+from app.application.near_duplicate_cache import NearDuplicateCache
+from app.application.rate_limiter import TokenBucketRateLimiter
+from app.application.result_cache import ResultCache
+from app.application.single_flight import SingleFlight
+from app.application.upload_guard import UploadGuard
+from app.application.video_detection_service import VideoDetectionService
+from app.domain.interfaces import (
+    IFaceDetector,
+    IImageFetcher,
+    IResultStore,
+    IVideoFaceDetector,
+)
+from app.infrastructure.image_header import HeaderImageInspector
+from app.infrastructure import metrics
+from app.infrastructure.metrics import PipelineMetrics
+from app.infrastructure.sqlite_result_store import SqliteResultStore
 from app.api.config import get_settings
 
+if TYPE_CHECKING:
+    from app.infrastructure.cascade_detector import CascadeFaceDetector
+
 
 @lru_cache()
-def get_face_detector() -> MediaPipeFaceDetector:
+def get_face_detector() -> IFaceDetector:
     """
-    Get or create MediaPipe face detector instance (cached).
+    Get or create the configured face detector instance (cached).
 
     Returns:
-        MediaPipeFaceDetector instance
+        IFaceDetector implementation selected by ``detector_backend``
+
+    Raises:
+        ValueError: If the configured backend is unknown
     """
     settings = get_settings()
-    return MediaPipeFaceDetector(
-        min_detection_confidence=settings.min_detection_confidence
+    # Backends import MediaPipe and OpenCV, most of the startup time, so
+    # only the configured one is imported, and only when first needed
+    if settings.detector_backend == "mediapipe":
+        from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+
+        return MediaPipeFaceDetector(
+            min_detection_confidence=settings.min_detection_confidence,
+            pool_size=settings.detector_pool_size,
+            max_image_side=settings.max_image_side,
+        )
+    if settings.detector_backend == "process_pool":
+        from app.infrastructure.process_pool_detector import ProcessPoolFaceDetector
+
+        return ProcessPoolFaceDetector(
+            min_detection_confidence=settings.min_detection_confidence,
+            num_workers=settings.process_pool_workers,
+            task_timeout=settings.process_pool_task_timeout,
+            max_image_side=settings.max_image_side,
+        )
+    if settings.detector_backend == "batched":
+        from app.infrastructure.batched_detector import BatchedBlazeFaceDetector
+
+        return BatchedBlazeFaceDetector(
+            min_detection_confidence=settings.min_detection_confidence,
+            max_batch_size=settings.micro_batch_max_size,
+            max_batch_wait=settings.micro_batch_max_wait_ms / 1000,
+            max_image_side=settings.max_image_side,
+        )
+    if settings.detector_backend == "cascade":
+        from app.infrastructure.cascade_detector import CascadeFaceDetector
+
+        return CascadeFaceDetector(
+            min_detection_confidence=settings.min_detection_confidence,
+            thumbnail_side=settings.cascade_thumbnail_side,
+            accept_above=settings.cascade_accept_above,
+            reject_below=settings.cascade_reject_below,
+            final_model=settings.cascade_final_model,
+            pool_size=settings.detector_pool_size,
+            max_image_side=settings.max_image_side,
+        )
+    if settings.detector_backend == "tiled":
+        from app.infrastructure.tiled_detector import TiledFaceDetector
+
+        return TiledFaceDetector(
+            min_detection_confidence=settings.min_detection_confidence,
+            pool_size=settings.detector_pool_size,
+            max_image_side=settings.max_image_side,
+            min_pixels=settings.tile_min_pixels,
+            tile_size=settings.tile_size,
+            tile_overlap=settings.tile_overlap,
+            nms_iou=settings.tile_nms_iou,
+            early_exit=settings.tile_early_exit,
+            early_exit_score=settings.tile_early_exit_score,
+        )
+    raise ValueError(f"Unknown detector backend: {settings.detector_backend}")
+
+
+def get_cascade_detector() -> Optional["CascadeFaceDetector"]:
+    """
+    Get the face detector if it is a cascade, for its stage statistics.
+
+    Returns:
+        CascadeFaceDetector instance, or None for other backends
+    """
+    if get_settings().detector_backend != "cascade":
+        return None
+    return cast("CascadeFaceDetector", get_face_detector())
+
+
+def close_face_detector() -> None:
+    """Close the cached face detector, if one has been created."""
+    if get_face_detector.cache_info().currsize:
+        get_face_detector().close()
+        get_face_detector.cache_clear()
+
+
+@lru_cache()
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Get or create the result cache (cached).
+
+    Returns:
+        ResultCache instance, or None when caching is disabled
+
+    Raises:
+        ValueError: If the configured shared backend is unknown
+    """
+    settings = get_settings()
+    if not settings.result_cache_enabled:
+        return None
+
+    shared_store: Optional[IResultStore] = None
+    if settings.result_cache_shared_backend == "sqlite":
+        shared_store = SqliteResultStore(settings.result_cache_sqlite_path)
+    elif settings.result_cache_shared_backend != "none":
+        raise ValueError(
+            f"Unknown result cache backend: {settings.result_cache_shared_backend}"
+        )
+
+    return ResultCache(
+        max_bytes=settings.result_cache_max_bytes,
+        ttl=settings.result_cache_ttl_seconds,
+        shared_store=shared_store,
     )
 
 
+def close_result_cache() -> None:
+    """Close the cached result cache, if one has been created."""
+    if get_result_cache.cache_info().currsize:
+        cache = get_result_cache()
+        if cache is not None:
+            cache.close()
+        get_result_cache.cache_clear()
+
+
+@lru_cache()
+def get_near_duplicate_cache() -> Optional[NearDuplicateCache]:
+    """
+    Get or create the near-duplicate cache (cached).
+
+    Returns:
+        NearDuplicateCache instance, or None when it is disabled
+    """
+    settings = get_settings()
+    if not settings.near_duplicate_cache_enabled:
+        return None
+    from app.infrastructure.perceptual_hash import DHashHasher
+
+    return NearDuplicateCache(
+        hasher=DHashHasher(),
+        max_distance=settings.near_duplicate_max_distance,
+        max_entries=settings.near_duplicate_max_entries,
+        ttl=settings.result_cache_ttl_seconds,
+    )
+
+
+@lru_cache()
+def get_upload_guard() -> UploadGuard:
+    """
+    Get or create the upload guard (cached).
+
+    Returns:
+        UploadGuard instance
+    """
+    settings = get_settings()
+    return UploadGuard(
+        inspector=HeaderImageInspector(),
+        max_bytes=settings.upload_max_bytes,
+        max_pixels=settings.upload_max_pixels,
+    )
+
+
+@lru_cache()
+def get_single_flight() -> Optional[SingleFlight]:
+    """
+    Get or create the group coalescing identical detections (cached).
+
+    Returns:
+        SingleFlight instance, or None when coalescing is disabled
+    """
+    if not get_settings().coalescing_enabled:
+        return None
+    return SingleFlight()
+
+
 def get_face_detection_service() -> FaceDetectionService:
     """
     Get face detection service instance with dependencies.
@@ -29,4 +214,201 @@ def get_face_detection_service() -> FaceDetectionService:
         FaceDetectionService instance
     """
     detector = get_face_detector()
-    return FaceDetectionService(face_detector=detector)
+    return FaceDetectionService(
+        face_detector=detector,
+        result_cache=get_result_cache(),
+        near_duplicate_cache=get_near_duplicate_cache(),
+        upload_guard=get_upload_guard(),
+        single_flight=get_single_flight(),
+    )
+
+
+@lru_cache()
+def get_video_face_detector() -> IVideoFaceDetector:
+    """
+    Get or create the video face detector instance (cached).
+
+    Returns:
+        IVideoFaceDetector implementation
+    """
+    from app.infrastructure.video_detector import MediaPipeVideoFaceDetector
+
+    settings = get_settings()
+    return MediaPipeVideoFaceDetector(
+        min_detection_confidence=settings.min_detection_confidence,
+        sample_fps=settings.video_sample_fps,
+        frame_stride=settings.video_frame_stride,
+        max_samples=settings.video_max_samples,
+        max_image_side=settings.max_image_side,
+    )
+
+
+def get_video_detection_service() -> VideoDetectionService:
+    """
+    Get video detection service instance with dependencies.
+
+    Returns:
+        VideoDetectionService instance
+    """
+    return VideoDetectionService(video_detector=get_video_face_detector())
+
+
+@lru_cache()
+def get_live_session_limiter() -> LiveSessionLimiter:
+    """
+    Get or create the limiter shared by live WebSocket sessions (cached).
+
+    Returns:
+        LiveSessionLimiter instance
+    """
+    return LiveSessionLimiter(max_sessions=get_settings().websocket_max_sessions)
+
+
+@lru_cache()
+def get_inference_executor() -> InferenceExecutor:
+    """
+    Get or create the inference executor (cached).
+
+    Returns:
+        InferenceExecutor instance
+    """
+    settings = get_settings()
+    return InferenceExecutor(
+        max_workers=settings.inference_workers,
+        max_queue_size=settings.inference_queue_size,
+    )
+
+
+@lru_cache()
+def get_rate_limiter() -> Optional[TokenBucketRateLimiter]:
+    """
+    Get or create the per-client rate limiter (cached).
+
+    Returns:
+        TokenBucketRateLimiter instance, or None when rate limiting is off
+    """
+    settings = get_settings()
+    if not settings.rate_limit_enabled:
+        return None
+    return TokenBucketRateLimiter(
+        rate=settings.rate_limit_per_second,
+        burst=settings.rate_limit_burst,
+        max_clients=settings.rate_limit_max_clients,
+    )
+
+
+@lru_cache()
+def get_image_fetcher() -> IImageFetcher:
+    """
+    Get or create the HTTP fetcher for detect-by-URL (cached).
+
+    Returns:
+        IImageFetcher implementation restricted to the allowed hosts
+    """
+    from app.infrastructure.http_image_fetcher import HttpImageFetcher
+
+    settings = get_settings()
+    hosts = {host.strip() for host in settings.url_fetch_allowed_hosts.split(",")} - {
+        ""
+    }
+    return HttpImageFetcher(
+        allowed_hosts=None if "*" in hosts else frozenset(hosts),
+        max_bytes=settings.upload_max_bytes,
+        max_connections=settings.url_fetch_max_connections,
+        max_per_host=settings.url_fetch_max_per_host,
+        connect_timeout=settings.url_fetch_connect_timeout,
+        timeout=settings.url_fetch_timeout,
+    )
+
+
+async def close_image_fetcher() -> None:
+    """Close the cached image fetcher, if one has been created."""
+    if get_image_fetcher.cache_info().currsize:
+        await get_image_fetcher().close()
+        get_image_fetcher.cache_clear()
+
+
+@lru_cache()
+def get_job_runner() -> Optional[JobRunner]:
+    """
+    Get or create the bulk job runner (cached).
+
+    Returns:
+        JobRunner instance, or None when bulk jobs are disabled
+    """
+    settings = get_settings()
+    if not settings.jobs_enabled:
+        return None
+    from app.infrastructure.local_image_reader import LocalImageReader
+    from app.infrastructure.sqlite_job_store import SqliteJobStore
+
+    file_reader = None
+    if settings.job_image_root:
+        file_reader = LocalImageReader(
+            settings.job_image_root, max_bytes=settings.upload_max_bytes
+        )
+    return JobRunner(
+        store=SqliteJobStore(settings.job_store_path),
+        service=get_face_detection_service(),
+        executor=get_inference_executor(),
+        url_fetcher=get_image_fetcher(),
+        file_reader=file_reader,
+        max_items=settings.job_max_items,
+        max_in_flight=settings.job_max_in_flight or None,
+        checkpoint_items=settings.job_checkpoint_items,
+        checkpoint_seconds=settings.job_checkpoint_seconds,
+    )
+
+
+async def start_job_runner() -> None:
+    """Resume unfinished bulk jobs, if bulk jobs are enabled."""
+    runner = get_job_runner()
+    if runner is not None:
+        await runner.start()
+
+
+async def close_job_runner() -> None:
+    """Stop the cached job runner, if one has been created."""
+    if get_job_runner.cache_info().currsize:
+        runner = get_job_runner()
+        if runner is not None:
+            await runner.close()
+        get_job_runner.cache_clear()
+
+
+def close_inference_executor() -> None:
+    """Shut down the cached inference executor, if one has been created."""
+    if get_inference_executor.cache_info().currsize:
+        get_inference_executor().shutdown()
+        get_inference_executor.cache_clear()
+
+
+@lru_cache()
+def get_pipeline_metrics() -> Optional[PipelineMetrics]:
+    """
+    Get or create the pipeline metrics and route the timing hooks to them.
+
+    Returns:
+        PipelineMetrics instance, or None when metrics are disabled
+    """
+    if not get_settings().metrics_enabled:
+        metrics.install(None)
+        return None
+    pipeline_metrics = PipelineMetrics(
+        queue_depth=lambda: get_inference_executor().stats().queued
+    )
+    metrics.install(pipeline_metrics)
+    return pipeline_metrics
+
+
+def warm_up() -> None:
+    """
+    Build the detector and run warm-up detections before serving (blocking).
+
+    Creates the executor, caches and upload guard on the way, so the first
+    request only has to look them up.
+    """
+    from app.infrastructure.image_decoding import warmup_image
+
+    get_inference_executor()
+    get_face_detection_service().warm_up(warmup_image(), get_settings().warmup_rounds)
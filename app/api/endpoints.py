@@ -1,48 +1,396 @@
 """API endpoints for face detection service."""
 
+import asyncio
+import contextlib
+import json
 import logging
-from typing import Annotated
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from io import BytesIO
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    AsyncIterator,
+    IO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
-from app.api.schemas import ErrorResponse, FaceDetectionResponse
+from app.api.config import Settings, get_settings
+from app.api.serialization import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    encode,
+    negotiate_media_type,
+    result_payload,
+)
+from app.api.schemas import (
+    BatchDetectionResponse,
+    BatchItemResponse,
+    CacheStatsResponse,
+    CascadeStageStatsResponse,
+    CascadeStatsResponse,
+    CoalescingStatsResponse,
+    ErrorResponse,
+    ExecutorStatsResponse,
+    FaceDetectionResponse,
+    JobResponse,
+    NearDuplicateStatsResponse,
+    StatsResponse,
+    UrlDetectionRequest,
+    UrlDetectionResponse,
+    UrlItemResponse,
+    VideoDetectionResponse,
+    VideoSegmentResponse,
+)
 from app.application.face_detection_service import FaceDetectionService
-from app.api.dependencies import get_face_detection_service
+from app.application.inference_executor import (
+    PRIORITY_CLASSES,
+    ExecutionResult,
+    InferenceExecutor,
+)
+from app.application.job_runner import JobRunner
+from app.application.live_session import LiveFrameSession, LiveSessionLimiter
+from app.application.near_duplicate_cache import NearDuplicateCache
+from app.application.rate_limiter import TokenBucketRateLimiter
+from app.application.result_cache import ResultCache
+from app.application.single_flight import SingleFlight
+from app.application.upload_guard import UploadGuard
+from app.application.video_detection_service import VideoDetectionService
+from app.api.dependencies import (
+    get_cascade_detector,
+    get_face_detection_service,
+    get_image_fetcher,
+    get_inference_executor,
+    get_job_runner,
+    get_live_session_limiter,
+    get_near_duplicate_cache,
+    get_rate_limiter,
+    get_result_cache,
+    get_single_flight,
+    get_upload_guard,
+    get_video_detection_service,
+)
+from app.domain.exceptions import (
+    DeadlineExceededError,
+    ImageTooLargeError,
+    RateLimitExceededError,
+    ServiceOverloadedError,
+    UnsupportedImageFormatError,
+)
+from app.domain.interfaces import IImageFetcher
+from app.domain.models import JOB_COMPLETED, FaceDetectionResult
+from app.infrastructure.archive_reader import ArchiveReader
+from app.infrastructure.metrics import (
+    observe_input,
+    record_detection,
+    time_stage,
+    track_request,
+)
+
+# Modules importing OpenCV or MediaPipe are imported where they are used,
+# so importing the app stays cheap for the CLI, tests and health checks
+if TYPE_CHECKING:
+    from app.infrastructure.cascade_detector import CascadeFaceDetector
 
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["Face Detection"])
 
+# Bytes copied per read while an upload is loaded or spooled
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def _read_limited(
+    chunks: AsyncIterator[bytes], declared_size: Optional[int], max_bytes: int
+) -> bytes:
+    """
+    Collect a body, stopping as soon as it exceeds the limit.
+
+    Args:
+        chunks: Body chunks in order
+        declared_size: Size announced by the client, if any
+        max_bytes: Largest accepted size
+
+    Returns:
+        Body contents
+
+    Raises:
+        ImageTooLargeError: If the body is larger than ``max_bytes``
+    """
+    too_large = ImageTooLargeError(f"Upload exceeds the {max_bytes} byte limit")
+    if declared_size is not None and declared_size > max_bytes:
+        raise too_large
+    parts: List[bytes] = []
+    total = 0
+    with time_stage("read"):
+        async for chunk in chunks:
+            total += len(chunk)
+            if total > max_bytes:
+                raise too_large
+            parts.append(chunk)
+        return b"".join(parts)
+
+
+async def _read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """
+    Read an upload in chunks, stopping as soon as it exceeds the limit.
+
+    Args:
+        file: Uploaded file
+        max_bytes: Largest accepted size
+
+    Returns:
+        File contents
+
+    Raises:
+        ImageTooLargeError: If the file is larger than ``max_bytes``
+    """
+
+    async def chunks() -> AsyncIterator[bytes]:
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+    return await _read_limited(chunks(), file.size, max_bytes)
+
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class Admission:
+    """Scheduling terms of an admitted request."""
+
+    priority: int
+    deadline: Optional[float]
+    client: str = ""
+    limiter: Optional[TokenBucketRateLimiter] = None
+
+    def charge(self, tokens: int) -> None:
+        """
+        Take further tokens from the caller's rate limit.
+
+        Args:
+            tokens: Extra work units of the request, e.g. one per image
+                beyond the first
+
+        Raises:
+            HTTPException: If the caller is over its rate limit
+        """
+        if self.limiter is None or tokens < 1:
+            return
+        try:
+            self.limiter.acquire(self.client, tokens)
+        except RateLimitExceededError as e:
+            logger.warning("Rejecting request: client over its rate limit")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+    def throttle(self, items: Iterator[_T]) -> Iterator[_T]:
+        """
+        Pace a stream of work to the caller's rate limit.
+
+        The first item is covered by the admission itself; every later one
+        takes a token, waiting for the bucket to refill when it is empty.
+        Blocks, so the stream must be consumed on a helper thread.
+
+        Args:
+            items: Work units of the request
+
+        Yields:
+            The same items, no faster than the caller's rate allows
+        """
+        for count, item in enumerate(items):
+            while count and self.limiter is not None:
+                try:
+                    self.limiter.acquire(self.client)
+                    break
+                except RateLimitExceededError as e:
+                    time.sleep(e.retry_after)
+            yield item
+
+
+async def admit_request(
+    request: Request,
+    api_key: Optional[str] = Header(None, alias="X-API-Key"),
+    priority: str = Header("normal", alias="X-Priority"),
+    deadline_ms: Optional[float] = Header(None, alias="X-Deadline-Ms", gt=0),
+    limiter: Optional[TokenBucketRateLimiter] = Depends(get_rate_limiter),
+) -> Admission:
+    """
+    Apply the caller's rate limit and read its priority and deadline.
+
+    Admission takes one token; requests carrying several images take the
+    rest through ``Admission.charge`` or ``Admission.throttle``.
+
+    Args:
+        request: Incoming request, whose client address identifies callers
+            without an API key
+        api_key: Caller identity for rate limiting
+        priority: Priority class name from ``PRIORITY_CLASSES``
+        deadline_ms: Milliseconds the client will wait for an answer
+        limiter: Per-client rate limiter, or None when rate limiting is off
+
+    Returns:
+        Admission with the priority class, absolute deadline and the
+        caller's rate limit
+
+    Raises:
+        HTTPException: If the priority is unknown or the caller is over
+            its rate limit
+    """
+    received_at = time.perf_counter()
+    priority_class = PRIORITY_CLASSES.get(priority.lower())
+    if priority_class is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown priority: {priority}. "
+            f"Must be one of {', '.join(PRIORITY_CLASSES)}.",
+        )
+    client = api_key or (request.client.host if request.client else "")
+    deadline = None
+    if deadline_ms is not None:
+        deadline = received_at + deadline_ms / 1000
+    admission = Admission(
+        priority=priority_class, deadline=deadline, client=client, limiter=limiter
+    )
+    admission.charge(1)
+    return admission
+
+
+def _detection_response(
+    response: Response,
+    execution: ExecutionResult[FaceDetectionResult],
+    detections: bool,
+    accept: Optional[str],
+) -> Union[FaceDetectionResponse, Response]:
+    """
+    Render a detection in the representation the client asked for.
+
+    The plain JSON answer goes through the response model; the detailed
+    mode and msgpack bodies are encoded directly from the domain result.
+    Either way the queue headers are attached and the outcome counted.
+
+    Args:
+        response: Outgoing response, used to set queue headers
+        execution: Detection result with its queue measurements
+        detections: Include confidence and every detection
+        accept: Accept header, selecting JSON or msgpack
+
+    Returns:
+        FaceDetectionResponse, or an encoded Response
+    """
+    record_detection(execution.value.face_detected)
+    queue_headers = {
+        "X-Queue-Depth": str(execution.queue_depth),
+        "X-Queue-Wait-Ms": f"{execution.queue_wait * 1000:.1f}",
+    }
+
+    with time_stage("response"):
+        media_type = negotiate_media_type(accept)
+        if detections or media_type != JSON_MEDIA_TYPE:
+            return Response(
+                content=encode(
+                    result_payload(execution.value, detailed=detections), media_type
+                ),
+                media_type=media_type,
+                headers=queue_headers,
+            )
+
+        response.headers.update(queue_headers)
+        return FaceDetectionResponse(face_detected=execution.value.face_detected)
+
 
 @router.post(
     "/detect-face",
     response_model=FaceDetectionResponse,
+    response_model_exclude_none=True,
     status_code=status.HTTP_200_OK,
     responses={
+        200: {"content": {MSGPACK_MEDIA_TYPE: {}}},
         400: {"model": ErrorResponse, "description": "Invalid image data"},
+        413: {"model": ErrorResponse, "description": "Too many bytes or pixels"},
+        415: {"model": ErrorResponse, "description": "Unsupported image format"},
         422: {"model": ErrorResponse, "description": "Validation error"},
+        429: {"model": ErrorResponse, "description": "Client over rate limit"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Service at capacity"},
+        504: {"model": ErrorResponse, "description": "Deadline cannot be met"},
     },
     summary="Detect human face in image",
     description=(
         "Upload an image and receive a boolean indicating "
-        "whether a human face was detected."
+        "whether a human face was detected. With detections=true every face "
+        "is returned with its box, keypoints and score. Send "
+        "Accept: application/msgpack for a msgpack body."
     ),
 )
 async def detect_face(
+    response: Response,
     file: Annotated[UploadFile, File(description="Image file to analyze")],
+    detections: bool = Query(
+        False, description="Return every detected face with box and keypoints"
+    ),
+    accept: Optional[str] = Header(None),
     service: FaceDetectionService = Depends(get_face_detection_service),
-) -> FaceDetectionResponse:
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    guard: UploadGuard = Depends(get_upload_guard),
+    admission: Admission = Depends(admit_request),
+) -> Union[FaceDetectionResponse, Response]:
     """
     Detect if a human face is present in the uploaded image.
 
+    Decoding and inference run on the inference executor so the event loop
+    stays free for other connections. Queue depth at admission and time
+    spent queued are reported in the ``X-Queue-Depth`` and
+    ``X-Queue-Wait-Ms`` response headers. Requests are queued by their
+    ``X-Priority`` class and shed with 504 before decoding when they cannot
+    finish within ``X-Deadline-Ms``. Identical uploads arriving while one
+    of them is being detected share that detection.
+
+    The detailed mode and msgpack bodies are encoded directly from the
+    domain result so large group photos do not pay for per-field validation.
+
     Args:
+        response: Outgoing response, used to set queue headers
         file: Uploaded image file (JPEG, PNG, etc.)
+        detections: Include confidence and every detection
+        accept: Accept header, selecting JSON or msgpack
         service: Face detection service instance
+        executor: Executor running the blocking detection work
+        guard: Upload limits, used for the read size limit
+        admission: Priority class and deadline of the request
 
     Returns:
-        FaceDetectionResponse with face_detected boolean
+        FaceDetectionResponse with face_detected boolean, or an encoded
+        Response in the detailed or msgpack modes
 
     Raises:
         HTTPException: If image is invalid or processing fails
@@ -62,30 +410,1071 @@ async def detect_face(
             detail=f"Invalid file type: {file.content_type}. Must be an image.",
         )
 
-    try:
-        # Read image data
-        image_data = await file.read()
+    with track_request():
+        try:
+            # Read image data, then check the header before queueing any decode
+            image_data = await _read_upload(file, guard.max_bytes)
 
-        if not image_data:
-            logger.warning("Empty file uploaded")
+            if not image_data:
+                logger.warning("Empty file uploaded")
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Uploaded file is empty",
+                )
+            info = service.check_image(image_data)
+            observe_input(len(image_data), info.pixels if info else None)
+
+            # Perform face detection off the event loop
+            execution = await service.detect_face_coalesced(
+                image_data,
+                executor,
+                priority=admission.priority,
+                deadline=admission.deadline,
+                stop_at_first_face=not detections,
+            )
+            return _detection_response(response, execution, detections, accept)
+
+        except HTTPException:
+            # Re-raise HTTPExceptions as-is
+            raise
+        except ServiceOverloadedError as e:
+            logger.warning(f"Rejecting request: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        except DeadlineExceededError as e:
+            logger.warning(f"Shedding request: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e)
+            )
+        except ImageTooLargeError as e:
+            logger.warning(f"Rejecting upload: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)
+            )
+        except UnsupportedImageFormatError as e:
+            logger.warning(f"Rejecting upload: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e)
+            )
+        except ValueError as e:
+            logger.error(f"Validation error: {str(e)}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception:
+            logger.exception("Unexpected error during face detection")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An unexpected error occurred while processing the image",
+            )
+
+
+@router.post(
+    "/detect-raw",
+    response_model=FaceDetectionResponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"content": {MSGPACK_MEDIA_TYPE: {}}},
+        400: {"model": ErrorResponse, "description": "Invalid frame geometry"},
+        413: {"model": ErrorResponse, "description": "Too many bytes or pixels"},
+        415: {"model": ErrorResponse, "description": "Unsupported pixel format"},
+        422: {"model": ErrorResponse, "description": "Validation error"},
+        429: {"model": ErrorResponse, "description": "Client over rate limit"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Service at capacity"},
+        504: {"model": ErrorResponse, "description": "Deadline cannot be met"},
+    },
+    summary="Detect human face in raw pixels",
+    description=(
+        "Send an uncompressed frame as application/octet-stream, described "
+        "by the X-Frame-Width, X-Frame-Height, X-Frame-Format (RGB24, BGR24, "
+        "GRAY8, NV12 or I420) and optional X-Frame-Stride headers. No image "
+        "decoding takes place. Responses match /detect-face."
+    ),
+)
+async def detect_raw(
+    request: Request,
+    response: Response,
+    width: int = Header(..., alias="X-Frame-Width", gt=0),
+    height: int = Header(..., alias="X-Frame-Height", gt=0),
+    pixel_format: str = Header(..., alias="X-Frame-Format"),
+    stride: Optional[int] = Header(None, alias="X-Frame-Stride", gt=0),
+    detections: bool = Query(
+        False, description="Return every detected face with box and keypoints"
+    ),
+    accept: Optional[str] = Header(None),
+    service: FaceDetectionService = Depends(get_face_detection_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    guard: UploadGuard = Depends(get_upload_guard),
+    admission: Admission = Depends(admit_request),
+) -> Union[FaceDetectionResponse, Response]:
+    """
+    Detect if a human face is present in an uncompressed frame.
+
+    Clients that already hold decoded pixels, such as camera pipelines,
+    skip the encode on their side and the decode on ours. The geometry is
+    checked against the upload limits before the body is read, and the
+    body is wrapped with ``np.frombuffer`` on the inference executor;
+    only formats other than packed RGB pay for a colour conversion.
+
+    Args:
+        request: Incoming request, whose body holds the pixels
+        response: Outgoing response, used to set queue headers
+        width: Frame width in pixels
+        height: Frame height in pixels
+        pixel_format: RGB24, BGR24, GRAY8, NV12 or I420
+        stride: Bytes per row of the first plane when rows are padded
+        detections: Include confidence and every detection
+        accept: Accept header, selecting JSON or msgpack
+        service: Face detection service instance
+        executor: Executor running the blocking detection work
+        guard: Upload limits for bytes and pixels
+        admission: Priority class and deadline of the request
+
+    Returns:
+        FaceDetectionResponse with face_detected boolean, or an encoded
+        Response in the detailed or msgpack modes
+
+    Raises:
+        HTTPException: If the frame is invalid or processing fails
+    """
+    content_type = request.headers.get("content-type")
+    if (
+        content_type
+        and content_type.split(";")[0].strip() != "application/octet-stream"
+    ):
+        logger.warning(f"Invalid content type: {content_type}")
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Invalid content type: {content_type}. "
+            "Must be application/octet-stream.",
+        )
+
+    from app.infrastructure.image_decoding import decode_raw_frame, raw_frame_size
+
+    def detect(frame_data: bytes) -> FaceDetectionResult:
+        return service.detect_face_in_array(
+            decode_raw_frame(frame_data, width, height, pixel_format, stride),
+            stop_at_first_face=not detections,
+        )
+
+    with track_request():
+        try:
+            raw_frame_size(width, height, pixel_format, stride)
+            if width * height > guard.max_pixels:
+                raise ImageTooLargeError(
+                    f"Frame is {width}x{height} pixels, "
+                    f"limit is {guard.max_pixels} pixels"
+                )
+            declared_size = request.headers.get("content-length")
+            frame_data = await _read_limited(
+                request.stream(),
+                int(declared_size) if declared_size else None,
+                guard.max_bytes,
+            )
+            observe_input(len(frame_data), width * height)
+
+            execution = await executor.run(
+                detect,
+                frame_data,
+                priority=admission.priority,
+                deadline=admission.deadline,
+            )
+            return _detection_response(response, execution, detections, accept)
+
+        except ServiceOverloadedError as e:
+            logger.warning(f"Rejecting request: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        except DeadlineExceededError as e:
+            logger.warning(f"Shedding request: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e)
+            )
+        except ImageTooLargeError as e:
+            logger.warning(f"Rejecting frame: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)
+            )
+        except UnsupportedImageFormatError as e:
+            logger.warning(f"Rejecting frame: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e)
+            )
+        except ValueError as e:
+            logger.error(f"Validation error: {str(e)}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception:
+            logger.exception("Unexpected error during face detection")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An unexpected error occurred while processing the frame",
+            )
+
+
+@router.post(
+    "/detect-faces",
+    response_model=BatchDetectionResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "Too many files"},
+        413: {"model": ErrorResponse, "description": "Batch too large"},
+        422: {"model": ErrorResponse, "description": "Validation error"},
+        429: {"model": ErrorResponse, "description": "Client over rate limit"},
+    },
+    summary="Detect human faces in several images",
+    description=(
+        "Upload many images in one request and receive a per-image result "
+        "or error, in upload order."
+    ),
+)
+async def detect_faces(
+    files: Annotated[List[UploadFile], File(description="Image files to analyze")],
+    service: FaceDetectionService = Depends(get_face_detection_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    settings: Settings = Depends(get_settings),
+    admission: Admission = Depends(admit_request),
+) -> BatchDetectionResponse:
+    """
+    Detect faces in every uploaded image.
+
+    Images are processed concurrently on the inference executor, at most
+    as many at a time as there are workers. Files that are not images, are
+    empty or fail to decode get an ``error`` entry instead of failing the
+    whole request. The batch takes one rate limit token per file, and its
+    priority and deadline apply to every image.
+
+    Args:
+        files: Uploaded image files
+        service: Face detection service instance
+        executor: Executor running the blocking detection work
+        settings: Application settings holding the batch limits
+        admission: Scheduling terms of the request
+
+    Returns:
+        BatchDetectionResponse with one entry per file
+
+    Raises:
+        HTTPException: If the batch exceeds the configured limits or the
+            caller's rate limit
+    """
+    if len(files) > settings.batch_max_files:
+        logger.warning(f"Rejecting batch of {len(files)} files")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files: at most {settings.batch_max_files} per request",
+        )
+    admission.charge(len(files) - 1)
+
+    errors: Dict[int, str] = {}
+    images: List[bytes] = []
+    positions: List[int] = []
+    total_bytes = 0
+    for index, file in enumerate(files):
+        if file.content_type and not file.content_type.startswith("image/"):
+            errors[index] = f"Invalid file type: {file.content_type}. Must be an image."
+            continue
+        try:
+            image_data = await _read_upload(
+                file, settings.batch_max_total_bytes - total_bytes
+            )
+        except ImageTooLargeError:
+            logger.warning("Rejecting batch over the total size limit")
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty"
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=(
+                    f"Batch too large: at most "
+                    f"{settings.batch_max_total_bytes} bytes per request"
+                ),
+            )
+        total_bytes += len(image_data)
+        if not image_data:
+            errors[index] = "Uploaded file is empty"
+            continue
+        images.append(image_data)
+        positions.append(index)
+
+    results: List[BatchItemResponse] = [
+        BatchItemResponse(index=index, filename=files[index].filename, error=error)
+        for index, error in errors.items()
+    ]
+    items = await service.detect_faces_in_images(
+        images, executor, priority=admission.priority, deadline=admission.deadline
+    )
+    for item in items:
+        index = positions[item.index]
+        results.append(
+            BatchItemResponse(
+                index=index,
+                filename=files[index].filename,
+                face_detected=item.result.face_detected if item.result else None,
+                error=item.error,
             )
+        )
+    results.sort(key=lambda item: item.index)
+    return BatchDetectionResponse(results=results)
+
+
+@router.post(
+    "/detect-urls",
+    response_model=UrlDetectionResponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "Too many URLs"},
+        422: {"model": ErrorResponse, "description": "Validation error"},
+        429: {"model": ErrorResponse, "description": "Client over rate limit"},
+    },
+    summary="Detect human faces in images fetched by URL",
+    description=(
+        "Send the URLs of images in object storage instead of uploading "
+        "them and receive a per-URL result or error, in request order."
+    ),
+)
+async def detect_urls(
+    request: UrlDetectionRequest,
+    service: FaceDetectionService = Depends(get_face_detection_service),
+    fetcher: IImageFetcher = Depends(get_image_fetcher),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    settings: Settings = Depends(get_settings),
+    admission: Admission = Depends(admit_request),
+) -> UrlDetectionResponse:
+    """
+    Fetch images from their URLs and detect faces in every one.
+
+    Images are downloaded over a shared connection pool while earlier
+    ones are detected on the inference executor. Only hosts listed in
+    ``URL_FETCH_ALLOWED_HOSTS`` are fetched from; URLs that are not allowed,
+    fail to download, exceed the upload limits or fail to decode get an
+    ``error`` entry instead of failing the whole request. The request takes
+    one rate limit token per URL, and its priority and deadline apply to
+    every image.
+
+    Args:
+        request: URLs of the images
+        service: Face detection service instance
+        fetcher: Fetcher downloading the images
+        executor: Executor running the blocking detection work
+        settings: Application settings holding the URL limits
+        admission: Scheduling terms of the request
 
-        # Perform face detection
-        result = service.detect_face_in_image(image_data)
+    Returns:
+        UrlDetectionResponse with one entry per URL
+
+    Raises:
+        HTTPException: If the request has too many URLs or exceeds the
+            caller's rate limit
+    """
+    if len(request.urls) > settings.url_fetch_max_urls:
+        logger.warning(f"Rejecting request for {len(request.urls)} URLs")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many URLs: at most {settings.url_fetch_max_urls} per request",
+        )
+    admission.charge(len(request.urls) - 1)
+
+    items = await service.detect_faces_at_urls(
+        request.urls,
+        fetcher,
+        executor,
+        max_in_flight=settings.url_fetch_max_in_flight or None,
+        priority=admission.priority,
+        deadline=admission.deadline,
+    )
+    return UrlDetectionResponse(
+        results=[
+            UrlItemResponse(
+                index=item.index,
+                url=request.urls[item.index],
+                face_detected=item.result.face_detected if item.result else None,
+                error=item.error,
+            )
+            for item in items
+        ]
+    )
 
-        return FaceDetectionResponse(face_detected=result.face_detected)
 
-    except HTTPException:
-        # Re-raise HTTPExceptions as-is
-        raise
+@router.post(
+    "/detect-archive",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "One JSON object per archive member, one per line",
+        },
+        400: {"model": ErrorResponse, "description": "Not a zip or tar archive"},
+        422: {"model": ErrorResponse, "description": "Validation error"},
+        429: {"model": ErrorResponse, "description": "Client over rate limit"},
+    },
+    summary="Detect human faces in every image of an archive",
+    description=(
+        "Upload a zip or tar (optionally compressed) archive and receive "
+        "newline-delimited JSON results as each member is processed."
+    ),
+)
+async def detect_archive(
+    file: Annotated[UploadFile, File(description="Zip or tar archive of images")],
+    service: FaceDetectionService = Depends(get_face_detection_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    settings: Settings = Depends(get_settings),
+    admission: Admission = Depends(admit_request),
+) -> StreamingResponse:
+    """
+    Stream detection results for the images in an uploaded archive.
+
+    The upload is spooled to disk by the server and members are read one
+    at a time, with at most ``ARCHIVE_MAX_IN_FLIGHT`` images held in memory,
+    so memory use does not grow with the archive. Each line has the member
+    ``name``, ``face_detected``, ``confidence`` and ``error``; lines arrive in
+    completion order, not archive order. Members are read no faster than
+    the caller's rate limit allows, one token each, and the request's
+    priority and deadline apply to every image.
+
+    Args:
+        file: Uploaded archive
+        service: Face detection service instance
+        executor: Executor running the blocking detection work
+        settings: Application settings holding the archive limits
+        admission: Scheduling terms of the request
+
+    Returns:
+        StreamingResponse of NDJSON lines
+
+    Raises:
+        HTTPException: If the upload is not a readable archive
+    """
+    # FastAPI closes uploads when the handler returns, before the body is
+    # streamed, so the response takes over the spooled file instead
+    archive_file, file.file = file.file, BytesIO()
+    try:
+        reader = await asyncio.to_thread(
+            ArchiveReader, archive_file, settings.archive_max_member_bytes
+        )
+    except ValueError as e:
+        archive_file.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def lines() -> AsyncIterator[str]:
+        try:
+            async for name, item in service.detect_faces_in_stream(
+                admission.throttle(reader.members()),
+                executor,
+                max_in_flight=settings.archive_max_in_flight or None,
+                max_image_bytes=settings.archive_max_member_bytes,
+                priority=admission.priority,
+                deadline=admission.deadline,
+            ):
+                yield json.dumps(
+                    {
+                        "name": name,
+                        "face_detected": (
+                            item.result.face_detected if item.result else None
+                        ),
+                        "confidence": item.result.confidence if item.result else None,
+                        "error": item.error,
+                    }
+                ) + "\n"
+        except ValueError as e:
+            # The archive is truncated or corrupt past the members read so far
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            reader.close()
+            await asyncio.to_thread(archive_file.close)
+
+    logger.info(f"Streaming detection over {reader.format} archive")
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# Results read from the job store per query while streaming
+_JOB_RESULTS_PAGE = 1000
+
+# Seconds between store reads while following a running job
+_JOB_POLL_SECONDS = 0.5
+
+
+def require_job_runner(
+    runner: Optional[JobRunner] = Depends(get_job_runner),
+) -> JobRunner:
+    """
+    Get the job runner, failing the request when bulk jobs are disabled.
+
+    Args:
+        runner: Job runner instance, or None when bulk jobs are disabled
+
+    Returns:
+        JobRunner instance
+
+    Raises:
+        HTTPException: If bulk jobs are disabled
+    """
+    if runner is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Bulk jobs are disabled"
+        )
+    return runner
+
+
+def _manifest_sources(manifest: IO[bytes]) -> Iterator[str]:
+    """
+    Read the image sources of a manifest, one per non-blank line.
+
+    Args:
+        manifest: Spooled manifest upload
+
+    Yields:
+        Sources with surrounding whitespace removed
+
+    Raises:
+        ValueError: If a line is not valid UTF-8
+    """
+    manifest.seek(0)
+    for number, line in enumerate(manifest, start=1):
+        try:
+            source = line.decode("utf-8").strip()
+        except UnicodeDecodeError:
+            raise ValueError(f"Manifest line {number} is not valid UTF-8")
+        if source:
+            yield source
+
+
+@router.post(
+    "/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        400: {"model": ErrorResponse, "description": "Empty or invalid manifest"},
+        404: {"model": ErrorResponse, "description": "Bulk jobs are disabled"},
+        413: {"model": ErrorResponse, "description": "Manifest too large"},
+        429: {"model": ErrorResponse, "description": "Client over rate limit"},
+    },
+    summary="Submit a bulk detection job",
+    description=(
+        "Send a plain-text manifest with one image URL or local path per "
+        "line and receive a job ID at once. Images are processed in the "
+        "background; poll /jobs/{job_id} for progress and read results from "
+        "/jobs/{job_id}/results."
+    ),
+)
+async def submit_job(
+    request: Request,
+    runner: JobRunner = Depends(require_job_runner),
+    settings: Settings = Depends(get_settings),
+    admission: Admission = Depends(admit_request),
+) -> JobResponse:
+    """
+    Record a bulk detection job and queue it.
+
+    The manifest is spooled to disk as it arrives and written to the job
+    store in one transaction, so a manifest of millions of lines is never
+    held in memory and a failed upload leaves no partial job. URLs are
+    fetched from ``URL_FETCH_ALLOWED_HOSTS`` only and local paths must lie
+    under ``JOB_IMAGE_ROOT``; sources that break these rules are recorded
+    as item errors, like images that fail to decode.
+
+    A submission takes one rate limit token. Job images always run at the
+    ``low`` priority, behind interactive requests, so the priority and
+    deadline headers do not apply.
+
+    Args:
+        request: Incoming request, whose body holds the manifest
+        runner: Job runner instance
+        settings: Application settings holding the manifest limit
+        admission: Scheduling terms of the request, unused beyond the
+            rate limit
+
+    Returns:
+        JobResponse of the queued job
+
+    Raises:
+        HTTPException: If the manifest is empty, invalid or too large
+    """
+    max_bytes = settings.job_max_manifest_bytes
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Manifest exceeds the {max_bytes} byte limit",
+    )
+    declared = request.headers.get("Content-Length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+        raise too_large
+    with tempfile.SpooledTemporaryFile(max_size=_UPLOAD_CHUNK_SIZE) as manifest:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_bytes:
+                raise too_large
+            manifest.write(chunk)
+        try:
+            job = await runner.submit(_manifest_sources(manifest))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    logger.info(f"Queued job {job.job_id} with {job.total} image(s)")
+    return JobResponse(**asdict(job))
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown job or jobs disabled"}
+    },
+    summary="Bulk job progress",
+    description="Status and item counters of a bulk detection job.",
+)
+async def get_job(
+    job_id: str, runner: JobRunner = Depends(require_job_runner)
+) -> JobResponse:
+    """
+    Report a bulk job's progress.
+
+    Args:
+        job_id: Job identifier
+        runner: Job runner instance
+
+    Returns:
+        JobResponse with the job's counters
+
+    Raises:
+        HTTPException: If there is no such job
+    """
+    job = await runner.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return JobResponse(**asdict(job))
+
+
+@router.get(
+    "/jobs/{job_id}/results",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "One JSON object per recorded image, one per line",
+        },
+        404: {"model": ErrorResponse, "description": "Unknown job or jobs disabled"},
+    },
+    summary="Bulk job results",
+    description=(
+        "Stream the recorded results of a bulk job as newline-delimited "
+        "JSON, in the order they were recorded."
+    ),
+)
+async def get_job_results(
+    job_id: str,
+    after: int = Query(
+        0, ge=0, description="Sequence of the last result already received"
+    ),
+    follow: bool = Query(
+        False, description="Keep streaming new results until the job completes"
+    ),
+    runner: JobRunner = Depends(require_job_runner),
+) -> StreamingResponse:
+    """
+    Stream a bulk job's results.
+
+    Each line has the result's ``sequence``, the image's manifest
+    ``index`` and ``source``, ``face_detected``, ``confidence`` and
+    ``error``. Sequences count up from 1 in recording order, so a client
+    whose connection drops resumes with ``after`` set to the last sequence
+    it received. Without ``follow`` the stream ends with the results
+    recorded so far; with it, the stream waits for new checkpoints and
+    ends when the job completes.
+
+    Args:
+        job_id: Job identifier
+        after: Sequence of the last result already received
+        follow: Keep streaming until the job completes
+        runner: Job runner instance
+
+    Returns:
+        StreamingResponse of NDJSON lines
+
+    Raises:
+        HTTPException: If there is no such job
+    """
+    if await runner.get_job(job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+
+    async def lines() -> AsyncIterator[str]:
+        last = after
+        while True:
+            # Read the status first: once it says completed, every result
+            # is already in the store
+            job = await runner.get_job(job_id)
+            if job is None:
+                # Deleted from the store while streaming
+                return
+            page = await runner.results(job_id, last, _JOB_RESULTS_PAGE)
+            for sequence, item in page:
+                yield json.dumps({"sequence": sequence, **asdict(item)}) + "\n"
+                last = sequence
+            if len(page) == _JOB_RESULTS_PAGE:
+                continue
+            if not follow or job.status == JOB_COMPLETED:
+                return
+            await asyncio.sleep(_JOB_POLL_SECONDS)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _spool_to_temp_file(source: IO[bytes], suffix: str, max_bytes: int) -> str:
+    """
+    Copy an upload into a named temporary file, enforcing a size limit.
+
+    Bytes are counted as they are copied, so the limit holds even when the
+    client sent no size for the part.
+
+    Args:
+        source: Uploaded file object
+        suffix: File name suffix, which helps FFmpeg pick a demuxer
+        max_bytes: Largest accepted size
+
+    Returns:
+        Path of the temporary file; the caller deletes it
+
+    Raises:
+        HTTPException: If the upload is larger than ``max_bytes``
+    """
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as target:
+        try:
+            size = 0
+            while chunk := source.read(_UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Video too large: at most {max_bytes} bytes",
+                    )
+                target.write(chunk)
+        except BaseException:
+            target.close()
+            os.unlink(target.name)
+            raise
+    return target.name
+
+
+@router.post(
+    "/detect-video",
+    response_model=VideoDetectionResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid video data"},
+        413: {"model": ErrorResponse, "description": "Video too large"},
+        422: {"model": ErrorResponse, "description": "Validation error"},
+        429: {"model": ErrorResponse, "description": "Client over rate limit"},
+        503: {"model": ErrorResponse, "description": "Service at capacity"},
+        504: {"model": ErrorResponse, "description": "Deadline cannot be met"},
+    },
+    summary="Detect human faces in a video",
+    description=(
+        "Upload an MP4, WebM or MJPEG video and receive whether any sampled "
+        "frame contains a face, with a timeline of face segments."
+    ),
+)
+async def detect_video(
+    file: Annotated[UploadFile, File(description="Video file to analyze")],
+    stop_at_first_face: Annotated[
+        bool, Query(description="Stop decoding at the first face found")
+    ] = False,
+    service: VideoDetectionService = Depends(get_video_detection_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    settings: Settings = Depends(get_settings),
+    admission: Admission = Depends(admit_request),
+) -> VideoDetectionResponse:
+    """
+    Detect faces in sampled frames of an uploaded video.
+
+    The upload is copied to a temporary file for ``cv2.VideoCapture`` and
+    the whole video is processed as one task on the inference executor,
+    at the request's priority and deadline.
+
+    Args:
+        file: Uploaded video file
+        stop_at_first_face: Stop decoding at the first face found
+        service: Video detection service instance
+        executor: Executor running the blocking detection work
+        settings: Application settings holding the upload limit
+        admission: Scheduling terms of the request
+
+    Returns:
+        VideoDetectionResponse with the segment timeline
+
+    Raises:
+        HTTPException: If the video is invalid, too large or processing fails
+    """
+    if file.content_type and not (
+        file.content_type.startswith("video/")
+        or file.content_type == "application/octet-stream"
+    ):
+        logger.warning(f"Invalid content type: {file.content_type}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid file type: {file.content_type}. Must be a video.",
+        )
+
+    if file.size is not None and file.size > settings.video_max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Video too large: at most {settings.video_max_bytes} bytes",
+        )
+
+    suffix = os.path.splitext(file.filename or "")[1]
+    path = await asyncio.to_thread(
+        _spool_to_temp_file, file.file, suffix, settings.video_max_bytes
+    )
+
+    try:
+        execution = await executor.run(
+            service.detect_faces_in_video,
+            path,
+            stop_at_first_face,
+            priority=admission.priority,
+            deadline=admission.deadline,
+        )
+    except ServiceOverloadedError as e:
+        logger.warning(f"Rejecting request: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except DeadlineExceededError as e:
+        logger.warning(f"Shedding request: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception:
-        logger.exception("Unexpected error during face detection")
+        logger.exception("Unexpected error during video face detection")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while processing the image",
+            detail="An unexpected error occurred while processing the video",
         )
+    finally:
+        await asyncio.to_thread(os.unlink, path)
+
+    result = execution.value
+    return VideoDetectionResponse(
+        face_detected=result.face_detected,
+        stopped_early=result.stopped_early,
+        frames_read=result.frames_read,
+        frames_sampled=result.frames_sampled,
+        segments=[VideoSegmentResponse(**asdict(s)) for s in result.segments],
+    )
+
+
+# Geometry and pixel format of raw frames on a live session
+_RawFormat = Tuple[int, int, str, Optional[int]]
+
+
+def _parse_frame_format(message: str) -> Optional[_RawFormat]:
+    """
+    Parse a live session format message.
+
+    Args:
+        message: JSON text such as ``{"format": "rgb24", "width": 640,
+            "height": 480}``, optionally with a row ``"stride"`` in bytes,
+            or ``{"format": "encoded"}``
+
+    Returns:
+        (width, height, pixel format, stride) for raw frames, or None for
+        encoded
+
+    Raises:
+        ValueError: If the message is malformed or the format unsupported
+    """
+    from app.infrastructure.image_decoding import RAW_PIXEL_FORMATS
+
+    try:
+        config = json.loads(message)
+        pixel_format = str(config["format"]).upper()
+        if pixel_format == "ENCODED":
+            return None
+        if pixel_format not in RAW_PIXEL_FORMATS:
+            raise ValueError(f"Unsupported pixel format: {config['format']}")
+        stride = config.get("stride")
+        return (
+            int(config["width"]),
+            int(config["height"]),
+            pixel_format,
+            int(stride) if stride is not None else None,
+        )
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid format message: {str(e)}")
+
+
+@router.websocket("/ws/detect-face")
+async def detect_face_live(
+    websocket: WebSocket,
+    service: FaceDetectionService = Depends(get_face_detection_service),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    limiter: LiveSessionLimiter = Depends(get_live_session_limiter),
+    settings: Settings = Depends(get_settings),
+) -> None:
+    """
+    Detect faces in live camera frames sent over a WebSocket.
+
+    Binary messages are frames; text messages switch between encoded
+    images and raw pixels. Only the newest waiting frame is processed, and
+    each result carries its frame ID, latency and the number of frames
+    dropped since the previous result. Sessions beyond the configured limit
+    are closed with code 1013.
+
+    Args:
+        websocket: Client connection
+        service: Face detection service instance
+        executor: Executor running the blocking detection work
+        limiter: Limiter shared by all live sessions
+        settings: Application settings holding the frame size limit
+    """
+    await websocket.accept()
+    if not limiter.try_acquire():
+        logger.warning("Rejecting live session: limit reached")
+        await websocket.close(
+            code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many live sessions"
+        )
+        return
+
+    from app.infrastructure.image_decoding import decode_raw_frame
+
+    def detect(frame: Tuple[bytes, Optional[_RawFormat]]) -> FaceDetectionResult:
+        data, raw_format = frame
+        if raw_format is None:
+            return service.detect_face_in_image(data, use_cache=False)
+        return service.detect_face_in_array(decode_raw_frame(data, *raw_format))
+
+    session = LiveFrameSession(executor, detect)
+
+    async def send_results() -> None:
+        async for item in session.results():
+            await websocket.send_json(
+                {
+                    "frame_id": item.frame_id,
+                    "face_detected": (
+                        item.result.face_detected if item.result else None
+                    ),
+                    "confidence": item.result.confidence if item.result else None,
+                    "latency_ms": round(item.latency * 1000, 1),
+                    "queue_wait_ms": round(item.queue_wait * 1000, 1),
+                    "dropped": item.dropped,
+                    "error": item.error,
+                }
+            )
+
+    logger.info(f"Live session started ({limiter.active} active)")
+    sender = asyncio.create_task(send_results())
+    raw_format: Optional[_RawFormat] = None
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                if len(message["bytes"]) > settings.websocket_max_frame_bytes:
+                    await websocket.send_json(
+                        {
+                            "error": f"Frame too large: at most "
+                            f"{settings.websocket_max_frame_bytes} bytes"
+                        }
+                    )
+                    continue
+                session.submit((message["bytes"], raw_format))
+            elif message.get("text") is not None:
+                try:
+                    raw_format = _parse_frame_format(message["text"])
+                except ValueError as e:
+                    await websocket.send_json({"error": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.close()
+        sender.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await sender
+        limiter.release()
+        logger.info(f"Live session ended, {session.dropped} frame(s) dropped")
+
+
+def _cascade_stats(cascade: "CascadeFaceDetector") -> CascadeStatsResponse:
+    """Convert cascade counters to their response model."""
+    stats = cascade.stats()
+    return CascadeStatsResponse(
+        accept_above=stats.accept_above,
+        reject_below=stats.reject_below,
+        stages=[
+            CascadeStageStatsResponse(**asdict(stage), exit_rate=stage.exit_rate)
+            for stage in stats.stages
+        ],
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=StatsResponse,
+    summary="Service statistics",
+    description=(
+        "Current inference queue depth, wait times, throughput counters "
+        "and result cache hit rates."
+    ),
+)
+async def get_stats(
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    result_cache: Optional[ResultCache] = Depends(get_result_cache),
+    near_duplicate_cache: Optional[NearDuplicateCache] = Depends(
+        get_near_duplicate_cache
+    ),
+    cascade: Optional["CascadeFaceDetector"] = Depends(get_cascade_detector),
+    single_flight: Optional[SingleFlight] = Depends(get_single_flight),
+) -> StatsResponse:
+    """
+    Report service load statistics.
+
+    Args:
+        executor: Inference executor instance
+        result_cache: Result cache instance, if caching is enabled
+        near_duplicate_cache: Near-duplicate cache instance, if enabled
+        cascade: Cascade detector, if it is the configured backend
+        single_flight: Request coalescing group, if coalescing is enabled
+
+    Returns:
+        StatsResponse with executor and cache statistics
+    """
+    stats = executor.stats()
+    return StatsResponse(
+        executor=ExecutorStatsResponse(
+            max_workers=stats.max_workers,
+            max_queue_size=stats.max_queue_size,
+            running=stats.running,
+            queued=stats.queued,
+            completed=stats.completed,
+            rejected=stats.rejected,
+            shed=stats.shed,
+            avg_queue_wait_ms=stats.avg_queue_wait * 1000,
+            avg_run_time_ms=stats.avg_run_time * 1000,
+        ),
+        result_cache=(
+            CacheStatsResponse(**asdict(result_cache.stats()))
+            if result_cache is not None
+            else None
+        ),
+        near_duplicate_cache=(
+            NearDuplicateStatsResponse(**asdict(near_duplicate_cache.stats()))
+            if near_duplicate_cache is not None
+            else None
+        ),
+        coalescing=(
+            CoalescingStatsResponse(**asdict(single_flight.stats()))
+            if single_flight is not None
+            else None
+        ),
+        cascade=_cascade_stats(cascade) if cascade is not None else None,
+    )
@@ -1,18 +1,153 @@
 """API request and response models."""
 
+from typing import List, Optional
+
 from pydantic import BaseModel, ConfigDict, Field
 
 
+class DetectionResponse(BaseModel):
+    """One detected face, in coordinates relative to the image size."""
+
+    score: float = Field(..., description="Detection confidence")
+    box: List[float] = Field(..., description="xmin, ymin, width and height")
+    keypoints: List[List[float]] = Field(
+        ...,
+        description=(
+            "x, y of the right eye, left eye, nose tip, mouth centre, "
+            "right ear tragion and left ear tragion"
+        ),
+    )
+
+
 class FaceDetectionResponse(BaseModel):
     """Response model for face detection endpoint."""
 
     face_detected: bool = Field(
         ..., description="Whether a human face was detected in the image"
     )
+    confidence: Optional[float] = Field(
+        default=None, description="Highest detection score, only with detections=true"
+    )
+    detections: Optional[List[DetectionResponse]] = Field(
+        default=None, description="Every detected face, only with detections=true"
+    )
 
     model_config = ConfigDict(json_schema_extra={"example": {"face_detected": True}})
 
 
+class BatchItemResponse(BaseModel):
+    """Result for one file of a batch request."""
+
+    index: int = Field(..., description="Position of the file in the request")
+    filename: Optional[str] = Field(default=None, description="Uploaded file name")
+    face_detected: Optional[bool] = Field(
+        default=None, description="Whether a face was detected, absent on error"
+    )
+    error: Optional[str] = Field(
+        default=None, description="Why the file was not processed"
+    )
+
+
+class BatchDetectionResponse(BaseModel):
+    """Response model for the batch face detection endpoint."""
+
+    results: List[BatchItemResponse] = Field(
+        ..., description="One entry per uploaded file, in upload order"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "results": [
+                    {"index": 0, "filename": "a.jpg", "face_detected": True},
+                    {
+                        "index": 1,
+                        "filename": "b.txt",
+                        "error": "Invalid file type: text/plain. Must be an image.",
+                    },
+                ]
+            }
+        }
+    )
+
+
+class UrlDetectionRequest(BaseModel):
+    """Request model for the detect-by-URL endpoint."""
+
+    urls: List[str] = Field(
+        ..., min_length=1, description="URLs of the images to analyze"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"urls": ["https://images.example.com/photos/a.jpg"]}
+        }
+    )
+
+
+class UrlItemResponse(BaseModel):
+    """Result for one URL of a detect-by-URL request."""
+
+    index: int = Field(..., description="Position of the URL in the request")
+    url: str = Field(..., description="URL of the image")
+    face_detected: Optional[bool] = Field(
+        None, description="Whether a face was detected, absent on error"
+    )
+    error: Optional[str] = Field(
+        None, description="Why the image was not fetched or processed"
+    )
+
+
+class UrlDetectionResponse(BaseModel):
+    """Response model for the detect-by-URL endpoint."""
+
+    results: List[UrlItemResponse] = Field(
+        ..., description="One entry per URL, in request order"
+    )
+
+
+class JobResponse(BaseModel):
+    """Progress of a bulk detection job."""
+
+    job_id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="queued, running or completed")
+    total: int = Field(..., description="Images listed in the manifest")
+    done: int = Field(..., description="Images with a recorded result or error")
+    failed: int = Field(..., description="Images recorded with an error")
+    faces: int = Field(..., description="Images in which a face was detected")
+    created_at: float = Field(..., description="Submission time, Unix seconds")
+    finished_at: Optional[float] = Field(
+        None, description="Completion time, Unix seconds, absent until completed"
+    )
+
+
+class VideoSegmentResponse(BaseModel):
+    """Stretch of a video with a constant face-presence answer."""
+
+    start_ms: float = Field(..., description="Segment start, in milliseconds")
+    end_ms: float = Field(..., description="Segment end, in milliseconds")
+    face_detected: bool = Field(..., description="Whether sampled frames had a face")
+    max_confidence: Optional[float] = Field(
+        None, description="Best face score in the segment"
+    )
+
+
+class VideoDetectionResponse(BaseModel):
+    """Response model for the video face detection endpoint."""
+
+    face_detected: bool = Field(
+        ..., description="Whether any sampled frame contained a face"
+    )
+    stopped_early: bool = Field(
+        ..., description="Whether decoding stopped at the first face found"
+    )
+    frames_read: int = Field(..., description="Frames read from the video")
+    frames_sampled: int = Field(..., description="Frames run through the detector")
+    segments: List[VideoSegmentResponse] = Field(
+        ..., description="Timeline of sampled frames grouped by face presence"
+    )
+
+
 class HealthResponse(BaseModel):
     """Response model for health check endpoint."""
 
@@ -24,6 +159,112 @@ class HealthResponse(BaseModel):
     )
 
 
+class ReadinessResponse(BaseModel):
+    """Response model for the readiness check endpoint."""
+
+    ready: bool = Field(..., description="Whether startup warm-up has finished")
+    time_to_ready_seconds: Optional[float] = Field(
+        None, description="Seconds from startup until the service became ready"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={"example": {"ready": True, "time_to_ready_seconds": 1.4}}
+    )
+
+
+class ExecutorStatsResponse(BaseModel):
+    """Load of the inference executor."""
+
+    max_workers: int = Field(..., description="Number of inference workers")
+    max_queue_size: int = Field(..., description="Maximum number of queued tasks")
+    running: int = Field(..., description="Tasks currently running")
+    queued: int = Field(..., description="Tasks waiting for a worker")
+    completed: int = Field(..., description="Tasks completed since startup")
+    rejected: int = Field(..., description="Tasks rejected because the queue was full")
+    shed: int = Field(
+        ..., description="Tasks shed because they could not meet their deadline"
+    )
+    avg_queue_wait_ms: float = Field(
+        ..., description="Moving average of time spent queued, in milliseconds"
+    )
+    avg_run_time_ms: float = Field(
+        ..., description="Moving average of task run time, in milliseconds"
+    )
+
+
+class CacheStatsResponse(BaseModel):
+    """Effectiveness of the result cache."""
+
+    hits: int = Field(..., description="Lookups served from local memory")
+    shared_hits: int = Field(..., description="Lookups served from the shared store")
+    misses: int = Field(..., description="Lookups that required detection")
+    evictions: int = Field(..., description="Entries evicted to stay within budget")
+    entries: int = Field(..., description="Entries currently held in memory")
+    size_bytes: int = Field(..., description="Approximate memory used by entries")
+    max_bytes: int = Field(..., description="Memory budget for entries")
+
+
+class CoalescingStatsResponse(BaseModel):
+    """Work saved by coalescing concurrent identical uploads."""
+
+    leaders: int = Field(..., description="Detections run on behalf of a group")
+    coalesced: int = Field(
+        ..., description="Requests that joined a detection already in flight"
+    )
+    in_flight: int = Field(..., description="Shared detections currently running")
+
+
+class NearDuplicateStatsResponse(BaseModel):
+    """Effectiveness of the near-duplicate cache."""
+
+    hits: int = Field(..., description="Lookups matched to a similar image")
+    misses: int = Field(..., description="Lookups with no similar image")
+    hash_failures: int = Field(..., description="Images that could not be hashed")
+    entries: int = Field(..., description="Hashes currently held")
+    max_entries: int = Field(..., description="Maximum number of hashes held")
+    max_distance: int = Field(..., description="Hamming distance treated as a match")
+
+
+class CascadeStageStatsResponse(BaseModel):
+    """Exit counters for one cascade stage."""
+
+    name: str = Field(..., description="Stage name")
+    entered: int = Field(..., description="Images that reached this stage")
+    accepted: int = Field(..., description="Images answered as containing a face")
+    rejected: int = Field(..., description="Images answered as containing no face")
+    escalated: int = Field(..., description="Images passed on to the next stage")
+    exit_rate: float = Field(..., description="Fraction answered by this stage")
+
+
+class CascadeStatsResponse(BaseModel):
+    """Cascade backend statistics."""
+
+    accept_above: float = Field(..., description="Score accepted as a face early")
+    reject_below: float = Field(..., description="Score rejected as no face early")
+    stages: List[CascadeStageStatsResponse] = Field(
+        ..., description="Stages in the order images pass through them"
+    )
+
+
+class StatsResponse(BaseModel):
+    """Response model for service statistics endpoint."""
+
+    executor: ExecutorStatsResponse = Field(..., description="Inference executor load")
+    result_cache: Optional[CacheStatsResponse] = Field(
+        None, description="Result cache counters, absent when caching is disabled"
+    )
+    near_duplicate_cache: Optional[NearDuplicateStatsResponse] = Field(
+        None,
+        description="Near-duplicate cache counters, absent when it is disabled",
+    )
+    coalescing: Optional[CoalescingStatsResponse] = Field(
+        None, description="Request coalescing counters, absent when it is disabled"
+    )
+    cascade: Optional[CascadeStatsResponse] = Field(
+        None, description="Cascade stage counters, absent for other backends"
+    )
+
+
 class ErrorResponse(BaseModel):
     """Response model for error cases."""
 
@@ -0,0 +1,106 @@
+"""Fast encoding of detection results for detailed and binary responses."""
+
+from typing import Any, Dict, Optional
+
+import orjson
+
+from app.domain.models import FaceDetection, FaceDetectionResult
+
+try:
+    import msgpack  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+_MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Choose the response encoding from an ``Accept`` header.
+
+    msgpack is chosen when the client ranks it above JSON and the msgpack
+    package is installed; anything else gets JSON, as before content
+    negotiation existed.
+
+    Args:
+        accept: Raw ``Accept`` header value, if any
+
+    Returns:
+        ``JSON_MEDIA_TYPE`` or ``MSGPACK_MEDIA_TYPE``
+    """
+    if not accept or msgpack is None:
+        return JSON_MEDIA_TYPE
+
+    ranked = []
+    for position, entry in enumerate(accept.split(",")):
+        media_type, *parameters = (part.strip() for part in entry.split(";"))
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranked.append((-quality, position, media_type.lower()))
+
+    for _, _, media_type in sorted(ranked):
+        if media_type in _MSGPACK_ALIASES:
+            return MSGPACK_MEDIA_TYPE
+        if media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            return JSON_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def result_payload(
+    result: FaceDetectionResult, detailed: bool = False
+) -> Dict[str, Any]:
+    """
+    Build the response body for a detection result.
+
+    Detections are left as domain objects; both encoders below write them
+    directly without building intermediate dicts through pydantic.
+
+    Args:
+        result: Detection result
+        detailed: Include the confidence and every detection
+
+    Returns:
+        Mapping ready for ``encode``
+    """
+    if not detailed:
+        return {"face_detected": result.face_detected}
+    return {
+        "face_detected": result.face_detected,
+        "confidence": result.confidence,
+        "detections": result.detections,
+    }
+
+
+def encode(payload: Dict[str, Any], media_type: str) -> bytes:
+    """
+    Serialize a payload built by ``result_payload``.
+
+    Args:
+        payload: Response body
+        media_type: ``JSON_MEDIA_TYPE`` or ``MSGPACK_MEDIA_TYPE``
+
+    Returns:
+        Encoded body
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(payload, default=_detection_fields)
+    # orjson writes dataclasses, slotted ones included, natively
+    return orjson.dumps(payload)
+
+
+def _detection_fields(value: Any) -> Dict[str, Any]:
+    """msgpack fallback for domain detections."""
+    if isinstance(value, FaceDetection):
+        return {"score": value.score, "box": value.box, "keypoints": value.keypoints}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
@@ -1,46 +1,180 @@
 """Application service for face detection use cases."""
 
+import asyncio
+import functools
 import logging
+import time
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from app.domain.interfaces import IFaceDetector
-from app.domain.models import FaceDetectionResult
+import numpy as np
+
+from app.application.inference_executor import (
+    DEFAULT_PRIORITY,
+    ExecutionResult,
+    InferenceExecutor,
+)
+from app.application.near_duplicate_cache import NearDuplicateCache
+from app.application.result_cache import ResultCache, content_key
+from app.application.single_flight import SingleFlight
+from app.application.upload_guard import UploadGuard
+from app.domain.exceptions import DeadlineExceededError, ServiceOverloadedError
+from app.domain.interfaces import IFaceDetector, IImageFetcher
+from app.domain.models import BatchItemResult, FaceDetectionResult, ImageInfo
 
 
 logger = logging.getLogger(__name__)
 
+# Uploads above this size are hashed on a helper thread; BLAKE2b takes
+# about 2 ms per MiB, too long to hold the event loop
+_HASH_OFF_LOOP_BYTES = 1024 * 1024
+
 
 class FaceDetectionService:
     """Service for handling face detection use cases."""
 
-    def __init__(self, face_detector: IFaceDetector):
+    def __init__(
+        self,
+        face_detector: IFaceDetector,
+        result_cache: Optional[ResultCache] = None,
+        near_duplicate_cache: Optional[NearDuplicateCache] = None,
+        upload_guard: Optional[UploadGuard] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
         """
         Initialize the face detection service.
 
         Args:
             face_detector: Implementation of face detector interface
+            result_cache: Optional cache of results keyed by image content
+            near_duplicate_cache: Optional cache matching similar images
+                by perceptual hash, consulted after an exact miss
+            upload_guard: Optional byte, pixel and format limits checked
+                before anything is decoded
+            single_flight: Optional group coalescing concurrent detections
+                of identical uploads
         """
         self._face_detector = face_detector
+        self._result_cache = result_cache
+        self._near_duplicate_cache = near_duplicate_cache
+        self._upload_guard = upload_guard
+        self._single_flight = single_flight
+
+    def check_image(self, image_data: bytes) -> Optional[ImageInfo]:
+        """
+        Apply the upload limits without decoding the image.
+
+        Cheap enough to run on the event loop, so oversized uploads are
+        rejected before they queue for a worker.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            ImageInfo read from the header, or None without an upload guard
+
+        Raises:
+            ImageTooLargeError: If the image exceeds the byte or pixel limit
+            UnsupportedImageFormatError: If the format is not supported
+            ValueError: If the data is not a recognisable image
+        """
+        if self._upload_guard is None:
+            return None
+        return self._upload_guard.check(image_data)
 
-    def detect_face_in_image(self, image_data: bytes) -> FaceDetectionResult:
+    def detect_face_in_image(
+        self,
+        image_data: bytes,
+        use_cache: bool = True,
+        stop_at_first_face: bool = False,
+        cache_key: Optional[str] = None,
+    ) -> FaceDetectionResult:
         """
         Execute face detection on provided image.
 
         Args:
             image_data: Raw image bytes
+            use_cache: Consult and fill the result caches; live camera
+                frames never repeat, so caching them only evicts useful
+                entries
+            stop_at_first_face: The caller only needs ``face_detected``, so
+                the detector may stop at the first face; such partial
+                results are not cached
+            cache_key: ``content_key`` of the image under the detector's
+                settings, if the caller already computed it
 
         Returns:
             FaceDetectionResult with detection status
 
         Raises:
-            ValueError: If image data is invalid or empty
+            ValueError: If image data is invalid, empty or rejected by the
+                upload limits
         """
         if not image_data:
             logger.warning("Empty image data provided")
             raise ValueError("Image data cannot be empty")
+        self.check_image(image_data)
+
+        cache = self._result_cache if use_cache else None
+        key = ""
+        if cache is not None:
+            key = cache_key or content_key(image_data, self._face_detector.settings_key)
+            cached = cache.get(key)
+            if cached is not None:
+                logger.info(
+                    f"Face detection served from cache: "
+                    f"face_detected={cached.face_detected}"
+                )
+                return cached
+
+        settings_key = self._face_detector.settings_key
+        near_cache = self._near_duplicate_cache if use_cache else None
+        fingerprint = None
+        image_array = None
+        if near_cache is not None:
+            # Formats without a reduced decode are hashed from the pixels the
+            # detector needs anyway, so a miss still decodes only once
+            if not near_cache.fingerprints_cheaply(image_data):
+                image_array = self._face_detector.decode_image(image_data)
+            if image_array is not None:
+                fingerprint = near_cache.fingerprint_array(image_array)
+            else:
+                fingerprint = near_cache.fingerprint(image_data)
+            if fingerprint is not None:
+                near = near_cache.get(fingerprint, settings_key)
+                if near is not None:
+                    if cache is not None:
+                        cache.put(key, near)
+                    logger.info(
+                        f"Face detection served from near-duplicate cache: "
+                        f"face_detected={near.face_detected}"
+                    )
+                    return near
 
         try:
             logger.info("Processing face detection request")
-            result = self._face_detector.detect_face(image_data)
+            if image_array is not None:
+                result = self._face_detector.detect_face_in_array(
+                    image_array, stop_at_first_face
+                )
+            else:
+                result = self._face_detector.detect_face(image_data, stop_at_first_face)
+            if cache is not None and not result.stopped_early:
+                cache.put(key, result)
+            if (
+                near_cache is not None
+                and fingerprint is not None
+                and not result.stopped_early
+            ):
+                near_cache.put(fingerprint, settings_key, result)
             logger.info(
                 f"Face detection completed: face_detected={result.face_detected}"
             )
@@ -48,3 +182,341 @@ class FaceDetectionService:
         except Exception as e:
             logger.error(f"Face detection failed: {str(e)}")
             raise
+
+    def detect_face_in_array(
+        self, image_array: np.ndarray, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Execute face detection on an already decoded frame.
+
+        Decoded frames bypass the result caches, which are keyed by encoded
+        bytes.
+
+        Args:
+            image_array: Frame as an RGB numpy array
+            stop_at_first_face: The caller only needs ``face_detected``, so
+                the detector may stop at the first face
+
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If the frame cannot be processed
+        """
+        try:
+            return self._face_detector.detect_face_in_array(
+                image_array, stop_at_first_face
+            )
+        except Exception as e:
+            logger.error(f"Face detection failed: {str(e)}")
+            raise
+
+    async def detect_face_coalesced(
+        self,
+        image_data: bytes,
+        executor: InferenceExecutor,
+        priority: int = DEFAULT_PRIORITY,
+        deadline: Optional[float] = None,
+        stop_at_first_face: bool = False,
+    ) -> ExecutionResult[FaceDetectionResult]:
+        """
+        Detect faces on the executor, sharing the work with identical uploads.
+
+        A result already held in memory is returned without queueing. An
+        upload whose content is already being detected waits for that
+        detection instead of queueing its own decode and inference. A
+        shared run shed for its first caller's deadline says nothing about
+        the other callers' deadlines, so they retry under their own.
+
+        Args:
+            image_data: Raw image bytes
+            executor: Executor running the blocking detection work
+            priority: Priority class of this caller
+            deadline: ``time.perf_counter()`` value after which this caller
+                no longer wants the result
+            stop_at_first_face: The caller only needs ``face_detected``;
+                it only shares runs with callers that said the same
+
+        Returns:
+            ExecutionResult of the run this caller started or joined
+
+        Raises:
+            ServiceOverloadedError: If the executor queue is full
+            DeadlineExceededError: If this caller's deadline cannot be met
+            ValueError: If image data is invalid, empty or rejected by the
+                upload limits
+        """
+        settings_key = self._face_detector.settings_key
+        key: Optional[str] = None
+        if self._result_cache is not None or self._single_flight is not None:
+            if len(image_data) > _HASH_OFF_LOOP_BYTES:
+                key = await asyncio.to_thread(content_key, image_data, settings_key)
+            else:
+                key = content_key(image_data, settings_key)
+
+        if self._result_cache is not None and key is not None:
+            cached = self._result_cache.get_local(key)
+            if cached is not None:
+                logger.info(
+                    f"Face detection served from cache: "
+                    f"face_detected={cached.face_detected}"
+                )
+                return ExecutionResult(value=cached, queue_wait=0.0, queue_depth=0)
+
+        def start() -> Awaitable[ExecutionResult[FaceDetectionResult]]:
+            return executor.run(
+                functools.partial(
+                    self.detect_face_in_image,
+                    stop_at_first_face=stop_at_first_face,
+                    cache_key=key,
+                ),
+                image_data,
+                priority=priority,
+                deadline=deadline,
+            )
+
+        if self._single_flight is None or key is None:
+            return await start()
+
+        flight_key = f"{key}:first_face" if stop_at_first_face else key
+        while True:
+            led = False
+
+            def lead() -> Awaitable[ExecutionResult[FaceDetectionResult]]:
+                nonlocal led
+                led = True
+                return start()
+
+            try:
+                return await self._single_flight.do(flight_key, lead)
+            except DeadlineExceededError:
+                if led:
+                    raise
+
+    def warm_up(self, image_data: bytes, rounds: int) -> None:
+        """
+        Prepare the detector before the service takes traffic.
+
+        Builds the detector's graphs, then runs uncached detections so the
+        decoders, lazily allocated buffers and, for worker pools, each
+        worker have handled a request before any client sends one.
+
+        Args:
+            image_data: Encoded image to detect on
+            rounds: Number of detections to run
+
+        Raises:
+            ValueError: If a warm-up detection fails
+        """
+        start = time.perf_counter()
+        self._face_detector.prewarm()
+        built = time.perf_counter()
+        logger.info(f"Detector graphs built in {built - start:.2f}s")
+        for _ in range(rounds):
+            self.detect_face_in_image(image_data, use_cache=False)
+        logger.info(
+            f"Ran {rounds} warm-up detections in {time.perf_counter() - built:.2f}s"
+        )
+
+    async def detect_faces_in_images(
+        self,
+        images: Sequence[bytes],
+        executor: InferenceExecutor,
+        max_concurrency: Optional[int] = None,
+        priority: int = DEFAULT_PRIORITY,
+        deadline: Optional[float] = None,
+    ) -> List[BatchItemResult]:
+        """
+        Execute face detection on several images concurrently.
+
+        Images are fanned out to the executor, but at most
+        ``max_concurrency`` of them are submitted at a time so one large
+        batch cannot fill the executor queue and starve other requests. A
+        failing image is reported in its own result and does not affect the
+        rest of the batch.
+
+        Args:
+            images: Raw image bytes, one entry per image
+            executor: Executor running the blocking detection work
+            max_concurrency: Images in flight at once, defaults to the
+                executor's worker count
+            priority: Priority class of every image
+            deadline: ``time.perf_counter()`` value after which results
+                are no longer wanted; later images fail with an error
+
+        Returns:
+            One BatchItemResult per image, in input order
+        """
+        limit = asyncio.Semaphore(max_concurrency or executor.max_workers)
+
+        async def detect_one(index: int, image_data: bytes) -> BatchItemResult:
+            async with limit:
+                return await self._detect_item(
+                    index, image_data, executor, priority, deadline
+                )
+
+        logger.info(f"Processing batch of {len(images)} image(s)")
+        return list(
+            await asyncio.gather(
+                *(detect_one(index, data) for index, data in enumerate(images))
+            )
+        )
+
+    async def detect_faces_at_urls(
+        self,
+        urls: Sequence[str],
+        fetcher: IImageFetcher,
+        executor: InferenceExecutor,
+        max_in_flight: Optional[int] = None,
+        priority: int = DEFAULT_PRIORITY,
+        deadline: Optional[float] = None,
+    ) -> List[BatchItemResult]:
+        """
+        Fetch remote images and detect faces in them concurrently.
+
+        Each image is fetched, checked against the upload limits and
+        detected in its own task, so later downloads overlap inference on
+        earlier images. At most ``max_in_flight`` images are being fetched
+        or held at once, which bounds memory, and no more images are
+        submitted to the executor than it has workers. A failed fetch is
+        reported in that image's result.
+
+        Args:
+            urls: Image URLs, one entry per image
+            fetcher: Fetcher downloading the images
+            executor: Executor running the blocking detection work
+            max_in_flight: Images fetched or awaiting detection at once,
+                defaults to twice the executor's worker count
+            priority: Priority class of every image
+            deadline: ``time.perf_counter()`` value after which results
+                are no longer wanted; later images fail with an error
+
+        Returns:
+            One BatchItemResult per URL, in input order
+        """
+        window = asyncio.Semaphore(max_in_flight or 2 * executor.max_workers)
+        detecting = asyncio.Semaphore(executor.max_workers)
+
+        async def detect_one(index: int, url: str) -> BatchItemResult:
+            async with window:
+                try:
+                    image_data = await fetcher.fetch(url)
+                    self.check_image(image_data)
+                except ValueError as e:
+                    return BatchItemResult(index=index, error=str(e))
+                except Exception:
+                    logger.exception(f"Unexpected error fetching image {index}")
+                    return BatchItemResult(
+                        index=index,
+                        error="An unexpected error occurred while fetching the image",
+                    )
+                async with detecting:
+                    return await self._detect_item(
+                        index, image_data, executor, priority, deadline
+                    )
+
+        logger.info(f"Fetching and processing {len(urls)} image(s)")
+        return list(
+            await asyncio.gather(
+                *(detect_one(index, url) for index, url in enumerate(urls))
+            )
+        )
+
+    async def detect_faces_in_stream(
+        self,
+        images: Iterator[Tuple[str, bytes]],
+        executor: InferenceExecutor,
+        max_in_flight: Optional[int] = None,
+        max_image_bytes: Optional[int] = None,
+        priority: int = DEFAULT_PRIORITY,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[str, BatchItemResult]]:
+        """
+        Execute face detection on a stream of named images.
+
+        The next image is read on a helper thread while earlier ones are
+        detected on the executor, and reading pauses whenever
+        ``max_in_flight`` images are pending, so memory use is bounded by
+        the in-flight window rather than by the length of the stream.
+
+        Args:
+            images: Blocking iterator of (name, raw image bytes)
+            executor: Executor running the blocking detection work
+            max_in_flight: Images submitted but not yet reported, defaults
+                to the executor's worker count
+            max_image_bytes: Images longer than this are reported as errors
+                without being decoded
+            priority: Priority class of every image
+            deadline: ``time.perf_counter()`` value after which results
+                are no longer wanted; later images fail with an error
+
+        Yields:
+            Tuple of (name, BatchItemResult) in completion order; the
+            result index is the image's position in the stream
+
+        Raises:
+            ValueError: If the underlying iterator fails partway through
+        """
+        window = max_in_flight or executor.max_workers
+        pending: Dict["asyncio.Task[BatchItemResult]", str] = {}
+        index = 0
+        try:
+            while True:
+                item = await asyncio.to_thread(next, images, None)
+                if item is None:
+                    break
+                name, image_data = item
+                if max_image_bytes is not None and len(image_data) > max_image_bytes:
+                    yield name, BatchItemResult(
+                        index=index,
+                        error=f"Image larger than {max_image_bytes} bytes",
+                    )
+                else:
+                    task = asyncio.ensure_future(
+                        self._detect_item(
+                            index, image_data, executor, priority, deadline
+                        )
+                    )
+                    pending[task] = name
+                index += 1
+
+                while len(pending) >= window:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield pending.pop(task), task.result()
+
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield pending.pop(task), task.result()
+            logger.info(f"Processed stream of {index} image(s)")
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _detect_item(
+        self,
+        index: int,
+        image_data: bytes,
+        executor: InferenceExecutor,
+        priority: int = DEFAULT_PRIORITY,
+        deadline: Optional[float] = None,
+    ) -> BatchItemResult:
+        """Detect one image on the executor, capturing errors in the result."""
+        try:
+            execution = await self.detect_face_coalesced(
+                image_data, executor, priority=priority, deadline=deadline
+            )
+            return BatchItemResult(index=index, result=execution.value)
+        except (ServiceOverloadedError, DeadlineExceededError, ValueError) as e:
+            return BatchItemResult(index=index, error=str(e))
+        except Exception:
+            logger.exception(f"Unexpected error on image {index}")
+            return BatchItemResult(
+                index=index,
+                error="An unexpected error occurred while processing the image",
+            )
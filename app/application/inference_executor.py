@@ -0,0 +1,308 @@
+"""Bounded worker executor that keeps inference off the event loop."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+from app.domain.exceptions import DeadlineExceededError, ServiceOverloadedError
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Weight of the newest sample in the moving averages
+_EWMA_ALPHA = 0.2
+
+# Priority classes; lower values are served first
+PRIORITY_CLASSES: Dict[str, int] = {"high": 0, "normal": 1, "low": 2}
+
+DEFAULT_PRIORITY = PRIORITY_CLASSES["normal"]
+
+
+@dataclass(frozen=True)
+class ExecutionResult(Generic[T]):
+    """Value returned by a task together with its queueing cost."""
+
+    value: T
+    queue_wait: float
+    queue_depth: int
+
+
+@dataclass(frozen=True)
+class ExecutorStats:
+    """Point-in-time snapshot of executor load."""
+
+    max_workers: int
+    max_queue_size: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+    shed: int
+    avg_queue_wait: float
+    avg_run_time: float
+
+
+@dataclass(order=True)
+class _Task:
+    """Queued call, ordered by priority class and then arrival."""
+
+    priority: int
+    sequence: int
+    fn: Callable[..., Any] = field(compare=False)
+    args: tuple = field(compare=False)
+    deadline: Optional[float] = field(compare=False)
+    submitted_at: float = field(compare=False)
+    future: Future = field(compare=False, default_factory=Future)
+    queue_wait: float = field(compare=False, default=0.0)
+
+
+class InferenceExecutor:
+    """
+    Thread pool with a bounded priority queue in front of blocking work.
+
+    Tasks beyond ``max_workers + max_queue_size`` are rejected immediately
+    with ServiceOverloadedError instead of waiting, so latency stays bounded
+    under overload and callers get a retry hint derived from recent run
+    times. A full queue makes room for a more urgent task by rejecting the
+    newest task of the lowest queued priority class.
+
+    Tasks may carry a deadline. A task that is not expected to finish in
+    time, judged from the work ahead of it and recent run times, is shed
+    with DeadlineExceededError when it arrives or when a worker picks it
+    up, so workers only spend time on results someone is still waiting for.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 16):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of worker threads running tasks
+            max_queue_size: Number of tasks allowed to wait for a worker
+
+        Raises:
+            ValueError: If max_workers < 1 or max_queue_size < 0
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size cannot be negative")
+
+        self._max_workers = max_workers
+        self._max_queue_size = max_queue_size
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()
+        self._queue: List[_Task] = []
+        self._sequence = itertools.count()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._shed = 0
+        self._avg_queue_wait = 0.0
+        self._avg_run_time = 0.0
+        logger.info(
+            f"Inference executor started with {max_workers} worker(s) "
+            f"and queue size {max_queue_size}"
+        )
+
+    @property
+    def max_workers(self) -> int:
+        """Number of worker threads."""
+        return self._max_workers
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        priority: int = DEFAULT_PRIORITY,
+        deadline: Optional[float] = None,
+    ) -> ExecutionResult[T]:
+        """
+        Run a blocking callable on a worker thread.
+
+        Args:
+            fn: Callable to execute
+            *args: Positional arguments for the callable
+            priority: Priority class from ``PRIORITY_CLASSES``
+            deadline: ``time.perf_counter()`` value after which the result
+                is no longer wanted
+
+        Returns:
+            ExecutionResult with the callable's return value
+
+        Raises:
+            ServiceOverloadedError: If the queue is full, or the task was
+                pushed out of it by a more urgent one
+            DeadlineExceededError: If the task cannot finish by its deadline
+        """
+        submitted_at = time.perf_counter()
+        task = _Task(priority, next(self._sequence), fn, args, deadline, submitted_at)
+        evicted = None
+        with self._lock:
+            queue_depth = self._pending - self._running
+            if deadline is not None and (
+                submitted_at + self._expected_latency(priority) > deadline
+            ):
+                self._shed += 1
+                raise DeadlineExceededError(
+                    "Request cannot be served before its deadline"
+                )
+            if self._pending >= self._max_workers + self._max_queue_size:
+                evicted = self._evict_for(priority)
+                if evicted is None:
+                    self._rejected += 1
+                    raise ServiceOverloadedError(
+                        "Service is at capacity, retry later",
+                        retry_after=self._retry_after(),
+                    )
+            self._pending += 1
+            heapq.heappush(self._queue, task)
+        task.future.add_done_callback(lambda _: self._on_done(task))
+
+        # A caller may cancel between leaving the queue and being failed;
+        # claiming the future first keeps that from raising InvalidStateError
+        if evicted is not None and evicted.future.set_running_or_notify_cancel():
+            evicted.future.set_exception(
+                ServiceOverloadedError(
+                    "Service is at capacity, retry later",
+                    retry_after=self._retry_after(),
+                )
+            )
+        try:
+            # Workers take the most urgent queued task, not this one
+            self._pool.submit(self._run_next)
+        except Exception:
+            task.future.cancel()
+            raise
+
+        value = await asyncio.wrap_future(task.future)
+        return ExecutionResult(
+            value=value, queue_wait=task.queue_wait, queue_depth=queue_depth
+        )
+
+    def stats(self) -> ExecutorStats:
+        """
+        Get a snapshot of the executor load.
+
+        Returns:
+            ExecutorStats instance
+        """
+        with self._lock:
+            return ExecutorStats(
+                max_workers=self._max_workers,
+                max_queue_size=self._max_queue_size,
+                running=self._running,
+                queued=self._pending - self._running,
+                completed=self._completed,
+                rejected=self._rejected,
+                shed=self._shed,
+                avg_queue_wait=self._avg_queue_wait,
+                avg_run_time=self._avg_run_time,
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting work and release the worker threads.
+
+        Args:
+            wait: Whether to wait for running tasks to finish
+        """
+        with self._lock:
+            queued, self._queue = self._queue, []
+        for task in queued:
+            task.future.cancel()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Inference executor shut down")
+
+    def _run_next(self) -> None:
+        """Run the most urgent queued task, shedding any that are too late."""
+        while True:
+            with self._lock:
+                if not self._queue:
+                    return
+                task = heapq.heappop(self._queue)
+                started_at = time.perf_counter()
+                late = (
+                    task.deadline is not None
+                    and started_at + self._avg_run_time > task.deadline
+                )
+                if late:
+                    self._shed += 1
+            if late:
+                if task.future.set_running_or_notify_cancel():
+                    task.future.set_exception(
+                        DeadlineExceededError("Request deadline passed while queued")
+                    )
+                continue
+            if task.future.set_running_or_notify_cancel():
+                break
+
+        task.queue_wait = started_at - task.submitted_at
+        with self._lock:
+            self._running += 1
+            self._avg_queue_wait += _EWMA_ALPHA * (
+                task.queue_wait - self._avg_queue_wait
+            )
+        try:
+            value = task.fn(*task.args)
+        except BaseException as e:
+            self._finish(started_at)
+            task.future.set_exception(e)
+        else:
+            self._finish(started_at)
+            task.future.set_result(value)
+
+    def _finish(self, started_at: float) -> None:
+        """Record a task that ran, before its caller is woken."""
+        run_time = time.perf_counter() - started_at
+        with self._lock:
+            self._running -= 1
+            self._completed += 1
+            self._avg_run_time += _EWMA_ALPHA * (run_time - self._avg_run_time)
+
+    def _on_done(self, task: _Task) -> None:
+        """Free the queue slot of a finished, shed or cancelled task."""
+        with self._lock:
+            self._pending -= 1
+            if task.future.cancelled() and task in self._queue:
+                self._queue.remove(task)
+                heapq.heapify(self._queue)
+
+    def _evict_for(self, priority: int) -> Optional[_Task]:
+        """Take the newest task of the lowest priority class below ``priority``."""
+        if not self._queue:
+            return None
+        victim = max(self._queue)
+        if victim.priority <= priority:
+            return None
+        self._queue.remove(victim)
+        heapq.heapify(self._queue)
+        self._rejected += 1
+        return victim
+
+    def _expected_latency(self, priority: int) -> float:
+        """Estimate queue wait plus run time for a new task of ``priority``."""
+        if self._running < self._max_workers:
+            return self._avg_run_time
+        ahead = sum(1 for task in self._queue if task.priority <= priority)
+        # Running tasks are half done on average, then the queue drains in
+        # waves of max_workers
+        waves = 0.5 + ahead // self._max_workers
+        return (waves + 1) * self._avg_run_time
+
+    def _retry_after(self) -> int:
+        """Estimate whole seconds until a queue slot frees up."""
+        backlog = self._pending / self._max_workers
+        return max(1, math.ceil(backlog * self._avg_run_time))
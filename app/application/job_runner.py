@@ -0,0 +1,290 @@
+"""Background processing of bulk detection jobs."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.application.face_detection_service import FaceDetectionService
+from app.application.inference_executor import PRIORITY_CLASSES, InferenceExecutor
+from app.domain.exceptions import ImageFetchError, ServiceOverloadedError
+from app.domain.interfaces import IImageFetcher, IJobStore
+from app.domain.models import FaceDetectionResult, Job, JobItemResult
+
+
+logger = logging.getLogger(__name__)
+
+# Pending items read from the store per query
+_PAGE_SIZE = 1000
+
+_URL_PREFIXES = ("http://", "https://")
+
+
+class JobRunner:
+    """
+    Works through bulk detection jobs in the background.
+
+    Jobs run one at a time in submission order. Each job's items are
+    fetched, checked and detected concurrently through the same service
+    methods as the synchronous endpoints, at the executor's ``low``
+    priority so interactive requests always go first. At most
+    ``max_in_flight`` images are fetched or held at once and no more are
+    submitted to the executor than it has workers. An item pushed out of a
+    full executor queue waits and retries instead of failing.
+
+    Outcomes are buffered and written to the store in one transaction per
+    ``checkpoint_items`` items or ``checkpoint_seconds``, whichever comes
+    first, which is also the most work a restart repeats: unfinished jobs
+    are resumed from their unrecorded items by ``start``.
+
+    The runner belongs to the event loop that first uses it.
+    """
+
+    def __init__(
+        self,
+        store: IJobStore,
+        service: FaceDetectionService,
+        executor: InferenceExecutor,
+        url_fetcher: IImageFetcher,
+        file_reader: Optional[IImageFetcher] = None,
+        max_items: int = 10_000_000,
+        max_in_flight: Optional[int] = None,
+        checkpoint_items: int = 256,
+        checkpoint_seconds: float = 2.0,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            store: Durable store of jobs and their results
+            service: Face detection service instance
+            executor: Executor running the blocking detection work
+            url_fetcher: Fetcher for ``http`` and ``https`` sources
+            file_reader: Reader for local paths, or None to refuse them
+            max_items: Most images accepted in one job
+            max_in_flight: Images fetched or awaiting detection at once,
+                defaults to twice the executor's worker count
+            checkpoint_items: Outcomes buffered before they are written
+            checkpoint_seconds: Longest time an outcome stays buffered
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if min(max_items, checkpoint_items) < 1 or checkpoint_seconds <= 0:
+            raise ValueError("Job limits must be positive")
+
+        self._store = store
+        self._service = service
+        self._executor = executor
+        self._url_fetcher = url_fetcher
+        self._file_reader = file_reader
+        self._max_items = max_items
+        self._max_in_flight = max_in_flight or 2 * executor.max_workers
+        self._checkpoint_items = checkpoint_items
+        self._checkpoint_seconds = checkpoint_seconds
+        self._priority = PRIORITY_CLASSES["low"]
+        self._queue: Deque[str] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def start(self) -> None:
+        """Queue every unfinished job in the store and start processing."""
+        job_ids = await asyncio.to_thread(self._store.unfinished_jobs)
+        if job_ids:
+            logger.info(f"Resuming {len(job_ids)} unfinished job(s)")
+        for job_id in job_ids:
+            self._enqueue(job_id)
+        self._ensure_running()
+
+    async def submit(self, sources: Iterable[str]) -> Job:
+        """
+        Record a job and queue it for processing.
+
+        Args:
+            sources: Image URLs or local paths, one per image; iterated on
+                a helper thread, so it may read from a file
+
+        Returns:
+            The queued Job
+
+        Raises:
+            ValueError: If there are no sources or more than ``max_items``,
+                or iterating the sources fails with a ValueError
+        """
+        job = await asyncio.to_thread(self._store.create_job, self._checked(sources))
+        self._enqueue(job.job_id)
+        self._ensure_running()
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job's progress.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job, or None if there is no such job
+        """
+        return await asyncio.to_thread(self._store.get_job, job_id)
+
+    async def results(
+        self, job_id: str, after_sequence: int, limit: int
+    ) -> List[Tuple[int, JobItemResult]]:
+        """
+        Page through a job's recorded outcomes in recording order.
+
+        Args:
+            job_id: Job identifier
+            after_sequence: Sequence of the last outcome already seen, or 0
+            limit: Largest number of outcomes returned
+
+        Returns:
+            (sequence, JobItemResult) pairs
+        """
+        return await asyncio.to_thread(
+            self._store.results, job_id, after_sequence, limit
+        )
+
+    async def close(self) -> None:
+        """Stop processing, keeping recorded progress, and close the store."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._store.close()
+        logger.info("Job runner closed")
+
+    def _checked(self, sources: Iterable[str]) -> Iterator[str]:
+        """Pass sources through, enforcing the job size limits."""
+        count = 0
+        for source in sources:
+            count += 1
+            if count > self._max_items:
+                raise ValueError(f"Too many images: at most {self._max_items} per job")
+            yield source
+        if not count:
+            raise ValueError("Manifest lists no images")
+
+    def _enqueue(self, job_id: str) -> None:
+        """Add a job to the queue and wake the processing loop."""
+        self._queue.append(job_id)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_running(self) -> None:
+        """Start the processing loop on the current event loop if needed."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(self._wakeup))
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        """Process queued jobs one after another, sleeping on ``wakeup``."""
+        while True:
+            while not self._queue:
+                wakeup.clear()
+                await wakeup.wait()
+            job_id = self._queue.popleft()
+            try:
+                await self._run_job(job_id)
+            except Exception:
+                # Unrecorded items stay pending and are retried on restart
+                logger.exception(f"Job {job_id} stopped with an error")
+
+    async def _run_job(self, job_id: str) -> None:
+        """Detect every pending item of one job, checkpointing outcomes."""
+        await asyncio.to_thread(self._store.start_job, job_id)
+        logger.info(f"Running job {job_id}")
+        detecting = asyncio.Semaphore(self._executor.max_workers)
+        page: Deque[Tuple[int, str]] = deque()
+        after_index: Optional[int] = -1
+        pending: Set["asyncio.Task[JobItemResult]"] = set()
+        buffer: List[JobItemResult] = []
+        flushed_at = time.monotonic()
+        try:
+            while True:
+                if not page and after_index is not None:
+                    rows = await asyncio.to_thread(
+                        self._store.pending_items, job_id, after_index, _PAGE_SIZE
+                    )
+                    page.extend(rows)
+                    after_index = rows[-1][0] if len(rows) == _PAGE_SIZE else None
+                while page and len(pending) < self._max_in_flight:
+                    index, source = page.popleft()
+                    pending.add(
+                        asyncio.ensure_future(self._process(index, source, detecting))
+                    )
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self._checkpoint_seconds,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                buffer.extend(task.result() for task in done)
+                now = time.monotonic()
+                if len(buffer) >= self._checkpoint_items or (
+                    buffer and now - flushed_at >= self._checkpoint_seconds
+                ):
+                    await self._save(job_id, buffer)
+                    buffer, flushed_at = [], now
+        finally:
+            for task in pending:
+                task.cancel()
+            if buffer:
+                await self._save(job_id, buffer)
+        logger.info(f"Finished job {job_id}")
+
+    async def _save(self, job_id: str, items: List[JobItemResult]) -> None:
+        """Write a batch of outcomes in one transaction."""
+        job = await asyncio.to_thread(self._store.save_results, job_id, items)
+        logger.debug(f"Job {job_id}: {job.done}/{job.total} item(s) recorded")
+
+    async def _process(
+        self, index: int, source: str, detecting: asyncio.Semaphore
+    ) -> JobItemResult:
+        """Fetch and detect one item, capturing errors in the outcome."""
+        try:
+            image_data = await self._fetcher_for(source).fetch(source)
+            self._service.check_image(image_data)
+            async with detecting:
+                result = await self._detect(image_data)
+        except ValueError as e:
+            return JobItemResult(index=index, source=source, error=str(e))
+        except Exception:
+            logger.exception(f"Unexpected error on job item {index}")
+            return JobItemResult(
+                index=index,
+                source=source,
+                error="An unexpected error occurred while processing the image",
+            )
+        return JobItemResult(
+            index=index,
+            source=source,
+            face_detected=result.face_detected,
+            confidence=result.confidence,
+        )
+
+    async def _detect(self, image_data: bytes) -> FaceDetectionResult:
+        """Detect at low priority, retrying while the executor is full."""
+        while True:
+            try:
+                execution = await self._service.detect_face_coalesced(
+                    image_data, self._executor, priority=self._priority
+                )
+                return execution.value
+            except ServiceOverloadedError as e:
+                await asyncio.sleep(e.retry_after)
+
+    def _fetcher_for(self, source: str) -> IImageFetcher:
+        """Pick the fetcher for a URL or a local path."""
+        if source.startswith(_URL_PREFIXES):
+            return self._url_fetcher
+        if self._file_reader is None:
+            raise ImageFetchError("Local paths are not enabled")
+        return self._file_reader
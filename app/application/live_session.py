@@ -0,0 +1,165 @@
+"""Newest-frame-wins scheduling for live camera connections."""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Optional, Tuple
+
+from app.application.inference_executor import InferenceExecutor
+from app.domain.exceptions import ServiceOverloadedError
+from app.domain.models import FaceDetectionResult
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LiveFrameResult:
+    """Outcome of one processed live frame."""
+
+    frame_id: int
+    result: Optional[FaceDetectionResult]
+    error: Optional[str]
+    latency: float
+    queue_wait: float
+    dropped: int
+
+
+class LiveSessionLimiter:
+    """Caps the number of concurrent live sessions."""
+
+    def __init__(self, max_sessions: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_sessions: Sessions allowed at once; 0 disables live sessions
+        """
+        self._max_sessions = max_sessions
+        self._active = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        """Number of sessions currently admitted."""
+        return self._active
+
+    @property
+    def max_sessions(self) -> int:
+        """Maximum number of concurrent sessions."""
+        return self._max_sessions
+
+    def try_acquire(self) -> bool:
+        """
+        Admit a session if a slot is free.
+
+        Returns:
+            True if the session was admitted and must call ``release``
+        """
+        with self._lock:
+            if self._active >= self._max_sessions:
+                return False
+            self._active += 1
+            return True
+
+    def release(self) -> None:
+        """Free the slot of a finished session."""
+        with self._lock:
+            self._active -= 1
+
+
+class LiveFrameSession:
+    """
+    Detection loop for one live connection where the newest frame wins.
+
+    Frames are submitted as they arrive but only one is processed at a
+    time, and a frame still waiting when a newer one arrives is dropped.
+    Results therefore lag the camera by at most one inference, and a
+    session never occupies more than one executor worker.
+    """
+
+    def __init__(self, executor: InferenceExecutor, detect: Callable[[Any], Any]):
+        """
+        Initialize the session.
+
+        Args:
+            executor: Executor running the blocking detection work
+            detect: Blocking callable turning a submitted frame into a
+                FaceDetectionResult
+        """
+        self._executor = executor
+        self._detect = detect
+        self._pending: Optional[Tuple[int, Any, float]] = None
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._next_id = 0
+        self._dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """Frames replaced by a newer one before being processed."""
+        return self._dropped
+
+    def submit(self, frame: Any) -> int:
+        """
+        Queue a frame, replacing any frame not yet picked up.
+
+        Args:
+            frame: Frame passed to the ``detect`` callable
+
+        Returns:
+            Frame ID, counting from 1 in arrival order
+        """
+        self._next_id += 1
+        if self._pending is not None:
+            self._dropped += 1
+        self._pending = (self._next_id, frame, time.perf_counter())
+        self._ready.set()
+        return self._next_id
+
+    def close(self) -> None:
+        """Stop the result stream once the current frame finishes."""
+        self._closed = True
+        self._ready.set()
+
+    async def results(self) -> AsyncIterator[LiveFrameResult]:
+        """
+        Process frames until the session is closed.
+
+        Yields:
+            LiveFrameResult for every frame that was not dropped
+        """
+        reported_drops = 0
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            if self._closed:
+                return
+            if self._pending is None:
+                continue
+            frame_id, frame, received_at = self._pending
+            self._pending = None
+            dropped, reported_drops = self._dropped - reported_drops, self._dropped
+
+            result: Optional[FaceDetectionResult] = None
+            error: Optional[str] = None
+            queue_wait = 0.0
+            try:
+                execution = await self._executor.run(self._detect, frame)
+                result, queue_wait = execution.value, execution.queue_wait
+            except (ServiceOverloadedError, ValueError) as e:
+                error = str(e)
+            except Exception:
+                logger.exception(f"Unexpected error on live frame {frame_id}")
+                error = "An unexpected error occurred while processing the frame"
+
+            yield LiveFrameResult(
+                frame_id=frame_id,
+                result=result,
+                error=error,
+                latency=time.perf_counter() - received_at,
+                queue_wait=queue_wait,
+                dropped=dropped,
+            )
@@ -0,0 +1,257 @@
+"""Perceptual-hash cache that reuses results for near-duplicate images."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Callable, DefaultDict, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from app.domain.interfaces import IImageHasher
+from app.domain.models import FaceDetectionResult
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class NearDuplicateStats:
+    """Point-in-time snapshot of near-duplicate cache effectiveness."""
+
+    hits: int
+    misses: int
+    hash_failures: int
+    entries: int
+    max_entries: int
+    max_distance: int
+
+
+class MultiIndexHashIndex:
+    """
+    Index for Hamming-radius queries over fixed-width hashes.
+
+    Hashes are split into ``max_distance + 1`` disjoint chunks. Two hashes
+    within ``max_distance`` bits of each other must agree exactly on at
+    least one chunk (pigeonhole), so a query only examines hashes sharing a
+    chunk with it. Unlike a BK-tree, entries can be removed cheaply, which
+    the cache needs for eviction.
+    """
+
+    def __init__(self, bits: int, max_distance: int):
+        """
+        Initialize the index.
+
+        Args:
+            bits: Width of every hash in bits
+            max_distance: Largest Hamming distance queries will use
+
+        Raises:
+            ValueError: If max_distance is negative or not below bits
+        """
+        if not 0 <= max_distance < bits:
+            raise ValueError("max_distance must be between 0 and bits - 1")
+
+        chunks = max_distance + 1
+        self._max_distance = max_distance
+        self._chunks: List[Tuple[int, int]] = []
+        start = 0
+        for index in range(chunks):
+            width = bits // chunks + (1 if index < bits % chunks else 0)
+            self._chunks.append((start, (1 << width) - 1))
+            start += width
+        self._tables: List[DefaultDict[int, Set[int]]] = [
+            defaultdict(set) for _ in self._chunks
+        ]
+
+    def add(self, value: int) -> None:
+        """Add a hash to the index."""
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            table[(value >> shift) & mask].add(value)
+
+    def remove(self, value: int) -> None:
+        """Remove a hash from the index."""
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            key = (value >> shift) & mask
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(value)
+                if not bucket:
+                    del table[key]
+
+    def within(self, value: int) -> List[Tuple[int, int]]:
+        """
+        Find every indexed hash within the maximum distance.
+
+        Args:
+            value: Hash to look up
+
+        Returns:
+            (hash, distance) pairs, closest first
+        """
+        matches: Dict[int, int] = {}
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            for candidate in table.get((value >> shift) & mask, ()):
+                if candidate not in matches:
+                    distance = bin(candidate ^ value).count("1")
+                    if distance <= self._max_distance:
+                        matches[candidate] = distance
+        return sorted(matches.items(), key=lambda match: match[1])
+
+
+class NearDuplicateCache:
+    """
+    Second-level cache matching images by perceptual hash.
+
+    Re-encoded, resized or EXIF-stripped copies of an image hash to nearby
+    values, so their result can be reused without running the detector.
+    Matches are approximate: two different photos can collide, which is
+    why the cache is opt-in and the distance threshold is configurable.
+    """
+
+    def __init__(
+        self,
+        hasher: IImageHasher,
+        max_distance: int = 4,
+        max_entries: int = 10000,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            hasher: Perceptual hash implementation
+            max_distance: Largest Hamming distance treated as a duplicate
+            max_entries: Maximum number of hashes kept, oldest evicted first
+            ttl: Seconds an entry stays valid
+            clock: Monotonic time source, replaceable in tests
+        """
+        self._hasher = hasher
+        self._max_distance = max_distance
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._clock = clock
+        self._index = MultiIndexHashIndex(hasher.bits, max_distance)
+        self._entries: (
+            "OrderedDict[int, Dict[str, Tuple[FaceDetectionResult, float]]]"
+        ) = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._hash_failures = 0
+        self._lock = threading.Lock()
+
+    def fingerprint(self, image_data: bytes) -> Optional[int]:
+        """
+        Compute the perceptual hash of an image.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            Hash value, or None if the image cannot be decoded
+        """
+        try:
+            return self._hasher.perceptual_hash(image_data)
+        except ValueError:
+            with self._lock:
+                self._hash_failures += 1
+            return None
+
+    def fingerprint_array(self, image_array: np.ndarray) -> int:
+        """
+        Compute the perceptual hash of an already decoded image.
+
+        Args:
+            image_array: Image as an RGB numpy array
+
+        Returns:
+            Hash value, comparable with those of ``fingerprint``
+        """
+        return self._hasher.perceptual_hash_of_array(image_array)
+
+    def fingerprints_cheaply(self, image_data: bytes) -> bool:
+        """
+        Whether ``fingerprint`` costs far less than decoding the image.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            False if the image should rather be hashed once decoded
+        """
+        return self._hasher.hashes_cheaply(image_data)
+
+    def get(self, fingerprint: int, settings_key: str) -> Optional[FaceDetectionResult]:
+        """
+        Find the result of the most similar cached image.
+
+        Candidates are tried closest first, skipping those cached only for
+        other settings; expired entries met on the way are dropped.
+
+        Args:
+            fingerprint: Perceptual hash from ``fingerprint``
+            settings_key: Detector settings identifier
+
+        Returns:
+            FaceDetectionResult of a near duplicate, or None on a miss
+        """
+        with self._lock:
+            now = self._clock()
+            for candidate, distance in self._index.within(fingerprint):
+                entry = self._entries[candidate]
+                for key in [key for key, (_, expiry) in entry.items() if expiry <= now]:
+                    del entry[key]
+                if not entry:
+                    del self._entries[candidate]
+                    self._index.remove(candidate)
+                    continue
+                stored = entry.get(settings_key)
+                if stored is not None:
+                    self._entries.move_to_end(candidate)
+                    self._hits += 1
+                    logger.debug(f"Near-duplicate hit at distance {distance}")
+                    return stored[0]
+            self._misses += 1
+            return None
+
+    def put(
+        self, fingerprint: int, settings_key: str, result: FaceDetectionResult
+    ) -> None:
+        """
+        Remember the result for an image hash.
+
+        Args:
+            fingerprint: Perceptual hash from ``fingerprint``
+            settings_key: Detector settings identifier
+            result: Detection result to reuse for near duplicates
+        """
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                entry = self._entries[fingerprint] = {}
+                self._index.add(fingerprint)
+            else:
+                self._entries.move_to_end(fingerprint)
+            entry[settings_key] = (result, self._clock() + self._ttl)
+
+            while len(self._entries) > self._max_entries:
+                oldest, _ = self._entries.popitem(last=False)
+                self._index.remove(oldest)
+
+    def stats(self) -> NearDuplicateStats:
+        """
+        Get a snapshot of cache counters.
+
+        Returns:
+            NearDuplicateStats instance
+        """
+        with self._lock:
+            return NearDuplicateStats(
+                hits=self._hits,
+                misses=self._misses,
+                hash_failures=self._hash_failures,
+                entries=len(self._entries),
+                max_entries=self._max_entries,
+                max_distance=self._max_distance,
+            )
@@ -0,0 +1,82 @@
+"""Per-client token buckets that keep one caller from taking every worker."""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from app.domain.exceptions import RateLimitExceededError
+
+
+class TokenBucketRateLimiter:
+    """
+    Admits each client at a sustained rate with room for short bursts.
+
+    Every client owns a bucket holding up to ``burst`` tokens that refills
+    at ``rate`` tokens per second; a request takes one token or is refused.
+    A batch takes one token per image: it is admitted once the bucket could
+    pay for a full burst of it and may then leave the bucket in debt, so
+    batches larger than ``burst`` still get through but hold the client back
+    until the debt is refilled. Buckets are kept in LRU order and the least
+    recently seen client is forgotten beyond ``max_clients``, which only
+    ever hands that client a full bucket again.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_clients: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Tokens added to each bucket per second
+            burst: Bucket capacity, the most requests admitted at once
+            max_clients: Buckets remembered before the oldest is dropped
+            clock: Monotonic time source in seconds
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if rate <= 0 or burst < 1 or max_clients < 1:
+            raise ValueError("Rate limits must be positive")
+        self._rate = rate
+        self._burst = burst
+        self._max_clients = max_clients
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str, tokens: int = 1) -> None:
+        """
+        Take tokens from the client's bucket.
+
+        Args:
+            client: Identity of the caller, such as an API key
+            tokens: Tokens to take, one per image
+
+        Raises:
+            RateLimitExceededError: If the bucket holds fewer than
+                ``min(tokens, burst)`` tokens, with the seconds until it
+                does in ``retry_after``
+        """
+        needed = min(tokens, self._burst)
+        now = self._clock()
+        with self._lock:
+            available, updated = self._buckets.pop(client, (self._burst, now))
+            available = min(self._burst, available + (now - updated) * self._rate)
+            admitted = available >= needed
+            if admitted:
+                available -= tokens
+            self._buckets[client] = (available, now)
+            if len(self._buckets) > self._max_clients:
+                self._buckets.popitem(last=False)
+        if not admitted:
+            raise RateLimitExceededError(
+                "Rate limit exceeded, retry later",
+                retry_after=max(1, math.ceil((needed - available) / self._rate)),
+            )
@@ -0,0 +1,217 @@
+"""Content-addressed cache of face detection results."""
+
+import hashlib
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from app.domain.interfaces import IResultStore
+from app.domain.models import FaceDetectionResult
+
+
+logger = logging.getLogger(__name__)
+
+# Approximate bytes held per entry besides the key: the OrderedDict node,
+# the entry tuple and the frozen result object
+_ENTRY_OVERHEAD = 240
+
+# Approximate bytes per face detection: the slotted object, its box tuple
+# and six keypoint pairs of boxed floats
+_DETECTION_SIZE = 960
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time snapshot of cache effectiveness."""
+
+    hits: int
+    shared_hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+def content_key(image_data: bytes, settings_key: str) -> str:
+    """
+    Build a cache key from image bytes and detector settings.
+
+    BLAKE2b runs at memory bandwidth speeds on large uploads, and including
+    the detector settings keeps results from different thresholds or models
+    apart.
+
+    Args:
+        image_data: Raw image bytes
+        settings_key: Detector settings identifier
+
+    Returns:
+        Cache key string
+    """
+    digest = hashlib.blake2b(image_data, digest_size=16).hexdigest()
+    return f"{settings_key}:{digest}"
+
+
+class ResultCache:
+    """
+    In-memory LRU cache of detection results with TTL and a byte budget.
+
+    An optional shared store (for example SQLite on local disk) is consulted
+    on local misses and written through on every put, so several worker
+    processes can share results.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: float = 3600.0,
+        shared_store: Optional[IResultStore] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Approximate memory budget for cached entries
+            ttl: Seconds an entry stays valid
+            shared_store: Optional store shared across workers
+            clock: Monotonic time source, replaceable in tests
+        """
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._shared_store = shared_store
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[FaceDetectionResult, float, int]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[FaceDetectionResult]:
+        """
+        Look up a result, refreshing its LRU position.
+
+        Args:
+            key: Cache key from ``content_key``
+
+        Returns:
+            Cached FaceDetectionResult, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires_at, size = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return result
+                self._remove(key)
+
+        if self._shared_store is not None:
+            shared: Optional[FaceDetectionResult]
+            try:
+                shared = self._shared_store.get(key)
+            except Exception as e:
+                logger.warning(f"Shared result store lookup failed: {str(e)}")
+                shared = None
+            if shared is not None:
+                with self._lock:
+                    self._shared_hits += 1
+                    self._insert(key, shared)
+                return shared
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def get_local(self, key: str) -> Optional[FaceDetectionResult]:
+        """
+        Look up a result in memory only, refreshing its LRU position.
+
+        Never touches the shared store, so it is cheap enough for the event
+        loop. Misses are not counted: the caller follows up with ``get``.
+
+        Args:
+            key: Cache key from ``content_key``
+
+        Returns:
+            Cached FaceDetectionResult, or None if not held in memory
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self._clock():
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: str, result: FaceDetectionResult) -> None:
+        """
+        Store a result locally and in the shared store.
+
+        Args:
+            key: Cache key from ``content_key``
+            result: Detection result to cache
+        """
+        with self._lock:
+            self._insert(key, result)
+
+        if self._shared_store is not None:
+            try:
+                self._shared_store.put(key, result, self._ttl)
+            except Exception as e:
+                logger.warning(f"Shared result store write failed: {str(e)}")
+
+    def stats(self) -> CacheStats:
+        """
+        Get a snapshot of cache counters.
+
+        Returns:
+            CacheStats instance
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                shared_hits=self._shared_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size,
+                max_bytes=self._max_bytes,
+            )
+
+    def close(self) -> None:
+        """Close the shared store, if any."""
+        if self._shared_store is not None:
+            self._shared_store.close()
+
+    def _insert(self, key: str, result: FaceDetectionResult) -> None:
+        """Add an entry and evict least recently used ones over budget."""
+        if key in self._entries:
+            self._remove(key)
+        size = (
+            sys.getsizeof(key)
+            + _ENTRY_OVERHEAD
+            + _DETECTION_SIZE * len(result.detections)
+        )
+        if size > self._max_bytes:
+            return
+        self._entries[key] = (result, self._clock() + self._ttl, size)
+        self._size += size
+        while self._size > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and release its bytes."""
+        _, _, size = self._entries.pop(key)
+        self._size -= size
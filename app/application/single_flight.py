@@ -0,0 +1,104 @@
+"""Coalescing of concurrent identical calls into one execution."""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    """Point-in-time snapshot of how much work coalescing saved."""
+
+    leaders: int
+    coalesced: int
+    in_flight: int
+
+
+@dataclass
+class _Call(Generic[T]):
+    """One shared execution and the number of callers awaiting it."""
+
+    task: "asyncio.Future[T]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Runs at most one call per key at a time and shares its outcome.
+
+    The first caller for a key starts the call; callers arriving while it
+    runs await the same future instead of starting their own. Results and
+    errors alike go to every waiter, and the key is forgotten as soon as
+    the call finishes, so nothing is cached beyond the flight. A waiter
+    that is cancelled stops waiting without disturbing the others, and the
+    call itself is cancelled once nobody waits for it any more.
+
+    Keys live on one event loop; the group is not thread-safe.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty group."""
+        self._calls: Dict[str, _Call[T]] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identity of the work, such as a content hash
+            fn: Starts the work; only called by the first caller
+
+        Returns:
+            The shared call's result
+
+        Raises:
+            Exception: Whatever the shared call raised
+            asyncio.CancelledError: If this caller, or the shared call, was
+                cancelled
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self._leaders += 1
+        else:
+            self._coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                logger.info("Cancelling shared call abandoned by every caller")
+                # Forget the key now, not when the task finishes unwinding,
+                # so a caller arriving meanwhile starts afresh instead of
+                # joining a cancelled call
+                self._forget(key, call)
+                call.task.cancel()
+
+    def stats(self) -> SingleFlightStats:
+        """
+        Get a snapshot of the coalescing counters.
+
+        Returns:
+            SingleFlightStats instance
+        """
+        return SingleFlightStats(
+            leaders=self._leaders,
+            coalesced=self._coalesced,
+            in_flight=len(self._calls),
+        )
+
+    def _forget(self, key: str, call: _Call[T]) -> None:
+        """Drop a finished call so later callers start afresh."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
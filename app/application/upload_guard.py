@@ -0,0 +1,78 @@
+"""Admission checks on encoded uploads before any pixels are decoded."""
+
+import logging
+
+from app.domain.exceptions import ImageTooLargeError
+from app.domain.interfaces import IImageInspector
+from app.domain.models import ImageInfo
+
+
+logger = logging.getLogger(__name__)
+
+
+class UploadGuard:
+    """
+    Rejects uploads that are too large or in an unsupported format.
+
+    Only the container header is read, so a decompression bomb, a tiny
+    file that would expand to gigapixels, is turned away for the cost of
+    parsing a few bytes instead of a decode that exhausts memory.
+    """
+
+    def __init__(self, inspector: IImageInspector, max_bytes: int, max_pixels: int):
+        """
+        Initialize the guard.
+
+        Args:
+            inspector: Reads format and dimensions from image headers
+            max_bytes: Largest accepted upload in bytes
+            max_pixels: Largest accepted width x height
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if max_bytes < 1 or max_pixels < 1:
+            raise ValueError("Upload limits must be positive")
+        self._inspector = inspector
+        self._max_bytes = max_bytes
+        self._max_pixels = max_pixels
+
+    @property
+    def max_bytes(self) -> int:
+        """Largest accepted upload in bytes."""
+        return self._max_bytes
+
+    @property
+    def max_pixels(self) -> int:
+        """Largest accepted width x height."""
+        return self._max_pixels
+
+    def check(self, image_data: bytes) -> ImageInfo:
+        """
+        Admit an encoded image or explain why it is rejected.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            ImageInfo read from the header
+
+        Raises:
+            ImageTooLargeError: If the upload exceeds the byte or pixel limit
+            UnsupportedImageFormatError: If the format is not supported
+            ValueError: If the data is not a recognisable image
+        """
+        if len(image_data) > self._max_bytes:
+            raise ImageTooLargeError(
+                f"Image is {len(image_data)} bytes, limit is {self._max_bytes}"
+            )
+        info = self._inspector.inspect(image_data)
+        if info.pixels > self._max_pixels:
+            logger.warning(
+                f"Rejecting {info.format} of {info.width}x{info.height} pixels"
+            )
+            raise ImageTooLargeError(
+                f"Image is {info.width}x{info.height} pixels, "
+                f"limit is {self._max_pixels} pixels"
+            )
+        return info
@@ -0,0 +1,52 @@
+"""Application service for video face detection use cases."""
+
+import logging
+
+from app.domain.interfaces import IVideoFaceDetector
+from app.domain.models import VideoDetectionResult
+
+
+logger = logging.getLogger(__name__)
+
+
+class VideoDetectionService:
+    """Service for handling face detection in uploaded videos."""
+
+    def __init__(self, video_detector: IVideoFaceDetector):
+        """
+        Initialize the video detection service.
+
+        Args:
+            video_detector: Implementation of video face detector interface
+        """
+        self._video_detector = video_detector
+
+    def detect_faces_in_video(
+        self, video_path: str, stop_at_first_face: bool = False
+    ) -> VideoDetectionResult:
+        """
+        Execute face detection on a video file.
+
+        Args:
+            video_path: Path of the spooled video upload
+            stop_at_first_face: Stop decoding once a face has been found
+
+        Returns:
+            VideoDetectionResult with the segment timeline
+
+        Raises:
+            ValueError: If the video is invalid or has no decodable frames
+        """
+        try:
+            logger.info("Processing video face detection request")
+            result = self._video_detector.detect_faces_in_video(
+                video_path, stop_at_first_face=stop_at_first_face
+            )
+            logger.info(
+                f"Video face detection completed: "
+                f"face_detected={result.face_detected}"
+            )
+            return result
+        except Exception as e:
+            logger.error(f"Video face detection failed: {str(e)}")
+            raise
@@ -0,0 +1,36 @@
+"""Domain exceptions for face detection service."""
+
+
+class ServiceOverloadedError(Exception):
+    """Raised when the service cannot accept more work right now."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        """
+        Initialize the error.
+
+        Args:
+            message: Human readable reason for the rejection
+            retry_after: Suggested number of seconds before retrying
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitExceededError(ServiceOverloadedError):
+    """Raised when a client has used up its request allowance."""
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request cannot finish before its client's deadline."""
+
+
+class UnsupportedImageFormatError(ValueError):
+    """Raised when an upload is an image format the service does not decode."""
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when an upload exceeds the byte or pixel limits."""
+
+
+class ImageFetchError(ValueError):
+    """Raised when an image cannot be fetched from its URL."""
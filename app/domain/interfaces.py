@@ -1,25 +1,362 @@
 """Domain interfaces for face detection service."""
 
 from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Sequence, Tuple
 
-from app.domain.models import FaceDetectionResult
+import numpy as np
+
+from app.domain.models import (
+    FaceDetectionResult,
+    ImageInfo,
+    Job,
+    JobItemResult,
+    VideoDetectionResult,
+)
 
 
 class IFaceDetector(ABC):
     """Interface for face detection implementations."""
 
     @abstractmethod
-    def detect_face(self, image_data: bytes) -> FaceDetectionResult:
+    def detect_face(
+        self, image_data: bytes, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
         """
         Detect faces in the provided image data.
 
         Args:
             image_data: Raw image bytes
+            stop_at_first_face: Allow stopping once a face is found; the
+                result is then marked ``stopped_early`` and its detections
+                may be incomplete
+
+        Returns:
+            FaceDetectionResult containing detection status
+
+        Raises:
+            ValueError: If image data is invalid
+        """
+        pass
+
+    @abstractmethod
+    def detect_face_in_array(
+        self, image_array: np.ndarray, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces in an already decoded image.
+
+        Args:
+            image_array: Image as an RGB numpy array of shape (height, width, 3)
+            stop_at_first_face: Allow stopping once a face is found; the
+                result is then marked ``stopped_early`` and its detections
+                may be incomplete
 
         Returns:
             FaceDetectionResult containing detection status
 
+        Raises:
+            ValueError: If the image cannot be processed
+        """
+        pass
+
+    def decode_image(self, image_data: bytes) -> Optional[np.ndarray]:
+        """
+        Decode an image the way ``detect_face`` would.
+
+        Lets a caller look at the pixels and then hand them to
+        ``detect_face_in_array`` without decoding twice.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            RGB numpy array giving the same result through
+            ``detect_face_in_array`` as the bytes through ``detect_face``,
+            or None if the detector decodes in its own way
+
         Raises:
             ValueError: If image data is invalid
         """
+        return None
+
+    @property
+    def settings_key(self) -> str:
+        """
+        Identify the detector settings that influence results.
+
+        Results cached under one key must not be served to a detector with
+        a different key (other model, threshold or input budget).
+        """
+        return type(self).__name__
+
+    def prewarm(self) -> None:
+        """Load models and build graphs ahead of the first request."""
+
+    def close(self) -> None:
+        """Release any resources held by the detector."""
+
+
+class IVideoFaceDetector(ABC):
+    """Interface for face detection over video files."""
+
+    @abstractmethod
+    def detect_faces_in_video(
+        self, video_path: str, stop_at_first_face: bool = False
+    ) -> VideoDetectionResult:
+        """
+        Detect faces in sampled frames of a video file.
+
+        Args:
+            video_path: Path of a video file readable by the implementation
+            stop_at_first_face: Stop reading as soon as a face is found
+
+        Returns:
+            VideoDetectionResult with a timeline of segments
+
+        Raises:
+            ValueError: If the video cannot be opened or has no frames
+        """
         pass
+
+    def close(self) -> None:
+        """Release any resources held by the detector."""
+
+
+class IResultStore(ABC):
+    """Interface for shared stores of detection results."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[FaceDetectionResult]:
+        """
+        Look up a stored result.
+
+        Args:
+            key: Content-addressed cache key
+
+        Returns:
+            Stored FaceDetectionResult, or None if absent or expired
+        """
+        pass
+
+    @abstractmethod
+    def put(self, key: str, result: FaceDetectionResult, ttl: float) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Content-addressed cache key
+            result: Detection result to store
+            ttl: Seconds the result stays valid
+        """
+        pass
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class IImageHasher(ABC):
+    """Interface for perceptual image hash implementations."""
+
+    @abstractmethod
+    def perceptual_hash(self, image_data: bytes) -> int:
+        """
+        Compute a perceptual hash of an encoded image.
+
+        Similar-looking images, including re-encoded or resized copies,
+        produce hashes with a small Hamming distance.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            Hash as a non-negative integer of ``bits`` bits
+
+        Raises:
+            ValueError: If the image cannot be decoded
+        """
+        pass
+
+    @abstractmethod
+    def perceptual_hash_of_array(self, image_array: np.ndarray) -> int:
+        """
+        Compute the perceptual hash of an already decoded image.
+
+        Args:
+            image_array: Image as an RGB numpy array of shape (height, width, 3)
+
+        Returns:
+            Hash as a non-negative integer of ``bits`` bits, comparable
+            with those of ``perceptual_hash``
+        """
+        pass
+
+    def hashes_cheaply(self, image_data: bytes) -> bool:
+        """
+        Whether hashing the encoded image costs far less than decoding it.
+
+        When it does not, callers that decode the image anyway should hash
+        the decoded pixels instead.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            True if ``perceptual_hash`` is cheap for this image
+        """
+        return True
+
+    @property
+    def bits(self) -> int:
+        """Number of bits in each hash."""
+        return 64
+
+
+class IImageInspector(ABC):
+    """Interface for reading image metadata without decoding pixels."""
+
+    @abstractmethod
+    def inspect(self, image_data: bytes) -> ImageInfo:
+        """
+        Read the format and dimensions of an encoded image.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            ImageInfo with the format and dimensions
+
+        Raises:
+            UnsupportedImageFormatError: If the format is not supported
+            ValueError: If the data is not a recognisable image
+        """
+        pass
+
+
+class IImageFetcher(ABC):
+    """Interface for fetching images from remote storage."""
+
+    @abstractmethod
+    async def fetch(self, url: str) -> bytes:
+        """
+        Download an encoded image.
+
+        Args:
+            url: Location of the image
+
+        Returns:
+            Raw image bytes
+
+        Raises:
+            ImageFetchError: If the URL is not allowed or the download fails
+            ImageTooLargeError: If the image exceeds the size limit
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release any connections held by the fetcher."""
+
+
+class IJobStore(ABC):
+    """Interface for durable stores of bulk detection jobs."""
+
+    @abstractmethod
+    def create_job(self, sources: Iterable[str]) -> Job:
+        """
+        Record a new job with one pending item per source, atomically.
+
+        Args:
+            sources: Image locations in manifest order; an exception raised
+                while iterating discards the whole job
+
+        Returns:
+            The queued Job
+        """
+        pass
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job's progress.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job, or None if there is no such job
+        """
+        pass
+
+    @abstractmethod
+    def unfinished_jobs(self) -> List[str]:
+        """
+        List jobs that have not completed yet.
+
+        Returns:
+            Job identifiers in submission order
+        """
+        pass
+
+    @abstractmethod
+    def start_job(self, job_id: str) -> None:
+        """
+        Mark a queued job as running.
+
+        Args:
+            job_id: Job identifier
+        """
+        pass
+
+    @abstractmethod
+    def pending_items(
+        self, job_id: str, after_index: int, limit: int
+    ) -> List[Tuple[int, str]]:
+        """
+        Page through the items of a job that have no recorded outcome.
+
+        Args:
+            job_id: Job identifier
+            after_index: Only items with a higher index are returned
+            limit: Largest number of items returned
+
+        Returns:
+            (index, source) pairs in index order
+        """
+        pass
+
+    @abstractmethod
+    def save_results(self, job_id: str, items: Sequence[JobItemResult]) -> Job:
+        """
+        Record the outcomes of several items in one transaction.
+
+        Items that already have an outcome are left alone. The job is
+        marked completed once every item has one.
+
+        Args:
+            job_id: Job identifier
+            items: Outcomes to record
+
+        Returns:
+            The job's updated progress
+        """
+        pass
+
+    @abstractmethod
+    def results(
+        self, job_id: str, after_sequence: int, limit: int
+    ) -> List[Tuple[int, JobItemResult]]:
+        """
+        Page through recorded outcomes in the order they were recorded.
+
+        Args:
+            job_id: Job identifier
+            after_sequence: Only outcomes recorded after this position are
+                returned; 0 starts from the beginning
+            limit: Largest number of outcomes returned
+
+        Returns:
+            (sequence, JobItemResult) pairs; sequences start at 1
+        """
+        pass
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
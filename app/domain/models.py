@@ -1,7 +1,24 @@
 """Domain models for face detection service."""
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class FaceDetection:
+    """
+    One detected face in coordinates relative to the image size.
+
+    Attributes:
+        score: Detection confidence (0.0-1.0)
+        box: ``(xmin, ymin, width, height)`` of the bounding box
+        keypoints: Six ``(x, y)`` points: right eye, left eye, nose tip,
+            mouth centre, right ear tragion, left ear tragion
+    """
+
+    score: float
+    box: Tuple[float, float, float, float]
+    keypoints: Tuple[Tuple[float, float], ...]
 
 
 @dataclass(frozen=True)
@@ -10,7 +27,86 @@ class FaceDetectionResult:
 
     face_detected: bool
     confidence: Optional[float] = None
+    detections: Tuple[FaceDetection, ...] = ()
+    # Detection stopped at the first face, so ``detections`` and
+    # ``confidence`` may not cover every face; never cached
+    stopped_early: bool = False
 
     def to_dict(self) -> dict:
         """Convert to dictionary representation."""
         return {"face_detected": self.face_detected}
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    """Format and dimensions of an encoded image, read from its header."""
+
+    format: str
+    width: int
+    height: int
+
+    @property
+    def pixels(self) -> int:
+        """Number of pixels a full decode would produce."""
+        return self.width * self.height
+
+
+@dataclass(frozen=True)
+class BatchItemResult:
+    """Outcome of one image in a batch: a detection result or an error."""
+
+    index: int
+    result: Optional[FaceDetectionResult] = None
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class VideoSegment:
+    """Stretch of a video whose sampled frames agree on face presence."""
+
+    start_ms: float
+    end_ms: float
+    face_detected: bool
+    max_confidence: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class VideoDetectionResult:
+    """Domain model representing face detection over a video."""
+
+    face_detected: bool
+    segments: Tuple[VideoSegment, ...]
+    frames_read: int
+    frames_sampled: int
+    stopped_early: bool = False
+
+
+# Lifecycle of a bulk detection job
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+
+
+@dataclass(frozen=True)
+class Job:
+    """Progress of a bulk detection job."""
+
+    job_id: str
+    status: str
+    total: int
+    done: int = 0
+    failed: int = 0
+    faces: int = 0
+    created_at: float = 0.0
+    finished_at: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class JobItemResult:
+    """Recorded outcome of one image of a job: a detection or an error."""
+
+    index: int
+    source: str
+    face_detected: Optional[bool] = None
+    confidence: Optional[float] = None
+    error: Optional[str] = None
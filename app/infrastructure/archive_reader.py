@@ -0,0 +1,104 @@
+"""Sequential readers for zip and tar archives of images."""
+
+import logging
+import tarfile
+import zipfile
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Local file header and end-of-central-directory (empty archive) signatures
+_ZIP_MAGIC = (b"PK\x03\x04", b"PK\x05\x06")
+
+
+class ArchiveReader:
+    """
+    Reads the regular-file members of a zip or tar archive one at a time.
+
+    Tar archives, optionally gzip, bzip2 or xz compressed, are read in
+    stream mode so the file is scanned once from the start. Zip archives
+    need random access to the central directory, which the spooled upload
+    file provides. Only one member is held in memory at a time, and a
+    member larger than ``max_member_bytes`` is cut short at
+    ``max_member_bytes + 1`` bytes so the caller can reject it without
+    buffering it whole.
+    """
+
+    def __init__(self, fileobj: BinaryIO, max_member_bytes: int):
+        """
+        Open an archive.
+
+        Args:
+            fileobj: Binary file object positioned anywhere; it is rewound
+            max_member_bytes: Largest member size that is read in full
+
+        Raises:
+            ValueError: If the data is not a zip or tar archive
+        """
+        self._max_member_bytes = max_member_bytes
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+
+        fileobj.seek(0)
+        magic = fileobj.read(4)
+        fileobj.seek(0)
+        try:
+            if magic in _ZIP_MAGIC:
+                self._zip = zipfile.ZipFile(fileobj)
+            else:
+                self._tar = tarfile.open(fileobj=fileobj, mode="r|*")
+        except (zipfile.BadZipFile, tarfile.TarError) as e:
+            logger.warning(f"Unreadable archive: {str(e)}")
+            raise ValueError(f"Invalid archive: {str(e)}")
+
+    @property
+    def format(self) -> str:
+        """Archive format, ``"zip"`` or ``"tar"``."""
+        return "zip" if self._zip is not None else "tar"
+
+    def members(self) -> Iterator[Tuple[str, bytes]]:
+        """
+        Iterate over regular files in archive order.
+
+        Directories, links and other special members are skipped.
+
+        Yields:
+            Tuple of (member name, member bytes)
+
+        Raises:
+            ValueError: If the archive is corrupt partway through
+        """
+        try:
+            if self._zip is not None:
+                yield from self._zip_members(self._zip)
+            elif self._tar is not None:
+                yield from self._tar_members(self._tar)
+        except (zipfile.BadZipFile, tarfile.TarError, EOFError) as e:
+            logger.warning(f"Archive ended unexpectedly: {str(e)}")
+            raise ValueError(f"Invalid archive: {str(e)}")
+
+    def close(self) -> None:
+        """Release the archive handle."""
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+    def _zip_members(self, archive: zipfile.ZipFile) -> Iterator[Tuple[str, bytes]]:
+        """Read zip entries, bounding how much of each is decompressed."""
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            with archive.open(info) as member:
+                yield info.filename, member.read(self._max_member_bytes + 1)
+
+    def _tar_members(self, archive: tarfile.TarFile) -> Iterator[Tuple[str, bytes]]:
+        """Read tar entries in stream order."""
+        for info in archive:
+            if not info.isfile():
+                continue
+            member = archive.extractfile(info)
+            if member is None:
+                continue
+            yield info.name, member.read(self._max_member_bytes + 1)
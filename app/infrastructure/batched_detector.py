@@ -0,0 +1,349 @@
+"""BlazeFace detector on OpenCV DNN with dynamic micro-batching."""
+
+import logging
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.domain.interfaces import IFaceDetector
+from app.domain.models import FaceDetection, FaceDetectionResult
+from app.infrastructure.image_decoding import decode_to_rgb, fit_to_max_side
+from app.infrastructure.metrics import time_stage
+from app.infrastructure.micro_batcher import BatchStats, MicroBatcher
+from app.infrastructure.model_files import FACE_DETECTION_SHORT_RANGE_MODEL
+
+
+logger = logging.getLogger(__name__)
+
+_INPUT_SIZE = 128
+
+# Anchor grids per output layer: 16x16 cells x 2 and 8x8 cells x 6. OpenCV
+# concatenates the per-layer outputs after the batch dimension, so a batch
+# comes back as all images' layer-one outputs followed by their layer-two
+# outputs rather than image by image.
+_LAYERS = ((16, 2), (8, 6))
+_LAYER_ANCHORS = tuple(grid * grid * per_cell for grid, per_cell in _LAYERS)
+
+# Anchor centres in model input coordinates, in output order
+_ANCHORS = np.concatenate(
+    [
+        np.repeat(
+            np.stack(
+                np.meshgrid(
+                    (np.arange(grid) + 0.5) / grid, (np.arange(grid) + 0.5) / grid
+                ),
+                axis=-1,
+            ).reshape(-1, 2),
+            per_cell,
+            axis=0,
+        )
+        for grid, per_cell in _LAYERS
+    ]
+).astype(np.float32)
+
+# Overlap above which detections are merged, as in MediaPipe's graph
+_MIN_SUPPRESSION_IOU = 0.3
+
+# Placement of the image inside the letterbox: left, top, width, height
+Placement = Tuple[int, int, int, int]
+
+
+def letterbox(
+    image_array: np.ndarray, size: int = _INPUT_SIZE
+) -> Tuple[np.ndarray, Placement]:
+    """
+    Fit an image into a square, keeping its aspect ratio.
+
+    The image is scaled so its longer side equals ``size`` and centred on
+    black padding, matching MediaPipe's keep-aspect-ratio preprocessing.
+
+    Args:
+        image_array: RGB image
+        size: Side of the square output
+
+    Returns:
+        uint8 array of shape (size, size, 3) and the image's placement in it
+    """
+    height, width = image_array.shape[:2]
+    scale = size / max(height, width)
+    new_height = max(1, round(height * scale))
+    new_width = max(1, round(width * scale))
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    resized = cv2.resize(
+        image_array, (new_width, new_height), interpolation=interpolation
+    )
+
+    canvas = np.zeros((size, size, 3), dtype=np.uint8)
+    top = (size - new_height) // 2
+    left = (size - new_width) // 2
+    canvas[top : top + new_height, left : left + new_width] = resized
+    return canvas, (left, top, new_width, new_height)
+
+
+def _weighted_nms(
+    scores: np.ndarray, boxes: np.ndarray, keypoints: np.ndarray
+) -> List[Tuple[float, np.ndarray, np.ndarray]]:
+    """
+    Merge overlapping candidates as MediaPipe's weighted suppression does.
+
+    Each surviving detection keeps its best score and the score-weighted
+    mean box and keypoints of every candidate overlapping it.
+
+    Args:
+        scores: Candidate scores, shape (K,)
+        boxes: ``(xmin, ymin, xmax, ymax)`` per candidate, shape (K, 4)
+        keypoints: Keypoints per candidate, shape (K, 12)
+
+    Returns:
+        List of (score, box, keypoints), best first
+    """
+    order = np.argsort(-scores)
+    scores, boxes, keypoints = scores[order], boxes[order], keypoints[order]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    remaining = np.arange(len(scores))
+    merged = []
+    while remaining.size:
+        best = remaining[0]
+        top_left = np.maximum(boxes[best, :2], boxes[remaining, :2])
+        bottom_right = np.minimum(boxes[best, 2:], boxes[remaining, 2:])
+        overlap = np.prod(np.clip(bottom_right - top_left, 0, None), axis=1)
+        iou = overlap / (areas[best] + areas[remaining] - overlap + 1e-9)
+        overlapping = iou > _MIN_SUPPRESSION_IOU
+        overlapping[0] = True  # degenerate boxes have no area to overlap
+        group = remaining[overlapping]
+        weights = scores[group, None] / scores[group].sum()
+        merged.append(
+            (
+                float(scores[best]),
+                (boxes[group] * weights).sum(axis=0),
+                (keypoints[group] * weights).sum(axis=0),
+            )
+        )
+        remaining = remaining[~overlapping]
+    return merged
+
+
+class BatchedBlazeFaceDetector(IFaceDetector):
+    """
+    Face detector running BlazeFace through OpenCV DNN in batches.
+
+    Decoding and letterboxing run on the calling threads in parallel; the
+    128x128 tensors are then merged by a MicroBatcher into one forward pass
+    of up to ``max_batch_size`` images. The network is only touched by the
+    batching thread. Uses the same short-range model file as
+    MediaPipeFaceDetector, and the best anchor score stands in for the
+    highest detection confidence.
+    """
+
+    def __init__(
+        self,
+        min_detection_confidence: float = 0.5,
+        max_batch_size: int = 8,
+        max_batch_wait: float = 0.002,
+        max_image_side: Optional[int] = None,
+        model_path: str = FACE_DETECTION_SHORT_RANGE_MODEL,
+    ):
+        """
+        Initialize the batched detector.
+
+        Args:
+            min_detection_confidence: Minimum confidence threshold
+                for detection (0.0-1.0)
+            max_batch_size: Most images per forward pass
+            max_batch_wait: Seconds the first image of a batch waits for
+                others to arrive
+            max_image_side: Longest image side kept while decoding; None
+                keeps full size
+            model_path: BlazeFace short-range TFLite model file
+        """
+        self._min_detection_confidence = min_detection_confidence
+        self._max_image_side = max_image_side
+        self._net = cv2.dnn.readNetFromTFLite(model_path)
+        # Sigmoid is monotonic, so thresholds are compared as logits
+        self._min_logit = float(
+            np.log(min_detection_confidence / (1 - min_detection_confidence))
+            if 0 < min_detection_confidence < 1
+            else (-np.inf if min_detection_confidence <= 0 else np.inf)
+        )
+        self._batcher: MicroBatcher[np.ndarray, List[FaceDetection]] = MicroBatcher(
+            self._run_batch,
+            max_batch_size=max_batch_size,
+            max_wait=max_batch_wait,
+            name="blazeface-batcher",
+        )
+        logger.info(
+            f"Batched BlazeFace detector initialized with confidence threshold: "
+            f"{min_detection_confidence}, batch size: {max_batch_size}, "
+            f"batch wait: {max_batch_wait * 1000:.1f} ms"
+        )
+
+    def detect_face(
+        self, image_data: bytes, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces in the provided image.
+
+        Args:
+            image_data: Raw image bytes
+            stop_at_first_face: Unused; one pass finds every face
+
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If image data is invalid or cannot be processed
+        """
+        return self.detect_face_in_array(self.decode_image(image_data))
+
+    def decode_image(self, image_data: bytes) -> np.ndarray:
+        """
+        Decode an image to RGB within the input budget.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            Contiguous RGB numpy array
+
+        Raises:
+            ValueError: If image data is invalid or cannot be decoded
+        """
+        try:
+            return decode_to_rgb(image_data, self._max_image_side)
+        except Exception as e:
+            logger.error(f"Error during face detection: {str(e)}")
+            raise ValueError(f"Failed to process image: {str(e)}")
+
+    def detect_face_in_array(
+        self, image_array: np.ndarray, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces in an already decoded image.
+
+        Args:
+            image_array: Decoded image as an RGB numpy array
+            stop_at_first_face: Unused; one pass finds every face
+
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If the image cannot be processed
+        """
+        try:
+            tensor, placement = letterbox(
+                fit_to_max_side(image_array, self._max_image_side)
+            )
+        except Exception as e:
+            logger.error(f"Error during face detection: {str(e)}")
+            raise ValueError(f"Failed to process image: {str(e)}")
+
+        detections = self._batcher.submit(tensor)
+        if not detections:
+            return FaceDetectionResult(face_detected=False)
+        detections = [_unletterbox(detection, placement) for detection in detections]
+        return FaceDetectionResult(
+            face_detected=True,
+            confidence=detections[0].score,
+            detections=tuple(detections),
+        )
+
+    @property
+    def settings_key(self) -> str:
+        """Identify the model and settings that influence results."""
+        return (
+            f"blazeface_dnn:short_range:conf={self._min_detection_confidence}"
+            f":max_side={self._max_image_side or 0}"
+        )
+
+    def batch_stats(self) -> BatchStats:
+        """
+        Get micro-batching counters.
+
+        Returns:
+            BatchStats instance
+        """
+        return self._batcher.stats()
+
+    def close(self) -> None:
+        """Finish queued images and stop the batching thread."""
+        self._batcher.close()
+
+    def _run_batch(self, tensors: List[np.ndarray]) -> List[List[FaceDetection]]:
+        """Detect faces in a batch of letterboxed images on the batching thread."""
+        count = len(tensors)
+        blob = cv2.dnn.blobFromImages(
+            tensors, scalefactor=1 / 127.5, mean=(127.5, 127.5, 127.5)
+        )
+        self._net.setInput(blob)
+        with time_stage("process"):
+            logits, regressors = self._net.forward(["classificators", "regressors"])
+        logits = _by_image(logits.reshape(-1, 1), count)[..., 0]
+        regressors = _by_image(regressors.reshape(-1, 16), count)
+
+        batch: List[List[FaceDetection]] = []
+        for image_logits, image_regressors in zip(logits, regressors):
+            candidates = np.flatnonzero(image_logits >= self._min_logit)
+            if not candidates.size:
+                batch.append([])
+                continue
+            raw = image_regressors[candidates] / _INPUT_SIZE
+            centres = _ANCHORS[candidates]
+            centre = raw[:, :2] + centres
+            half = raw[:, 2:4] / 2
+            boxes = np.concatenate([centre - half, centre + half], axis=1)
+            keypoints = raw[:, 4:] + np.tile(centres, 6)
+            scores = 1 / (1 + np.exp(-np.clip(image_logits[candidates], -100, 100)))
+            detections = []
+            for score, box, points in _weighted_nms(scores, boxes, keypoints):
+                xmin, ymin, xmax, ymax = (float(v) for v in box)
+                detections.append(
+                    FaceDetection(
+                        score=score,
+                        box=(xmin, ymin, xmax, ymax),
+                        keypoints=tuple(
+                            (float(x), float(y)) for x, y in points.reshape(6, 2)
+                        ),
+                    )
+                )
+            batch.append(detections)
+        return batch
+
+
+def _by_image(output: np.ndarray, count: int) -> np.ndarray:
+    """Regroup a layer-major batched output to shape (count, anchors, values)."""
+    layers = []
+    offset = 0
+    for anchors in _LAYER_ANCHORS:
+        layers.append(
+            output[offset : offset + count * anchors].reshape(count, anchors, -1)
+        )
+        offset += count * anchors
+    return np.concatenate(layers, axis=1)
+
+
+def _unletterbox(detection: FaceDetection, placement: Placement) -> FaceDetection:
+    """
+    Map a detection from letterbox coordinates to image coordinates.
+
+    Boxes are kept as ``(xmin, ymin, xmax, ymax)`` until this point and
+    converted to ``(xmin, ymin, width, height)`` here.
+    """
+    left, top, width, height = placement
+    scale_x, scale_y = _INPUT_SIZE / width, _INPUT_SIZE / height
+    offset_x, offset_y = left / width, top / height
+    xmin, ymin, xmax, ymax = detection.box
+    return FaceDetection(
+        score=detection.score,
+        box=(
+            xmin * scale_x - offset_x,
+            ymin * scale_y - offset_y,
+            (xmax - xmin) * scale_x,
+            (ymax - ymin) * scale_y,
+        ),
+        keypoints=tuple(
+            (x * scale_x - offset_x, y * scale_y - offset_y)
+            for x, y in detection.keypoints
+        ),
+    )
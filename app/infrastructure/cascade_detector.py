@@ -0,0 +1,298 @@
+"""Cheap-first cascade of MediaPipe detectors for face/no-face answers."""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import mediapipe as mp
+import numpy as np
+
+from app.domain.interfaces import IFaceDetector
+from app.domain.models import FaceDetection, FaceDetectionResult
+from app.infrastructure.graph_pool import FaceDetectionGraphPool
+from app.infrastructure.image_decoding import decode_to_rgb, fit_to_max_side
+from app.infrastructure.mediapipe_detector import detections_from_mediapipe
+from app.infrastructure.metrics import time_stage
+
+
+logger = logging.getLogger(__name__)
+
+FINAL_MODELS = {"short_range": 0, "full_range": 1}
+
+
+@dataclass(frozen=True)
+class CascadeStageStats:
+    """Point-in-time counters for one cascade stage."""
+
+    name: str
+    entered: int
+    accepted: int
+    rejected: int
+    escalated: int
+
+    @property
+    def exit_rate(self) -> float:
+        """Fraction of entering images answered by this stage."""
+        return (self.accepted + self.rejected) / self.entered if self.entered else 0.0
+
+
+@dataclass(frozen=True)
+class CascadeStats:
+    """Point-in-time snapshot of cascade counters."""
+
+    accept_above: float
+    reject_below: float
+    stages: Tuple[CascadeStageStats, ...]
+
+
+class _Stage:
+    """One resolution and model step of the cascade."""
+
+    def __init__(
+        self,
+        name: str,
+        max_side: Optional[int],
+        model_selection: int,
+        min_detection_confidence: float,
+        pool_size: int,
+    ):
+        self.name = name
+        self.max_side = max_side
+        self._model_selection = model_selection
+        self._min_detection_confidence = min_detection_confidence
+        self.pool = FaceDetectionGraphPool(factory=self._create_graph, size=pool_size)
+        self.entered = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    def detect(self, image_array: np.ndarray) -> Tuple[FaceDetection, ...]:
+        """Detections at or above the graph threshold."""
+        with self.pool.checkout() as face_detection, time_stage("process"):
+            results = face_detection.process(image_array)
+        return detections_from_mediapipe(results.detections or ())
+
+    def _create_graph(self):
+        """Build a MediaPipe face detection graph for this stage."""
+        return mp.solutions.face_detection.FaceDetection(
+            min_detection_confidence=self._min_detection_confidence,
+            model_selection=self._model_selection,
+        )
+
+
+class CascadeFaceDetector(IFaceDetector):
+    """
+    Face detector that answers clear-cut images from a thumbnail.
+
+    The image is decoded once at ``max_image_side`` and the first stage
+    runs the short-range model on a thumbnail shrunk from that array, with
+    its threshold lowered to ``reject_below``. An image whose best score
+    reaches ``accept_above`` is reported as a face, and one with no
+    detection at or above ``reject_below`` as no face. Only the uncertain
+    images in between reach the final stage, which runs its model on the
+    decoded array against ``min_detection_confidence``.
+    """
+
+    def __init__(
+        self,
+        min_detection_confidence: float = 0.5,
+        thumbnail_side: int = 256,
+        accept_above: float = 0.8,
+        reject_below: float = 0.3,
+        final_model: str = "short_range",
+        pool_size: int = 1,
+        max_image_side: Optional[int] = None,
+    ):
+        """
+        Initialize the cascade.
+
+        Args:
+            min_detection_confidence: Confidence threshold applied by the
+                final stage (0.0-1.0)
+            thumbnail_side: Longest image side seen by the first stage
+            accept_above: First-stage score treated as a certain face
+            reject_below: First-stage score below which there is certainly
+                no face
+            final_model: ``"short_range"`` or ``"full_range"`` model for
+                uncertain images
+            pool_size: Maximum number of detection graphs kept per stage
+            max_image_side: Longest image side seen by the final stage;
+                None keeps full size
+
+        Raises:
+            ValueError: If the bands do not bracket the threshold or the
+                final model is unknown
+        """
+        if not reject_below <= min_detection_confidence <= accept_above:
+            raise ValueError(
+                "Cascade bands must satisfy "
+                "reject_below <= min_detection_confidence <= accept_above"
+            )
+        if final_model not in FINAL_MODELS:
+            raise ValueError(f"Unknown cascade final model: {final_model}")
+
+        self._min_detection_confidence = min_detection_confidence
+        self._thumbnail_side = thumbnail_side
+        self._accept_above = accept_above
+        self._reject_below = reject_below
+        self._final_model = final_model
+        self._max_image_side = max_image_side
+        self._lock = threading.Lock()
+        self._stages: List[_Stage] = [
+            _Stage("thumbnail", thumbnail_side, 0, reject_below, pool_size),
+            _Stage(
+                final_model,
+                max_image_side,
+                FINAL_MODELS[final_model],
+                min_detection_confidence,
+                pool_size,
+            ),
+        ]
+        logger.info(
+            f"Cascade face detector initialized with thumbnail side: "
+            f"{thumbnail_side}, bands: {reject_below}-{accept_above}, "
+            f"final model: {final_model}"
+        )
+
+    def detect_face(
+        self, image_data: bytes, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces, running the final model only for uncertain images.
+
+        Args:
+            image_data: Raw image bytes
+            stop_at_first_face: Unused; the stage bands decide when to stop
+
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If image data is invalid or cannot be processed
+        """
+        return self._run(self.decode_image(image_data))
+
+    def decode_image(self, image_data: bytes) -> np.ndarray:
+        """
+        Decode an image to RGB within the input budget.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            Contiguous RGB numpy array
+
+        Raises:
+            ValueError: If image data is invalid or cannot be decoded
+        """
+        try:
+            return decode_to_rgb(image_data, self._max_image_side)
+        except Exception as e:
+            logger.error(f"Error during face detection: {str(e)}")
+            raise ValueError(f"Failed to process image: {str(e)}")
+
+    def detect_face_in_array(
+        self, image_array: np.ndarray, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces in an already decoded image.
+
+        Args:
+            image_array: Decoded image as an RGB numpy array
+            stop_at_first_face: Unused; the stage bands decide when to stop
+
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If the image cannot be processed
+        """
+        return self._run(image_array)
+
+    @property
+    def settings_key(self) -> str:
+        """Identify the models and settings that influence results."""
+        return (
+            f"cascade:thumb={self._thumbnail_side}"
+            f":bands={self._reject_below}-{self._accept_above}"
+            f":final={self._final_model}:conf={self._min_detection_confidence}"
+            f":max_side={self._max_image_side or 0}"
+        )
+
+    def stats(self) -> CascadeStats:
+        """
+        Get per-stage exit counters for tuning the bands.
+
+        Returns:
+            CascadeStats instance
+        """
+        with self._lock:
+            stages = tuple(
+                CascadeStageStats(
+                    name=stage.name,
+                    entered=stage.entered,
+                    accepted=stage.accepted,
+                    rejected=stage.rejected,
+                    escalated=stage.entered - stage.accepted - stage.rejected,
+                )
+                for stage in self._stages
+            )
+        return CascadeStats(
+            accept_above=self._accept_above,
+            reject_below=self._reject_below,
+            stages=stages,
+        )
+
+    def prewarm(self) -> None:
+        """Build and warm every detection graph of every stage."""
+        for stage in self._stages:
+            stage.pool.prewarm()
+
+    def close(self) -> None:
+        """Close the detection graphs of every stage."""
+        for stage in self._stages:
+            stage.pool.close()
+
+    def _run(self, image_array: np.ndarray) -> FaceDetectionResult:
+        """Walk the stages until one gives a confident answer."""
+        final = self._stages[-1]
+        for stage in self._stages:
+            try:
+                detections = stage.detect(fit_to_max_side(image_array, stage.max_side))
+            except Exception as e:
+                logger.error(f"Error during face detection: {str(e)}")
+                raise ValueError(f"Failed to process image: {str(e)}")
+
+            score = max((d.score for d in detections), default=None)
+            if stage is final:
+                face_detected = score is not None
+            elif score is None or score < self._reject_below:
+                face_detected = False
+            elif score >= self._accept_above:
+                face_detected = True
+            else:
+                face_detected = None
+
+            with self._lock:
+                stage.entered += 1
+                if face_detected is True:
+                    stage.accepted += 1
+                elif face_detected is False:
+                    stage.rejected += 1
+
+            if face_detected is None:
+                logger.debug(f"Stage {stage.name} unsure at {score:.3f}, escalating")
+            elif face_detected:
+                return FaceDetectionResult(
+                    face_detected=True,
+                    confidence=score,
+                    detections=tuple(
+                        detection
+                        for detection in detections
+                        if detection.score >= self._min_detection_confidence
+                    ),
+                )
+            else:
+                return FaceDetectionResult(face_detected=False)
+
+        raise AssertionError("Final cascade stage always answers")
@@ -0,0 +1,187 @@
+"""Bounded pool of long-lived MediaPipe face detection graphs."""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+# Frame pushed through every new graph so the first real request does not
+# pay for delegate initialisation and buffer allocation.
+_WARMUP_FRAME = np.zeros((128, 128, 3), dtype=np.uint8)
+
+
+class FaceDetectionGraphPool:
+    """
+    Pool of reusable face detection graphs with exclusive checkout.
+
+    A MediaPipe graph is not safe to use from two threads at once, so every
+    graph is owned by exactly one thread while checked out. Threads get back
+    the graph they used last when it is idle, which keeps per-thread caches
+    warm. Graphs are built lazily up to ``size`` and a graph that raises
+    while checked out is closed and replaced on a later checkout.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 1,
+        checkout_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the graph pool.
+
+        Args:
+            factory: Callable building a new graph exposing ``process``
+                and ``close``
+            size: Maximum number of graphs kept alive
+            checkout_timeout: Seconds to wait for an idle graph, or None
+                to wait indefinitely
+
+        Raises:
+            ValueError: If size is smaller than 1
+        """
+        if size < 1:
+            raise ValueError("Graph pool size must be at least 1")
+
+        self._factory = factory
+        self._size = size
+        self._checkout_timeout = checkout_timeout
+        self._idle: List[Any] = []
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._affinity = threading.local()
+
+    @property
+    def size(self) -> int:
+        """Maximum number of graphs in the pool."""
+        return self._size
+
+    @property
+    def created(self) -> int:
+        """Number of graphs currently alive (idle or checked out)."""
+        return self._created
+
+    @property
+    def idle(self) -> int:
+        """Number of graphs waiting to be checked out."""
+        return len(self._idle)
+
+    @contextmanager
+    def checkout(self) -> Iterator[Any]:
+        """
+        Check a graph out for exclusive use by the calling thread.
+
+        Yields:
+            A warmed graph
+
+        Raises:
+            RuntimeError: If the pool is closed
+            TimeoutError: If no graph became idle within the timeout
+        """
+        graph = self._acquire()
+        try:
+            yield graph
+        except Exception:
+            self._discard(graph)
+            raise
+        else:
+            self._release(graph)
+
+    def prewarm(self) -> None:
+        """Build and warm every graph in the pool up front."""
+        graphs = []
+        try:
+            for _ in range(self._size):
+                graphs.append(self._acquire())
+        finally:
+            for graph in graphs:
+                self._release(graph)
+
+    def close(self) -> None:
+        """Close all idle graphs; checked-out graphs close when returned."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._condition.notify_all()
+        for graph in idle:
+            self._close_graph(graph)
+        logger.info("Face detection graph pool closed")
+
+    def _acquire(self) -> Any:
+        """Take an idle graph, build a new one or wait for one."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Face detection graph pool is closed")
+
+                if self._idle:
+                    preferred = getattr(self._affinity, "graph", None)
+                    if preferred is not None and preferred in self._idle:
+                        self._idle.remove(preferred)
+                        return preferred
+                    graph = self._idle.pop()
+                    self._affinity.graph = graph
+                    return graph
+
+                if self._created < self._size:
+                    self._created += 1
+                    break
+
+                if not self._condition.wait(timeout=self._checkout_timeout):
+                    raise TimeoutError("Timed out waiting for a face detection graph")
+
+        try:
+            graph = self._build()
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+        self._affinity.graph = graph
+        return graph
+
+    def _release(self, graph: Any) -> None:
+        """Return a healthy graph to the idle list."""
+        with self._condition:
+            if not self._closed:
+                self._idle.append(graph)
+                self._condition.notify()
+                return
+            self._created -= 1
+        self._close_graph(graph)
+
+    def _discard(self, graph: Any) -> None:
+        """Drop a graph that failed so a fresh one is built in its place."""
+        logger.warning("Discarding face detection graph after a failure")
+        with self._condition:
+            self._created -= 1
+            self._condition.notify()
+        if getattr(self._affinity, "graph", None) is graph:
+            self._affinity.graph = None
+        self._close_graph(graph)
+
+    def _build(self) -> Any:
+        """Create a graph and run a warm-up frame through it."""
+        graph = self._factory()
+        try:
+            graph.process(_WARMUP_FRAME)
+        except Exception:
+            self._close_graph(graph)
+            raise
+        logger.debug("Built and warmed a new face detection graph")
+        return graph
+
+    @staticmethod
+    def _close_graph(graph: Any) -> None:
+        """Close a graph, logging instead of raising on failure."""
+        try:
+            graph.close()
+        except Exception as e:
+            logger.warning(f"Failed to close face detection graph: {str(e)}")
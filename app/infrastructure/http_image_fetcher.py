@@ -0,0 +1,171 @@
+"""Connection-pooled HTTP fetcher for images held in object storage."""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional
+
+import httpx
+
+from app.domain.exceptions import ImageFetchError, ImageTooLargeError
+from app.domain.interfaces import IImageFetcher
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMES = frozenset({"http", "https"})
+
+
+@dataclass
+class _HostSlots:
+    """Concurrency limit of one host and the fetches holding or awaiting it."""
+
+    semaphore: asyncio.Semaphore
+    users: int = 0
+
+
+class HttpImageFetcher(IImageFetcher):
+    """
+    Fetches images over one shared, keep-alive connection pool.
+
+    Every fetch goes through a single ``httpx.AsyncClient``, so repeated
+    fetches from the same storage endpoint reuse warm connections instead
+    of paying for a TCP and TLS handshake each. At most
+    ``max_connections`` requests are open overall and ``max_per_host`` per
+    host, so one slow bucket cannot take every connection. Bodies are
+    streamed and abandoned as soon as they pass ``max_bytes``, and every
+    fetch, from connecting to the last byte, is bounded by ``timeout``.
+    URLs are never logged or echoed in errors, since presigned URLs carry
+    credentials.
+
+    Only ``http`` and ``https`` URLs on ``allowed_hosts`` are fetched and
+    redirects are not followed, so clients cannot point the service at
+    hosts it was not meant to reach. The client is created on first use
+    and belongs to the event loop that made it.
+    """
+
+    def __init__(
+        self,
+        allowed_hosts: Optional[FrozenSet[str]] = None,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_connections: int = 32,
+        max_per_host: int = 8,
+        connect_timeout: float = 5.0,
+        timeout: float = 30.0,
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            allowed_hosts: Host names that may be fetched from, or None to
+                allow any host
+            max_bytes: Largest accepted image
+            max_connections: Requests open at once across all hosts
+            max_per_host: Requests open at once to one host
+            connect_timeout: Seconds allowed to establish a connection
+            timeout: Seconds allowed for a whole fetch
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if min(max_bytes, max_connections, max_per_host) < 1 or timeout <= 0:
+            raise ValueError("Fetch limits must be positive")
+
+        self._allowed_hosts = allowed_hosts
+        self._max_bytes = max_bytes
+        self._max_connections = max_connections
+        self._max_per_host = max_per_host
+        self._connect_timeout = connect_timeout
+        self._timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._hosts: Dict[str, _HostSlots] = {}
+        hosts = "any host" if allowed_hosts is None else sorted(allowed_hosts)
+        logger.info(
+            f"HTTP image fetcher initialized for {hosts} with "
+            f"{max_connections} connection(s), {max_per_host} per host"
+        )
+
+    async def fetch(self, url: str) -> bytes:
+        """
+        Download an image, streaming it against the size limit.
+
+        Args:
+            url: ``http`` or ``https`` URL of the image
+
+        Returns:
+            Raw image bytes
+
+        Raises:
+            ImageFetchError: If the URL is not allowed, the server does not
+                answer 200 or the fetch times out
+            ImageTooLargeError: If the image exceeds ``max_bytes``
+        """
+        host = self._check_url(url)
+        slots = self._hosts.setdefault(
+            host, _HostSlots(asyncio.Semaphore(self._max_per_host))
+        )
+        slots.users += 1
+        try:
+            async with slots.semaphore:
+                return await asyncio.wait_for(self._download(url), self._timeout)
+        except asyncio.TimeoutError:
+            raise ImageFetchError(f"Fetch timed out after {self._timeout:g}s")
+        except httpx.HTTPError as e:
+            raise ImageFetchError(f"Fetch failed: {type(e).__name__}")
+        finally:
+            slots.users -= 1
+            if not slots.users:
+                del self._hosts[host]
+
+    async def close(self) -> None:
+        """Close the pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("HTTP image fetcher closed")
+
+    def _check_url(self, url: str) -> str:
+        """Return the host of an allowed URL."""
+        try:
+            parsed = httpx.URL(url)
+        except Exception:
+            raise ImageFetchError("Invalid URL")
+        if parsed.scheme not in _SCHEMES or not parsed.host:
+            raise ImageFetchError("Only http and https URLs can be fetched")
+        if self._allowed_hosts is not None and parsed.host not in self._allowed_hosts:
+            raise ImageFetchError(f"Host not allowed: {parsed.host}")
+        return parsed.host
+
+    async def _download(self, url: str) -> bytes:
+        """Stream one response body into memory."""
+        async with self._get_client().stream("GET", url) as response:
+            if response.status_code != httpx.codes.OK:
+                raise ImageFetchError(f"Fetch failed: HTTP {response.status_code}")
+            too_large = ImageTooLargeError(
+                f"Image exceeds the {self._max_bytes} byte limit"
+            )
+            declared = response.headers.get("Content-Length")
+            if declared is not None and declared.isdigit():
+                if int(declared) > self._max_bytes:
+                    raise too_large
+            parts: List[bytes] = []
+            total = 0
+            async for chunk in response.aiter_bytes():
+                total += len(chunk)
+                if total > self._max_bytes:
+                    raise too_large
+                parts.append(chunk)
+        return b"".join(parts)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the shared client on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                timeout=httpx.Timeout(self._timeout, connect=self._connect_timeout),
+                follow_redirects=False,
+            )
+        return self._client
@@ -0,0 +1,377 @@
+"""Image decoding helpers shared by face detector implementations."""
+
+import logging
+from io import BytesIO
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from app.domain.exceptions import UnsupportedImageFormatError
+from app.infrastructure.image_header import sniff_format
+from app.infrastructure.metrics import time_stage
+
+
+logger = logging.getLogger(__name__)
+
+# OpenCV >= 4.11 can hand back RGB straight from the codec
+_IMREAD_COLOR_RGB: Optional[int] = getattr(cv2, "IMREAD_COLOR_RGB", None)
+
+# Orientation is ignored to match what PIL returns for the same bytes
+_IMREAD_FLAGS = (
+    _IMREAD_COLOR_RGB if _IMREAD_COLOR_RGB is not None else cv2.IMREAD_COLOR
+) | cv2.IMREAD_IGNORE_ORIENTATION
+
+
+# libjpeg can scale by these factors during the inverse DCT
+_JPEG_REDUCED_FLAGS = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+}
+
+
+def _jpeg_scale_factor(size: Tuple[int, int], max_side: Optional[int]) -> int:
+    """Largest DCT scale factor that keeps the long side >= max_side."""
+    if not max_side:
+        return 1
+    long_side = max(size)
+    for factor in (8, 4, 2):
+        if long_side // factor >= max_side:
+            return factor
+    return 1
+
+
+def _imdecode(image_data: bytes, flags: int) -> Optional[np.ndarray]:
+    """Run cv2.imdecode and make sure the result is RGB."""
+    with time_stage("decode"):
+        image_array = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), flags)
+    if image_array is None:
+        return None
+    if _IMREAD_COLOR_RGB is None or not flags & _IMREAD_COLOR_RGB:
+        with time_stage("cvtColor"):
+            cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB, dst=image_array)
+    return image_array
+
+
+def _decode_with_opencv(
+    image_data: bytes, max_side: Optional[int]
+) -> Optional[np.ndarray]:
+    """Decode with OpenCV at full resolution."""
+    return _imdecode(image_data, _IMREAD_FLAGS)
+
+
+def _decode_jpeg_with_opencv(
+    image_data: bytes, max_side: Optional[int]
+) -> Optional[np.ndarray]:
+    """Decode a JPEG with OpenCV, scaling down in the DCT when allowed."""
+    factor = 1
+    if max_side:
+        factor = _jpeg_scale_factor(Image.open(BytesIO(image_data)).size, max_side)
+    if factor == 1:
+        return _imdecode(image_data, _IMREAD_FLAGS)
+    return _imdecode(
+        image_data, _JPEG_REDUCED_FLAGS[factor] | cv2.IMREAD_IGNORE_ORIENTATION
+    )
+
+
+def _decode_with_pil(image_data: bytes, max_side: Optional[int]) -> np.ndarray:
+    """Decode with PIL, converting to RGB only when the mode differs."""
+    with time_stage("decode"):
+        pil_image = Image.open(BytesIO(image_data))
+        if max_side and max(pil_image.size) > max_side:
+            # Only JPEG honours draft(); other formats ignore it
+            pil_image.draft("RGB", (max_side, max_side))
+        pil_image.load()
+    if pil_image.mode != "RGB":
+        with time_stage("cvtColor"):
+            pil_image = pil_image.convert("RGB")  # type: ignore[assignment]
+    return np.asarray(pil_image)
+
+
+def fit_to_max_side(image_array: np.ndarray, max_side: Optional[int]) -> np.ndarray:
+    """
+    Shrink an image so its longer side is at most ``max_side`` pixels.
+
+    Whole-number reductions use OpenCV's fast integer area filter (after
+    trimming at most factor-1 edge pixels) and the remaining factor, always
+    below 2x, uses bilinear interpolation; a single fractional INTER_AREA
+    resize is several times slower on large frames.
+
+    Args:
+        image_array: Image as a numpy array
+        max_side: Pixel budget for the longer side, or None/0 for no limit
+
+    Returns:
+        The input array if it already fits, otherwise a resized copy
+    """
+    height, width = image_array.shape[:2]
+    if not max_side or max(height, width) <= max_side:
+        return image_array
+    with time_stage("resize"):
+        return _shrink(image_array, max_side)
+
+
+def _shrink(image_array: np.ndarray, max_side: int) -> np.ndarray:
+    """Resize an image whose longer side exceeds ``max_side``."""
+    height, width = image_array.shape[:2]
+    factor = min(max(height, width) // max_side, height, width)
+    if factor >= 2:
+        trimmed = image_array[: height - height % factor, : width - width % factor]
+        height, width = trimmed.shape[0] // factor, trimmed.shape[1] // factor
+        image_array = cv2.resize(trimmed, (width, height), interpolation=cv2.INTER_AREA)
+        if max(height, width) <= max_side:
+            return image_array
+
+    scale = max_side / max(height, width)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image_array, size, interpolation=cv2.INTER_LINEAR)
+
+
+# Fastest decoder per format, measured with benchmarks/decode_benchmark.py.
+# Anything not listed (GIF, TIFF, ICO, ...) goes through PIL.
+_DECODERS: Dict[str, Callable[[bytes, Optional[int]], Optional[np.ndarray]]] = {
+    "JPEG": _decode_jpeg_with_opencv,
+    "PNG": _decode_with_opencv,
+    "WEBP": _decode_with_opencv,
+    "BMP": _decode_with_opencv,
+}
+
+
+def decode_to_rgb(image_data: bytes, max_side: Optional[int] = None) -> np.ndarray:
+    """
+    Decode compressed image bytes into a contiguous RGB array.
+
+    The codec output is converted to RGB at most once and no intermediate
+    copies are made, so the result can be passed to MediaPipe as is. With
+    ``max_side`` set, JPEGs are decoded at a reduced DCT scale where
+    possible and anything still larger is resized to fit the budget.
+
+    Args:
+        image_data: Raw image bytes
+        max_side: Pixel budget for the longer side, or None/0 for full size
+
+    Returns:
+        Numpy array of shape (height, width, 3) in RGB channel order
+
+    Raises:
+        ValueError: If image cannot be decoded
+    """
+    try:
+        decoder = _DECODERS.get(sniff_format(image_data) or "")
+        image_array = decoder(image_data, max_side) if decoder is not None else None
+        if image_array is None:
+            # Unknown format, or a variant OpenCV rejects; PIL also
+            # produces the error message when the data is not an image
+            image_array = _decode_with_pil(image_data, max_side)
+        return np.ascontiguousarray(fit_to_max_side(image_array, max_side))
+    except Exception as e:
+        logger.error(f"Failed to decode image: {str(e)}")
+        raise ValueError(f"Invalid image data: {str(e)}")
+
+
+def decode_grayscale_thumbnail(image_data: bytes) -> np.ndarray:
+    """
+    Decode an image to grayscale as cheaply as the codec allows.
+
+    JPEGs are decoded at 1/8 scale in the DCT; other formats OpenCV reads
+    are decoded straight to one channel, and the rest go through PIL.
+
+    Args:
+        image_data: Raw image bytes
+
+    Returns:
+        2-D uint8 numpy array; small for JPEG, full size otherwise
+
+    Raises:
+        ValueError: If image cannot be decoded
+    """
+    try:
+        image_format = sniff_format(image_data)
+        image_array = None
+        if image_format in _DECODERS:
+            flags = (
+                cv2.IMREAD_REDUCED_GRAYSCALE_8
+                if image_format == "JPEG"
+                else cv2.IMREAD_GRAYSCALE
+            )
+            image_array = cv2.imdecode(
+                np.frombuffer(image_data, dtype=np.uint8),
+                flags | cv2.IMREAD_IGNORE_ORIENTATION,
+            )
+        if image_array is None:
+            image_array = np.asarray(Image.open(BytesIO(image_data)).convert("L"))
+        return image_array
+    except Exception as e:
+        logger.error(f"Failed to decode image: {str(e)}")
+        raise ValueError(f"Invalid image data: {str(e)}")
+
+
+# Bytes per pixel of the packed formats and bytes per Y-plane pixel of the
+# 4:2:0 planar ones, whose chroma adds half as much again
+_RAW_BYTES_PER_PIXEL = {"RGB24": 3, "BGR24": 3, "GRAY8": 1, "NV12": 1, "I420": 1}
+_YUV420_FORMATS = frozenset({"NV12", "I420"})
+
+RAW_PIXEL_FORMATS = tuple(_RAW_BYTES_PER_PIXEL)
+
+
+def raw_frame_size(
+    width: int, height: int, pixel_format: str, stride: Optional[int] = None
+) -> int:
+    """
+    Number of bytes an uncompressed frame occupies.
+
+    Args:
+        width: Frame width in pixels
+        height: Frame height in pixels
+        pixel_format: One of ``RAW_PIXEL_FORMATS``
+        stride: Bytes per row of the first plane; defaults to tightly packed
+
+    Returns:
+        Expected buffer length in bytes
+
+    Raises:
+        UnsupportedImageFormatError: If the pixel format is unknown
+        ValueError: If the geometry is invalid
+    """
+    pixel_format = pixel_format.upper()
+    bytes_per_pixel = _RAW_BYTES_PER_PIXEL.get(pixel_format)
+    if bytes_per_pixel is None:
+        raise UnsupportedImageFormatError(f"Unsupported pixel format: {pixel_format}")
+    row_bytes = width * bytes_per_pixel
+    if stride is None:
+        stride = row_bytes
+    if width <= 0 or height <= 0 or stride < row_bytes:
+        raise ValueError(
+            f"Invalid frame geometry: {width}x{height} {pixel_format} "
+            f"with stride {stride}"
+        )
+    if pixel_format not in _YUV420_FORMATS:
+        return stride * height
+    if width % 2 or height % 2 or stride % 2:
+        raise ValueError(
+            f"Invalid frame geometry: {pixel_format} needs even width, "
+            f"height and stride, got {width}x{height} with stride {stride}"
+        )
+    # NV12 interleaves U and V in half-height rows of the same stride;
+    # I420 stores them as two quarter planes of half the stride
+    return stride * height * 3 // 2
+
+
+def decode_raw_frame(
+    frame_data: bytes,
+    width: int,
+    height: int,
+    pixel_format: str,
+    stride: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Wrap an uncompressed frame as an RGB array.
+
+    The buffer is wrapped with ``np.frombuffer`` and only converted when
+    its layout is not already RGB: RGB24 costs nothing, padded rows
+    included, while BGR24, GRAY8 and the 4:2:0 YUV formats pay for one
+    OpenCV colour conversion.
+
+    Args:
+        frame_data: Pixel bytes, rows top to bottom
+        width: Frame width in pixels
+        height: Frame height in pixels
+        pixel_format: ``"RGB24"``, ``"BGR24"``, ``"GRAY8"``, ``"NV12"`` or
+            ``"I420"``
+        stride: Bytes per row of the first plane when rows are padded;
+            defaults to tightly packed
+
+    Returns:
+        Numpy array of shape (height, width, 3) in RGB channel order; RGB24
+        input is returned as a read-only view of ``frame_data``, which is
+        not contiguous when rows are padded
+
+    Raises:
+        UnsupportedImageFormatError: If the pixel format is unknown
+        ValueError: If the size does not match
+    """
+    pixel_format = pixel_format.upper()
+    expected = raw_frame_size(width, height, pixel_format, stride)
+    if len(frame_data) != expected:
+        raise ValueError(
+            f"Invalid frame data: expected {width}x{height} {pixel_format} "
+            f"({expected} bytes), got {len(frame_data)} bytes"
+        )
+
+    buffer = np.frombuffer(frame_data, dtype=np.uint8)
+    bytes_per_pixel = _RAW_BYTES_PER_PIXEL[pixel_format]
+    row_bytes = width * bytes_per_pixel
+    stride = stride or row_bytes
+    rows = buffer.reshape(-1, stride)
+
+    if pixel_format == "RGB24":
+        return rows[:, :row_bytes].reshape(height, width, bytes_per_pixel)
+    with time_stage("cvtColor"):
+        return _convert_raw_frame(buffer, rows, width, height, pixel_format, stride)
+
+
+def _convert_raw_frame(
+    buffer: np.ndarray,
+    rows: np.ndarray,
+    width: int,
+    height: int,
+    pixel_format: str,
+    stride: int,
+) -> np.ndarray:
+    """Convert a raw frame that is not already RGB."""
+    if pixel_format == "NV12":
+        planes = rows[:, :width]
+        return cv2.cvtColorTwoPlane(
+            planes[:height],
+            planes[height:].reshape(height // 2, width // 2, 2),
+            cv2.COLOR_YUV2RGB_NV12,
+        )
+    if pixel_format == "I420":
+        if stride != width:
+            buffer = _pack_i420(buffer, width, height, stride)
+        return cv2.cvtColor(
+            buffer.reshape(height * 3 // 2, width), cv2.COLOR_YUV2RGB_I420
+        )
+    if pixel_format == "GRAY8":
+        return cv2.cvtColor(rows[:, :width], cv2.COLOR_GRAY2RGB)
+    return cv2.cvtColor(
+        rows[:, : width * 3].reshape(height, width, 3), cv2.COLOR_BGR2RGB
+    )
+
+
+def _pack_i420(buffer: np.ndarray, width: int, height: int, stride: int) -> np.ndarray:
+    """Drop row padding from the three I420 planes, which OpenCV needs packed."""
+    luma_size = stride * height
+    chroma_size = luma_size // 4
+    luma = buffer[:luma_size].reshape(height, stride)[:, :width]
+    chroma = [
+        buffer[start : start + chroma_size].reshape(height // 2, stride // 2)[
+            :, : width // 2
+        ]
+        for start in (luma_size, luma_size + chroma_size)
+    ]
+    return np.concatenate([luma.ravel(), *(plane.ravel() for plane in chroma)])
+
+
+def warmup_image(width: int = 640, height: int = 480) -> bytes:
+    """
+    Encode a synthetic JPEG for exercising the pipeline at startup.
+
+    A smooth color gradient, so it decodes like a photo rather than a flat
+    image that codecs short-circuit.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+
+    Returns:
+        JPEG bytes
+    """
+    rows = np.linspace(0, 255, height, dtype=np.uint8)[:, None]
+    columns = np.linspace(0, 255, width, dtype=np.uint8)[None, :]
+    image = np.dstack(
+        np.broadcast_arrays(rows, columns, (rows // 2 + columns // 2))
+    ).astype(np.uint8)
+    return cv2.imencode(".jpg", image)[1].tobytes()
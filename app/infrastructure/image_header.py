@@ -0,0 +1,199 @@
+"""Image format and dimensions read from the file header alone."""
+
+import logging
+import struct
+from io import BytesIO
+from typing import Optional, Tuple
+
+from PIL import Image, UnidentifiedImageError
+
+from app.domain.exceptions import UnsupportedImageFormatError
+from app.domain.interfaces import IImageInspector
+from app.domain.models import ImageInfo
+
+
+logger = logging.getLogger(__name__)
+
+
+def sniff_format(image_data: bytes) -> Optional[str]:
+    """
+    Identify the container format from the leading magic bytes.
+
+    Args:
+        image_data: Raw image bytes
+
+    Returns:
+        PIL-style format name (``"JPEG"``, ``"PNG"``, ...) or None if unknown
+    """
+    if image_data[:3] == b"\xff\xd8\xff":
+        return "JPEG"
+    if image_data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "PNG"
+    if image_data[:4] == b"RIFF" and image_data[8:12] == b"WEBP":
+        return "WEBP"
+    if image_data[:2] == b"BM":
+        return "BMP"
+    if image_data[:6] in (b"GIF87a", b"GIF89a"):
+        return "GIF"
+    if image_data[:4] in (b"II*\x00", b"MM\x00*"):
+        return "TIFF"
+    return None
+
+
+# JPEG start-of-frame markers; C4, C8 and CC share the range but are not frames
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# JPEG markers without a length field
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD9)})
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Walk JPEG segments up to the first start-of-frame marker."""
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # fill byte
+            offset += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            offset += 2
+            continue
+        if marker == 0xDA:  # scan data before any frame header
+            return None
+        (length,) = struct.unpack_from(">H", data, offset + 2)
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height, width = struct.unpack_from(">HH", data, offset + 5)
+            return width, height
+        offset += 2 + length
+    return None
+
+
+def _png_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read the IHDR chunk, which must come first."""
+    if len(data) < 24 or data[12:16] != b"IHDR":
+        return None
+    return struct.unpack_from(">II", data, 16)
+
+
+def _gif_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read the logical screen descriptor."""
+    if len(data) < 10:
+        return None
+    return struct.unpack_from("<HH", data, 6)
+
+
+def _bmp_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read the DIB header; height is negative for top-down bitmaps."""
+    if len(data) < 26:
+        return None
+    (header_size,) = struct.unpack_from("<I", data, 14)
+    if header_size == 12:
+        return struct.unpack_from("<HH", data, 18)
+    width, height = struct.unpack_from("<ii", data, 18)
+    return abs(width), abs(height)
+
+
+def _webp_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read the lossy, lossless or extended WebP frame header."""
+    if len(data) < 30:
+        return None
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack_from("<HH", data, 26)
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        (bits,) = struct.unpack_from("<I", data, 21)
+        return 1 + (bits & 0x3FFF), 1 + ((bits >> 14) & 0x3FFF)
+    if chunk == b"VP8X":
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def _tiff_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Read the ImageWidth and ImageLength tags of the first IFD."""
+    order = "<" if data[:2] == b"II" else ">"
+    (offset,) = struct.unpack_from(order + "I", data, 4)
+    if offset + 2 > len(data):
+        return None
+    (count,) = struct.unpack_from(order + "H", data, offset)
+    size = {}
+    for entry in range(count):
+        position = offset + 2 + entry * 12
+        if position + 12 > len(data):
+            return None
+        tag, field_type = struct.unpack_from(order + "HH", data, position)
+        if tag in (256, 257):
+            value_format = "H" if field_type == 3 else "I"
+            (size[tag],) = struct.unpack_from(order + value_format, data, position + 8)
+    if 256 not in size or 257 not in size:
+        return None
+    return size[256], size[257]
+
+
+_HEADER_READERS = {
+    "JPEG": _jpeg_size,
+    "PNG": _png_size,
+    "GIF": _gif_size,
+    "BMP": _bmp_size,
+    "WEBP": _webp_size,
+    "TIFF": _tiff_size,
+}
+
+
+class HeaderImageInspector(IImageInspector):
+    """
+    Image inspector that parses container headers without decoding.
+
+    The formats the decode path handles (JPEG, PNG, WebP, BMP, GIF and
+    TIFF) are recognised by their magic bytes and their dimensions read
+    with ``struct``, which costs a few microseconds. Other
+    data is handed to PIL's lazy ``Image.open``, which also stops at the
+    header, only to tell an unsupported format from invalid data.
+    """
+
+    def inspect(self, image_data: bytes) -> ImageInfo:
+        """
+        Read the format and dimensions of an encoded image.
+
+        Args:
+            image_data: Raw image bytes, or at least their leading part
+
+        Returns:
+            ImageInfo with the format and dimensions
+
+        Raises:
+            UnsupportedImageFormatError: If the image is in a format the
+                service does not decode
+            ValueError: If the data is not a recognisable image
+        """
+        image_format = sniff_format(image_data)
+        if image_format is None:
+            image_format = self._identify_with_pil(image_data)
+            raise UnsupportedImageFormatError(
+                f"Unsupported image format: {image_format}"
+            )
+
+        try:
+            size = _HEADER_READERS[image_format](image_data)
+        except struct.error:
+            size = None
+        if size is None:
+            raise ValueError(f"Invalid image data: truncated {image_format} header")
+        width, height = size
+        return ImageInfo(format=image_format, width=width, height=height)
+
+    def _identify_with_pil(self, image_data: bytes) -> str:
+        """Name a format PIL can read but the service does not decode."""
+        try:
+            with Image.open(BytesIO(image_data)) as image:
+                return image.format or "unknown"
+        except Image.DecompressionBombError:
+            return "unknown"
+        except (UnidentifiedImageError, OSError):
+            raise ValueError("Invalid image data: unrecognised image format")
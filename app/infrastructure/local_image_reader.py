@@ -0,0 +1,70 @@
+"""Reader for images on a local or mounted filesystem."""
+
+import asyncio
+import logging
+import os
+
+from app.domain.exceptions import ImageFetchError, ImageTooLargeError
+from app.domain.interfaces import IImageFetcher
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocalImageReader(IImageFetcher):
+    """
+    Reads images from files below one root directory.
+
+    Paths are resolved against ``root``, following symlinks, and anything
+    that ends up outside it is refused, so job manifests cannot read
+    arbitrary files of the host. Reads run on a helper thread and stop at
+    ``max_bytes``.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize the reader.
+
+        Args:
+            root: Directory that every path must resolve into
+            max_bytes: Largest accepted image
+
+        Raises:
+            ValueError: If ``root`` is not a directory
+        """
+        if not os.path.isdir(root):
+            raise ValueError(f"Image root is not a directory: {root}")
+
+        self._root = os.path.realpath(root)
+        self._max_bytes = max_bytes
+        logger.info(f"Local image reader initialized for {self._root}")
+
+    async def fetch(self, url: str) -> bytes:
+        """
+        Read an image file.
+
+        Args:
+            url: Path of the image, relative to the root or absolute
+
+        Returns:
+            Raw image bytes
+
+        Raises:
+            ImageFetchError: If the path is outside the root or unreadable
+            ImageTooLargeError: If the file exceeds ``max_bytes``
+        """
+        return await asyncio.to_thread(self._read, url)
+
+    def _read(self, path: str) -> bytes:
+        """Resolve, check and read one file."""
+        resolved = os.path.realpath(os.path.join(self._root, path))
+        if os.path.commonpath([resolved, self._root]) != self._root:
+            raise ImageFetchError("Path is outside the image root")
+        try:
+            with open(resolved, "rb") as file:
+                image_data = file.read(self._max_bytes + 1)
+        except OSError as e:
+            raise ImageFetchError(f"Cannot read file: {e.strerror}")
+        if len(image_data) > self._max_bytes:
+            raise ImageTooLargeError(f"Image exceeds the {self._max_bytes} byte limit")
+        return image_data
@@ -1,44 +1,85 @@
 """MediaPipe face detector implementation."""
 
 import logging
-from io import BytesIO
+from typing import Iterable, Optional, Tuple
 
-import cv2
 import mediapipe as mp
 import numpy as np
-from PIL import Image
 
 from app.domain.interfaces import IFaceDetector
-from app.domain.models import FaceDetectionResult
+from app.domain.models import FaceDetection, FaceDetectionResult
+from app.infrastructure.graph_pool import FaceDetectionGraphPool
+from app.infrastructure.image_decoding import decode_to_rgb, fit_to_max_side
+from app.infrastructure.metrics import time_stage
 
 
 logger = logging.getLogger(__name__)
 
 
+def detections_from_mediapipe(detections: Iterable) -> Tuple[FaceDetection, ...]:
+    """
+    Convert MediaPipe detection protos to domain detections.
+
+    Args:
+        detections: ``detections`` of a MediaPipe face detection result
+
+    Returns:
+        Tuple of FaceDetection in MediaPipe's order
+    """
+    faces = []
+    for detection in detections:
+        location = detection.location_data
+        box = location.relative_bounding_box
+        faces.append(
+            FaceDetection(
+                score=detection.score[0],
+                box=(box.xmin, box.ymin, box.width, box.height),
+                keypoints=tuple(
+                    (point.x, point.y) for point in location.relative_keypoints
+                ),
+            )
+        )
+    return tuple(faces)
+
+
 class MediaPipeFaceDetector(IFaceDetector):
     """Face detector implementation using MediaPipe."""
 
-    def __init__(self, min_detection_confidence: float = 0.5):
+    def __init__(
+        self,
+        min_detection_confidence: float = 0.5,
+        pool_size: int = 1,
+        max_image_side: Optional[int] = None,
+    ):
         """
         Initialize MediaPipe face detector.
 
         Args:
             min_detection_confidence: Minimum confidence threshold
                 for detection (0.0-1.0)
+            pool_size: Maximum number of detection graphs kept alive for
+                concurrent calls
+            max_image_side: Longest image side passed to the model; larger
+                images are downscaled during decode. None keeps full size
         """
         self._min_detection_confidence = min_detection_confidence
+        self._max_image_side = max_image_side
         self._mp_face_detection = mp.solutions.face_detection
+        self._pool = FaceDetectionGraphPool(factory=self._create_graph, size=pool_size)
         logger.info(
             f"MediaPipe face detector initialized with confidence threshold: "
-            f"{min_detection_confidence}"
+            f"{min_detection_confidence}, graph pool size: {pool_size}"
         )
 
-    def detect_face(self, image_data: bytes) -> FaceDetectionResult:
+    def detect_face(
+        self, image_data: bytes, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
         """
         Detect faces in the provided image using MediaPipe.
 
         Args:
             image_data: Raw image bytes
+            stop_at_first_face: Unused; one pass finds every face
 
         Returns:
             FaceDetectionResult with detection status
@@ -46,19 +87,50 @@ class MediaPipeFaceDetector(IFaceDetector):
         Raises:
             ValueError: If image data is invalid or cannot be processed
         """
+        return self.detect_face_in_array(self.decode_image(image_data))
+
+    def decode_image(self, image_data: bytes) -> np.ndarray:
+        """
+        Decode an image to RGB within the input budget.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            Contiguous RGB numpy array
+
+        Raises:
+            ValueError: If image data is invalid or cannot be decoded
+        """
         try:
-            # Convert bytes to numpy array
-            image_array = self._bytes_to_image(image_data)
+            return self._bytes_to_image(image_data)
+        except Exception as e:
+            logger.error(f"Error during face detection: {str(e)}")
+            raise ValueError(f"Failed to process image: {str(e)}")
+
+    def detect_face_in_array(
+        self, image_array: np.ndarray, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces in an already decoded image.
+
+        Args:
+            image_array: Decoded image as a contiguous RGB numpy array
+            stop_at_first_face: Unused; one pass finds every face
 
-            # Perform face detection
-            with self._mp_face_detection.FaceDetection(
-                min_detection_confidence=self._min_detection_confidence
-            ) as face_detection:
-                # Convert BGR to RGB (MediaPipe uses RGB)
-                rgb_image = cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB)
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If the image cannot be processed
+        """
+        try:
+            image_array = fit_to_max_side(image_array, self._max_image_side)
 
-                # Process the image
-                results = face_detection.process(rgb_image)
+            # Perform face detection on a pooled graph
+            with self._pool.checkout() as face_detection:
+                with time_stage("process"):
+                    results = face_detection.process(image_array)
 
                 # Check if any faces were detected
                 face_detected = (
@@ -67,22 +139,51 @@ class MediaPipeFaceDetector(IFaceDetector):
 
                 if face_detected:
                     logger.debug(f"Detected {len(results.detections)} face(s)")
+                    detections = detections_from_mediapipe(results.detections)
                     # Get the highest confidence score
-                    confidence = max(
-                        detection.score[0] for detection in results.detections
-                    )
+                    confidence = max(detection.score for detection in detections)
                 else:
                     logger.debug("No faces detected")
+                    detections = ()
                     confidence = None
 
                 return FaceDetectionResult(
-                    face_detected=face_detected, confidence=confidence
+                    face_detected=face_detected,
+                    confidence=confidence,
+                    detections=detections,
                 )
 
         except Exception as e:
             logger.error(f"Error during face detection: {str(e)}")
             raise ValueError(f"Failed to process image: {str(e)}")
 
+    @property
+    def settings_key(self) -> str:
+        """Identify the model and settings that influence results."""
+        return (
+            f"mediapipe:short_range:conf={self._min_detection_confidence}"
+            f":max_side={self._max_image_side or 0}"
+        )
+
+    def prewarm(self) -> None:
+        """Build and warm every detection graph in the pool."""
+        self._pool.prewarm()
+
+    def close(self) -> None:
+        """Close all pooled detection graphs."""
+        self._pool.close()
+
+    def _create_graph(self):
+        """
+        Build a new MediaPipe face detection graph.
+
+        Returns:
+            MediaPipe FaceDetection solution instance
+        """
+        return self._mp_face_detection.FaceDetection(
+            min_detection_confidence=self._min_detection_confidence
+        )
+
     def _bytes_to_image(self, image_data: bytes) -> np.ndarray:
         """
         Convert image bytes to numpy array.
@@ -91,22 +192,9 @@ class MediaPipeFaceDetector(IFaceDetector):
             image_data: Raw image bytes
 
         Returns:
-            Numpy array representing the image
+            Contiguous RGB numpy array representing the image
 
         Raises:
             ValueError: If image cannot be decoded
         """
-        try:
-            # Try to open with PIL first
-            pil_image = Image.open(BytesIO(image_data))
-            # Convert to RGB if necessary
-            if pil_image.mode != "RGB":
-                pil_image = pil_image.convert("RGB")  # type: ignore[assignment]
-            # Convert PIL Image to numpy array
-            image_array = np.array(pil_image)
-            # Convert RGB to BGR for OpenCV
-            image_array = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
-            return image_array
-        except Exception as e:
-            logger.error(f"Failed to decode image: {str(e)}")
-            raise ValueError(f"Invalid image data: {str(e)}")
+        return decode_to_rgb(image_data, self._max_image_side)
@@ -0,0 +1,198 @@
+"""Prometheus metrics for the detection pipeline."""
+
+import contextlib
+import logging
+from typing import Callable, ContextManager, Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages timed by ``time_stage``, in request order
+STAGES = ("read", "decode", "cvtColor", "resize", "process", "response")
+
+OUTCOMES = ("face", "no_face", "error")
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# From a cache hit's read to a multi-megapixel decode
+_LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+# 4 KiB to 64 MiB in powers of four
+_BYTE_BUCKETS = tuple(float(4**power * 1024) for power in range(1, 9))
+
+# From a VGA frame to the default 50 megapixel upload limit
+_PIXEL_BUCKETS = (3e5, 1e6, 2e6, 5e6, 1.2e7, 2.5e7, 5e7)
+
+_NO_TIMER = contextlib.nullcontext()
+
+
+class PipelineMetrics:
+    """
+    Latency histograms, outcome counters and load gauges for detection.
+
+    Collectors live in a registry of their own rather than the
+    process-wide default, so several instances, one per test app for
+    example, never clash over metric names.
+    """
+
+    def __init__(self, queue_depth: Optional[Callable[[], float]] = None):
+        """
+        Initialize the collectors.
+
+        Args:
+            queue_depth: Called at scrape time for the number of tasks
+                waiting for an inference worker
+        """
+        self.registry = CollectorRegistry()
+        stage_seconds = Histogram(
+            "face_detection_stage_seconds",
+            "Time spent in each stage of the detection pipeline",
+            ["stage"],
+            buckets=_LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        requests = Counter(
+            "face_detection_requests",
+            "Detection requests by outcome",
+            ["outcome"],
+            registry=self.registry,
+        )
+        # Children are bound once; labels() takes a lock on every call
+        self.stages = {stage: stage_seconds.labels(stage=stage) for stage in STAGES}
+        self.outcomes = {
+            outcome: requests.labels(outcome=outcome) for outcome in OUTCOMES
+        }
+        self.in_flight = Gauge(
+            "face_detection_requests_in_flight",
+            "Detection requests being handled",
+            registry=self.registry,
+        )
+        self.queued = Gauge(
+            "face_detection_tasks_queued",
+            "Tasks waiting for an inference worker",
+            registry=self.registry,
+        )
+        if queue_depth is not None:
+            self.queued.set_function(queue_depth)
+        self.input_bytes = Histogram(
+            "face_detection_input_bytes",
+            "Size of uploaded images and frames",
+            buckets=_BYTE_BUCKETS,
+            registry=self.registry,
+        )
+        self.input_pixels = Histogram(
+            "face_detection_input_pixels",
+            "Width times height of uploaded images and frames",
+            buckets=_PIXEL_BUCKETS,
+            registry=self.registry,
+        )
+
+    def render(self) -> bytes:
+        """Serialize every collector in the Prometheus text format."""
+        return generate_latest(self.registry)
+
+
+_active: Optional[PipelineMetrics] = None
+
+
+def install(metrics: Optional[PipelineMetrics]) -> None:
+    """
+    Route the pipeline hooks below to ``metrics``.
+
+    Args:
+        metrics: Collectors to record into, or None to turn the hooks into
+            no-ops
+    """
+    global _active
+    _active = metrics
+    logger.info(f"Pipeline metrics {'enabled' if metrics else 'disabled'}")
+
+
+def time_stage(stage: str) -> ContextManager:
+    """
+    Time a block as one pipeline stage.
+
+    With no metrics installed this returns a shared null context, so a
+    hook costs one global lookup.
+
+    Args:
+        stage: One of ``STAGES``
+
+    Returns:
+        Context manager observing the block's duration
+    """
+    metrics = _active
+    if metrics is None:
+        return _NO_TIMER
+    return metrics.stages[stage].time()
+
+
+def track_request() -> ContextManager:
+    """
+    Count a request as in flight, and as an error if it raises.
+
+    Returns:
+        Context manager wrapping the request handling
+    """
+    metrics = _active
+    if metrics is None:
+        return _NO_TIMER
+    return _tracked(metrics)
+
+
+@contextlib.contextmanager
+def _tracked(metrics: PipelineMetrics) -> Iterator[None]:
+    """Body of ``track_request`` with metrics installed."""
+    with metrics.in_flight.track_inprogress():
+        try:
+            yield
+        except BaseException:
+            metrics.outcomes["error"].inc()
+            raise
+
+
+def record_detection(face_detected: bool) -> None:
+    """Count a successful request by whether a face was found."""
+    metrics = _active
+    if metrics is not None:
+        metrics.outcomes["face" if face_detected else "no_face"].inc()
+
+
+def observe_input(size: int, pixels: Optional[int] = None) -> None:
+    """
+    Record the size of an upload.
+
+    Args:
+        size: Length in bytes
+        pixels: Width times height, when known
+    """
+    metrics = _active
+    if metrics is None:
+        return
+    metrics.input_bytes.observe(size)
+    if pixels is not None:
+        metrics.input_pixels.observe(pixels)
@@ -0,0 +1,186 @@
+"""Dynamic micro-batching of concurrent inference calls."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Queue entry telling the batching thread to exit
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class BatchStats:
+    """Point-in-time snapshot of batching effectiveness."""
+
+    batches: int
+    items: int
+
+    @property
+    def avg_batch_size(self) -> float:
+        """Mean number of items per executed batch."""
+        return self.items / self.batches if self.batches else 0.0
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Merges concurrent single-item calls into batched calls.
+
+    Callers block in ``submit`` while a dedicated thread gathers items
+    until ``max_batch_size`` are waiting or ``max_wait`` seconds have passed
+    since the first one arrived, then runs them through ``run_batch`` in one
+    call. The batch function runs only on that thread, so runtimes that
+    are not thread-safe can be used without a lock.
+
+    ``close`` finishes the items already queued; a ``submit`` racing with
+    it either gets its item queued ahead of the stop or is refused.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[T]], List[R]],
+        max_batch_size: int = 8,
+        max_wait: float = 0.002,
+        name: str = "micro-batcher",
+    ):
+        """
+        Initialize the batcher and start its thread.
+
+        Args:
+            run_batch: Callable mapping a list of items to a list of results
+                of the same length and order
+            max_batch_size: Most items merged into one call
+            max_wait: Seconds the first item of a batch waits for company
+            name: Name of the batching thread
+
+        Raises:
+            ValueError: If max_batch_size < 1 or max_wait < 0
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait < 0:
+            raise ValueError("max_wait cannot be negative")
+
+        self._run_batch = run_batch
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: T, timeout: Optional[float] = None) -> R:
+        """
+        Run one item as part of the next batch and wait for its result.
+
+        Args:
+            item: Input for ``run_batch``
+            timeout: Seconds to wait for the result, or None to wait
+                indefinitely
+
+        Returns:
+            Result for this item
+
+        Raises:
+            RuntimeError: If the batcher is closed
+            Exception: Whatever ``run_batch`` raised for the batch
+        """
+        future: "Future[R]" = Future()
+        # Checked and queued under the lock so nothing lands behind _STOP
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Micro-batcher is closed")
+            self._queue.put((item, future))
+        return future.result(timeout)
+
+    def stats(self) -> BatchStats:
+        """
+        Get a snapshot of batching counters.
+
+        Returns:
+            BatchStats instance
+        """
+        with self._lock:
+            return BatchStats(batches=self._batches, items=self._items)
+
+    def close(self) -> None:
+        """Finish queued items and stop the batching thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        self._fail_leftovers()
+
+    def _loop(self) -> None:
+        """Gather and execute batches until stopped."""
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                return
+            batch: List[Tuple[T, "Future[R]"]] = [entry]  # type: ignore[list-item]
+            deadline = time.monotonic() + self._max_wait
+            stop = False
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    break
+                batch.append(entry)  # type: ignore[arg-type]
+
+            self._execute(batch)
+            if stop:
+                return
+
+    def _fail_leftovers(self) -> None:
+        """Fail any item still queued after the batching thread stopped."""
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if entry is not _STOP:
+                pending: Tuple[T, "Future[R]"] = entry  # type: ignore[assignment]
+                pending[1].set_exception(RuntimeError("Micro-batcher is closed"))
+
+    def _execute(self, batch: List[Tuple[T, "Future[R]"]]) -> None:
+        """Run one batch and resolve its futures."""
+        try:
+            results = self._run_batch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch function returned {len(results)} results "
+                    f"for {len(batch)} items"
+                )
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} failed: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
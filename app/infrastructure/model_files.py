@@ -0,0 +1,15 @@
+"""Locations of model files shipped with the installed packages."""
+
+import os
+
+import mediapipe as mp
+
+
+# BlazeFace short-range model bundled with MediaPipe: 128x128 RGB input in
+# [-1, 1], 896 SSD anchors over a 16x16 (2 per cell) and 8x8 (6 per cell) grid
+FACE_DETECTION_SHORT_RANGE_MODEL = os.path.join(
+    os.path.dirname(mp.__file__),
+    "modules",
+    "face_detection",
+    "face_detection_short_range.tflite",
+)
@@ -0,0 +1,395 @@
+"""Multi-process face detector with shared-memory frame hand-off."""
+
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from multiprocessing.connection import Connection, wait
+from multiprocessing.context import SpawnContext
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.domain.interfaces import IFaceDetector
+from app.domain.models import FaceDetectionResult
+from app.infrastructure.image_decoding import decode_to_rgb, fit_to_max_side
+
+
+logger = logging.getLogger(__name__)
+
+# Initial size of each worker's frame buffer; grown on demand
+_INITIAL_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def _worker_main(conn: Connection, min_detection_confidence: float) -> None:
+    """
+    Entry point of a detection worker process.
+
+    The worker owns a single MediaPipe detector and serves requests from
+    ``conn`` until it receives ``None``. Each request names a shared memory
+    segment holding the decoded frame, so pixels never cross the pipe.
+
+    Args:
+        conn: Pipe end connected to the parent process
+        min_detection_confidence: Confidence threshold for the detector
+    """
+    # The parent owns the worker lifecycle; ignore terminal interrupts
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+
+    detector = MediaPipeFaceDetector(
+        min_detection_confidence=min_detection_confidence, pool_size=1
+    )
+    detector.prewarm()
+    conn.send(("ready", os.getpid()))
+
+    segment: Optional[SharedMemory] = None
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+
+            name, shape = message
+            try:
+                if segment is None or segment.name != name:
+                    if segment is not None:
+                        segment.close()
+                    segment = SharedMemory(name=name)
+                frame = np.ndarray(shape, dtype=np.uint8, buffer=segment.buf)
+                result = detector.detect_face_in_array(frame)
+                del frame
+                conn.send(
+                    ("ok", result.face_detected, result.confidence, result.detections)
+                )
+            except Exception as e:
+                conn.send(("error", str(e)))
+    finally:
+        if segment is not None:
+            segment.close()
+        detector.close()
+        conn.close()
+
+
+class _WorkerSlot:
+    """A worker process together with its pipe and frame buffer."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.conn: Optional[Connection] = None
+        self.buffer: Optional[SharedMemory] = None
+        # Held while a request or a restart uses the worker
+        self.lock = threading.Lock()
+
+    def ensure_buffer(self, size: int) -> SharedMemory:
+        """Return a shared buffer of at least ``size`` bytes."""
+        if self.buffer is None or self.buffer.size < size:
+            self.release_buffer()
+            self.buffer = SharedMemory(
+                create=True, size=max(size, _INITIAL_BUFFER_SIZE)
+            )
+        return self.buffer
+
+    def release_buffer(self) -> None:
+        """Close and unlink the frame buffer."""
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer.unlink()
+            self.buffer = None
+
+
+class ProcessPoolFaceDetector(IFaceDetector):
+    """
+    Face detector spreading inference across worker processes.
+
+    Each worker process owns its own MediaPipe detector, so inference runs
+    in parallel without contending for the parent's GIL. Images are decoded
+    in the calling thread and copied into a per-worker shared memory buffer;
+    only the buffer name and frame shape travel over the pipe. Workers that
+    die or stop responding are restarted and the request is retried once.
+    A monitor thread watches the worker processes and restarts one as soon
+    as it exits, so a worker that dies while idle is replaced before the
+    next request needs it.
+
+    Workers are spawned rather than forked: forking a parent that runs
+    MediaPipe's graph threads is unsafe.
+    """
+
+    def __init__(
+        self,
+        min_detection_confidence: float = 0.5,
+        num_workers: int = 0,
+        task_timeout: float = 30.0,
+        max_image_side: Optional[int] = None,
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            min_detection_confidence: Minimum confidence threshold
+                for detection (0.0-1.0)
+            num_workers: Number of worker processes, or 0 for one per CPU
+            task_timeout: Seconds to wait for a worker before restarting it
+            max_image_side: Longest image side sent to the workers; larger
+                images are downscaled during decode. None keeps full size
+        """
+        self._min_detection_confidence = min_detection_confidence
+        self._num_workers = num_workers or os.cpu_count() or 1
+        self._task_timeout = task_timeout
+        self._max_image_side = max_image_side
+        self._context: SpawnContext = multiprocessing.get_context("spawn")
+        self._slots: List[_WorkerSlot] = []
+        self._idle: "queue.Queue[_WorkerSlot]" = queue.Queue()
+        self._restarts = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+        for index in range(self._num_workers):
+            slot = _WorkerSlot(index)
+            self._start_worker(slot)
+            self._slots.append(slot)
+            self._idle.put(slot)
+
+        # Written to by close() to wake the monitor
+        self._wake_reader, self._wake_writer = self._context.Pipe(duplex=False)
+        self._monitor = threading.Thread(
+            target=self._watch_workers, name="face-detection-monitor", daemon=True
+        )
+        self._monitor.start()
+
+        logger.info(
+            f"Process pool face detector started with {self._num_workers} "
+            f"worker(s), confidence threshold: {min_detection_confidence}"
+        )
+
+    @property
+    def num_workers(self) -> int:
+        """Number of worker processes."""
+        return self._num_workers
+
+    @property
+    def restarts(self) -> int:
+        """Number of worker restarts since startup."""
+        return self._restarts
+
+    @property
+    def settings_key(self) -> str:
+        """Identify the model and settings that influence results."""
+        return (
+            f"mediapipe:short_range:conf={self._min_detection_confidence}"
+            f":max_side={self._max_image_side or 0}"
+        )
+
+    def detect_face(
+        self, image_data: bytes, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces in the provided image on a worker process.
+
+        Args:
+            image_data: Raw image bytes
+            stop_at_first_face: Unused; one pass finds every face
+
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If image data is invalid or cannot be processed
+        """
+        return self.detect_face_in_array(self.decode_image(image_data))
+
+    def decode_image(self, image_data: bytes) -> np.ndarray:
+        """
+        Decode an image to RGB within the input budget.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            Contiguous RGB numpy array
+
+        Raises:
+            ValueError: If image data is invalid or cannot be decoded
+        """
+        try:
+            return decode_to_rgb(image_data, self._max_image_side)
+        except Exception as e:
+            logger.error(f"Error during face detection: {str(e)}")
+            raise ValueError(f"Failed to process image: {str(e)}")
+
+    def detect_face_in_array(
+        self, image_array: np.ndarray, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces in an already decoded image on a worker process.
+
+        Args:
+            image_array: Decoded image as an RGB numpy array
+            stop_at_first_face: Unused; one pass finds every face
+
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If the image cannot be processed
+            RuntimeError: If the pool is closed or workers keep failing
+        """
+        if self._closed:
+            raise RuntimeError("Process pool face detector is closed")
+
+        image_array = np.ascontiguousarray(
+            fit_to_max_side(image_array, self._max_image_side), dtype=np.uint8
+        )
+        slot = self._idle.get()
+        try:
+            with slot.lock:
+                return self._detect_on(slot, image_array)
+        finally:
+            self._idle.put(slot)
+
+    def close(self) -> None:
+        """Stop the monitor and all worker processes and release buffers."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._wake_writer.send(None)
+        self._monitor.join()
+        self._wake_reader.close()
+        self._wake_writer.close()
+        for slot in self._slots:
+            self._stop_worker(slot)
+            slot.release_buffer()
+        logger.info("Process pool face detector closed")
+
+    def _detect_on(
+        self, slot: _WorkerSlot, image_array: np.ndarray
+    ) -> FaceDetectionResult:
+        """Run one frame on a slot, restarting its worker once on failure."""
+        for attempt in range(2):
+            try:
+                reply = self._submit(slot, image_array)
+            except (EOFError, OSError, TimeoutError) as e:
+                logger.warning(
+                    f"Detection worker {slot.index} failed: {str(e) or type(e)}"
+                )
+                self._restart_worker(slot)
+                if attempt:
+                    raise RuntimeError("Detection worker failed twice") from e
+                continue
+
+            if reply[0] == "error":
+                raise ValueError(reply[1])
+            _, face_detected, confidence, detections = reply
+            return FaceDetectionResult(
+                face_detected=face_detected,
+                confidence=confidence,
+                detections=detections,
+            )
+
+        raise RuntimeError("Detection worker failed")  # pragma: no cover
+
+    def _submit(self, slot: _WorkerSlot, image_array: np.ndarray) -> Tuple:
+        """Copy a frame into the slot's buffer and wait for the reply."""
+        conn = slot.conn
+        if conn is None or slot.process is None or not slot.process.is_alive():
+            raise EOFError("worker process is not running")
+
+        buffer = slot.ensure_buffer(image_array.nbytes)
+        frame = np.ndarray(image_array.shape, dtype=np.uint8, buffer=buffer.buf)
+        frame[...] = image_array
+        del frame
+
+        conn.send((buffer.name, image_array.shape))
+        if not conn.poll(self._task_timeout):
+            raise TimeoutError("worker did not answer in time")
+        return conn.recv()
+
+    def _start_worker(self, slot: _WorkerSlot) -> None:
+        """Spawn a worker process for a slot and wait until it is ready."""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self._min_detection_confidence),
+            name=f"face-detection-worker-{slot.index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        slot.process = process
+        slot.conn = parent_conn
+
+        try:
+            if not parent_conn.poll(self._task_timeout):
+                raise TimeoutError("worker did not report ready in time")
+            parent_conn.recv()
+        except (EOFError, OSError, TimeoutError) as e:
+            self._stop_worker(slot)
+            raise RuntimeError(
+                f"Detection worker {slot.index} failed to start: {str(e)}"
+            ) from e
+
+    def _watch_workers(self) -> None:
+        """Restart workers as soon as their process exits, until closed."""
+        while True:
+            # Keep each process referenced so its sentinel stays open
+            watched: Dict[int, Tuple[_WorkerSlot, object]] = {
+                slot.process.sentinel: (slot, slot.process)
+                for slot in self._slots
+                if slot.process is not None
+            }
+            ready = wait([self._wake_reader, *watched])
+            if self._wake_reader in ready:
+                return
+            for sentinel, (slot, _) in watched.items():
+                if sentinel in ready:
+                    self._revive(slot)
+
+    def _revive(self, slot: _WorkerSlot) -> None:
+        """Restart a slot's worker if it has exited and nobody else did."""
+        with slot.lock:
+            process = slot.process
+            if self._closed or process is None or process.is_alive():
+                return
+            logger.warning(
+                f"Detection worker {slot.index} exited with code {process.exitcode}"
+            )
+            try:
+                self._restart_worker(slot)
+            except RuntimeError as e:
+                # The next request on this slot tries again
+                logger.error(str(e))
+
+    def _restart_worker(self, slot: _WorkerSlot) -> None:
+        """Replace a dead or unresponsive worker process."""
+        self._stop_worker(slot)
+        with self._lock:
+            self._restarts += 1
+        logger.warning(f"Restarting detection worker {slot.index}")
+        self._start_worker(slot)
+
+    def _stop_worker(self, slot: _WorkerSlot) -> None:
+        """Ask a worker to exit, terminating it if it does not."""
+        if slot.conn is not None:
+            try:
+                slot.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        if slot.process is not None:
+            slot.process.join(timeout=5)
+            if slot.process.is_alive():
+                slot.process.kill()
+                slot.process.join()
+        if slot.conn is not None:
+            slot.conn.close()
+        slot.process = None
+        slot.conn = None
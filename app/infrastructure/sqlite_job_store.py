@@ -0,0 +1,306 @@
+"""SQLite-backed store of bulk detection jobs that survives restarts."""
+
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.domain.interfaces import IJobStore
+from app.domain.models import (
+    JOB_COMPLETED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    Job,
+    JobItemResult,
+)
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    "id INTEGER PRIMARY KEY, job_id TEXT NOT NULL UNIQUE, status TEXT NOT NULL, "
+    "total INTEGER NOT NULL, done INTEGER NOT NULL DEFAULT 0, "
+    "failed INTEGER NOT NULL DEFAULT 0, faces INTEGER NOT NULL DEFAULT 0, "
+    "created_at REAL NOT NULL, finished_at REAL)",
+    # ``seq`` is the item's position in recording order, NULL while pending
+    "CREATE TABLE IF NOT EXISTS items ("
+    "job INTEGER NOT NULL, idx INTEGER NOT NULL, source TEXT NOT NULL, "
+    "seq INTEGER, face_detected INTEGER, confidence REAL, error TEXT, "
+    "PRIMARY KEY (job, idx)) WITHOUT ROWID",
+    # Pending items are paged along the primary key; recorded ones through
+    # a partial index, so paging results costs the rows returned
+    "CREATE UNIQUE INDEX IF NOT EXISTS items_recorded ON items (job, seq) "
+    "WHERE seq IS NOT NULL",
+)
+
+_JOB_COLUMNS = "job_id, status, total, done, failed, faces, created_at, finished_at"
+
+_JOB_KEY = "(SELECT id FROM jobs WHERE job_id = ?)"
+
+
+class SqliteJobStore(IJobStore):
+    """
+    Job store in a local SQLite database.
+
+    Jobs and their items live in two tables; an item's outcome is written
+    into its row, so a job resumes from its pending rows after a restart.
+    The database runs in WAL mode so progress polls and result streams
+    read without blocking the writer. Each thread uses its own connection.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the job database.
+
+        Args:
+            path: Filesystem path of the SQLite database
+        """
+        self._path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+        logger.info(f"SQLite job store opened at {path}")
+
+    def create_job(self, sources: Iterable[str]) -> Job:
+        """
+        Record a new job with one pending item per source, atomically.
+
+        Args:
+            sources: Image locations in manifest order; an exception raised
+                while iterating discards the whole job
+
+        Returns:
+            The queued Job
+        """
+        job_id = uuid.uuid4().hex
+        created_at = time.time()
+        connection = self._connection()
+        try:
+            key = connection.execute(
+                "INSERT INTO jobs (job_id, status, total, created_at) "
+                "VALUES (?, ?, 0, ?)",
+                (job_id, JOB_QUEUED, created_at),
+            ).lastrowid
+            total = connection.executemany(
+                "INSERT INTO items (job, idx, source) VALUES (?, ?, ?)",
+                ((key, index, source) for index, source in enumerate(sources)),
+            ).rowcount
+            connection.execute("UPDATE jobs SET total = ? WHERE id = ?", (total, key))
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        logger.info(f"Created job {job_id} with {total} item(s)")
+        return Job(job_id=job_id, status=JOB_QUEUED, total=total, created_at=created_at)
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job's progress.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job, or None if there is no such job
+        """
+        row = (
+            self._connection()
+            .execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,))
+            .fetchone()
+        )
+        return Job(*row) if row else None
+
+    def unfinished_jobs(self) -> List[str]:
+        """
+        List jobs that have not completed yet.
+
+        Returns:
+            Job identifiers in submission order
+        """
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT job_id FROM jobs WHERE status != ? ORDER BY id",
+                (JOB_COMPLETED,),
+            )
+            .fetchall()
+        )
+        return [job_id for (job_id,) in rows]
+
+    def start_job(self, job_id: str) -> None:
+        """
+        Mark a queued job as running.
+
+        Args:
+            job_id: Job identifier
+        """
+        connection = self._connection()
+        connection.execute(
+            "UPDATE jobs SET status = ? WHERE job_id = ? AND status = ?",
+            (JOB_RUNNING, job_id, JOB_QUEUED),
+        )
+        connection.commit()
+
+    def pending_items(
+        self, job_id: str, after_index: int, limit: int
+    ) -> List[Tuple[int, str]]:
+        """
+        Page through the items of a job that have no recorded outcome.
+
+        Args:
+            job_id: Job identifier
+            after_index: Only items with a higher index are returned
+            limit: Largest number of items returned
+
+        Returns:
+            (index, source) pairs in index order
+        """
+        return (
+            self._connection()
+            .execute(
+                f"SELECT idx, source FROM items WHERE job = {_JOB_KEY} "
+                "AND seq IS NULL AND idx > ? ORDER BY idx LIMIT ?",
+                (job_id, after_index, limit),
+            )
+            .fetchall()
+        )
+
+    def save_results(self, job_id: str, items: Sequence[JobItemResult]) -> Job:
+        """
+        Record the outcomes of several items in one transaction.
+
+        Items that already have an outcome are left alone. The job is
+        marked completed once every item has one.
+
+        Args:
+            job_id: Job identifier
+            items: Outcomes to record
+
+        Returns:
+            The job's updated progress
+
+        Raises:
+            KeyError: If there is no such job
+        """
+        connection = self._connection()
+        try:
+            # Take the write lock up front so the sequence read below
+            # cannot race another writer
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT id, total, done FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(job_id)
+            key, total, done = row
+            failed = faces = 0
+            for item in items:
+                updated = connection.execute(
+                    "UPDATE items SET seq = ?, face_detected = ?, confidence = ?, "
+                    "error = ? WHERE job = ? AND idx = ? AND seq IS NULL",
+                    (
+                        done + 1,
+                        item.face_detected,
+                        item.confidence,
+                        item.error,
+                        key,
+                        item.index,
+                    ),
+                ).rowcount
+                if updated:
+                    done += 1
+                    failed += item.error is not None
+                    faces += bool(item.face_detected)
+            connection.execute(
+                "UPDATE jobs SET done = ?, failed = failed + ?, faces = faces + ? "
+                "WHERE id = ?",
+                (done, failed, faces, key),
+            )
+            if done >= total:
+                connection.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?",
+                    (JOB_COMPLETED, time.time(), key),
+                )
+            job = Job(
+                *connection.execute(
+                    f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (key,)
+                ).fetchone()
+            )
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        return job
+
+    def results(
+        self, job_id: str, after_sequence: int, limit: int
+    ) -> List[Tuple[int, JobItemResult]]:
+        """
+        Page through recorded outcomes in the order they were recorded.
+
+        Args:
+            job_id: Job identifier
+            after_sequence: Only outcomes recorded after this position are
+                returned; 0 starts from the beginning
+            limit: Largest number of outcomes returned
+
+        Returns:
+            (sequence, JobItemResult) pairs; sequences start at 1
+        """
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT seq, idx, source, face_detected, confidence, error "
+                f"FROM items WHERE job = {_JOB_KEY} AND seq > ? "
+                "ORDER BY seq LIMIT ?",
+                (job_id, after_sequence, limit),
+            )
+            .fetchall()
+        )
+        return [
+            (
+                seq,
+                JobItemResult(
+                    index=index,
+                    source=source,
+                    face_detected=None if face is None else bool(face),
+                    confidence=confidence,
+                    error=error,
+                ),
+            )
+            for seq, index, source, face, confidence, error in rows
+        ]
+
+    def close(self) -> None:
+        """Fold the write-ahead log into the database and close connections."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        if connections:
+            try:
+                connections[0].execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                logger.warning(f"Job store checkpoint failed: {str(e)}")
+        for connection in connections:
+            connection.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self._path, timeout=5.0, check_same_thread=False
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
@@ -0,0 +1,159 @@
+"""SQLite-backed result store shared by worker processes on one host."""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from app.domain.interfaces import IResultStore
+from app.domain.models import FaceDetection, FaceDetectionResult
+
+
+logger = logging.getLogger(__name__)
+
+# Expired rows are purged after this many writes
+_PURGE_INTERVAL = 1000
+
+
+def result_to_json(result: FaceDetectionResult) -> str:
+    """
+    Serialize a detection result for storage.
+
+    Args:
+        result: Detection result
+
+    Returns:
+        JSON string
+    """
+    return json.dumps(
+        {
+            "face_detected": result.face_detected,
+            "confidence": result.confidence,
+            "detections": [
+                [detection.score, detection.box, detection.keypoints]
+                for detection in result.detections
+            ],
+        }
+    )
+
+
+def result_from_json(payload: str) -> FaceDetectionResult:
+    """
+    Deserialize a stored detection result.
+
+    Args:
+        payload: JSON string produced by ``result_to_json``
+
+    Returns:
+        FaceDetectionResult instance
+    """
+    data = json.loads(payload)
+    return FaceDetectionResult(
+        face_detected=data["face_detected"],
+        confidence=data.get("confidence"),
+        detections=tuple(
+            FaceDetection(
+                score=score,
+                box=tuple(box),
+                keypoints=tuple(tuple(point) for point in keypoints),
+            )
+            for score, box, keypoints in data.get("detections", ())
+        ),
+    )
+
+
+class SqliteResultStore(IResultStore):
+    """
+    Result store in a local SQLite database.
+
+    The database runs in WAL mode so readers in several processes do not
+    block each other or the writer. Each thread uses its own connection.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the result database.
+
+        Args:
+            path: Filesystem path of the SQLite database
+        """
+        self._path = path
+        self._local = threading.local()
+        self._writes = 0
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        connection.commit()
+        logger.info(f"SQLite result store opened at {path}")
+
+    def get(self, key: str) -> Optional[FaceDetectionResult]:
+        """
+        Look up a stored result.
+
+        Args:
+            key: Content-addressed cache key
+
+        Returns:
+            Stored FaceDetectionResult, or None if absent or expired
+        """
+        row = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM results WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return result_from_json(row[0]) if row else None
+
+    def put(self, key: str, result: FaceDetectionResult, ttl: float) -> None:
+        """
+        Store a result, replacing any previous value.
+
+        Args:
+            key: Content-addressed cache key
+            result: Detection result to store
+            ttl: Seconds the result stays valid
+        """
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO results (key, payload, expires_at) "
+            "VALUES (?, ?, ?)",
+            (key, result_to_json(result), time.time() + ttl),
+        )
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % _PURGE_INTERVAL == 0
+        if purge:
+            connection.execute(
+                "DELETE FROM results WHERE expires_at <= ?", (time.time(),)
+            )
+        connection.commit()
+
+    def close(self) -> None:
+        """Close every connection opened by this store."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self._path, timeout=5.0, check_same_thread=False
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
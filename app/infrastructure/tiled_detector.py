@@ -0,0 +1,341 @@
+"""Tiled MediaPipe detection for small faces in very large images."""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import replace
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.domain.interfaces import IFaceDetector
+from app.domain.models import FaceDetection, FaceDetectionResult
+from app.infrastructure.image_decoding import decode_to_rgb
+from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+
+
+logger = logging.getLogger(__name__)
+
+# Pixel box of one tile as (left, top, right, bottom)
+TileBox = Tuple[int, int, int, int]
+
+
+def tile_grid(width: int, height: int, tile_size: int, overlap: int) -> List[TileBox]:
+    """
+    Cover an image with overlapping square tiles.
+
+    Tiles step by ``tile_size - overlap`` and the last row and column are
+    pulled back to end on the image border, so every tile has full size
+    unless the image itself is smaller, and a face up to ``overlap`` pixels
+    wide lies whole inside at least one tile.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        tile_size: Side of each tile in pixels
+        overlap: Pixels shared by neighbouring tiles
+
+    Returns:
+        Tile boxes in row-major order
+
+    Raises:
+        ValueError: If the overlap does not leave a positive step
+    """
+    if not 0 <= overlap < tile_size:
+        raise ValueError("Tile overlap must be at least 0 and below the tile size")
+
+    def starts(length: int) -> List[int]:
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, tile_size - overlap))
+        return positions + [length - tile_size]
+
+    return [
+        (left, top, min(left + tile_size, width), min(top + tile_size, height))
+        for top in starts(height)
+        for left in starts(width)
+    ]
+
+
+def _iou(first: FaceDetection, second: FaceDetection) -> float:
+    """Intersection over union of two boxes in the same coordinates."""
+    ax, ay, aw, ah = first.box
+    bx, by, bw, bh = second.box
+    overlap_w = min(ax + aw, bx + bw) - max(ax, bx)
+    overlap_h = min(ay + ah, by + bh) - max(ay, by)
+    if overlap_w <= 0 or overlap_h <= 0:
+        return 0.0
+    intersection = overlap_w * overlap_h
+    return intersection / (aw * ah + bw * bh - intersection)
+
+
+def non_max_suppression(
+    detections: Iterable[FaceDetection], iou_threshold: float
+) -> Tuple[FaceDetection, ...]:
+    """
+    Keep the best detection of every group of overlapping boxes.
+
+    Args:
+        detections: Detections in one coordinate frame
+        iou_threshold: Overlap above which the lower-scoring box is dropped
+
+    Returns:
+        Surviving detections, highest score first
+    """
+    kept: List[FaceDetection] = []
+    for detection in sorted(detections, key=lambda d: d.score, reverse=True):
+        if all(_iou(detection, other) <= iou_threshold for other in kept):
+            kept.append(detection)
+    return tuple(kept)
+
+
+def _to_image_coordinates(
+    detection: FaceDetection, tile: TileBox, width: int, height: int
+) -> FaceDetection:
+    """Map a detection relative to a tile into full-image relative coordinates."""
+    left, top, right, bottom = tile
+    tile_w, tile_h = right - left, bottom - top
+    xmin, ymin, box_w, box_h = detection.box
+    return FaceDetection(
+        score=detection.score,
+        box=(
+            (left + xmin * tile_w) / width,
+            (top + ymin * tile_h) / height,
+            box_w * tile_w / width,
+            box_h * tile_h / height,
+        ),
+        keypoints=tuple(
+            ((left + x * tile_w) / width, (top + y * tile_h) / height)
+            for x, y in detection.keypoints
+        ),
+    )
+
+
+class TiledFaceDetector(IFaceDetector):
+    """
+    Face detector that scans very large images tile by tile.
+
+    A 20 MP photo shrunk to the model's input leaves faces in a group shot
+    or CCTV still a few pixels wide, below what the short-range model can
+    find. Images above ``min_pixels`` are therefore processed twice: once
+    whole at ``max_image_side``, which finds the large faces exactly like
+    the plain MediaPipe backend, and once as overlapping ``tile_size``
+    tiles at full resolution, which finds the small ones. Tiles run in
+    parallel on the pooled graphs and the boxes of both passes are merged
+    by non-maximum suppression in full-image coordinates.
+
+    The full-resolution frame is decoded once into memory and every tile
+    is copied out of it only when a worker picks it up, so the scan adds
+    no more than the in-flight tiles to that frame.
+
+    With ``early_exit`` set, callers that pass ``stop_at_first_face``
+    (those that only ask whether a face is present) stop at the first pass
+    or tile with a detection scoring ``early_exit_score`` or more.
+    ``face_detected`` is then exact but ``detections`` only lists the faces
+    found so far, so the result is marked ``stopped_early``. Callers that
+    want every face always get the full scan.
+    """
+
+    def __init__(
+        self,
+        min_detection_confidence: float = 0.5,
+        pool_size: int = 1,
+        max_image_side: Optional[int] = None,
+        min_pixels: int = 20_000_000,
+        tile_size: int = 640,
+        tile_overlap: int = 160,
+        nms_iou: float = 0.3,
+        early_exit: bool = False,
+        early_exit_score: float = 0.8,
+    ):
+        """
+        Initialize the tiled detector.
+
+        Args:
+            min_detection_confidence: Minimum confidence threshold
+                for detection (0.0-1.0)
+            pool_size: Detection graphs kept alive, which is also the
+                number of tiles processed at once
+            max_image_side: Longest image side of the whole-image pass and
+                of images too small to tile; None keeps full size
+            min_pixels: Images with more pixels than this are tiled
+            tile_size: Side of each tile in pixels
+            tile_overlap: Pixels shared by neighbouring tiles
+            nms_iou: Box overlap above which duplicates are merged
+            early_exit: Let callers that pass ``stop_at_first_face`` stop at
+                the first confident detection
+            early_exit_score: Score that counts as confident for early exit
+
+        Raises:
+            ValueError: If the tile geometry is invalid
+        """
+        if not 0 <= tile_overlap < tile_size:
+            raise ValueError("Tile overlap must be at least 0 and below the tile size")
+
+        self._min_pixels = min_pixels
+        self._tile_size = tile_size
+        self._tile_overlap = tile_overlap
+        self._nms_iou = nms_iou
+        self._early_exit = early_exit
+        self._early_exit_score = early_exit_score
+        self._detector = MediaPipeFaceDetector(
+            min_detection_confidence=min_detection_confidence,
+            pool_size=pool_size,
+            max_image_side=max_image_side,
+        )
+        self._workers = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="tile"
+        )
+        logger.info(
+            f"Tiled face detector initialized with tile size: {tile_size}, "
+            f"overlap: {tile_overlap}, tiling above {min_pixels} pixels, "
+            f"early exit: {early_exit}"
+        )
+
+    def detect_face(
+        self, image_data: bytes, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces, tiling images larger than ``min_pixels``.
+
+        Args:
+            image_data: Raw image bytes
+            stop_at_first_face: Stop at the first confident detection when
+                early exit is enabled
+
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If image data is invalid or cannot be processed
+        """
+        try:
+            width, height = Image.open(BytesIO(image_data)).size
+        except Exception:
+            # Let the whole-image path produce the usual error
+            return self._detector.detect_face(image_data)
+        if width * height <= self._min_pixels:
+            return self._detector.detect_face(image_data)
+
+        # JPEGs reach the whole-image budget through DCT scaling, far
+        # cheaper than shrinking the full-resolution tiles source
+        overview = self._detector.detect_face(image_data)
+        early_exit = self._early_exit and stop_at_first_face
+        if early_exit and self._is_confident(overview.detections):
+            return replace(overview, stopped_early=True)
+
+        try:
+            source = decode_to_rgb(image_data)
+        except Exception as e:
+            logger.error(f"Error during face detection: {str(e)}")
+            raise ValueError(f"Failed to process image: {str(e)}")
+        return self._detect_tiles(source, overview.detections, early_exit)
+
+    def detect_face_in_array(
+        self, image_array: np.ndarray, stop_at_first_face: bool = False
+    ) -> FaceDetectionResult:
+        """
+        Detect faces in an already decoded image, tiling large ones.
+
+        Args:
+            image_array: Decoded image as an RGB numpy array
+            stop_at_first_face: Stop at the first confident detection when
+                early exit is enabled
+
+        Returns:
+            FaceDetectionResult with detection status
+
+        Raises:
+            ValueError: If the image cannot be processed
+        """
+        height, width = image_array.shape[:2]
+        overview = self._detector.detect_face_in_array(image_array)
+        if width * height <= self._min_pixels:
+            return overview
+        early_exit = self._early_exit and stop_at_first_face
+        if early_exit and self._is_confident(overview.detections):
+            return replace(overview, stopped_early=True)
+        return self._detect_tiles(image_array, overview.detections, early_exit)
+
+    @property
+    def settings_key(self) -> str:
+        """
+        Identify the model and tiling settings.
+
+        Early exit is left out: results that stopped early are never cached.
+        """
+        return (
+            f"tiled:{self._detector.settings_key}:min_pixels={self._min_pixels}"
+            f":tile={self._tile_size}:overlap={self._tile_overlap}"
+            f":nms={self._nms_iou}"
+        )
+
+    def prewarm(self) -> None:
+        """Build and warm every detection graph in the pool."""
+        self._detector.prewarm()
+
+    def close(self) -> None:
+        """Stop the tile workers and close the detection graphs."""
+        self._workers.shutdown(wait=True, cancel_futures=True)
+        self._detector.close()
+
+    def _detect_tiles(
+        self, source: np.ndarray, found: Tuple[FaceDetection, ...], early_exit: bool
+    ) -> FaceDetectionResult:
+        """Run every tile of ``source`` and merge with earlier detections."""
+        height, width = source.shape[:2]
+        tiles = tile_grid(width, height, self._tile_size, self._tile_overlap)
+        logger.debug(f"Scanning {width}x{height} image as {len(tiles)} tile(s)")
+
+        pending: Dict[Future, TileBox] = {
+            self._workers.submit(self._detect_tile, source, tile): tile
+            for tile in tiles
+        }
+        detections: List[FaceDetection] = list(found)
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tile = pending.pop(future)
+                    hits = [
+                        _to_image_coordinates(detection, tile, width, height)
+                        for detection in future.result()
+                    ]
+                    detections.extend(hits)
+                    if early_exit and self._is_confident(hits):
+                        logger.debug(f"Confident face in tile {tile}, stopping")
+                        return replace(self._merge(detections), stopped_early=True)
+        finally:
+            self._cancel(pending.keys())
+        return self._merge(detections)
+
+    def _detect_tile(
+        self, source: np.ndarray, tile: TileBox
+    ) -> Tuple[FaceDetection, ...]:
+        """Copy one tile out of the source and detect faces in it."""
+        left, top, right, bottom = tile
+        pixels = np.ascontiguousarray(source[top:bottom, left:right])
+        return self._detector.detect_face_in_array(pixels).detections
+
+    def _is_confident(self, detections: Iterable[FaceDetection]) -> bool:
+        """Whether a detection clears the early exit score."""
+        return any(
+            detection.score >= self._early_exit_score for detection in detections
+        )
+
+    def _merge(self, detections: List[FaceDetection]) -> FaceDetectionResult:
+        """Build the result from detections of every pass and tile."""
+        merged = non_max_suppression(detections, self._nms_iou)
+        if not merged:
+            return FaceDetectionResult(face_detected=False)
+        return FaceDetectionResult(
+            face_detected=True, confidence=merged[0].score, detections=merged
+        )
+
+    @staticmethod
+    def _cancel(futures: Iterable[Future]) -> None:
+        """Cancel tiles no worker has started."""
+        skipped = sum(future.cancel() for future in futures)
+        if skipped:
+            logger.debug(f"Skipped {skipped} tile(s)")
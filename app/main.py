@@ -1,15 +1,29 @@
 """Main FastAPI application."""
 
+import asyncio
 import logging
 import sys
+import time
 from contextlib import asynccontextmanager
+from typing import Optional
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.config import get_settings
+from app.api.dependencies import (
+    close_face_detector,
+    close_image_fetcher,
+    close_inference_executor,
+    close_job_runner,
+    close_result_cache,
+    get_pipeline_metrics,
+    start_job_runner,
+    warm_up,
+)
 from app.api.endpoints import router
-from app.api.schemas import HealthResponse
+from app.api.schemas import HealthResponse, ReadinessResponse
+from app.infrastructure.metrics import METRICS_CONTENT_TYPE, PipelineMetrics
 
 
 # Configure logging
@@ -29,8 +43,25 @@ async def lifespan(app: FastAPI):
     setup_logging(settings.log_level)
     logger = logging.getLogger(__name__)
     logger.info(f"Starting {settings.api_title} v{settings.api_version}")
+    # Warm up before the server accepts connections; a failure is logged and
+    # leaves /ready reporting 503 instead of crashing the process
+    started = time.perf_counter()
+    try:
+        if settings.warmup_enabled:
+            await asyncio.to_thread(warm_up)
+    except Exception:
+        logger.exception("Warm-up failed, the service is not ready")
+    else:
+        app.state.time_to_ready = time.perf_counter() - started
+        logger.info(f"Ready in {app.state.time_to_ready:.2f}s")
+    await start_job_runner()
     yield
     logger.info("Shutting down application")
+    await close_job_runner()
+    await close_image_fetcher()
+    close_inference_executor()
+    close_result_cache()
+    close_face_detector()
 
 
 def create_app() -> FastAPI:
@@ -76,6 +107,57 @@ def create_app() -> FastAPI:
         """Health check endpoint."""
         return HealthResponse(status="healthy", version=settings.api_version)
 
+    # Set by the lifespan handler once warm-up has finished
+    app.state.time_to_ready = None
+
+    @app.get(
+        "/ready",
+        response_model=ReadinessResponse,
+        responses={
+            503: {"model": ReadinessResponse, "description": "Warm-up unfinished"}
+        },
+        tags=["Health"],
+        summary="Readiness check",
+        description=(
+            "Check whether the detector is loaded and warmed up, so the "
+            "service can take traffic without a cold start"
+        ),
+    )
+    async def readiness_check(response: Response) -> ReadinessResponse:
+        """Readiness check endpoint."""
+        time_to_ready: Optional[float] = app.state.time_to_ready
+        if time_to_ready is None:
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ReadinessResponse(
+            ready=time_to_ready is not None, time_to_ready_seconds=time_to_ready
+        )
+
+    # Prometheus scrape endpoint; creating the metrics here switches the
+    # pipeline timing hooks on before the first request
+    get_pipeline_metrics()
+
+    @app.get(
+        "/metrics",
+        response_class=Response,
+        tags=["Health"],
+        summary="Prometheus metrics",
+        description=(
+            "Per-stage latency histograms, outcome counters, load gauges and "
+            "input size distributions in the Prometheus text format"
+        ),
+    )
+    async def metrics(
+        pipeline_metrics: Optional[PipelineMetrics] = Depends(get_pipeline_metrics),
+    ) -> Response:
+        """Prometheus scrape endpoint."""
+        if pipeline_metrics is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled"
+            )
+        return Response(
+            content=pipeline_metrics.render(), media_type=METRICS_CONTENT_TYPE
+        )
+
     return app
 
 
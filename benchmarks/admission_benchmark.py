@@ -0,0 +1,116 @@
+"""
+Goodput of the inference executor under overload, with and without deadlines.
+
+Offers open-loop load at multiples of the executor's capacity and counts
+the answers that arrive within the deadline. Tasks sleep for a fixed
+service time, which releases the GIL as native inference does, so the
+queueing policy is measured rather than the CPU count of the machine.
+
+Usage:
+    python -m benchmarks.admission_benchmark [--loads 0.5 1 2 3]
+        [--service-ms 20] [--deadline-ms 200] [--workers 4] [--queue 64]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from app.application.inference_executor import InferenceExecutor
+from app.domain.exceptions import DeadlineExceededError, ServiceOverloadedError
+
+
+async def offer(
+    workers: int,
+    queue: int,
+    rate: float,
+    seconds: float,
+    service: float,
+    deadline: float,
+    shed: bool,
+) -> Dict[str, float]:
+    """Send ``rate`` requests per second and classify every outcome."""
+    executor = InferenceExecutor(max_workers=workers, max_queue_size=queue)
+    counts = {"on_time": 0, "late": 0, "rejected": 0, "shed": 0}
+
+    async def request(arrival: float) -> None:
+        try:
+            await executor.run(
+                time.sleep, service, deadline=arrival + deadline if shed else None
+            )
+        except ServiceOverloadedError:
+            counts["rejected"] += 1
+            return
+        except DeadlineExceededError:
+            counts["shed"] += 1
+            return
+        late = time.perf_counter() - arrival > deadline
+        counts["late" if late else "on_time"] += 1
+
+    tasks = []
+    start = time.perf_counter()
+    for index in range(int(rate * seconds)):
+        scheduled = start + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(scheduled)))
+    await asyncio.gather(*tasks)
+    executor.shutdown()
+    return {name: count / seconds for name, count in counts.items()}
+
+
+def run(
+    loads: List[float],
+    seconds: float,
+    service: float,
+    deadline: float,
+    workers: int,
+    queue: int,
+) -> None:
+    """Print a markdown table of goodput per offered load."""
+    capacity = workers / service
+    print(
+        f"capacity {capacity:.0f} req/s ({workers} workers x {service * 1000:g} ms), "
+        f"queue {queue}, deadline {deadline * 1000:g} ms\n"
+    )
+    print(
+        "| load | offered req/s | FIFO goodput | FIFO late | "
+        "deadline goodput | deadline late | shed | rejected |"
+    )
+    print("|---|---|---|---|---|---|---|---|")
+    for load in loads:
+        rate = load * capacity
+        fifo, aware = (
+            asyncio.run(offer(workers, queue, rate, seconds, service, deadline, shed))
+            for shed in (False, True)
+        )
+        print(
+            f"| {load:g}x | {rate:.0f} | {fifo['on_time']:.0f} | {fifo['late']:.0f} "
+            f"| {aware['on_time']:.0f} | {aware['late']:.0f} | {aware['shed']:.0f} "
+            f"| {aware['rejected']:.0f} |"
+        )
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--loads", nargs="+", type=float, default=[0.5, 1, 1.5, 2, 3])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--service-ms", type=float, default=20.0)
+    parser.add_argument("--deadline-ms", type=float, default=200.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=64)
+    args = parser.parse_args()
+    run(
+        args.loads,
+        args.seconds,
+        args.service_ms / 1000,
+        args.deadline_ms / 1000,
+        args.workers,
+        args.queue,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Throughput of the batched backend against MediaPipe under concurrency.
+
+Each concurrency level runs that many client threads, each detecting
+pre-decoded frames back to back (the way inference workers call the
+detector), and reports images per second, latency percentiles and, for
+the batched backend, the mean batch size actually achieved.
+
+Usage:
+    python -m benchmarks.batching_benchmark [--concurrency 1 2 4 8 16]
+        [--seconds 3] [--batch-wait-ms 2]
+"""
+
+import argparse
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import cv2
+import numpy as np
+
+from app.domain.interfaces import IFaceDetector
+from app.infrastructure.batched_detector import BatchedBlazeFaceDetector
+from app.infrastructure.image_decoding import decode_to_rgb
+from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+from benchmarks.images import synthetic_image
+
+
+FACE_FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "face.jpg"
+
+
+def frames() -> List[np.ndarray]:
+    """Camera-sized frames with and without a face."""
+    face = decode_to_rgb(FACE_FIXTURE.read_bytes())
+    return [
+        cv2.resize(face, (640, 640)),
+        synthetic_image(640, 480, seed=1),
+        cv2.resize(face, (480, 480)),
+        synthetic_image(640, 480, seed=2),
+    ]
+
+
+def measure(
+    detector: IFaceDetector, images: List[np.ndarray], clients: int, seconds: float
+) -> Dict[str, float]:
+    """Run ``clients`` threads against a detector for a fixed time."""
+    latencies: List[float] = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def client(offset: int) -> None:
+        local = []
+        index = offset
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            detector.detect_face_in_array(images[index % len(images)])
+            local.append(time.perf_counter() - start)
+            index += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1000,
+    }
+
+
+def run(concurrency: List[int], seconds: float, batch_wait_ms: float) -> None:
+    """Print a markdown table for both backends at every level."""
+    images = frames()
+    backends: Dict[str, Callable[[int], IFaceDetector]] = {
+        "mediapipe": lambda clients: MediaPipeFaceDetector(pool_size=clients),
+        "batched": lambda clients: BatchedBlazeFaceDetector(
+            max_batch_size=clients, max_batch_wait=batch_wait_ms / 1000
+        ),
+    }
+
+    print(f"{os.cpu_count()} CPU(s), OpenCV threads: {cv2.getNumThreads()}\n")
+    print("| backend | clients | img/s | p50 ms | p99 ms | mean batch |")
+    print("|---|---|---|---|---|---|")
+    for name, factory in backends.items():
+        for clients in concurrency:
+            detector = factory(clients)
+            measure(detector, images, clients, 0.3)  # warm up
+            row = measure(detector, images, clients, seconds)
+            batch = "-"
+            if isinstance(detector, BatchedBlazeFaceDetector):
+                batch = f"{detector.batch_stats().avg_batch_size:.1f}"
+            detector.close()
+            print(
+                f"| {name} | {clients} | {row['throughput']:.0f} "
+                f"| {row['p50_ms']:.1f} | {row['p99_ms']:.1f} | {batch} |"
+            )
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--batch-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    run(args.concurrency, args.seconds, args.batch_wait_ms)
+
+
+if __name__ == "__main__":
+    main()
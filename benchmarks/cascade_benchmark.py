@@ -0,0 +1,115 @@
+"""
+Latency and agreement of the cascade against the MediaPipe backend.
+
+Runs ``detect_face`` on every image with both backends under the same
+``MAX_IMAGE_SIDE`` budget, then reports mean and p95 latency, how often
+``face_detected`` agrees, and the cascade's per-stage exit rates. Without
+``--images`` the phone-photo set of ``downscale_accuracy`` is used.
+
+Usage:
+    python -m benchmarks.cascade_benchmark [--images DIR] [--thumbnail-side 256]
+        [--accept-above 0.8] [--reject-below 0.3] [--final-model short_range]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.domain.interfaces import IFaceDetector
+from app.infrastructure.cascade_detector import CascadeFaceDetector
+from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+from benchmarks.downscale_accuracy import directory_set, phone_photo_set
+
+
+def measure(
+    detector: IFaceDetector, images: List[Tuple[str, bytes]], repeats: int
+) -> Tuple[Dict[str, bool], List[float]]:
+    """Time ``detect_face`` on every image and collect its answers."""
+    answers: Dict[str, bool] = {}
+    latencies: List[float] = []
+    for name, image_data in images:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = detector.detect_face(image_data)
+            latencies.append(time.perf_counter() - start)
+        answers[name] = result.face_detected
+    return answers, latencies
+
+
+def run(
+    images: List[Tuple[str, bytes]],
+    max_side: Optional[int],
+    repeats: int,
+    **cascade_options,
+) -> None:
+    """Print markdown tables comparing both backends."""
+    baseline = MediaPipeFaceDetector(max_image_side=max_side)
+    cascade = CascadeFaceDetector(max_image_side=max_side, **cascade_options)
+    # Warm both graphs up before timing
+    measure(baseline, images[:1], 1)
+    measure(cascade, images[:1], 1)
+    warmup = cascade.stats()
+
+    expected, baseline_times = measure(baseline, images, repeats)
+    answers, cascade_times = measure(cascade, images, repeats)
+    agreement = sum(answers[name] == expected[name] for name in expected)
+
+    print("| backend | mean ms | p95 ms | agreement |")
+    print("|---|---|---|---|")
+    for name, times in (("mediapipe", baseline_times), ("cascade", cascade_times)):
+        print(
+            f"| {name} | {np.mean(times) * 1000:.1f} "
+            f"| {np.percentile(times, 95) * 1000:.1f} "
+            f"| {agreement if name == 'cascade' else len(expected)}/{len(expected)} |"
+        )
+
+    print("\n| stage | entered | accepted | rejected | escalated | exit rate |")
+    print("|---|---|---|---|---|---|")
+    for stage, before in zip(cascade.stats().stages, warmup.stages):
+        entered = stage.entered - before.entered
+        answered = (stage.accepted - before.accepted) + (
+            stage.rejected - before.rejected
+        )
+        print(
+            f"| {stage.name} | {entered} | {stage.accepted - before.accepted} "
+            f"| {stage.rejected - before.rejected} "
+            f"| {stage.escalated - before.escalated} "
+            f"| {answered / entered if entered else 0:.0%} |"
+        )
+
+    for name in expected:
+        if answers[name] != expected[name]:
+            print(f"\ndisagreement: {name} (mediapipe={expected[name]})")
+    baseline.close()
+    cascade.close()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=Path, default=None)
+    parser.add_argument("--max-side", type=int, default=1024)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--thumbnail-side", type=int, default=256)
+    parser.add_argument("--accept-above", type=float, default=0.8)
+    parser.add_argument("--reject-below", type=float, default=0.3)
+    parser.add_argument("--final-model", default="short_range")
+    args = parser.parse_args()
+
+    images = list(directory_set(args.images) if args.images else phone_photo_set())
+    run(
+        images,
+        args.max_side or None,
+        args.repeats,
+        thumbnail_side=args.thumbnail_side,
+        accept_above=args.accept_above,
+        reject_below=args.reject_below,
+        final_model=args.final_model,
+    )
+
+
+if __name__ == "__main__":
+    main()
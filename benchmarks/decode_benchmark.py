@@ -0,0 +1,92 @@
+"""
+Per-format decode benchmark.
+
+Compares the original decode path (PIL decode, RGB to BGR for OpenCV, then
+BGR back to RGB for MediaPipe) with ``decode_to_rgb``.
+
+Usage:
+    python -m benchmarks.decode_benchmark [--repeat N] [--sizes WxH ...]
+"""
+
+import argparse
+import time
+from io import BytesIO
+from typing import Callable, List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from app.infrastructure.image_decoding import decode_to_rgb
+from benchmarks.images import encode_image, synthetic_image
+
+
+FORMATS = [
+    ("JPEG", {"quality": 90}),
+    ("PNG", {}),
+    ("WEBP", {"quality": 90}),
+    ("BMP", {}),
+    ("GIF", {}),
+]
+
+
+def legacy_decode(image_data: bytes) -> np.ndarray:
+    """Decode the way the detector did before ``decode_to_rgb``."""
+    pil_image = Image.open(BytesIO(image_data))
+    if pil_image.mode != "RGB":
+        pil_image = pil_image.convert("RGB")
+    image_array = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB)
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Return the median wall time of ``fn`` in milliseconds."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1000
+
+
+def parse_size(value: str) -> Tuple[int, int]:
+    """Parse a ``WIDTHxHEIGHT`` string."""
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def run(sizes: List[Tuple[int, int]], repeat: int) -> None:
+    """Print legacy and new decode times for every format and size."""
+    print(
+        f"{'format':<6} {'size':>11} {'bytes':>10} {'legacy ms':>10} "
+        f"{'rgb ms':>8} {'speedup':>8}"
+    )
+    for width, height in sizes:
+        image = synthetic_image(width, height)
+        for image_format, options in FORMATS:
+            data = encode_image(image, image_format, **options)
+            legacy = time_call(lambda: legacy_decode(data), repeat)
+            current = time_call(lambda: decode_to_rgb(data), repeat)
+            print(
+                f"{image_format:<6} {width:>5}x{height:<5} {len(data):>10} "
+                f"{legacy:>10.2f} {current:>8.2f} {legacy / current:>7.2f}x"
+            )
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=parse_size,
+        default=[(640, 480), (1920, 1080), (4000, 3000)],
+    )
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
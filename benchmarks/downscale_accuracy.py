@@ -0,0 +1,135 @@
+"""
+Accuracy and cost of the decode-time resolution budget.
+
+Runs the detector on every image at full resolution and at each budget,
+then reports how often ``face_detected`` agrees with the full-resolution
+answer, the confidence drift, and the decode plus inference cost. Without
+``--images`` the set is built from ``tests/fixtures/face.jpg`` pasted into
+large phone-sized canvases at several scales, plus face-free images.
+
+Usage:
+    python -m benchmarks.downscale_accuracy [--images DIR] [--budgets 640 1024]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.infrastructure.image_decoding import decode_to_rgb
+from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+from benchmarks.images import encode_image, synthetic_image
+
+
+FACE_FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "face.jpg"
+
+# Head-and-shoulders crop of the fixture; the face fills about a third
+FACE_CROP = (82, 0, 367, 285)
+
+CANVASES = [(4000, 3000), (3000, 4000), (1920, 1080), (6000, 4000)]
+
+# Crop height as a fraction of the canvas short side
+FACE_SCALES = [0.3, 0.5, 0.7, 1.0]
+
+
+def phone_photo_set() -> Iterator[Tuple[str, bytes]]:
+    """Yield large JPEGs with and without a face."""
+    face = Image.open(FACE_FIXTURE).convert("RGB").crop(FACE_CROP)
+    for index, (width, height) in enumerate(CANVASES):
+        background = synthetic_image(width, height, seed=index)
+        yield f"noface-{width}x{height}", encode_image(background, "JPEG", quality=90)
+        for scale in FACE_SCALES:
+            side = int(min(width, height) * scale)
+            canvas = Image.fromarray(background)
+            canvas.paste(face.resize((side, side)), ((width - side) // 2, 0))
+            yield (
+                f"face{int(scale * 100)}-{width}x{height}",
+                encode_image(np.asarray(canvas), "JPEG", quality=90),
+            )
+
+
+def directory_set(directory: Path) -> Iterator[Tuple[str, bytes]]:
+    """Yield every file in a directory."""
+    for path in sorted(directory.iterdir()):
+        if path.is_file():
+            yield path.name, path.read_bytes()
+
+
+def measure(
+    detector: MediaPipeFaceDetector, image_data: bytes, max_side: Optional[int]
+) -> Dict[str, float]:
+    """Decode and detect one image under a budget."""
+    start = time.perf_counter()
+    image_array = decode_to_rgb(image_data, max_side)
+    decoded = time.perf_counter()
+    result = detector.detect_face_in_array(image_array)
+    done = time.perf_counter()
+    return {
+        "face": float(result.face_detected),
+        "confidence": result.confidence or 0.0,
+        "decode_ms": (decoded - start) * 1000,
+        "infer_ms": (done - decoded) * 1000,
+        "frame_mb": image_array.nbytes / 1e6,
+    }
+
+
+def run(images: List[Tuple[str, bytes]], budgets: List[int]) -> None:
+    """Print a markdown table comparing each budget with full resolution."""
+    detector = MediaPipeFaceDetector(min_detection_confidence=0.5)
+    full = {name: measure(detector, data, None) for name, data in images}
+    faces = sum(int(row["face"]) for row in full.values())
+    print(f"{len(images)} images, {faces} with a face at full resolution\n")
+    print(
+        "| budget | agreement | max abs conf delta | decode ms | infer ms "
+        "| frame MB |"
+    )
+    print("|---|---|---|---|---|---|")
+
+    mismatches = []
+    for budget in [0] + budgets:
+        rows = {
+            name: full[name] if not budget else measure(detector, data, budget)
+            for name, data in images
+        }
+        agree = sum(rows[name]["face"] == full[name]["face"] for name in rows)
+        mismatches += [
+            (budget, name, full[name]["confidence"], rows[name]["confidence"])
+            for name in rows
+            if rows[name]["face"] != full[name]["face"]
+        ]
+        delta = max(
+            abs(rows[name]["confidence"] - full[name]["confidence"]) for name in rows
+        )
+        mean = {
+            key: float(np.mean([row[key] for row in rows.values()]))
+            for key in ("decode_ms", "infer_ms", "frame_mb")
+        }
+        print(
+            f"| {budget or 'full'} | {agree}/{len(rows)} | {delta:.3f} "
+            f"| {mean['decode_ms']:.1f} | {mean['infer_ms']:.1f} "
+            f"| {mean['frame_mb']:.1f} |"
+        )
+    detector.close()
+
+    for budget, name, full_conf, budget_conf in mismatches:
+        print(
+            f"\nmismatch at budget {budget}: {name} "
+            f"(full {full_conf:.3f}, budget {budget_conf:.3f})"
+        )
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=Path, help="Directory of test images")
+    parser.add_argument("--budgets", nargs="+", type=int, default=[512, 1024, 1536])
+    args = parser.parse_args()
+    images = list(directory_set(args.images) if args.images else phone_photo_set())
+    run(images, args.budgets)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Write and read throughput of the SQLite job store by checkpoint size.
+
+Creates a job of ``--items`` sources, then records every outcome in
+batches of each ``--checkpoints`` size, one transaction per batch as the
+job runner does, and reports outcomes recorded per second. Manifest
+insertion and result paging are timed on the same database. Runs on a
+temporary directory, so point ``TMPDIR`` at the disk the store will live
+on. The store commits with ``synchronous=NORMAL``, which skips the fsync
+per commit in WAL mode, so the per-transaction cost measured here is
+SQLite's own locking and log bookkeeping.
+
+Usage:
+    python -m benchmarks.job_store_benchmark [--items 20000]
+        [--checkpoints 1 16 256 1024]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+from app.domain.models import JobItemResult
+from app.infrastructure.sqlite_job_store import SqliteJobStore
+
+
+def record(store: SqliteJobStore, items: int, checkpoint: int) -> float:
+    """Create a job and record all its outcomes; return outcomes per second."""
+    job = store.create_job(f"images/{index:08d}.jpg" for index in range(items))
+    outcomes = [
+        JobItemResult(
+            index=index,
+            source=f"images/{index:08d}.jpg",
+            face_detected=index % 3 == 0,
+            confidence=0.9 if index % 3 == 0 else None,
+        )
+        for index in range(items)
+    ]
+    start = time.perf_counter()
+    for offset in range(0, items, checkpoint):
+        store.save_results(job.job_id, outcomes[offset : offset + checkpoint])
+    return items / (time.perf_counter() - start)
+
+
+def run(items: int, checkpoints: List[int]) -> None:
+    """Print a markdown table of store throughput."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = SqliteJobStore(os.path.join(directory, "jobs.sqlite3"))
+
+        start = time.perf_counter()
+        job = store.create_job(f"images/{index:08d}.jpg" for index in range(items))
+        created = items / (time.perf_counter() - start)
+
+        print(f"{items} items, manifest insert {created:,.0f} items/s\n")
+        print("| checkpoint items | outcomes/s | commits |")
+        print("|---|---|---|")
+        for checkpoint in checkpoints:
+            rate = record(store, items, checkpoint)
+            commits = -(-items // checkpoint)
+            print(f"| {checkpoint} | {rate:,.0f} | {commits} |")
+
+        store.save_results(
+            job.job_id,
+            [JobItemResult(index=index, source="") for index in range(items)],
+        )
+        start = time.perf_counter()
+        after, read = 0, 0
+        while page := store.results(job.job_id, after, 1000):
+            after, read = page[-1][0], read + len(page)
+        paged = read / (time.perf_counter() - start)
+        print(f"\nresult paging {paged:,.0f} results/s")
+        store.close()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument(
+        "--checkpoints", nargs="+", type=int, default=[1, 16, 256, 1024]
+    )
+    args = parser.parse_args()
+    run(args.items, args.checkpoints)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""
+Load generator replaying an image mix against the detection API.
+
+Drives ``/api/detect-face`` with a weighted mix of synthetic images, the
+face fixture or files from disk, either at a fixed number of concurrent
+clients (closed loop) or at a fixed arrival rate (open loop). The target
+is the app in-process through httpx's ASGI transport, a uvicorn server
+started for the run, or any URL. The report gives throughput, latency
+percentiles, error and rejection rates and the server-side queue wait
+from ``X-Queue-Wait-Ms``. With ``--deadline-ms`` every request carries
+``X-Deadline-Ms`` and the report adds goodput, the rate of answers that
+arrived within the deadline, and the share of requests the server shed;
+``--output`` writes it in the format of
+``benchmarks.suite``, so two runs compare with
+``python -m benchmarks.suite compare``.
+
+In open-loop mode latency is measured from each request's scheduled send
+time, so a server that falls behind is charged for the queueing it
+causes instead of silently slowing the client down.
+
+Usage:
+    python -m benchmarks.load_generator [--target asgi|uvicorn|URL]
+        [--mix JPEG:720p=6 PNG:320p=2 face=1] [--concurrency 8 | --rate 50]
+        [--duration 10] [--warmup 2] [--deadline-ms 500] [--output load.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import mimetypes
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+
+from benchmarks.images import encode_image, synthetic_image
+from benchmarks.suite import (
+    FACE_FIXTURE,
+    FORMATS,
+    RESOLUTIONS,
+    SCHEMA_VERSION,
+    Metric,
+    environment,
+    uncached_app,
+)
+
+
+DEFAULT_MIX = ["JPEG:720p=6", "JPEG:320p=2", "PNG:720p=1", "face=1"]
+
+# How long a spawned uvicorn gets to answer /health
+_STARTUP_TIMEOUT = 60.0
+
+
+@dataclass(frozen=True)
+class MixEntry:
+    """Images of one kind in the request mix and their relative weight."""
+
+    name: str
+    variants: Sequence[bytes]
+    content_type: str
+    weight: float
+
+
+@dataclass(frozen=True)
+class Sample:
+    """Outcome of one request."""
+
+    latency: float
+    status: int
+    queue_wait: Optional[float]
+
+
+def parse_mix(spec: List[str], variants: int) -> List[MixEntry]:
+    """
+    Build the request mix from ``NAME=WEIGHT`` entries.
+
+    ``FORMAT:RESOLUTION`` (e.g. ``JPEG:720p``) is a synthetic image with
+    ``variants`` different seeds, ``face`` is the test fixture and
+    anything else is read as a file path.
+
+    Args:
+        spec: Mix entries
+        variants: Distinct synthetic images per entry
+
+    Returns:
+        Parsed entries
+
+    Raises:
+        ValueError: If an entry cannot be parsed
+    """
+    mix = []
+    for entry in spec:
+        name, _, weight = entry.rpartition("=")
+        if not name:
+            name, weight = weight, "1"
+        if name == "face":
+            data = [FACE_FIXTURE.read_bytes()]
+            content_type = "image/jpeg"
+        elif ":" in name and not Path(name).exists():
+            image_format, _, resolution = name.partition(":")
+            image_format = image_format.upper()
+            if image_format not in FORMATS or resolution not in RESOLUTIONS:
+                raise ValueError(f"Unknown synthetic image: {name}")
+            data = [
+                encode_image(
+                    synthetic_image(*RESOLUTIONS[resolution], seed=seed),
+                    image_format,
+                    **FORMATS[image_format],
+                )
+                for seed in range(variants)
+            ]
+            content_type = f"image/{image_format.lower()}"
+        else:
+            data = [Path(name).read_bytes()]
+            content_type = mimetypes.guess_type(name)[0] or "image/jpeg"
+        mix.append(MixEntry(name, data, content_type, float(weight)))
+    return mix
+
+
+class RequestPicker:
+    """Deterministic sequence of images drawn from the mix by weight."""
+
+    def __init__(self, mix: List[MixEntry], seed: int = 0):
+        """
+        Initialize the picker.
+
+        Args:
+            mix: Entries to draw from
+            seed: Seed making the sequence repeatable across runs
+        """
+        self._mix = mix
+        self._weights = [entry.weight for entry in mix]
+        self._rng = random.Random(seed)
+        self._counts = [0] * len(mix)
+
+    def next(self) -> Dict[str, tuple]:
+        """Multipart ``files`` argument for the next request."""
+        (index,) = self._rng.choices(range(len(self._mix)), self._weights)
+        entry = self._mix[index]
+        data = entry.variants[self._counts[index] % len(entry.variants)]
+        self._counts[index] += 1
+        return {"file": (entry.name, data, entry.content_type)}
+
+
+async def _send(
+    client: httpx.AsyncClient, files: Dict[str, tuple], started: float
+) -> Sample:
+    """Send one upload and time it from ``started``."""
+    queue_wait = None
+    try:
+        response = await client.post("/api/detect-face", files=files)
+        status = response.status_code
+        header = response.headers.get("X-Queue-Wait-Ms")
+        if header is not None:
+            queue_wait = float(header) / 1000
+    except httpx.HTTPError:
+        status = 0
+    return Sample(time.perf_counter() - started, status, queue_wait)
+
+
+async def closed_loop(
+    client: httpx.AsyncClient, picker: RequestPicker, concurrency: int, duration: float
+) -> List[Sample]:
+    """Keep ``concurrency`` requests outstanding for ``duration`` seconds."""
+    samples: List[Sample] = []
+    stop_at = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < stop_at:
+            samples.append(await _send(client, picker.next(), time.perf_counter()))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def open_loop(
+    client: httpx.AsyncClient,
+    picker: RequestPicker,
+    rate: float,
+    duration: float,
+    max_in_flight: int,
+) -> List[Sample]:
+    """
+    Start requests at ``rate`` per second regardless of completions.
+
+    Requests that would exceed ``max_in_flight`` are not sent and count as
+    client-side drops (status -1), which keeps an overloaded target from
+    exhausting the generator's sockets.
+    """
+    samples: List[Sample] = []
+    tasks = set()
+
+    def collect(task: asyncio.Task) -> None:
+        tasks.discard(task)
+        samples.append(task.result())
+
+    start = time.perf_counter()
+    for index in range(int(rate * duration)):
+        scheduled = start + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(tasks) >= max_in_flight:
+            samples.append(Sample(0.0, -1, None))
+            continue
+        task = asyncio.create_task(_send(client, picker.next(), scheduled))
+        tasks.add(task)
+        task.add_done_callback(collect)
+    if tasks:
+        await asyncio.wait(tasks)
+    return samples
+
+
+def summarize(
+    samples: List[Sample], elapsed: float, deadline: Optional[float] = None
+) -> Dict[str, Metric]:
+    """Reduce samples to throughput, percentiles and error rates."""
+    answered = [sample for sample in samples if sample.status == 200]
+    latencies = np.array([sample.latency for sample in answered]) * 1000
+    waits = (
+        np.array([s.queue_wait for s in answered if s.queue_wait is not None]) * 1000
+    )
+    total = max(len(samples), 1)
+    metrics = {
+        "throughput": Metric(len(answered) / elapsed, "req/s", True),
+        "error_rate": Metric(
+            sum(s.status not in (200, 429, 503, 504, -1) for s in samples) / total,
+            "ratio",
+        ),
+        "rejected_rate": Metric(
+            sum(s.status in (429, 503) for s in samples) / total, "ratio"
+        ),
+        "shed_rate": Metric(sum(s.status == 504 for s in samples) / total, "ratio"),
+        "dropped_rate": Metric(sum(s.status == -1 for s in samples) / total, "ratio"),
+    }
+    if deadline is not None:
+        on_time = sum(sample.latency <= deadline for sample in answered)
+        metrics["goodput"] = Metric(on_time / elapsed, "req/s", True)
+    for name, values in (("latency", latencies), ("queue_wait", waits)):
+        if len(values) == 0:
+            continue
+        for percentile in (50, 90, 99, 99.9):
+            label = f"p{percentile:g}".replace(".", "")
+            metrics[f"{name}.{label}"] = Metric(
+                float(np.percentile(values, percentile)), "ms"
+            )
+    return metrics
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused TCP port."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def open_client(
+    target: str, workers: int, with_cache: bool, connections: int
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield a client for the chosen target, starting a server if needed.
+
+    Args:
+        target: ``asgi``, ``uvicorn`` or a base URL
+        workers: uvicorn worker processes for the ``uvicorn`` target
+        with_cache: Leave the result caches on
+        connections: Connection pool size for network targets
+    """
+    limits = httpx.Limits(max_connections=connections)
+    timeout = httpx.Timeout(60.0)
+    if target == "asgi":
+        from app.main import create_app
+
+        app = create_app() if with_cache else uncached_app()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load", timeout=timeout
+        ) as client:
+            yield client
+        return
+
+    server = None
+    if target == "uvicorn":
+        port = _free_port()
+        target = f"http://127.0.0.1:{port}"
+        env = dict(os.environ)
+        if not with_cache:
+            env["RESULT_CACHE_ENABLED"] = "false"
+            env["NEAR_DUPLICATE_CACHE_ENABLED"] = "false"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)]
+            + ["--workers", str(workers), "--log-level", "warning"],
+            env=env,
+        )
+    try:
+        async with httpx.AsyncClient(
+            base_url=target, limits=limits, timeout=timeout
+        ) as client:
+            if server is not None:
+                await _wait_until_healthy(client, server)
+            yield client
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+async def _wait_until_healthy(
+    client: httpx.AsyncClient, server: subprocess.Popen
+) -> None:
+    """Poll /health until a spawned server answers."""
+    deadline = time.perf_counter() + _STARTUP_TIMEOUT
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+        with contextlib.suppress(httpx.HTTPError):
+            if (await client.get("/health")).status_code == 200:
+                return
+        await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn did not become healthy in time")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, object]:
+    """Warm up, measure and return the result document."""
+    mix = parse_mix(args.mix, args.variants)
+    picker = RequestPicker(mix, seed=args.seed)
+    connections = args.concurrency if args.rate is None else args.max_in_flight
+
+    async def phase(client: httpx.AsyncClient, duration: float) -> List[Sample]:
+        if args.rate is None:
+            return await closed_loop(client, picker, args.concurrency, duration)
+        return await open_loop(client, picker, args.rate, duration, args.max_in_flight)
+
+    async with open_client(
+        args.target, args.workers, args.with_cache, connections
+    ) as client:
+        if args.deadline_ms is not None:
+            client.headers["X-Deadline-Ms"] = f"{args.deadline_ms:g}"
+        if args.warmup > 0:
+            await phase(client, args.warmup)
+        start = time.perf_counter()
+        samples = await phase(client, args.duration)
+        elapsed = time.perf_counter() - start
+
+    deadline = args.deadline_ms / 1000 if args.deadline_ms is not None else None
+    metrics = summarize(samples, elapsed, deadline)
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "target": args.target,
+            "mode": "closed" if args.rate is None else "open",
+            "concurrency": args.concurrency if args.rate is None else None,
+            "rate": args.rate,
+            "duration": args.duration,
+            "mix": args.mix,
+            "variants": args.variants,
+            "with_cache": args.with_cache,
+            "deadline_ms": args.deadline_ms,
+            "requests": len(samples),
+        },
+        "environment": environment(),
+        "metrics": {name: asdict(metric) for name, metric in metrics.items()},
+    }
+
+
+def print_report(result: Dict[str, object]) -> None:
+    """Print the configuration and metrics as markdown."""
+    config = result["config"]
+    load = (
+        f"{config['rate']:g} req/s"
+        if config["mode"] == "open"
+        else f"{config['concurrency']} clients"
+    )
+    print(
+        f"{config['requests']} requests, {config['mode']} loop at {load}, "
+        f"target {config['target']}\n"
+    )
+    print("| metric | value |")
+    print("|---|---|")
+    for name, metric in result["metrics"].items():
+        print(f"| {name} | {metric['value']:.3f} {metric['unit']} |")
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", default="asgi")
+    parser.add_argument("--mix", nargs="+", default=DEFAULT_MIX)
+    parser.add_argument("--variants", type=int, default=8)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--concurrency", type=int, default=8)
+    mode.add_argument("--rate", type=float, default=None)
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--deadline-ms", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--with-cache", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    # The multipart parser warns about httpx's trailing CRLF on every upload
+    logging.basicConfig(level=logging.ERROR)
+    result = asyncio.run(run(args))
+    print_report(result)
+    if args.output is not None:
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Cost of encoding detailed detection results against inference.
+
+Encodes a result with ``--faces`` detections through the pydantic
+response model, the standard library JSON encoder and the orjson and
+msgpack encoders used by the detailed response mode, and prints the time
+per encode next to one MediaPipe inference on a camera-sized frame.
+
+Usage:
+    python -m benchmarks.serialization_benchmark [--faces 50] [--repeats 2000]
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from app.api.schemas import FaceDetectionResponse
+from app.api.serialization import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    encode,
+    result_payload,
+)
+from app.domain.models import FaceDetection, FaceDetectionResult
+from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+from benchmarks.images import synthetic_image
+
+
+def group_photo_result(faces: int) -> FaceDetectionResult:
+    """Build a result with ``faces`` detections of realistic precision."""
+    rng = np.random.default_rng(0)
+    detections = tuple(
+        FaceDetection(
+            score=float(rng.uniform(0.5, 1.0)),
+            box=tuple(float(v) for v in rng.uniform(0, 1, 4)),
+            keypoints=tuple((float(x), float(y)) for x, y in rng.uniform(0, 1, (6, 2))),
+        )
+        for _ in range(faces)
+    )
+    return FaceDetectionResult(
+        face_detected=bool(faces),
+        confidence=max((d.score for d in detections), default=None),
+        detections=detections,
+    )
+
+
+def time_per_call(function: Callable[[], object], repeats: int) -> float:
+    """Mean seconds per call."""
+    function()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def run(faces: int, repeats: int) -> None:
+    """Print a markdown table of encode times and one inference time."""
+    result = group_photo_result(faces)
+    payload = result_payload(result, detailed=True)
+
+    def pydantic_model() -> bytes:
+        return (
+            FaceDetectionResponse.model_validate(
+                {
+                    "face_detected": result.face_detected,
+                    "confidence": result.confidence,
+                    "detections": [
+                        {"score": d.score, "box": d.box, "keypoints": d.keypoints}
+                        for d in result.detections
+                    ],
+                }
+            )
+            .model_dump_json()
+            .encode()
+        )
+
+    def stdlib_json() -> bytes:
+        return json.dumps(
+            {
+                "face_detected": result.face_detected,
+                "confidence": result.confidence,
+                "detections": [
+                    {"score": d.score, "box": d.box, "keypoints": d.keypoints}
+                    for d in result.detections
+                ],
+            }
+        ).encode()
+
+    encoders: Dict[str, Callable[[], bytes]] = {
+        "pydantic model": pydantic_model,
+        "json (stdlib)": stdlib_json,
+        "orjson": lambda: encode(payload, JSON_MEDIA_TYPE),
+        "msgpack": lambda: encode(payload, MSGPACK_MEDIA_TYPE),
+    }
+
+    detector = MediaPipeFaceDetector()
+    frame = synthetic_image(640, 480)
+    inference = time_per_call(lambda: detector.detect_face_in_array(frame), 50)
+    detector.close()
+
+    print(f"{faces} detections; one 640x480 inference: {inference * 1e3:.2f} ms\n")
+    print("| encoder | us per result | bytes | share of inference |")
+    print("|---|---|---|---|")
+    for name, encoder in encoders.items():
+        seconds = time_per_call(encoder, repeats)
+        print(
+            f"| {name} | {seconds * 1e6:.0f} | {len(encoder())} "
+            f"| {seconds / inference:.1%} |"
+        )
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--faces", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.faces, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Reproducible benchmark suite with a JSON baseline and regression check.
+
+``run`` measures decode time per format and resolution, MediaPipe inference
+time per resolution and end-to-end throughput of ``/api/detect-face``
+through the ASGI app in-process, and writes every metric to a JSON file.
+``compare`` reads two such files and exits with status 1 when any metric
+is worse than the baseline by more than the tolerance. Inputs are
+deterministic synthetic images, so the suite runs offline on CPU-only
+machines; compare results from the same machine only.
+
+Usage:
+    python -m benchmarks.suite run [--quick] [--output current.json]
+        [--compare benchmarks/results/baseline.json] [--tolerance 0.25]
+    python -m benchmarks.suite compare BASELINE CURRENT [--tolerance 0.25]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import httpx
+import mediapipe
+import numpy as np
+from fastapi import FastAPI
+
+from app.api.dependencies import (
+    get_face_detection_service,
+    get_face_detector,
+    get_upload_guard,
+)
+from app.application.face_detection_service import FaceDetectionService
+from app.infrastructure.image_decoding import decode_to_rgb, fit_to_max_side
+from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+from app.main import create_app
+from benchmarks.images import encode_image, synthetic_image
+
+
+SCHEMA_VERSION = 1
+
+FACE_FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "face.jpg"
+
+FORMATS = {
+    "JPEG": {"quality": 90},
+    "PNG": {},
+    "WEBP": {"quality": 90},
+}
+
+RESOLUTIONS = {
+    "320p": (480, 320),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "12MP": (4000, 3000),
+    "24MP": (6000, 4000),
+}
+
+QUICK_RESOLUTIONS = ("320p", "720p")
+
+# Larger frames are shrunk to MAX_SIDE before inference and cost what 720p does
+INFERENCE_RESOLUTIONS = ("320p", "720p")
+
+# Budget the service applies by default (MAX_IMAGE_SIDE)
+MAX_SIDE = 1024
+
+
+@dataclass(frozen=True)
+class Metric:
+    """One measured value and which direction is an improvement."""
+
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Median wall time of ``fn`` in milliseconds, after one warm-up call."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1000
+
+
+def encoded_inputs(resolutions: List[str]) -> Dict[Tuple[str, str], bytes]:
+    """Encode the synthetic image of every resolution in every format."""
+    inputs = {}
+    for name in resolutions:
+        image = synthetic_image(*RESOLUTIONS[name])
+        for image_format, options in FORMATS.items():
+            inputs[image_format, name] = encode_image(image, image_format, **options)
+    return inputs
+
+
+def measure_decode(
+    inputs: Dict[Tuple[str, str], bytes], repeat: int
+) -> Dict[str, Metric]:
+    """Time ``decode_to_rgb`` under the default resolution budget."""
+    return {
+        f"decode.{image_format}.{name}": Metric(
+            time_call(lambda: decode_to_rgb(data, MAX_SIDE), repeat), "ms"
+        )
+        for (image_format, name), data in inputs.items()
+    }
+
+
+def measure_inference(repeat: int) -> Dict[str, Metric]:
+    """Time MediaPipe on decoded frames, with and without a face."""
+    detector = MediaPipeFaceDetector(pool_size=1)
+    frames = {
+        name: fit_to_max_side(synthetic_image(*RESOLUTIONS[name]), MAX_SIDE)
+        for name in INFERENCE_RESOLUTIONS
+    }
+    frames["face"] = decode_to_rgb(FACE_FIXTURE.read_bytes(), MAX_SIDE)
+    metrics = {
+        f"inference.{name}": Metric(
+            time_call(lambda: detector.detect_face_in_array(frame), repeat), "ms"
+        )
+        for name, frame in frames.items()
+    }
+    detector.close()
+    return metrics
+
+
+def uncached_app() -> FastAPI:
+    """Create the app with a service that never answers from a cache."""
+    app = create_app()
+    app.dependency_overrides[get_face_detection_service] = lambda: (
+        FaceDetectionService(
+            face_detector=get_face_detector(), upload_guard=get_upload_guard()
+        )
+    )
+    return app
+
+
+async def _drive(
+    client: httpx.AsyncClient, image_data: bytes, requests: int, concurrency: int
+) -> List[float]:
+    """Send ``requests`` uploads from ``concurrency`` tasks; return latencies."""
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/detect-face",
+                files={"file": ("bench.jpg", image_data, "image/jpeg")},
+            )
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def _measure_end_to_end(
+    image_data: bytes, requests: int, levels: List[int]
+) -> Dict[str, Metric]:
+    """Run the app in-process with the result cache bypassed."""
+    metrics = {}
+    transport = httpx.ASGITransport(app=uncached_app())
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await _drive(client, image_data, 2, 1)
+        for concurrency in levels:
+            start = time.perf_counter()
+            latencies = await _drive(client, image_data, requests, concurrency)
+            elapsed = time.perf_counter() - start
+            key = f"e2e.JPEG.720p.c{concurrency}"
+            metrics[f"{key}.throughput"] = Metric(requests / elapsed, "req/s", True)
+            metrics[f"{key}.p50"] = Metric(np.percentile(latencies, 50) * 1000, "ms")
+            metrics[f"{key}.p95"] = Metric(np.percentile(latencies, 95) * 1000, "ms")
+    return metrics
+
+
+def measure_end_to_end(
+    inputs: Dict[Tuple[str, str], bytes], requests: int, levels: List[int]
+) -> Dict[str, Metric]:
+    """Time ``/api/detect-face`` on a 720p JPEG at each concurrency level."""
+    return asyncio.run(_measure_end_to_end(inputs["JPEG", "720p"], requests, levels))
+
+
+def environment() -> Dict[str, object]:
+    """Describe the machine and library versions behind a result file."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "mediapipe": mediapipe.__version__,
+    }
+
+
+def run_suite(quick: bool, repeat: int, requests: int) -> Dict[str, object]:
+    """Run every benchmark and return the result document."""
+    # The multipart parser warns about httpx's trailing CRLF on every upload
+    logging.basicConfig(level=logging.ERROR)
+    resolutions = list(QUICK_RESOLUTIONS if quick else RESOLUTIONS)
+    inputs = encoded_inputs(resolutions)
+    metrics: Dict[str, Metric] = {}
+    for stage, measure in (
+        ("decode", lambda: measure_decode(inputs, repeat)),
+        ("inference", lambda: measure_inference(repeat)),
+        ("end-to-end", lambda: measure_end_to_end(inputs, requests, [1, 4])),
+    ):
+        print(f"measuring {stage}...", file=sys.stderr)
+        metrics.update(measure())
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "quick": quick,
+        "environment": environment(),
+        "metrics": {name: asdict(metric) for name, metric in metrics.items()},
+    }
+
+
+def compare(
+    baseline: Dict[str, object], current: Dict[str, object], tolerance: float
+) -> List[str]:
+    """
+    Print a comparison table and return the metrics that regressed.
+
+    A metric regresses when it is worse than the baseline by more than
+    ``tolerance``, relative to the baseline value. Metrics missing from
+    either file are listed but never fail the comparison.
+
+    Args:
+        baseline: Result document to compare against
+        current: Newly measured result document
+        tolerance: Allowed relative slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        Names of the regressed metrics
+    """
+    if baseline["environment"] != current["environment"]:
+        print("warning: results come from different environments\n")
+    if baseline.get("config") != current.get("config"):
+        print("warning: results come from differently configured runs\n")
+
+    base_metrics: Dict[str, dict] = baseline["metrics"]  # type: ignore[assignment]
+    new_metrics: Dict[str, dict] = current["metrics"]  # type: ignore[assignment]
+    regressions = []
+    print("| metric | baseline | current | change | status |")
+    print("|---|---|---|---|---|")
+    for name in sorted(base_metrics.keys() | new_metrics.keys()):
+        if name not in base_metrics or name not in new_metrics:
+            status = "new" if name in new_metrics else "missing"
+            print(f"| {name} | | | | {status} |")
+            continue
+        before, after = base_metrics[name], new_metrics[name]
+        if before["value"]:
+            change = (after["value"] - before["value"]) / before["value"]
+        else:
+            # Error rates are usually zero; any increase from zero regresses
+            change = float("inf") if after["value"] else 0.0
+        worse = -change if before["higher_is_better"] else change
+        status = "ok"
+        if worse > tolerance:
+            status = "REGRESSED"
+            regressions.append(name)
+        elif worse < -tolerance:
+            status = "improved"
+        print(
+            f"| {name} | {before['value']:.2f} {before['unit']} "
+            f"| {after['value']:.2f} {after['unit']} | {change:+.1%} | {status} |"
+        )
+    return regressions
+
+
+def _load(path: Path) -> Dict[str, object]:
+    """Read a result document, checking its schema version."""
+    document = json.loads(path.read_text())
+    if document.get("schema") != SCHEMA_VERSION:
+        raise SystemExit(f"{path}: unsupported schema {document.get('schema')}")
+    return document
+
+
+def _report(baseline_path: Path, current: Dict[str, object], tolerance: float) -> int:
+    """Compare against a baseline file and turn regressions into an exit code."""
+    regressions = compare(_load(baseline_path), current, tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed beyond {tolerance:.0%}")
+        return 1
+    return 0
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="measure and write a result file")
+    run_parser.add_argument("--output", type=Path, default=Path("benchmark.json"))
+    run_parser.add_argument("--quick", action="store_true")
+    run_parser.add_argument("--repeat", type=int, default=15)
+    run_parser.add_argument("--requests", type=int, default=40)
+    run_parser.add_argument("--compare", type=Path, default=None)
+    run_parser.add_argument("--tolerance", type=float, default=0.25)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--tolerance", type=float, default=0.25)
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        sys.exit(_report(args.baseline, _load(args.current), args.tolerance))
+
+    result = run_suite(args.quick, args.repeat, args.requests)
+    args.output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"wrote {len(result['metrics'])} metrics to {args.output}", file=sys.stderr)
+    if args.compare is not None:
+        sys.exit(_report(args.compare, result, args.tolerance))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Small-face recall, latency and memory of the tiled backend on large photos.
+
+Pastes the fixture face, cropped so the face fills about a third of the
+paste, at ``--face-sizes`` pixels into synthetic ``--size`` JPEGs and runs
+``detect_face(stop_at_first_face=True)``, as a request without
+``detections=true`` does, with the MediaPipe backend at ``MAX_IMAGE_SIDE``, the
+MediaPipe backend at full resolution and the tiled backend with and
+without early exit. A face counts as found when a detection box contains
+its centre. Each backend runs in a fresh process, and the peak of
+anonymous (heap) and file-backed resident memory above the idle process is
+sampled from ``/proc/self/status``, so the numbers are Linux-only.
+
+Usage:
+    python -m benchmarks.tiling_benchmark [--size 6000x4000]
+        [--face-sizes 60 90 120 200] [--tile-size 640] [--tile-overlap 160]
+"""
+
+import argparse
+import multiprocessing
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.domain.interfaces import IFaceDetector
+from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
+from app.infrastructure.tiled_detector import TiledFaceDetector
+from benchmarks.decode_benchmark import parse_size
+from benchmarks.images import encode_image, synthetic_image
+
+
+FACE_PATH = Path(__file__).parent.parent / "tests" / "fixtures" / "face.jpg"
+
+# Crop of the fixture around its face; the face box spans ~32% of it
+FACE_CROP = (80, 0, 400, 320)
+FACE_FRACTION = 0.32
+
+# Centre of a pasted face in pixels
+Centre = Tuple[float, float]
+
+
+def group_photo(
+    width: int, height: int, face_sizes: List[int]
+) -> Tuple[bytes, List[Centre]]:
+    """Encode a photo with one face of every size on a diagonal."""
+    image = synthetic_image(width, height)
+    face = Image.open(FACE_PATH).convert("RGB").crop(FACE_CROP)
+    centres = []
+    for index, size in enumerate(face_sizes, start=1):
+        side = round(size / FACE_FRACTION)
+        left = index * width // (len(face_sizes) + 1) - side // 2
+        top = index * height // (len(face_sizes) + 1) - side // 2
+        image[top : top + side, left : left + side] = np.asarray(
+            face.resize((side, side), Image.Resampling.LANCZOS)
+        )
+        centres.append((left + side / 2, top + side / 2))
+    return encode_image(image, "JPEG", quality=90), centres
+
+
+def _memory_kb() -> Dict[str, int]:
+    """Anonymous and file-backed resident memory of this process."""
+    with open("/proc/self/status") as status:
+        fields = dict(line.split(":", 1) for line in status)
+    return {name: int(fields[name].split()[0]) for name in ("RssAnon", "RssFile")}
+
+
+def measure(
+    backend: str, options: Dict, image_data: bytes, centres: List[Centre]
+) -> Dict[str, float]:
+    """Run one backend in this process and report time, memory and recall."""
+    detector: IFaceDetector = (
+        TiledFaceDetector(**options)
+        if backend == "tiled"
+        else MediaPipeFaceDetector(**options)
+    )
+    detector.prewarm()
+    width, height = Image.open(BytesIO(image_data)).size
+    idle = _memory_kb()
+    peak = dict(idle)
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.wait(0.002):
+            for name, value in _memory_kb().items():
+                peak[name] = max(peak[name], value)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    start = time.perf_counter()
+    # As a request without detections=true; only early exit backends use it
+    result = detector.detect_face(image_data, stop_at_first_face=True)
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    detector.close()
+
+    found = sum(
+        any(
+            x * width <= cx <= (x + w) * width and y * height <= cy <= (y + h) * height
+            for x, y, w, h in (detection.box for detection in result.detections)
+        )
+        for cx, cy in centres
+    )
+    return {
+        "ms": elapsed * 1000,
+        "found": found,
+        "detections": len(result.detections),
+        "face_detected": result.face_detected,
+        "anon_mb": (peak["RssAnon"] - idle["RssAnon"]) / 1024,
+        "file_mb": (peak["RssFile"] - idle["RssFile"]) / 1024,
+    }
+
+
+def run(
+    size: Tuple[int, int], face_sizes: List[int], tile_size: int, tile_overlap: int
+) -> None:
+    """Print a markdown table comparing the backends."""
+    image_data, centres = group_photo(*size, face_sizes)
+    tiled = {
+        "max_image_side": 1024,
+        "pool_size": 2,
+        "tile_size": tile_size,
+        "tile_overlap": tile_overlap,
+    }
+    backends = [
+        ("mediapipe 1024", "mediapipe", {"max_image_side": 1024}),
+        ("mediapipe full", "mediapipe", {"max_image_side": None}),
+        ("tiled", "tiled", tiled),
+        ("tiled early exit", "tiled", {**tiled, "early_exit": True}),
+    ]
+    print(
+        f"{size[0]}x{size[1]} JPEG ({len(image_data) / 1e6:.1f} MB), "
+        f"faces of {', '.join(map(str, face_sizes))} px\n"
+    )
+    print("| backend | ms | faces found | detections | heap MB | mapped MB |")
+    print("|---|---|---|---|---|---|")
+    context = multiprocessing.get_context("spawn")
+    for name, backend, options in backends:
+        with context.Pool(1) as pool:
+            row = pool.apply(measure, (backend, options, image_data, centres))
+        print(
+            f"| {name} | {row['ms']:.0f} | {row['found']}/{len(centres)} "
+            f"| {row['detections']} | {row['anon_mb']:.0f} | {row['file_mb']:.0f} |"
+        )
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=parse_size, default=(6000, 4000))
+    parser.add_argument("--face-sizes", nargs="+", type=int, default=[60, 90, 120, 200])
+    parser.add_argument("--tile-size", type=int, default=640)
+    parser.add_argument("--tile-overlap", type=int, default=160)
+    args = parser.parse_args()
+    run(args.size, args.face_sizes, args.tile_size, args.tile_overlap)
+
+
+if __name__ == "__main__":
+    main()
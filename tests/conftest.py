@@ -1,8 +1,123 @@
 """Pytest configuration."""
 
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+import pytest
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def face_image_bytes() -> bytes:
+    """JPEG bytes of a photo that contains one clearly visible face."""
+    return (FIXTURES_DIR / "face.jpg").read_bytes()
+
+
+@pytest.fixture
+def face_video_path(tmp_path) -> str:
+    """
+    Three-second 10 fps MJPEG video with the face fixture from 1 s to 2 s.
+
+    The other frames are black.
+    """
+    face = cv2.imread(str(FIXTURES_DIR / "face.jpg"))
+    height, width = face.shape[:2]
+    path = str(tmp_path / "face.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (width, height))
+    for index in range(30):
+        writer.write(face if 10 <= index < 20 else np.zeros_like(face))
+    writer.release()
+    return path
+
+
+class ImageServer:
+    """
+    Local stand-in for object storage, serving canned responses over HTTP/1.1.
+
+    Routes map a path to ``(status, body, delay_seconds)``; responses go out
+    with a Content-Length unless the path is in ``unsized``. The server
+    counts requests, the client ports they came from and the most requests
+    it handled at once.
+    """
+
+    def __init__(self):
+        self.routes: Dict[str, Tuple[int, bytes, float]] = {}
+        self.unsized: Set[str] = set()
+        self.requests = 0
+        self.client_ports: Set[int] = set()
+        self.peak_concurrency = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def url(self, path: str) -> str:
+        """Absolute URL of a path on this server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self) -> None:
+        """Serve on an ephemeral localhost port from a background thread."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    server.client_ports.add(self.client_address[1])
+                    server._active += 1
+                    server.peak_concurrency = max(
+                        server.peak_concurrency, server._active
+                    )
+                try:
+                    status, body, delay = server.routes.get(
+                        self.path, (404, b"missing", 0.0)
+                    )
+                    time.sleep(delay)
+                    self.send_response(status)
+                    if self.path in server.unsized:
+                        self.send_header("Connection", "close")
+                        self.close_connection = True
+                    else:
+                        self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server._lock:
+                        server._active -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.01,), daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def image_server(face_image_bytes):
+    """Running ImageServer with the face fixture at ``/face.jpg``."""
+    server = ImageServer()
+    server.routes["/face.jpg"] = (200, face_image_bytes, 0.0)
+    server.start()
+    yield server
+    server.stop()
@@ -1,10 +1,48 @@
 """Integration tests for API endpoints."""
 
+import json
+import tempfile
+import time
+
+import cv2
+import msgpack
+import numpy as np
+import tarfile
+import zipfile
+
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
 from io import BytesIO
+from unittest.mock import AsyncMock
 from PIL import Image
+from prometheus_client.parser import text_string_to_metric_families
 
+from app.api.config import Settings, get_settings
+from app.api.endpoints import _spool_to_temp_file
+from app.api.dependencies import (
+    get_cascade_detector,
+    get_face_detector,
+    get_image_fetcher,
+    get_face_detection_service,
+    get_inference_executor,
+    get_job_runner,
+    get_live_session_limiter,
+    get_pipeline_metrics,
+    get_rate_limiter,
+    get_upload_guard,
+)
+from app.application.job_runner import JobRunner
+from app.application.live_session import LiveSessionLimiter
+from app.application.rate_limiter import TokenBucketRateLimiter
+from app.application.upload_guard import UploadGuard
+from app.domain.exceptions import ServiceOverloadedError
+from app.infrastructure.cascade_detector import CascadeFaceDetector
+from app.infrastructure.http_image_fetcher import HttpImageFetcher
+from app.infrastructure.image_header import HeaderImageInspector
+from app.infrastructure.local_image_reader import LocalImageReader
+from app.infrastructure.sqlite_job_store import SqliteJobStore
 from app.main import create_app
 
 
@@ -15,9 +53,11 @@ def client():
     return TestClient(app)
 
 
-def create_test_image(width=100, height=100, format="PNG") -> BytesIO:
+def create_test_image(
+    width=100, height=100, format="PNG", color=(73, 109, 137)
+) -> BytesIO:
     """Create a test image file."""
-    image = Image.new("RGB", (width, height), color=(73, 109, 137))
+    image = Image.new("RGB", (width, height), color=color)
     buffer = BytesIO()
     image.save(buffer, format=format)
     buffer.seek(0)
@@ -37,6 +77,45 @@ class TestHealthEndpoint:
         assert "version" in data
 
 
+class TestReadinessEndpoint:
+    """Test cases for the readiness check endpoint."""
+
+    def test_not_ready_before_startup(self, client):
+        """Test readiness is 503 until the lifespan warm-up has run."""
+        response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.json() == {"ready": False, "time_to_ready_seconds": None}
+
+    def test_ready_after_warm_up(self):
+        """Test the lifespan warms up the detector before serving."""
+        with TestClient(create_app()) as client:
+            response = client.get("/ready")
+            warmed = get_face_detector.cache_info().currsize
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["time_to_ready_seconds"] > 0
+        assert warmed == 1
+
+    def test_failed_warm_up_stays_unready(self, monkeypatch):
+        """Test a warm-up failure leaves the service running but unready."""
+
+        def fail() -> None:
+            raise ValueError("model file missing")
+
+        monkeypatch.setattr("app.main.warm_up", fail)
+
+        with TestClient(create_app()) as client:
+            ready = client.get("/ready")
+            health = client.get("/health")
+
+        assert ready.status_code == 503
+        assert ready.json()["ready"] is False
+        assert health.status_code == 200
+
+
 class TestFaceDetectionEndpoint:
     """Test cases for face detection endpoint."""
 
@@ -126,6 +205,944 @@ class TestFaceDetectionEndpoint:
         # Verify only face_detected is in response (no confidence or other fields)
         assert set(data.keys()) == {"face_detected"}
 
+    def test_detect_face_reports_queue_headers(self, client):
+        """Test that queue depth and wait time are exposed as headers."""
+        # Arrange
+        image_file = create_test_image()
+
+        # Act
+        response = client.post(
+            "/api/detect-face", files={"file": ("test.png", image_file, "image/png")}
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert int(response.headers["X-Queue-Depth"]) >= 0
+        assert float(response.headers["X-Queue-Wait-Ms"]) >= 0
+
+    def test_detect_face_when_overloaded(self):
+        """Test that a full queue returns 503 with Retry-After."""
+        # Arrange
+        app = create_app()
+        executor = AsyncMock()
+        executor.run.side_effect = ServiceOverloadedError("at capacity", retry_after=3)
+        app.dependency_overrides[get_inference_executor] = lambda: executor
+        client = TestClient(app)
+        # A colour no other test detects, so the result cache cannot answer
+        image_file = create_test_image(color=(200, 30, 30))
+
+        # Act
+        response = client.post(
+            "/api/detect-face", files={"file": ("test.png", image_file, "image/png")}
+        )
+
+        # Assert
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+        assert response.json()["detail"] == "at capacity"
+
+
+class TestAdmissionControl:
+    """Test cases for rate limits, priorities and deadlines."""
+
+    def _post(self, client, headers, color=(73, 109, 137)):
+        """Upload a small image with the given admission headers."""
+        image_bytes = create_test_image(width=64, height=48, color=color).getvalue()
+        return client.post(
+            "/api/detect-face",
+            files={"file": ("test.png", BytesIO(image_bytes), "image/png")},
+            headers=headers,
+        )
+
+    def test_rate_limit_per_api_key(self, client):
+        """Test a client over its limit gets 429 while others are served."""
+        limiter = TokenBucketRateLimiter(rate=0.01, burst=1)
+        client.app.dependency_overrides[get_rate_limiter] = lambda: limiter
+
+        first = self._post(client, {"X-API-Key": "noisy"})
+        second = self._post(client, {"X-API-Key": "noisy"})
+        other = self._post(client, {"X-API-Key": "quiet"})
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+        assert int(second.headers["Retry-After"]) >= 1
+        assert other.status_code == 200
+
+    def test_request_that_cannot_meet_deadline_is_shed(self, client):
+        """Test a deadline shorter than reading the upload returns 504."""
+        # A colour no other test detects, so the result cache cannot answer
+        response = self._post(client, {"X-Deadline-Ms": "0.001"}, color=(200, 30, 30))
+
+        assert response.status_code == 504
+        assert "deadline" in response.json()["detail"]
+
+    def test_generous_deadline_and_priority(self, client):
+        """Test requests within their deadline are served at any priority."""
+        for priority in ("high", "normal", "LOW"):
+            response = self._post(
+                client, {"X-Priority": priority, "X-Deadline-Ms": "60000"}
+            )
+
+            assert response.status_code == 200
+
+    def test_unknown_priority(self, client):
+        """Test an unknown priority class is rejected."""
+        response = self._post(client, {"X-Priority": "urgent"})
+
+        assert response.status_code == 400
+        assert "Unknown priority" in response.json()["detail"]
+
+    def test_batch_takes_a_token_per_file(self, client):
+        """Test a batch spends the caller's rate limit once per image."""
+        limiter = TokenBucketRateLimiter(rate=0.01, burst=3)
+        client.app.dependency_overrides[get_rate_limiter] = lambda: limiter
+        files = [
+            ("files", (f"{i}.png", create_test_image(), "image/png")) for i in range(3)
+        ]
+        headers = {"X-API-Key": "tenant"}
+
+        first = client.post("/api/detect-faces", files=files, headers=headers)
+        second = self._post(client, headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+
+    def test_url_request_over_rate_limit(self, client):
+        """Test the URL endpoint is rate limited like uploads."""
+        limiter = TokenBucketRateLimiter(rate=0.01, burst=1)
+        client.app.dependency_overrides[get_rate_limiter] = lambda: limiter
+        headers = {"X-API-Key": "tenant"}
+        self._post(client, headers)
+
+        response = client.post(
+            "/api/detect-urls",
+            json={"urls": ["http://127.0.0.1/face.jpg"]},
+            headers=headers,
+        )
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_batch_images_past_deadline_fail_their_entries(self, client):
+        """Test the batch applies the request deadline to every image."""
+        # Colours no other test detects, so the result cache cannot answer
+        files = [
+            ("files", (f"{i}.png", create_test_image(color=(200, 30, i)), "image/png"))
+            for i in range(2)
+        ]
+
+        response = client.post(
+            "/api/detect-faces", files=files, headers={"X-Deadline-Ms": "0.001"}
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert all("deadline" in item["error"] for item in results)
+
+    def test_video_past_deadline_is_shed(self, client):
+        """Test the video endpoint answers 504 for a deadline it cannot meet."""
+        response = client.post(
+            "/api/detect-video",
+            files={"file": ("clip.mp4", BytesIO(b"\0" * 64), "video/mp4")},
+            headers={"X-Deadline-Ms": "0.001"},
+        )
+
+        assert response.status_code == 504
+
+
+class TestBatchDetectionEndpoint:
+    """Test cases for the batch face detection endpoint."""
+
+    def test_mixed_batch_reports_each_file(self, client):
+        """Test valid and invalid files get their own entries, in order."""
+        # Arrange
+        files = [
+            ("files", ("a.png", create_test_image(), "image/png")),
+            ("files", ("b.txt", BytesIO(b"text"), "text/plain")),
+            ("files", ("c.png", BytesIO(b""), "image/png")),
+            ("files", ("d.jpg", BytesIO(b"not an image"), "image/jpeg")),
+            ("files", ("e.jpg", create_test_image(format="JPEG"), "image/jpeg")),
+        ]
+
+        # Act
+        response = client.post("/api/detect-faces", files=files)
+
+        # Assert
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [item["index"] for item in results] == [0, 1, 2, 3, 4]
+        assert [item["filename"] for item in results] == [
+            "a.png",
+            "b.txt",
+            "c.png",
+            "d.jpg",
+            "e.jpg",
+        ]
+        assert results[0]["face_detected"] is False
+        assert results[0]["error"] is None
+        assert "Invalid file type" in results[1]["error"]
+        assert results[2]["error"] == "Uploaded file is empty"
+        assert results[3]["face_detected"] is None
+        assert results[3]["error"]
+        assert results[4]["face_detected"] is False
+
+    def test_too_many_files(self):
+        """Test that the file count limit returns 400."""
+        # Arrange
+        app = create_app()
+        app.dependency_overrides[get_settings] = lambda: Settings(batch_max_files=2)
+        client = TestClient(app)
+        files = [
+            ("files", (f"{i}.png", create_test_image(), "image/png")) for i in range(3)
+        ]
+
+        # Act
+        response = client.post("/api/detect-faces", files=files)
+
+        # Assert
+        assert response.status_code == 400
+        assert "Too many files" in response.json()["detail"]
+
+    def test_batch_too_large(self):
+        """Test that the total size limit returns 413."""
+        # Arrange
+        app = create_app()
+        app.dependency_overrides[get_settings] = lambda: Settings(
+            batch_max_total_bytes=100
+        )
+        client = TestClient(app)
+        files = [("files", ("a.png", create_test_image(), "image/png"))]
+
+        # Act
+        response = client.post("/api/detect-faces", files=files)
+
+        # Assert
+        assert response.status_code == 413
+
+    def test_batch_budget_spans_files(self):
+        """Test files that fit alone are rejected once they exhaust the budget."""
+        image_bytes = create_test_image().getvalue()
+        app = create_app()
+        limit = len(image_bytes) + 10
+        app.dependency_overrides[get_settings] = lambda: Settings(
+            batch_max_total_bytes=limit
+        )
+        client = TestClient(app)
+        files = [
+            ("files", (f"{i}.png", BytesIO(image_bytes), "image/png")) for i in range(2)
+        ]
+
+        response = client.post("/api/detect-faces", files=files)
+
+        assert response.status_code == 413
+        assert response.json()["detail"] == (
+            f"Batch too large: at most {limit} bytes per request"
+        )
+
+
+class TestUrlDetectionEndpoint:
+    """Test cases for the detect-by-URL endpoint."""
+
+    @pytest.fixture
+    def url_app(self):
+        """App whose fetcher may only reach the local image server."""
+        app = create_app()
+        app.dependency_overrides[get_image_fetcher] = lambda: HttpImageFetcher(
+            allowed_hosts=frozenset({"127.0.0.1"})
+        )
+        return app
+
+    def test_detect_urls(self, url_app, image_server):
+        """Test results and errors are reported per URL in request order."""
+        urls = [
+            image_server.url("/face.jpg"),
+            image_server.url("/missing.jpg"),
+            "https://elsewhere.example/face.jpg",
+        ]
+
+        response = TestClient(url_app).post("/api/detect-urls", json={"urls": urls})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [item["url"] for item in results] == urls
+        assert results[0]["face_detected"] is True
+        assert "error" not in results[0]
+        assert results[1]["error"] == "Fetch failed: HTTP 404"
+        assert results[2]["error"] == "Host not allowed: elsewhere.example"
+
+    def test_fetched_images_pass_upload_guard(self, url_app, image_server):
+        """Test fetched bytes get the same format checks as uploads."""
+        image_server.routes["/notes.txt"] = (200, b"plain text, not an image", 0.0)
+
+        response = TestClient(url_app).post(
+            "/api/detect-urls", json={"urls": [image_server.url("/notes.txt")]}
+        )
+
+        assert response.status_code == 200
+        assert "face_detected" not in response.json()["results"][0]
+        assert response.json()["results"][0]["error"]
+
+    def test_too_many_urls(self, url_app):
+        """Test that the URL count limit returns 400."""
+        url_app.dependency_overrides[get_settings] = lambda: Settings(
+            url_fetch_max_urls=1
+        )
+
+        response = TestClient(url_app).post(
+            "/api/detect-urls",
+            json={"urls": ["http://127.0.0.1/a.jpg", "http://127.0.0.1/b.jpg"]},
+        )
+
+        assert response.status_code == 400
+        assert "Too many URLs" in response.json()["detail"]
+
+    def test_empty_url_list_is_rejected(self, client):
+        """Test that a request without URLs fails validation."""
+        response = client.post("/api/detect-urls", json={"urls": []})
+
+        assert response.status_code == 422
+
+    def test_no_host_allowed_by_default(self, client):
+        """Test URL fetching refuses every host until hosts are configured."""
+        response = client.post(
+            "/api/detect-urls", json={"urls": ["http://127.0.0.1/face.jpg"]}
+        )
+
+        assert response.json()["results"][0]["error"] == "Host not allowed: 127.0.0.1"
+
+
+class TestJobEndpoints:
+    """Test cases for the bulk job endpoints."""
+
+    @pytest.fixture
+    def job_app(self, tmp_path, face_image_bytes):
+        """App with bulk jobs reading from a temporary image root."""
+        (tmp_path / "images").mkdir()
+        (tmp_path / "images" / "face.jpg").write_bytes(face_image_bytes)
+        app = create_app()
+        runner = JobRunner(
+            store=SqliteJobStore(str(tmp_path / "jobs.sqlite3")),
+            service=get_face_detection_service(),
+            executor=get_inference_executor(),
+            url_fetcher=HttpImageFetcher(allowed_hosts=frozenset({"127.0.0.1"})),
+            file_reader=LocalImageReader(str(tmp_path / "images")),
+            checkpoint_seconds=0.05,
+        )
+        app.dependency_overrides[get_job_runner] = lambda: runner
+        return app
+
+    @staticmethod
+    def wait_for(client, job_id):
+        """Poll the progress endpoint until the job completes."""
+        for _ in range(300):
+            job = client.get(f"/api/jobs/{job_id}").json()
+            if job["status"] == "completed":
+                return job
+            time.sleep(0.02)
+        raise AssertionError("Job did not complete")
+
+    def test_submit_poll_and_stream_results(self, job_app, image_server):
+        """Test a manifest of paths and URLs runs to per-item results."""
+        manifest = "\n".join(
+            ["face.jpg", "", image_server.url("/face.jpg"), "../outside.jpg"]
+        )
+
+        with TestClient(job_app) as client:
+            response = client.post(
+                "/api/jobs", content=manifest, headers={"Content-Type": "text/plain"}
+            )
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            assert response.json()["total"] == 3
+
+            job = self.wait_for(client, job_id)
+            lines = client.get(f"/api/jobs/{job_id}/results").text.splitlines()
+            rest = client.get(f"/api/jobs/{job_id}/results", params={"after": 2})
+
+        assert (job["done"], job["faces"], job["failed"]) == (3, 2, 1)
+        assert job["finished_at"] is not None
+        results = {item["index"]: item for item in map(json.loads, lines)}
+        assert sorted(item["sequence"] for item in results.values()) == [1, 2, 3]
+        assert results[0]["source"] == "face.jpg"
+        assert results[0]["face_detected"] is True
+        assert results[1]["face_detected"] is True
+        assert results[2]["error"] == "Path is outside the image root"
+        assert [json.loads(line)["sequence"] for line in rest.text.splitlines()] == [3]
+
+    def test_follow_streams_until_completion(self, job_app):
+        """Test following a job returns every result once it completes."""
+        with TestClient(job_app) as client:
+            job_id = client.post("/api/jobs", content="face.jpg\nface.jpg").json()[
+                "job_id"
+            ]
+            response = client.get(
+                f"/api/jobs/{job_id}/results", params={"follow": True}
+            )
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert len(response.text.splitlines()) == 2
+
+    def test_invalid_manifests(self, job_app):
+        """Test empty, non-UTF-8 and oversized manifests are refused."""
+        job_app.dependency_overrides[get_settings] = lambda: Settings(
+            job_max_manifest_bytes=64
+        )
+
+        with TestClient(job_app) as client:
+            empty = client.post("/api/jobs", content="\n\n")
+            binary = client.post("/api/jobs", content=b"face.jpg\n\xff\xfe\n")
+            large = client.post("/api/jobs", content="face.jpg\n" * 10)
+
+        assert empty.status_code == 400
+        assert empty.json()["detail"] == "Manifest lists no images"
+        assert binary.status_code == 400
+        assert "line 2" in binary.json()["detail"]
+        assert large.status_code == 413
+
+    def test_unknown_job(self, job_app):
+        """Test progress and results of an unknown job return 404."""
+        with TestClient(job_app) as client:
+            progress = client.get("/api/jobs/missing")
+            results = client.get("/api/jobs/missing/results")
+
+        assert progress.status_code == 404
+        assert results.status_code == 404
+
+    def test_jobs_disabled_by_default(self, client):
+        """Test the job endpoints are off until enabled."""
+        response = client.post("/api/jobs", content="face.jpg")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Bulk jobs are disabled"
+
+
+class TestArchiveDetectionEndpoint:
+    """Test cases for the archive streaming endpoint."""
+
+    @staticmethod
+    def _members(face_image_bytes):
+        return {
+            "people/face.jpg": face_image_bytes,
+            "plain.png": create_test_image().getvalue(),
+            "notes.txt": b"not an image",
+        }
+
+    def _post(self, client, archive_bytes, filename):
+        return client.post(
+            "/api/detect-archive",
+            files={"file": (filename, BytesIO(archive_bytes), "application/zip")},
+        )
+
+    def test_zip_archive_streams_ndjson(self, client, face_image_bytes):
+        """Test each zip member produces one NDJSON line."""
+        # Arrange
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("people/", b"")
+            for name, data in self._members(face_image_bytes).items():
+                archive.writestr(name, data)
+
+        # Act
+        response = self._post(client, buffer.getvalue(), "images.zip")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        by_name = {line["name"]: line for line in lines}
+        assert set(by_name) == {"people/face.jpg", "plain.png", "notes.txt"}
+        assert by_name["people/face.jpg"]["face_detected"] is True
+        assert by_name["people/face.jpg"]["confidence"] > 0.5
+        assert by_name["plain.png"]["face_detected"] is False
+        assert by_name["notes.txt"]["face_detected"] is None
+        assert by_name["notes.txt"]["error"]
+
+    def test_members_are_paced_by_rate_limit(self, client, face_image_bytes):
+        """Test an archive waits for tokens instead of failing mid-stream."""
+        limiter = TokenBucketRateLimiter(rate=20, burst=2)
+        client.app.dependency_overrides[get_rate_limiter] = lambda: limiter
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for name, data in self._members(face_image_bytes).items():
+                archive.writestr(name, data)
+
+        start = time.perf_counter()
+        response = self._post(client, buffer.getvalue(), "images.zip")
+
+        # The third member found the bucket empty and waited for a refill
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 3
+        assert time.perf_counter() - start >= 1
+
+    def test_compressed_tar_archive(self, client, face_image_bytes):
+        """Test gzip-compressed tar archives are read as a stream."""
+        # Arrange
+        buffer = BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for name, data in self._members(face_image_bytes).items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, BytesIO(data))
+
+        # Act
+        response = self._post(client, buffer.getvalue(), "images.tar.gz")
+
+        # Assert
+        assert response.status_code == 200
+        names = [json.loads(line)["name"] for line in response.text.splitlines()]
+        assert sorted(names) == ["notes.txt", "people/face.jpg", "plain.png"]
+
+    def test_oversized_member_is_reported(self, face_image_bytes):
+        """Test members over the size limit are rejected individually."""
+        # Arrange
+        app = create_app()
+        app.dependency_overrides[get_settings] = lambda: Settings(
+            archive_max_member_bytes=1000
+        )
+        client = TestClient(app)
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("big.jpg", face_image_bytes)
+
+        # Act
+        response = self._post(client, buffer.getvalue(), "images.zip")
+
+        # Assert
+        line = json.loads(response.text)
+        assert line["name"] == "big.jpg"
+        assert "larger than 1000 bytes" in line["error"]
+
+    def test_non_archive_is_rejected(self, client):
+        """Test that other uploads return 400."""
+        response = self._post(client, b"definitely not an archive" * 40, "x.zip")
+
+        assert response.status_code == 400
+        assert "Invalid archive" in response.json()["detail"]
+
+
+class TestVideoDetectionEndpoint:
+    """Test cases for the video face detection endpoint."""
+
+    def _post(self, client, path, query=""):
+        with open(path, "rb") as video:
+            return client.post(
+                f"/api/detect-video{query}",
+                files={"file": ("clip.avi", video, "video/x-msvideo")},
+            )
+
+    def test_video_timeline(self, client, face_video_path):
+        """Test a full pass returns the segment timeline."""
+        response = self._post(client, face_video_path)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["face_detected"] is True
+        assert data["stopped_early"] is False
+        assert [s["face_detected"] for s in data["segments"]] == [False, True, False]
+
+    def test_video_early_exit(self, client, face_video_path):
+        """Test early exit reads only part of the video."""
+        response = self._post(client, face_video_path, "?stop_at_first_face=true")
+
+        data = response.json()
+        assert data["face_detected"] is True
+        assert data["stopped_early"] is True
+        assert data["frames_read"] < 30
+
+    def test_invalid_video(self, client, tmp_path):
+        """Test that unreadable videos return 400."""
+        path = tmp_path / "clip.avi"
+        path.write_bytes(b"garbage" * 100)
+
+        response = self._post(client, str(path))
+
+        assert response.status_code == 400
+
+    def test_video_too_large(self, face_video_path):
+        """Test that the size limit returns 413."""
+        app = create_app()
+        app.dependency_overrides[get_settings] = lambda: Settings(video_max_bytes=100)
+        client = TestClient(app)
+
+        response = self._post(client, face_video_path)
+
+        assert response.status_code == 413
+
+    def test_size_limit_holds_without_declared_size(self, tmp_path, monkeypatch):
+        """Test the spool counts bytes itself and cleans up when over."""
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+        with pytest.raises(HTTPException) as exc_info:
+            _spool_to_temp_file(BytesIO(b"\0" * 200), ".mp4", max_bytes=100)
+
+        assert exc_info.value.status_code == 413
+        assert list(tmp_path.iterdir()) == []
+
+    def test_non_video_content_type(self, client):
+        """Test that images are rejected by content type."""
+        response = client.post(
+            "/api/detect-video",
+            files={"file": ("a.png", create_test_image(), "image/png")},
+        )
+
+        assert response.status_code == 400
+
+
+class TestLiveDetectionWebSocket:
+    """Test cases for the live WebSocket endpoint."""
+
+    def test_encoded_frames_get_results(self, client, face_image_bytes):
+        """Test each processed frame returns its ID and latency."""
+        with client.websocket_connect("/api/ws/detect-face") as websocket:
+            websocket.send_bytes(face_image_bytes)
+            result = websocket.receive_json()
+
+        assert result["frame_id"] == 1
+        assert result["face_detected"] is True
+        assert result["confidence"] > 0.5
+        assert result["latency_ms"] >= 0
+        assert result["error"] is None
+
+    def test_raw_frames(self, client, face_image_bytes):
+        """Test raw RGB frames after a format message."""
+        image = Image.open(BytesIO(face_image_bytes)).convert("RGB")
+
+        with client.websocket_connect("/api/ws/detect-face") as websocket:
+            websocket.send_text(
+                json.dumps(
+                    {"format": "rgb24", "width": image.width, "height": image.height}
+                )
+            )
+            websocket.send_bytes(image.tobytes())
+            result = websocket.receive_json()
+            websocket.send_bytes(b"short")
+            error = websocket.receive_json()
+
+        assert result["face_detected"] is True
+        assert error["frame_id"] == 2
+        assert "Invalid frame data" in error["error"]
+
+    def test_bad_format_message(self, client):
+        """Test malformed control messages are answered with an error."""
+        with client.websocket_connect("/api/ws/detect-face") as websocket:
+            websocket.send_text('{"format": "yuyv", "width": 1, "height": 1}')
+            error = websocket.receive_json()
+
+        assert "Unsupported pixel format" in error["error"]
+
+    def test_session_limit_closes_with_1013(self):
+        """Test sessions beyond the limit are turned away."""
+        app = create_app()
+        limiter = LiveSessionLimiter(max_sessions=1)
+        app.dependency_overrides[get_live_session_limiter] = lambda: limiter
+        client = TestClient(app)
+
+        with client.websocket_connect("/api/ws/detect-face"):
+            with client.websocket_connect("/api/ws/detect-face") as second:
+                with pytest.raises(WebSocketDisconnect) as closed:
+                    second.receive_json()
+
+        assert closed.value.code == 1013
+
+
+class TestUploadGuardEndpoint:
+    """Test cases for upload limits on the single-image endpoint."""
+
+    def test_decompression_bomb_rejected(self, client):
+        """Test a tiny PNG claiming gigapixels is rejected from its header."""
+        ihdr = b"IHDR" + (100_000).to_bytes(4, "big") * 2 + b"\x08\x02\x00\x00\x00"
+        bomb = b"\x89PNG\r\n\x1a\n" + len(ihdr[4:]).to_bytes(4, "big") + ihdr
+
+        response = client.post(
+            "/api/detect-face", files={"file": ("bomb.png", bomb, "image/png")}
+        )
+
+        assert response.status_code == 413
+        assert "100000x100000 pixels" in response.json()["detail"]
+
+    def test_upload_over_byte_limit_rejected(self, client):
+        """Test uploads larger than the byte limit are rejected with 413."""
+        client.app.dependency_overrides[get_upload_guard] = lambda: UploadGuard(
+            HeaderImageInspector(), max_bytes=100, max_pixels=10**6
+        )
+
+        response = client.post(
+            "/api/detect-face",
+            files={"file": ("big.png", create_test_image(200, 200), "image/png")},
+        )
+
+        assert response.status_code == 413
+
+    def test_unsupported_format_rejected(self, client):
+        """Test images PIL can read but the service does not decode get 415."""
+        buffer = BytesIO()
+        Image.new("RGB", (32, 32)).save(buffer, format="PPM")
+
+        response = client.post(
+            "/api/detect-face",
+            files={"file": ("a.ppm", buffer.getvalue(), "image/x-portable-pixmap")},
+        )
+
+        assert response.status_code == 415
+        assert "PPM" in response.json()["detail"]
+
+
+class TestDetailedDetection:
+    """Test cases for the detailed and msgpack response modes."""
+
+    def test_detections_mode_returns_boxes(self, client, face_image_bytes):
+        """Test detections=true returns every face with box and keypoints."""
+        response = client.post(
+            "/api/detect-face?detections=true",
+            files={"file": ("face.jpg", face_image_bytes, "image/jpeg")},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert "X-Queue-Wait-Ms" in response.headers
+        data = response.json()
+        assert data["face_detected"] is True
+        (face,) = data["detections"]
+        assert face["score"] == data["confidence"]
+        assert len(face["box"]) == 4
+        assert len(face["keypoints"]) == 6
+
+    def test_detections_mode_without_face(self, client):
+        """Test the detailed mode reports an empty list without a face."""
+        response = client.post(
+            "/api/detect-face?detections=true",
+            files={"file": ("test.png", create_test_image(), "image/png")},
+        )
+
+        assert response.json() == {
+            "face_detected": False,
+            "confidence": None,
+            "detections": [],
+        }
+
+    def test_msgpack_selected_by_accept_header(self, client, face_image_bytes):
+        """Test Accept: application/msgpack returns a msgpack body."""
+        response = client.post(
+            "/api/detect-face?detections=true",
+            files={"file": ("face.jpg", face_image_bytes, "image/jpeg")},
+            headers={"Accept": "application/msgpack, application/json;q=0.5"},
+        )
+
+        assert response.headers["content-type"] == "application/msgpack"
+        data = msgpack.unpackb(response.content)
+        assert data["face_detected"] is True
+        assert set(data["detections"][0]) == {"score", "box", "keypoints"}
+
+    def test_json_preferred_over_msgpack(self, client):
+        """Test JSON is kept when the client ranks it higher."""
+        response = client.post(
+            "/api/detect-face",
+            files={"file": ("test.png", create_test_image(), "image/png")},
+            headers={"Accept": "application/json, application/msgpack;q=0.5"},
+        )
+
+        assert response.json() == {"face_detected": False}
+
+
+class TestRawFrameEndpoint:
+    """Test cases for the raw pixel endpoint."""
+
+    def _post(self, client, data, width, height, pixel_format, query="", **headers):
+        """Send a raw frame described by the frame headers."""
+        return client.post(
+            "/api/detect-raw" + query,
+            content=data,
+            headers={
+                "Content-Type": "application/octet-stream",
+                "X-Frame-Width": str(width),
+                "X-Frame-Height": str(height),
+                "X-Frame-Format": pixel_format,
+                **headers,
+            },
+        )
+
+    def test_rgb_frame(self, client, face_image_bytes):
+        """Test a packed RGB frame is detected without decoding."""
+        image = Image.open(BytesIO(face_image_bytes)).convert("RGB")
+
+        response = self._post(
+            client, image.tobytes(), image.width, image.height, "RGB24"
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"face_detected": True}
+        assert "X-Queue-Wait-Ms" in response.headers
+
+    def test_padded_nv12_frame_with_detections(self, client, face_image_bytes):
+        """Test a camera-style NV12 frame with padded rows."""
+        image = Image.open(BytesIO(face_image_bytes)).convert("RGB")
+        width, height = image.width // 2 * 2, image.height // 2 * 2
+        rgb = np.asarray(image)[:height, :width]
+        i420 = cv2.cvtColor(rgb, cv2.COLOR_RGB2YUV_I420)
+        u, v = i420[height:].reshape(2, height // 2, width // 2)
+        nv12 = np.vstack([i420[:height], np.dstack([u, v]).reshape(-1, width)])
+
+        response = self._post(
+            client,
+            np.pad(nv12, ((0, 0), (0, 64))).tobytes(),
+            width,
+            height,
+            "nv12",
+            query="?detections=true",
+            **{"X-Frame-Stride": str(width + 64)},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["face_detected"] is True
+        assert len(data["detections"]) == 1
+
+    def test_size_mismatch_rejected(self, client):
+        """Test a body that does not match the geometry gets 400."""
+        response = self._post(client, bytes(11), 2, 2, "RGB24")
+
+        assert response.status_code == 400
+        assert "expected 2x2 RGB24 (12 bytes)" in response.json()["detail"]
+
+    def test_unsupported_pixel_format(self, client):
+        """Test unknown pixel formats get 415."""
+        response = self._post(client, bytes(8), 2, 2, "YUYV")
+
+        assert response.status_code == 415
+
+    def test_pixel_limit(self, client):
+        """Test frames over the pixel limit are rejected before reading."""
+        client.app.dependency_overrides[get_upload_guard] = lambda: UploadGuard(
+            HeaderImageInspector(), max_bytes=10**6, max_pixels=100
+        )
+
+        response = self._post(client, bytes(11 * 10), 11, 10, "GRAY8")
+
+        assert response.status_code == 413
+
+    def test_missing_geometry_header(self, client):
+        """Test the frame headers are required."""
+        response = client.post(
+            "/api/detect-raw",
+            content=bytes(3),
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+        assert response.status_code == 422
+
+    def test_wrong_content_type(self, client):
+        """Test bodies that are not octet streams get 415."""
+        response = self._post(
+            client, bytes(3), 1, 1, "RGB24", **{"Content-Type": "image/png"}
+        )
+
+        assert response.status_code == 415
+
+
+class TestStatsEndpoint:
+    """Test cases for service statistics endpoint."""
+
+    def test_stats_report_executor_load(self, client):
+        """Test that executor statistics are returned."""
+        response = client.get("/api/stats")
+
+        assert response.status_code == 200
+        executor = response.json()["executor"]
+        assert executor["max_workers"] >= 1
+        assert executor["queued"] >= 0
+        assert "avg_queue_wait_ms" in executor
+
+    def test_stats_report_cache_hits(self, client):
+        """Test that resubmitting an image counts as a cache hit."""
+        image_bytes = create_test_image(width=64, height=48).getvalue()
+        before = client.get("/api/stats").json()["result_cache"]
+
+        for _ in range(2):
+            client.post(
+                "/api/detect-face",
+                files={"file": ("test.png", BytesIO(image_bytes), "image/png")},
+            )
+
+        after = client.get("/api/stats").json()["result_cache"]
+        assert after["hits"] >= before["hits"] + 1
+        assert after["entries"] >= 1
+
+    def test_stats_report_coalescing(self, client):
+        """Test that every detection is counted as a leader or a follower."""
+        image_bytes = create_test_image(width=64, height=40).getvalue()
+        before = client.get("/api/stats").json()["coalescing"]
+
+        client.post(
+            "/api/detect-face",
+            files={"file": ("test.png", BytesIO(image_bytes), "image/png")},
+        )
+
+        after = client.get("/api/stats").json()["coalescing"]
+        assert after["leaders"] + after["coalesced"] == (
+            before["leaders"] + before["coalesced"] + 1
+        )
+        assert after["in_flight"] == 0
+
+    def test_stats_omit_cascade_for_other_backends(self, client):
+        """Test that cascade counters are absent by default."""
+        response = client.get("/api/stats")
+
+        assert response.json()["cascade"] is None
+
+    def test_stats_report_cascade_exit_rates(self, client, face_image_bytes):
+        """Test that cascade stage counters are reported."""
+        cascade = CascadeFaceDetector()
+        cascade.detect_face(face_image_bytes)
+        client.app.dependency_overrides[get_cascade_detector] = lambda: cascade
+
+        response = client.get("/api/stats")
+        cascade.close()
+
+        stats = response.json()["cascade"]
+        assert (stats["reject_below"], stats["accept_above"]) == (0.3, 0.8)
+        assert [stage["name"] for stage in stats["stages"]] == [
+            "thumbnail",
+            "short_range",
+        ]
+        assert stats["stages"][0]["entered"] == 1
+        assert stats["stages"][0]["exit_rate"] == 1.0
+
+
+class TestMetricsEndpoint:
+    """Test cases for the Prometheus metrics endpoint."""
+
+    def test_metrics_cover_detection_pipeline(self, client):
+        """Test a detection shows up in stage, outcome and size metrics."""
+        client.post(
+            "/api/detect-face",
+            files={"file": ("a.jpg", create_test_image(format="JPEG"), "image/jpeg")},
+        )
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        samples = {
+            (sample.name, sample.labels.get("stage") or sample.labels.get("outcome")): (
+                sample.value
+            )
+            for family in text_string_to_metric_families(response.text)
+            for sample in family.samples
+        }
+        for stage in ("read", "decode", "cvtColor", "response"):
+            assert samples["face_detection_stage_seconds_count", stage] >= 1
+        assert samples["face_detection_requests_total", "no_face"] >= 1
+        assert samples["face_detection_input_pixels_count", None] >= 1
+        assert ("face_detection_tasks_queued", None) in samples
+
+    def test_metrics_disabled(self, client):
+        """Test the endpoint is absent when metrics are disabled."""
+        client.app.dependency_overrides[get_pipeline_metrics] = lambda: None
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 404
+
 
 class TestAPIDocumentation:
     """Test cases for API documentation."""
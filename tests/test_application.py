@@ -1,11 +1,47 @@
 """Tests for face detection service."""
 
+import asyncio
+import threading
+import time
+
+import numpy as np
 import pytest
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 from app.application.face_detection_service import FaceDetectionService
-from app.domain.models import FaceDetectionResult
-from app.domain.interfaces import IFaceDetector
+from app.application.inference_executor import (
+    PRIORITY_CLASSES,
+    ExecutionResult,
+    InferenceExecutor,
+)
+from app.application.job_runner import JobRunner
+from app.application.live_session import LiveFrameSession, LiveSessionLimiter
+from app.application.near_duplicate_cache import NearDuplicateCache
+from app.application.rate_limiter import TokenBucketRateLimiter
+from app.application.result_cache import ResultCache, content_key
+from app.application.single_flight import SingleFlight, SingleFlightStats
+from app.application.upload_guard import UploadGuard
+from app.domain.exceptions import (
+    DeadlineExceededError,
+    ImageFetchError,
+    ImageTooLargeError,
+    RateLimitExceededError,
+    ServiceOverloadedError,
+    UnsupportedImageFormatError,
+)
+from app.domain.models import (
+    JOB_COMPLETED,
+    FaceDetectionResult,
+    ImageInfo,
+    JobItemResult,
+)
+from app.domain.interfaces import (
+    IFaceDetector,
+    IImageFetcher,
+    IImageHasher,
+    IImageInspector,
+)
+from app.infrastructure.sqlite_job_store import SqliteJobStore
 
 
 class TestFaceDetectionService:
@@ -34,7 +70,7 @@ class TestFaceDetectionService:
         # Assert
         assert result.face_detected is True
         assert result.confidence == 0.9
-        mock_detector.detect_face.assert_called_once_with(image_data)
+        mock_detector.detect_face.assert_called_once_with(image_data, False)
 
     def test_detect_no_face(self, service, mock_detector):
         """Test when no face is detected."""
@@ -49,7 +85,7 @@ class TestFaceDetectionService:
         # Assert
         assert result.face_detected is False
         assert result.confidence is None
-        mock_detector.detect_face.assert_called_once_with(image_data)
+        mock_detector.detect_face.assert_called_once_with(image_data, False)
 
     def test_detect_face_with_empty_data(self, service, mock_detector):
         """Test that empty image data raises ValueError."""
@@ -71,3 +107,1178 @@ class TestFaceDetectionService:
         # Act & Assert
         with pytest.raises(ValueError, match="Invalid image format"):
             service.detect_face_in_image(image_data)
+
+    def test_upload_guard_runs_before_detection(self, mock_detector):
+        """Test that rejected uploads never reach the detector."""
+        # Arrange
+        inspector = Mock(spec=IImageInspector)
+        inspector.inspect.return_value = ImageInfo("PNG", 100_000, 100_000)
+        guard = UploadGuard(inspector, max_bytes=1024, max_pixels=1000)
+        service = FaceDetectionService(face_detector=mock_detector, upload_guard=guard)
+
+        # Act & Assert
+        with pytest.raises(ImageTooLargeError):
+            service.detect_face_in_image(b"tiny bomb")
+        mock_detector.detect_face.assert_not_called()
+
+
+class TestUploadGuard:
+    """Test cases for UploadGuard."""
+
+    @pytest.fixture
+    def inspector(self):
+        """Create an inspector reporting a 100x50 PNG."""
+        inspector = Mock(spec=IImageInspector)
+        inspector.inspect.return_value = ImageInfo("PNG", 100, 50)
+        return inspector
+
+    def test_admits_image_within_limits(self, inspector):
+        """Test an image inside both limits is admitted."""
+        guard = UploadGuard(inspector, max_bytes=10, max_pixels=5000)
+
+        info = guard.check(b"0123456789")
+
+        assert (info.format, info.pixels) == ("PNG", 5000)
+
+    def test_rejects_bytes_before_inspecting(self, inspector):
+        """Test an oversized upload is rejected without parsing it."""
+        guard = UploadGuard(inspector, max_bytes=4, max_pixels=5000)
+
+        with pytest.raises(ImageTooLargeError, match="bytes"):
+            guard.check(b"0123456789")
+        inspector.inspect.assert_not_called()
+
+    def test_rejects_too_many_pixels(self, inspector):
+        """Test the pixel limit applies to header dimensions."""
+        guard = UploadGuard(inspector, max_bytes=100, max_pixels=4999)
+
+        with pytest.raises(ImageTooLargeError, match="100x50 pixels"):
+            guard.check(b"png")
+
+    def test_inspector_errors_propagate(self, inspector):
+        """Test unsupported formats surface unchanged."""
+        inspector.inspect.side_effect = UnsupportedImageFormatError("PPM")
+        guard = UploadGuard(inspector, max_bytes=100, max_pixels=100)
+
+        with pytest.raises(UnsupportedImageFormatError):
+            guard.check(b"P6")
+
+    def test_limits_must_be_positive(self, inspector):
+        """Test zero limits are rejected."""
+        with pytest.raises(ValueError, match="positive"):
+            UploadGuard(inspector, max_bytes=0, max_pixels=100)
+
+
+class TestFaceDetectionServiceBatch:
+    """Test cases for FaceDetectionService.detect_faces_in_images."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create executor with two workers."""
+        executor = InferenceExecutor(max_workers=2, max_queue_size=8)
+        yield executor
+        executor.shutdown(wait=False)
+
+    async def test_results_keep_input_order(self, executor):
+        """Test that each result lines up with its image."""
+        detector = Mock(spec=IFaceDetector)
+        detector.detect_face.side_effect = (
+            lambda data, stop_at_first_face: FaceDetectionResult(
+                face_detected=data == b"face"
+            )
+        )
+        service = FaceDetectionService(face_detector=detector)
+
+        items = await service.detect_faces_in_images(
+            [b"face", b"none", b"face"], executor
+        )
+
+        assert [item.index for item in items] == [0, 1, 2]
+        assert [item.result.face_detected for item in items] == [True, False, True]
+
+    async def test_failing_image_does_not_fail_batch(self, executor):
+        """Test that errors are reported per item."""
+        detector = Mock(spec=IFaceDetector)
+        detector.detect_face.side_effect = [
+            FaceDetectionResult(face_detected=True),
+            ValueError("Invalid image format"),
+        ]
+        service = FaceDetectionService(face_detector=detector)
+
+        items = await service.detect_faces_in_images([b"a", b"b"], executor)
+
+        errors = {item.error for item in items}
+        assert "Invalid image format" in errors
+        assert sum(item.result is not None for item in items) == 1
+
+    async def test_concurrency_is_limited(self, executor):
+        """Test that no more than max_concurrency images run at once."""
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def detect(data, stop_at_first_face):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            threading.Event().wait(0.01)
+            with lock:
+                active["now"] -= 1
+            return FaceDetectionResult(face_detected=False)
+
+        detector = Mock(spec=IFaceDetector)
+        detector.detect_face.side_effect = detect
+        service = FaceDetectionService(face_detector=detector)
+
+        await service.detect_faces_in_images(
+            [bytes([i]) for i in range(8)], executor, max_concurrency=1
+        )
+
+        assert active["peak"] == 1
+        assert executor.stats().rejected == 0
+
+    async def test_stream_bounds_read_ahead(self, executor):
+        """Test the stream is consumed no faster than the in-flight window."""
+        release = threading.Event()
+        consumed = []
+
+        def images():
+            for index in range(6):
+                consumed.append(index)
+                yield f"img{index}", bytes([index + 1])
+
+        def detect(data, stop_at_first_face):
+            release.wait(5)
+            return FaceDetectionResult(face_detected=data[0] % 2 == 0)
+
+        detector = Mock(spec=IFaceDetector)
+        detector.detect_face.side_effect = detect
+        service = FaceDetectionService(face_detector=detector)
+        stream = service.detect_faces_in_stream(images(), executor, max_in_flight=2)
+
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.1)
+        assert len(consumed) == 2
+        release.set()
+        results = [await first] + [item async for item in stream]
+
+        assert sorted(name for name, _ in results) == [f"img{i}" for i in range(6)]
+        by_name = {name: item for name, item in results}
+        assert by_name["img1"].result.face_detected is True
+        assert by_name["img1"].index == 1
+
+    async def test_stream_rejects_oversized_images(self, executor):
+        """Test oversized images are reported without running detection."""
+        detector = Mock(spec=IFaceDetector)
+        service = FaceDetectionService(face_detector=detector)
+
+        results = [
+            item
+            async for item in service.detect_faces_in_stream(
+                iter([("big", b"12345")]), executor, max_image_bytes=4
+            )
+        ]
+
+        assert results[0][0] == "big"
+        assert "larger than 4 bytes" in results[0][1].error
+        detector.detect_face.assert_not_called()
+
+    async def test_urls_report_fetch_errors_per_item(self, executor):
+        """Test a failed fetch is reported without failing the other URLs."""
+
+        async def fetch(url):
+            if url.endswith("missing"):
+                raise ImageFetchError("Fetch failed: HTTP 404")
+            return url.rsplit("/", 1)[1].encode()
+
+        fetcher = Mock(spec=IImageFetcher)
+        fetcher.fetch = AsyncMock(side_effect=fetch)
+        detector = Mock(spec=IFaceDetector)
+        detector.detect_face.side_effect = (
+            lambda data, stop_at_first_face: FaceDetectionResult(
+                face_detected=data == b"face"
+            )
+        )
+        service = FaceDetectionService(face_detector=detector)
+
+        items = await service.detect_faces_at_urls(
+            ["http://s/face", "http://s/missing", "http://s/none"], fetcher, executor
+        )
+
+        assert [item.index for item in items] == [0, 1, 2]
+        assert items[0].result.face_detected is True
+        assert items[1].error == "Fetch failed: HTTP 404"
+        assert items[2].result.face_detected is False
+
+    async def test_urls_bound_fetch_ahead(self, executor):
+        """Test no more than max_in_flight images are fetched or held at once."""
+        release = threading.Event()
+        fetcher = Mock(spec=IImageFetcher)
+        fetcher.fetch = AsyncMock(return_value=b"image")
+
+        def detect(data, stop_at_first_face):
+            release.wait(5)
+            return FaceDetectionResult(face_detected=True)
+
+        detector = Mock(spec=IFaceDetector)
+        detector.detect_face.side_effect = detect
+        service = FaceDetectionService(face_detector=detector)
+
+        batch = asyncio.ensure_future(
+            service.detect_faces_at_urls(
+                [f"http://s/{i}" for i in range(6)], fetcher, executor, max_in_flight=3
+            )
+        )
+        await asyncio.sleep(0.1)
+        assert fetcher.fetch.await_count == 3
+        release.set()
+        items = await batch
+
+        assert fetcher.fetch.await_count == 6
+        assert all(item.result.face_detected for item in items)
+
+
+class TestFaceDetectionServiceCaching:
+    """Test cases for FaceDetectionService with a result cache."""
+
+    @pytest.fixture
+    def mock_detector(self):
+        """Create mock face detector."""
+        detector = Mock(spec=IFaceDetector)
+        detector.settings_key = "mock:conf=0.5"
+        detector.detect_face.return_value = FaceDetectionResult(
+            face_detected=True, confidence=0.9
+        )
+        return detector
+
+    @pytest.fixture
+    def cache(self):
+        """Create an in-memory result cache."""
+        return ResultCache(max_bytes=1024 * 1024, ttl=60)
+
+    @pytest.fixture
+    def service(self, mock_detector, cache):
+        """Create service with mock detector and cache."""
+        return FaceDetectionService(face_detector=mock_detector, result_cache=cache)
+
+    def test_repeated_image_skips_detector(self, service, mock_detector, cache):
+        """Test that a cache hit does not decode or detect again."""
+        first = service.detect_face_in_image(b"same_image")
+        second = service.detect_face_in_image(b"same_image")
+
+        assert first == second
+        mock_detector.detect_face.assert_called_once_with(b"same_image", False)
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+
+    def test_warm_up_bypasses_cache(self, service, mock_detector, cache):
+        """Test warm-up prewarms the detector and runs every round."""
+        service.warm_up(b"warmup_image", rounds=3)
+
+        mock_detector.prewarm.assert_called_once_with()
+        assert mock_detector.detect_face.call_count == 3
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (0, 0)
+
+    def test_different_settings_do_not_share_results(self, mock_detector, cache):
+        """Test that the detector settings are part of the key."""
+        service = FaceDetectionService(face_detector=mock_detector, result_cache=cache)
+        service.detect_face_in_image(b"image")
+
+        mock_detector.settings_key = "mock:conf=0.9"
+        service.detect_face_in_image(b"image")
+
+        assert mock_detector.detect_face.call_count == 2
+
+    def test_errors_are_not_cached(self, service, mock_detector):
+        """Test that failed detections are retried."""
+        mock_detector.detect_face.side_effect = [
+            ValueError("Invalid image format"),
+            FaceDetectionResult(face_detected=False),
+        ]
+
+        with pytest.raises(ValueError):
+            service.detect_face_in_image(b"image")
+        result = service.detect_face_in_image(b"image")
+
+        assert result.face_detected is False
+
+    def test_results_that_stopped_early_are_not_cached(
+        self, service, mock_detector, cache
+    ):
+        """Test a partial result is never served to a later caller."""
+        mock_detector.detect_face.return_value = FaceDetectionResult(
+            face_detected=True, confidence=0.9, stopped_early=True
+        )
+
+        service.detect_face_in_image(b"image", stop_at_first_face=True)
+        mock_detector.detect_face.return_value = FaceDetectionResult(
+            face_detected=True, confidence=0.95
+        )
+        result = service.detect_face_in_image(b"image")
+
+        assert result.stopped_early is False
+        assert mock_detector.detect_face.call_args_list[0].args == (b"image", True)
+        assert mock_detector.detect_face.call_args_list[1].args == (b"image", False)
+        assert service.detect_face_in_image(b"image", stop_at_first_face=True) == result
+
+    def test_near_duplicate_skips_detector(self, mock_detector, cache):
+        """Test a similar image reuses the earlier result."""
+        hasher = Mock(spec=IImageHasher)
+        hasher.bits = 64
+        hasher.perceptual_hash.side_effect = [0b1010, 0b1011]
+        near_cache = NearDuplicateCache(hasher, max_distance=2)
+        service = FaceDetectionService(
+            face_detector=mock_detector,
+            result_cache=cache,
+            near_duplicate_cache=near_cache,
+        )
+
+        first = service.detect_face_in_image(b"original")
+        second = service.detect_face_in_image(b"recompressed")
+
+        assert first == second
+        mock_detector.detect_face.assert_called_once_with(b"original", False)
+        assert near_cache.stats().hits == 1
+        assert service.detect_face_in_image(b"recompressed") == first
+        assert hasher.perceptual_hash.call_count == 2
+
+    def test_costly_formats_hash_the_detector_input(self, mock_detector):
+        """Test images without a cheap hash are decoded once for both uses."""
+        pixels = np.zeros((4, 4, 3), dtype=np.uint8)
+        mock_detector.decode_image.return_value = pixels
+        mock_detector.detect_face_in_array.return_value = FaceDetectionResult(
+            face_detected=True
+        )
+        hasher = Mock(spec=IImageHasher)
+        hasher.bits = 64
+        hasher.hashes_cheaply.return_value = False
+        hasher.perceptual_hash_of_array.return_value = 0b1010
+        near_cache = NearDuplicateCache(hasher)
+        service = FaceDetectionService(
+            face_detector=mock_detector, near_duplicate_cache=near_cache
+        )
+
+        result = service.detect_face_in_image(b"png")
+
+        assert result.face_detected is True
+        mock_detector.decode_image.assert_called_once_with(b"png")
+        hasher.perceptual_hash_of_array.assert_called_once_with(pixels)
+        hasher.perceptual_hash.assert_not_called()
+        mock_detector.detect_face_in_array.assert_called_once_with(pixels, False)
+        mock_detector.detect_face.assert_not_called()
+        assert near_cache.stats().entries == 1
+
+    def test_unhashable_image_falls_through_to_detector(self, mock_detector):
+        """Test hashing failures do not block detection."""
+        hasher = Mock(spec=IImageHasher)
+        hasher.bits = 64
+        hasher.perceptual_hash.side_effect = ValueError("Invalid image data")
+        near_cache = NearDuplicateCache(hasher)
+        service = FaceDetectionService(
+            face_detector=mock_detector, near_duplicate_cache=near_cache
+        )
+
+        result = service.detect_face_in_image(b"image")
+
+        assert result.face_detected is True
+        stats = near_cache.stats()
+        assert (stats.hash_failures, stats.entries) == (1, 0)
+
+
+class TestNearDuplicateCache:
+    """Test cases for NearDuplicateCache."""
+
+    @pytest.fixture
+    def hasher(self):
+        """Create a mock hasher."""
+        hasher = Mock(spec=IImageHasher)
+        hasher.bits = 64
+        return hasher
+
+    def test_match_within_distance(self, hasher):
+        """Test lookups succeed up to the distance threshold only."""
+        cache = NearDuplicateCache(hasher, max_distance=3)
+        result = FaceDetectionResult(face_detected=True, confidence=0.8)
+        cache.put(0xFF00FF00FF00FF00, "s", result)
+
+        assert cache.get(0xFF00FF00FF00FF07, "s") == result
+        assert cache.get(0xFF00FF00FF00FF0F, "s") is None
+        assert cache.get(0xFF00FF00FF00FF00, "other") is None
+
+    def test_closest_match_wins(self, hasher):
+        """Test the nearest of several candidates is returned."""
+        cache = NearDuplicateCache(hasher, max_distance=4)
+        cache.put(0b0000, "s", FaceDetectionResult(face_detected=False))
+        cache.put(0b1110, "s", FaceDetectionResult(face_detected=True))
+
+        assert cache.get(0b1100, "s").face_detected is True
+
+    def test_farther_match_for_these_settings_is_used(self, hasher):
+        """Test a nearer hash cached only for other settings is skipped."""
+        cache = NearDuplicateCache(hasher, max_distance=4)
+        cache.put(0b1110, "other", FaceDetectionResult(face_detected=False))
+        cache.put(0b0000, "s", FaceDetectionResult(face_detected=True))
+
+        assert cache.get(0b1100, "s").face_detected is True
+
+    def test_expired_candidates_are_purged(self, hasher):
+        """Test lookups drop expired entries and fall back to valid ones."""
+        clock = TestResultCache.FakeClock()
+        cache = NearDuplicateCache(hasher, max_distance=4, ttl=10, clock=clock)
+        cache.put(0b1110, "s", FaceDetectionResult(face_detected=False))
+        clock.now = 5.0
+        cache.put(0b0000, "s", FaceDetectionResult(face_detected=True))
+
+        clock.now = 12.0
+        assert cache.get(0b1100, "s").face_detected is True
+        assert cache.stats().entries == 1
+
+    def test_oldest_entry_is_evicted(self, hasher):
+        """Test the entry limit."""
+        cache = NearDuplicateCache(hasher, max_distance=0, max_entries=2)
+        result = FaceDetectionResult(face_detected=True)
+        for value in (1, 2, 3):
+            cache.put(value, "s", result)
+
+        assert cache.get(1, "s") is None
+        assert cache.get(3, "s") is not None
+        assert cache.stats().entries == 2
+
+    def test_entries_expire_after_ttl(self, hasher):
+        """Test TTL expiry."""
+        clock = TestResultCache.FakeClock()
+        cache = NearDuplicateCache(hasher, ttl=10, clock=clock)
+        cache.put(42, "s", FaceDetectionResult(face_detected=True))
+
+        clock.now = 10.0
+        assert cache.get(42, "s") is None
+
+    def test_invalid_distance_is_rejected(self, hasher):
+        """Test max_distance must leave room for the pigeonhole split."""
+        with pytest.raises(ValueError):
+            NearDuplicateCache(hasher, max_distance=64)
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    class FakeClock:
+        """Manually advanced clock."""
+
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    def test_content_key(self):
+        """Test keys depend on both content and settings."""
+        assert content_key(b"a", "s1") == content_key(b"a", "s1")
+        assert content_key(b"a", "s1") != content_key(b"b", "s1")
+        assert content_key(b"a", "s1") != content_key(b"a", "s2")
+
+    def test_entries_expire_after_ttl(self):
+        """Test TTL expiry."""
+        clock = self.FakeClock()
+        cache = ResultCache(ttl=10, clock=clock)
+        cache.put("key", FaceDetectionResult(face_detected=True))
+
+        clock.now = 9.0
+        assert cache.get("key") is not None
+        clock.now = 10.0
+        assert cache.get("key") is None
+        assert cache.stats().entries == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test LRU eviction once the byte budget is exceeded."""
+        cache = ResultCache(max_bytes=1100)
+        result = FaceDetectionResult(face_detected=True)
+        cache.put("a" * 50, result)
+        cache.put("b" * 50, result)
+        cache.put("c" * 50, result)
+        assert cache.stats().entries == 3
+
+        cache.get("a" * 50)
+        for index in range(2):
+            cache.put(f"{index}" * 50, result)
+
+        stats = cache.stats()
+        assert stats.evictions == 2
+        assert stats.size_bytes <= 1100
+        assert cache.get("a" * 50) is not None
+        assert cache.get("b" * 50) is None
+
+    def test_shared_store_is_read_and_written(self):
+        """Test the shared store backs local misses."""
+        store = Mock()
+        store.get.return_value = FaceDetectionResult(face_detected=True)
+        cache = ResultCache(ttl=30, shared_store=store)
+
+        assert cache.get("key").face_detected is True
+        assert cache.get("key").face_detected is True
+        store.get.assert_called_once_with("key")
+
+        result = FaceDetectionResult(face_detected=False)
+        cache.put("other", result)
+        store.put.assert_called_once_with("other", result, 30)
+        stats = cache.stats()
+        assert (stats.shared_hits, stats.hits, stats.misses) == (1, 1, 0)
+
+    def test_local_lookup_skips_shared_store(self):
+        """Test get_local never reads the shared store nor counts misses."""
+        store = Mock()
+        store.get.return_value = FaceDetectionResult(face_detected=True)
+        cache = ResultCache(shared_store=store)
+
+        assert cache.get_local("key") is None
+        cache.put("other", FaceDetectionResult(face_detected=False))
+        assert cache.get_local("other").face_detected is False
+        store.get.assert_not_called()
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 0)
+
+    def test_shared_store_failures_are_misses(self):
+        """Test a broken shared store degrades to local caching."""
+        store = Mock()
+        store.get.side_effect = OSError("disk gone")
+        store.put.side_effect = OSError("disk gone")
+        cache = ResultCache(shared_store=store)
+
+        assert cache.get("key") is None
+        cache.put("key", FaceDetectionResult(face_detected=True))
+        assert cache.get("key") is not None
+
+
+class TestInferenceExecutor:
+    """Test cases for InferenceExecutor."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create executor with one worker and one queue slot."""
+        executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+        yield executor
+        executor.shutdown(wait=False)
+
+    async def test_run_returns_value_on_worker_thread(self, executor):
+        """Test that tasks run off the calling thread."""
+        caller = threading.get_ident()
+
+        execution = await executor.run(threading.get_ident)
+
+        assert execution.value != caller
+        assert execution.queue_wait >= 0
+        assert execution.queue_depth == 0
+        assert executor.stats().completed == 1
+
+    async def test_run_propagates_errors(self, executor):
+        """Test that task exceptions reach the caller."""
+
+        def fail():
+            raise ValueError("bad image")
+
+        with pytest.raises(ValueError, match="bad image"):
+            await executor.run(fail)
+
+        assert executor.stats().running == 0
+
+    async def test_rejects_when_queue_is_full(self, executor):
+        """Test backpressure once workers and queue are occupied."""
+        release = threading.Event()
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        stats = executor.stats()
+        assert stats.running == 1
+        assert stats.queued == 1
+        with pytest.raises(ServiceOverloadedError) as exc_info:
+            await executor.run(release.wait)
+        assert exc_info.value.retry_after >= 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+        stats = executor.stats()
+        assert stats.rejected == 1
+        assert stats.completed == 2
+        assert stats.queued == 0
+
+    async def test_cancelled_queued_task_frees_slot(self, executor):
+        """Test that cancelling a queued task releases its slot."""
+        release = threading.Event()
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        queued.cancel()
+        await asyncio.sleep(0.05)
+
+        assert executor.stats().queued == 0
+        release.set()
+        await running
+
+    async def test_queued_tasks_run_by_priority(self):
+        """Test that a free worker takes the most urgent queued task."""
+        executor = InferenceExecutor(max_workers=1, max_queue_size=3)
+        release = threading.Event()
+        order = []
+        blocking = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = [
+            asyncio.ensure_future(
+                executor.run(order.append, name, priority=PRIORITY_CLASSES[name])
+            )
+            for name in ("low", "normal", "high")
+        ]
+        await asyncio.sleep(0.05)
+
+        release.set()
+        await asyncio.gather(blocking, *queued)
+
+        assert order == ["high", "normal", "low"]
+        executor.shutdown()
+
+    async def test_full_queue_evicts_lower_priority(self, executor):
+        """Test an urgent task takes the slot of a queued low priority one."""
+        release = threading.Event()
+        running = asyncio.ensure_future(executor.run(release.wait))
+        low = asyncio.ensure_future(
+            executor.run(release.wait, priority=PRIORITY_CLASSES["low"])
+        )
+        await asyncio.sleep(0.05)
+
+        high = asyncio.ensure_future(
+            executor.run(release.wait, priority=PRIORITY_CLASSES["high"])
+        )
+        with pytest.raises(ServiceOverloadedError):
+            await low
+        release.set()
+        await asyncio.gather(running, high)
+
+        stats = executor.stats()
+        assert (stats.completed, stats.rejected, stats.queued) == (2, 1, 0)
+
+    async def test_sheds_task_past_deadline_on_arrival(self, executor):
+        """Test a task whose deadline has passed is never run."""
+        task = Mock()
+
+        with pytest.raises(DeadlineExceededError):
+            await executor.run(task, deadline=time.perf_counter() - 1)
+
+        task.assert_not_called()
+        assert executor.stats().shed == 1
+
+    async def test_sheds_task_whose_deadline_passes_in_queue(self, executor):
+        """Test a task that waited past its deadline is dropped by the worker."""
+        release = threading.Event()
+        task = Mock()
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(
+            executor.run(task, deadline=time.perf_counter() + 0.05)
+        )
+        await asyncio.sleep(0.1)
+
+        release.set()
+        await running
+        with pytest.raises(DeadlineExceededError):
+            await queued
+
+        task.assert_not_called()
+        stats = executor.stats()
+        assert (stats.shed, stats.completed, stats.queued) == (1, 1, 0)
+
+    def test_invalid_configuration(self):
+        """Test that executor limits are validated."""
+        with pytest.raises(ValueError):
+            InferenceExecutor(max_workers=0)
+        with pytest.raises(ValueError):
+            InferenceExecutor(max_workers=1, max_queue_size=-1)
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test callers arriving during a call await it instead of repeating it."""
+        group = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.ensure_future(group.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["result"] * 3
+        assert len(calls) == 1
+        assert group.stats() == SingleFlightStats(leaders=1, coalesced=2, in_flight=0)
+
+    async def test_errors_are_shared_but_not_kept(self):
+        """Test every waiter sees the error and the next call runs afresh."""
+        group = SingleFlight()
+        calls = []
+
+        async def fail():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("bad image")
+
+        results = await asyncio.gather(
+            group.do("key", fail), group.do("key", fail), return_exceptions=True
+        )
+        with pytest.raises(ValueError):
+            await group.do("key", fail)
+
+        assert [type(result) for result in results] == [ValueError, ValueError]
+        assert len(calls) == 2
+
+    async def test_cancelled_waiter_leaves_others_waiting(self):
+        """Test the first caller disconnecting does not cancel the call."""
+        group = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "result"
+
+        first = asyncio.ensure_future(group.do("key", work))
+        second = asyncio.ensure_future(group.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "result"
+        assert first.cancelled()
+
+    async def test_caller_arriving_during_cancellation_starts_afresh(self):
+        """Test a new caller does not join a call that is being cancelled."""
+        group = SingleFlight()
+        unwinding = asyncio.Event()
+        finish_unwinding = asyncio.Event()
+
+        async def slow_to_cancel():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                # Cleanup that yields keeps the task alive after cancel()
+                unwinding.set()
+                await finish_unwinding.wait()
+                raise
+
+        async def work():
+            return "result"
+
+        first = asyncio.ensure_future(group.do("key", slow_to_cancel))
+        await asyncio.sleep(0)
+        first.cancel()
+        await unwinding.wait()
+        second = asyncio.ensure_future(group.do("key", work))
+        await asyncio.sleep(0)
+        finish_unwinding.set()
+
+        assert await second == "result"
+        assert first.cancelled()
+        assert group.stats().leaders == 2
+
+    async def test_abandoned_call_is_cancelled(self):
+        """Test the call stops once no caller waits for it."""
+        group = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.ensure_future(group.do("key", work))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert group.stats().in_flight == 0
+
+
+class TestFaceDetectionServiceCoalescing:
+    """Test cases for FaceDetectionService with request coalescing."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create executor with two workers."""
+        executor = InferenceExecutor(max_workers=2, max_queue_size=4)
+        yield executor
+        executor.shutdown(wait=False)
+
+    @pytest.fixture
+    def mock_detector(self):
+        """Create a detector that takes a moment per image."""
+        detector = Mock(spec=IFaceDetector)
+        detector.settings_key = "mock"
+
+        def detect(image_data, stop_at_first_face):
+            time.sleep(0.05)
+            return FaceDetectionResult(face_detected=image_data == b"face")
+
+        detector.detect_face.side_effect = detect
+        return detector
+
+    @pytest.fixture
+    def service(self, mock_detector):
+        """Create service with a coalescing group."""
+        return FaceDetectionService(
+            face_detector=mock_detector, single_flight=SingleFlight()
+        )
+
+    async def test_identical_uploads_detect_once(
+        self, service, mock_detector, executor
+    ):
+        """Test concurrent duplicates share one detection."""
+        executions = await asyncio.gather(
+            *(service.detect_face_coalesced(b"face", executor) for _ in range(4)),
+            service.detect_face_coalesced(b"other", executor),
+        )
+
+        assert [e.value.face_detected for e in executions] == [True] * 4 + [False]
+        assert mock_detector.detect_face.call_count == 2
+
+    async def test_leader_deadline_does_not_shed_followers(
+        self, service, mock_detector, executor
+    ):
+        """Test a follower retries when the shared run missed the leader's deadline."""
+        leader, follower = await asyncio.gather(
+            service.detect_face_coalesced(
+                b"face", executor, deadline=time.perf_counter() - 1
+            ),
+            service.detect_face_coalesced(b"face", executor),
+            return_exceptions=True,
+        )
+
+        assert isinstance(leader, DeadlineExceededError)
+        assert follower.value.face_detected is True
+        mock_detector.detect_face.assert_called_once_with(b"face", False)
+
+    async def test_cached_result_is_served_without_queueing(
+        self, mock_detector, executor
+    ):
+        """Test a cache hit is answered on the event loop."""
+        cache = ResultCache(max_bytes=1024 * 1024, ttl=60)
+        service = FaceDetectionService(
+            face_detector=mock_detector,
+            result_cache=cache,
+            single_flight=SingleFlight(),
+        )
+        await service.detect_face_coalesced(b"face", executor)
+        executor.run = AsyncMock()
+
+        execution = await service.detect_face_coalesced(b"face", executor)
+
+        assert execution.value.face_detected is True
+        assert (execution.queue_wait, execution.queue_depth) == (0.0, 0)
+        executor.run.assert_not_awaited()
+        mock_detector.detect_face.assert_called_once_with(b"face", False)
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+
+    async def test_batch_duplicates_detect_once(self, service, mock_detector, executor):
+        """Test duplicates inside one batch are coalesced too."""
+        results = await service.detect_faces_in_images(
+            [b"face"] * 3, executor, max_concurrency=3
+        )
+
+        assert [item.result.face_detected for item in results] == [True] * 3
+        mock_detector.detect_face.assert_called_once_with(b"face", False)
+
+
+class TestJobRunner:
+    """Test cases for JobRunner."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create executor with two workers."""
+        executor = InferenceExecutor(max_workers=2, max_queue_size=8)
+        yield executor
+        executor.shutdown(wait=False)
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a job store in a temporary directory."""
+        return SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+    @pytest.fixture
+    def fetcher(self):
+        """Fetcher returning the last path segment of the URL as the image."""
+        fetcher = Mock(spec=IImageFetcher)
+        fetcher.fetch = AsyncMock(
+            side_effect=lambda url: url.rsplit("/", 1)[1].encode()
+        )
+        return fetcher
+
+    @pytest.fixture
+    def service(self):
+        """Service whose detector finds a face in images named ``face``."""
+        detector = Mock(spec=IFaceDetector)
+        detector.settings_key = "test"
+        detector.detect_face.side_effect = (
+            lambda data, stop_at_first_face: FaceDetectionResult(
+                face_detected=data == b"face",
+                confidence=0.9 if data == b"face" else None,
+            )
+        )
+        return FaceDetectionService(face_detector=detector)
+
+    @staticmethod
+    async def wait_for(runner, job_id):
+        """Poll until the job completes."""
+        for _ in range(200):
+            job = await runner.get_job(job_id)
+            if job.status == JOB_COMPLETED:
+                return job
+            await asyncio.sleep(0.01)
+        raise AssertionError("Job did not complete")
+
+    async def test_runs_job_to_completion(self, store, service, executor, fetcher):
+        """Test every source gets a result or an error."""
+        runner = JobRunner(store, service, executor, fetcher)
+        sources = ["http://s/face", "http://s/none", "images/a.jpg"]
+
+        job = await runner.submit(iter(sources))
+        finished = await self.wait_for(runner, job.job_id)
+        results = {
+            item.index: item for _, item in await runner.results(job.job_id, 0, 10)
+        }
+        await runner.close()
+
+        assert (finished.total, finished.done, finished.failed) == (3, 3, 1)
+        assert finished.faces == 1
+        assert results[0].face_detected is True
+        assert results[0].confidence == 0.9
+        assert results[1].face_detected is False
+        assert results[2].error == "Local paths are not enabled"
+
+    async def test_outcomes_are_written_in_batches(
+        self, store, service, executor, fetcher
+    ):
+        """Test results are saved per checkpoint rather than per image."""
+        spy = Mock(wraps=store)
+        runner = JobRunner(spy, service, executor, fetcher, checkpoint_items=4)
+
+        job = await runner.submit(f"http://s/{i}" for i in range(10))
+        await self.wait_for(runner, job.job_id)
+        await runner.close()
+
+        batches = [len(call.args[1]) for call in spy.save_results.call_args_list]
+        assert sum(batches) == 10
+        assert all(size >= 4 for size in batches[:-1])
+        assert len(batches) <= 3
+
+    async def test_start_resumes_unfinished_jobs(
+        self, store, service, executor, fetcher
+    ):
+        """Test a new runner finishes only the items left pending."""
+        job = store.create_job(["http://s/face", "http://s/none"])
+        store.save_results(
+            job.job_id,
+            [JobItemResult(index=0, source="http://s/face", face_detected=True)],
+        )
+        runner = JobRunner(store, service, executor, fetcher)
+
+        await runner.start()
+        finished = await self.wait_for(runner, job.job_id)
+        await runner.close()
+
+        fetcher.fetch.assert_awaited_once_with("http://s/none")
+        assert (finished.done, finished.faces) == (2, 1)
+
+    async def test_overloaded_executor_is_retried(self, store, executor, fetcher):
+        """Test an item pushed out of a full queue waits instead of failing."""
+        service = Mock(spec=FaceDetectionService)
+        service.detect_face_coalesced = AsyncMock(
+            side_effect=[
+                ServiceOverloadedError("Service is at capacity", retry_after=0),
+                ExecutionResult(
+                    value=FaceDetectionResult(face_detected=True),
+                    queue_wait=0.0,
+                    queue_depth=0,
+                ),
+            ]
+        )
+        runner = JobRunner(store, service, executor, fetcher)
+
+        job = await runner.submit(["http://s/face"])
+        finished = await self.wait_for(runner, job.job_id)
+        await runner.close()
+
+        assert (finished.failed, finished.faces) == (0, 1)
+        assert service.detect_face_coalesced.await_args.kwargs["priority"] == (
+            PRIORITY_CLASSES["low"]
+        )
+
+    async def test_manifest_limits(self, store, service, executor, fetcher):
+        """Test empty and oversized manifests are refused without a job."""
+        runner = JobRunner(store, service, executor, fetcher, max_items=2)
+
+        with pytest.raises(ValueError, match="no images"):
+            await runner.submit([])
+        with pytest.raises(ValueError, match="at most 2"):
+            await runner.submit(["a", "b", "c"])
+
+        assert store.unfinished_jobs() == []
+        await runner.close()
+
+
+class TestTokenBucketRateLimiter:
+    """Test cases for TokenBucketRateLimiter."""
+
+    @pytest.fixture
+    def clock(self):
+        """Create a clock that only moves when told to."""
+        clock = Mock()
+        clock.return_value = 100.0
+        return clock
+
+    def test_burst_then_reject(self, clock):
+        """Test a client may spend its burst and then has to wait."""
+        limiter = TokenBucketRateLimiter(rate=0.5, burst=2, clock=clock)
+
+        limiter.acquire("tenant")
+        limiter.acquire("tenant")
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            limiter.acquire("tenant")
+
+        assert exc_info.value.retry_after == 2
+
+    def test_tokens_refill_over_time(self, clock):
+        """Test the bucket refills at the configured rate."""
+        limiter = TokenBucketRateLimiter(rate=10, burst=1, clock=clock)
+        limiter.acquire("tenant")
+
+        clock.return_value += 0.15
+        limiter.acquire("tenant")
+
+        with pytest.raises(RateLimitExceededError):
+            limiter.acquire("tenant")
+
+    def test_clients_have_separate_buckets(self, clock):
+        """Test one noisy client does not use up another's allowance."""
+        limiter = TokenBucketRateLimiter(rate=1, burst=1, clock=clock)
+        limiter.acquire("noisy")
+
+        with pytest.raises(RateLimitExceededError):
+            limiter.acquire("noisy")
+        limiter.acquire("quiet")
+
+    def test_forgets_least_recent_client(self, clock):
+        """Test buckets beyond max_clients are dropped, oldest first."""
+        limiter = TokenBucketRateLimiter(rate=1, burst=1, max_clients=2, clock=clock)
+        limiter.acquire("first")
+        limiter.acquire("second")
+        limiter.acquire("third")
+
+        limiter.acquire("first")
+        with pytest.raises(RateLimitExceededError):
+            limiter.acquire("third")
+
+    def test_batch_takes_one_token_per_item(self, clock):
+        """Test a batch spends as many tokens as it has items."""
+        limiter = TokenBucketRateLimiter(rate=1, burst=5, clock=clock)
+        limiter.acquire("tenant", tokens=3)
+
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            limiter.acquire("tenant", tokens=3)
+
+        assert exc_info.value.retry_after == 1
+        limiter.acquire("tenant", tokens=2)
+
+    def test_batch_over_burst_leaves_bucket_in_debt(self, clock):
+        """Test a batch beyond the burst waits for a full bucket, then owes."""
+        limiter = TokenBucketRateLimiter(rate=1, burst=2, clock=clock)
+        limiter.acquire("tenant", tokens=6)
+
+        clock.return_value += 4
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            limiter.acquire("tenant")
+
+        assert exc_info.value.retry_after == 1
+        clock.return_value += 1
+        limiter.acquire("tenant")
+
+    def test_limits_must_be_positive(self):
+        """Test that invalid limits are rejected."""
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(rate=0, burst=1)
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(rate=1, burst=0)
+
+
+class TestLiveFrameSession:
+    """Test cases for LiveFrameSession and LiveSessionLimiter."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create executor with two workers."""
+        executor = InferenceExecutor(max_workers=2, max_queue_size=2)
+        yield executor
+        executor.shutdown(wait=False)
+
+    async def test_newest_frame_wins(self, executor):
+        """Test frames arriving during inference replace each other."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def detect(frame):
+            started.set()
+            release.wait(5)
+            return FaceDetectionResult(face_detected=frame == "last")
+
+        session = LiveFrameSession(executor, detect)
+        results = session.results()
+        first = asyncio.ensure_future(results.__anext__())
+
+        session.submit("first")
+        await asyncio.to_thread(started.wait, 5)
+        for frame in ("stale1", "stale2", "last"):
+            session.submit(frame)
+        release.set()
+
+        assert (await first).frame_id == 1
+        second = await results.__anext__()
+        assert second.frame_id == 4
+        assert second.dropped == 2
+        assert second.result.face_detected is True
+        assert second.latency >= 0
+        session.close()
+        assert [item async for item in results] == []
+
+    async def test_errors_are_reported_per_frame(self, executor):
+        """Test a bad frame does not end the session."""
+
+        def detect(frame):
+            if frame == "bad":
+                raise ValueError("Invalid image data")
+            return FaceDetectionResult(face_detected=False)
+
+        session = LiveFrameSession(executor, detect)
+        results = session.results()
+
+        session.submit("bad")
+        bad = await results.__anext__()
+        session.submit("good")
+        good = await results.__anext__()
+
+        assert (bad.frame_id, bad.error, bad.result) == (1, "Invalid image data", None)
+        assert (good.frame_id, good.error) == (2, None)
+
+    def test_limiter_caps_sessions(self):
+        """Test sessions beyond the limit are refused until one ends."""
+        limiter = LiveSessionLimiter(max_sessions=1)
+
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is False
+        limiter.release()
+        assert limiter.try_acquire() is True
+        assert limiter.active == 1
@@ -2,7 +2,7 @@
 
 import pytest
 
-from app.domain.models import FaceDetectionResult
+from app.domain.models import FaceDetection, FaceDetectionResult
 
 
 class TestFaceDetectionResult:
@@ -36,3 +36,23 @@ class TestFaceDetectionResult:
 
         with pytest.raises(Exception):
             result.face_detected = False
+
+    def test_detections_default_to_empty(self):
+        """Test that results carry no detections unless given."""
+        result = FaceDetectionResult(face_detected=False)
+
+        assert result.detections == ()
+
+
+class TestFaceDetection:
+    """Test cases for FaceDetection domain model."""
+
+    def test_uses_slots(self):
+        """Test that detections carry no per-instance dict."""
+        detection = FaceDetection(
+            score=0.9, box=(0.1, 0.2, 0.3, 0.4), keypoints=((0.5, 0.5),) * 6
+        )
+
+        assert not hasattr(detection, "__dict__")
+        with pytest.raises(Exception):
+            detection.score = 0.1
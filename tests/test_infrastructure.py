@@ -1,12 +1,64 @@
 """Tests for MediaPipe face detector."""
 
+import asyncio
+import tarfile
+import threading
+import time
+import zipfile
+
+import cv2
 import pytest
 import numpy as np
 from PIL import Image
 from io import BytesIO
+from unittest.mock import Mock
 
+from app.infrastructure.archive_reader import ArchiveReader
+from app.infrastructure.batched_detector import BatchedBlazeFaceDetector
+from app.infrastructure.cascade_detector import CascadeFaceDetector
+from app.infrastructure.graph_pool import FaceDetectionGraphPool
+from app.infrastructure.http_image_fetcher import HttpImageFetcher
+from app.infrastructure.image_header import HeaderImageInspector
+from app.infrastructure.local_image_reader import LocalImageReader
+from app.infrastructure.image_decoding import (
+    decode_grayscale_thumbnail,
+    decode_raw_frame,
+    decode_to_rgb,
+    fit_to_max_side,
+    raw_frame_size,
+    sniff_format,
+    warmup_image,
+)
+from app.infrastructure import metrics
 from app.infrastructure.mediapipe_detector import MediaPipeFaceDetector
-from app.domain.models import FaceDetectionResult
+from app.infrastructure.metrics import PipelineMetrics
+from app.infrastructure.micro_batcher import MicroBatcher
+from app.infrastructure.perceptual_hash import DHashHasher
+from app.infrastructure.process_pool_detector import ProcessPoolFaceDetector
+from app.infrastructure.sqlite_job_store import SqliteJobStore
+from app.infrastructure.sqlite_result_store import SqliteResultStore
+from app.infrastructure.tiled_detector import (
+    TiledFaceDetector,
+    non_max_suppression,
+    tile_grid,
+)
+from app.infrastructure.video_detector import (
+    MediaPipeVideoFaceDetector,
+    build_segments,
+)
+from app.domain.exceptions import (
+    ImageFetchError,
+    ImageTooLargeError,
+    UnsupportedImageFormatError,
+)
+from app.domain.models import (
+    JOB_COMPLETED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    FaceDetection,
+    FaceDetectionResult,
+    JobItemResult,
+)
 
 
 class TestMediaPipeFaceDetector:
@@ -71,6 +123,37 @@ class TestMediaPipeFaceDetector:
         assert isinstance(image_array, np.ndarray)
         assert len(image_array.shape) == 3  # Height, Width, Channels
         assert image_array.shape[2] == 3  # RGB channels
+        assert image_array[0, 0].tolist() == [255, 0, 0]  # RGB, not BGR
+
+    def test_detects_face_in_fixture(self, detector, face_image_bytes):
+        """Test detection of a real face."""
+        result = detector.detect_face(face_image_bytes)
+
+        assert result.face_detected is True
+        assert result.confidence > 0.8
+
+    def test_reports_box_and_keypoints(self, detector, face_image_bytes):
+        """Test every detection carries a relative box and six keypoints."""
+        result = detector.detect_face(face_image_bytes)
+
+        (face,) = result.detections
+        xmin, ymin, width, height = face.box
+        assert face.score == result.confidence
+        assert 0 <= xmin < xmin + width <= 1
+        assert 0 <= ymin < ymin + height <= 1
+        assert len(face.keypoints) == 6
+        right_eye, left_eye = face.keypoints[:2]
+        assert xmin < right_eye[0] < left_eye[0] < xmin + width
+
+    def test_detects_face_under_resolution_budget(self, face_image_bytes):
+        """Test that downscaling to the budget keeps the face detectable."""
+        large = Image.open(BytesIO(face_image_bytes)).resize((3000, 3000))
+        buffer = BytesIO()
+        large.save(buffer, format="JPEG")
+        detector = MediaPipeFaceDetector(max_image_side=256)
+
+        assert detector._bytes_to_image(buffer.getvalue()).shape == (256, 256, 3)
+        assert detector.detect_face(buffer.getvalue()).face_detected is True
 
     def test_different_confidence_thresholds(self):
         """Test detector with different confidence thresholds."""
@@ -79,3 +162,1373 @@ class TestMediaPipeFaceDetector:
 
         assert detector_low._min_detection_confidence == 0.3
         assert detector_high._min_detection_confidence == 0.9
+
+    def test_graph_is_reused_across_calls(self, detector):
+        """Test that consecutive detections share one pooled graph."""
+        image_data = self._create_test_image()
+
+        detector.detect_face(image_data)
+        detector.detect_face(image_data)
+
+        assert detector._pool.created == 1
+        assert detector._pool.idle == 1
+
+    def test_close_releases_graphs(self):
+        """Test that closing the detector closes its graph pool."""
+        detector = MediaPipeFaceDetector(min_detection_confidence=0.5, pool_size=2)
+        detector.detect_face(self._create_test_image())
+
+        detector.close()
+
+        assert detector._pool.created == 0
+        with pytest.raises(ValueError):
+            detector.detect_face(self._create_test_image())
+
+
+class TestImageDecoding:
+    """Test cases for the RGB decode path."""
+
+    def _encode(self, image: Image.Image, image_format: str) -> bytes:
+        """Encode a PIL image."""
+        buffer = BytesIO()
+        image.save(buffer, format=image_format)
+        return buffer.getvalue()
+
+    def _pattern(self) -> Image.Image:
+        """Create an image whose channels all differ."""
+        pixels = np.zeros((20, 30, 3), dtype=np.uint8)
+        pixels[..., 0] = 200
+        pixels[..., 1] = np.arange(30, dtype=np.uint8)
+        pixels[..., 2] = 10
+        return Image.fromarray(pixels)
+
+    @pytest.mark.parametrize("image_format", ["PNG", "BMP", "TIFF"])
+    def test_lossless_formats_decode_to_rgb(self, image_format):
+        """Test channel order and pixel values for lossless formats."""
+        image = self._pattern()
+
+        image_array = decode_to_rgb(self._encode(image, image_format))
+
+        np.testing.assert_array_equal(image_array, np.asarray(image))
+        assert image_array.flags.c_contiguous
+
+    @pytest.mark.parametrize("image_format", ["JPEG", "WEBP", "GIF"])
+    def test_lossy_formats_decode_to_rgb(self, image_format):
+        """Test channel order survives lossy codecs."""
+        image = Image.new("RGB", (32, 32), (220, 20, 60))
+
+        image_array = decode_to_rgb(self._encode(image, image_format))
+
+        assert image_array.shape == (32, 32, 3)
+        red, green, blue = image_array[16, 16].astype(int)
+        assert red > 180 and green < 60 and blue < 100
+
+    @pytest.mark.parametrize("mode", ["L", "RGBA", "P"])
+    def test_non_rgb_modes_become_three_channels(self, mode):
+        """Test grayscale, alpha and palette images are converted."""
+        image = Image.new(mode, (16, 8))
+
+        image_array = decode_to_rgb(self._encode(image, "PNG"))
+
+        assert image_array.shape == (8, 16, 3)
+
+    @pytest.mark.parametrize("image_format", ["JPEG", "PNG", "GIF"])
+    def test_max_side_budget(self, image_format):
+        """Test decoding respects the budget and keeps the aspect ratio."""
+        image = Image.new("RGB", (1600, 1200), (10, 200, 30))
+
+        image_array = decode_to_rgb(self._encode(image, image_format), max_side=400)
+
+        assert image_array.shape == (300, 400, 3)
+        assert image_array.flags.c_contiguous
+        assert image_array[150, 200, 1] > 150
+
+    def test_jpeg_budget_uses_reduced_decode(self):
+        """Test JPEG DCT scaling lands on the budget without full decode."""
+        image = Image.new("RGB", (1600, 1200), (10, 200, 30))
+
+        image_array = decode_to_rgb(self._encode(image, "JPEG"), max_side=200)
+
+        assert image_array.shape == (150, 200, 3)
+
+    def test_small_images_are_not_resized(self):
+        """Test images within the budget are returned untouched."""
+        image_array = np.zeros((10, 20, 3), dtype=np.uint8)
+
+        assert fit_to_max_side(image_array, 20) is image_array
+        assert fit_to_max_side(image_array, None) is image_array
+        assert fit_to_max_side(image_array, 7).shape == (4, 7, 3)
+
+    def test_invalid_data(self):
+        """Test undecodable data raises ValueError."""
+        with pytest.raises(ValueError, match="Invalid image data"):
+            decode_to_rgb(b"\xff\xd8\xff not really a jpeg")
+
+    def test_warmup_image_decodes(self):
+        """Test the warm-up image is a JPEG with varied pixels."""
+        data = warmup_image(64, 48)
+
+        image_array = decode_to_rgb(data)
+
+        assert sniff_format(data) == "JPEG"
+        assert image_array.shape == (48, 64, 3)
+        assert image_array.std() > 10
+
+    def test_sniff_format(self):
+        """Test format detection from magic bytes."""
+        image = self._pattern()
+
+        assert sniff_format(self._encode(image, "JPEG")) == "JPEG"
+        assert sniff_format(self._encode(image, "PNG")) == "PNG"
+        assert sniff_format(self._encode(image, "WEBP")) == "WEBP"
+        assert sniff_format(self._encode(image, "GIF")) == "GIF"
+        assert sniff_format(b"plain text") is None
+
+    def test_decode_raw_rgb_frame_is_zero_copy(self):
+        """Test RGB24 frames are wrapped without copying."""
+        data = bytes(range(24))
+
+        frame = decode_raw_frame(data, width=4, height=2, pixel_format="rgb24")
+
+        assert frame.shape == (2, 4, 3)
+        assert frame[0, 1].tolist() == [3, 4, 5]
+        assert not frame.flags.owndata
+
+    def test_decode_raw_bgr_frame_swaps_channels(self):
+        """Test BGR24 frames come back as RGB."""
+        frame = decode_raw_frame(bytes([1, 2, 3]), 1, 1, "BGR24")
+
+        assert frame[0, 0].tolist() == [3, 2, 1]
+
+    def test_decode_raw_frame_checks_size(self):
+        """Test a length mismatch raises ValueError."""
+        with pytest.raises(ValueError, match="expected 2x2 RGB24"):
+            decode_raw_frame(bytes(11), 2, 2, "RGB24")
+        with pytest.raises(ValueError, match="Unsupported pixel format"):
+            decode_raw_frame(bytes(4), 2, 2, "YUYV")
+
+    def test_decode_raw_frame_with_row_padding(self):
+        """Test padded RGB24 rows are skipped without copying."""
+        rows = np.arange(2 * 16, dtype=np.uint8).reshape(2, 16)
+
+        frame = decode_raw_frame(rows.tobytes(), 4, 2, "RGB24", stride=16)
+
+        assert frame[1, 0].tolist() == [16, 17, 18]
+        assert np.array_equal(frame.reshape(2, 12), rows[:, :12])
+        assert not frame.flags.owndata
+
+    def test_decode_raw_gray_frame(self):
+        """Test GRAY8 frames are expanded to three equal channels."""
+        frame = decode_raw_frame(bytes([10, 20, 0, 0, 30, 40, 0, 0]), 2, 2, "GRAY8", 4)
+
+        assert frame.shape == (2, 2, 3)
+        assert frame[:, :, 0].tolist() == [[10, 20], [30, 40]]
+        assert np.array_equal(frame[:, :, 0], frame[:, :, 2])
+
+    @pytest.mark.parametrize("stride", [16, 24])
+    def test_decode_raw_yuv_frames_match_opencv(self, stride):
+        """Test NV12 and I420 frames, padded or not, convert like OpenCV."""
+        rgb = np.random.default_rng(0).integers(0, 256, (32, 16, 3), dtype=np.uint8)
+        i420 = cv2.cvtColor(rgb, cv2.COLOR_RGB2YUV_I420)
+        expected = cv2.cvtColor(i420, cv2.COLOR_YUV2RGB_I420)
+        luma = i420[:32]
+        u, v = i420[32:].reshape(2, 16, 8)
+        interleaved = np.dstack([u, v]).reshape(16, 16)
+
+        def padded(plane: np.ndarray, width: int) -> bytes:
+            return np.pad(plane, ((0, 0), (0, width - plane.shape[1]))).tobytes()
+
+        planar = padded(luma, stride) + padded(u, stride // 2) + padded(v, stride // 2)
+        semi_planar = padded(luma, stride) + padded(interleaved, stride)
+
+        for pixel_format, data in (("I420", planar), ("NV12", semi_planar)):
+            frame = decode_raw_frame(data, 16, 32, pixel_format, stride)
+            assert np.array_equal(frame, expected), pixel_format
+
+    def test_raw_frame_size_checks_geometry(self):
+        """Test strides shorter than a row and odd YUV sizes are rejected."""
+        assert raw_frame_size(4, 2, "nv12") == 12
+        assert raw_frame_size(4, 2, "I420", stride=8) == 24
+        with pytest.raises(ValueError, match="Invalid frame geometry"):
+            raw_frame_size(4, 2, "RGB24", stride=11)
+        with pytest.raises(ValueError, match="needs even width"):
+            raw_frame_size(3, 2, "I420")
+        with pytest.raises(UnsupportedImageFormatError):
+            raw_frame_size(4, 2, "YUYV")
+
+
+class TestHeaderImageInspector:
+    """Test cases for HeaderImageInspector."""
+
+    def _encode(self, image_format: str, size=(321, 123), **options) -> bytes:
+        """Encode a blank image with PIL."""
+        buffer = BytesIO()
+        Image.new("RGB", size, (10, 20, 30)).save(
+            buffer, format=image_format, **options
+        )
+        return buffer.getvalue()
+
+    @pytest.mark.parametrize(
+        "image_format,options",
+        [
+            ("JPEG", {}),
+            ("JPEG", {"progressive": True, "exif": b"Exif\x00\x00" + b"\x00" * 2048}),
+            ("PNG", {}),
+            ("GIF", {}),
+            ("BMP", {}),
+            ("WEBP", {}),
+            ("WEBP", {"lossless": True}),
+            ("TIFF", {}),
+            ("TIFF", {"compression": "tiff_lzw"}),
+        ],
+    )
+    def test_reads_dimensions_from_header(self, image_format, options):
+        """Test format and size come from the header of every format."""
+        info = HeaderImageInspector().inspect(self._encode(image_format, **options))
+
+        assert (info.format, info.width, info.height) == (image_format, 321, 123)
+
+    def test_reads_only_the_header(self):
+        """Test a header on its own is enough, as with a bomb."""
+        image_data = self._encode("PNG", size=(4000, 3000))[:64]
+
+        info = HeaderImageInspector().inspect(image_data)
+
+        assert info.pixels == 12_000_000
+
+    def test_unsupported_format_is_named(self):
+        """Test formats PIL knows but the service does not decode."""
+        with pytest.raises(UnsupportedImageFormatError, match="PPM"):
+            HeaderImageInspector().inspect(self._encode("PPM"))
+
+    def test_garbage_is_invalid(self):
+        """Test unrecognisable data is invalid rather than unsupported."""
+        with pytest.raises(ValueError, match="Invalid image data"):
+            HeaderImageInspector().inspect(b"not an image at all")
+
+    def test_truncated_header_is_invalid(self):
+        """Test a known signature with a cut-off header is invalid."""
+        with pytest.raises(ValueError, match="truncated PNG header"):
+            HeaderImageInspector().inspect(self._encode("PNG")[:12])
+
+
+class TestFaceDetectionGraphPool:
+    """Test cases for FaceDetectionGraphPool."""
+
+    @pytest.fixture
+    def factory(self):
+        """Create a factory producing mock graphs."""
+        return Mock(side_effect=lambda: Mock())
+
+    def test_graphs_are_warmed_on_creation(self, factory):
+        """Test that a new graph processes a warm-up frame."""
+        pool = FaceDetectionGraphPool(factory=factory, size=1)
+
+        with pool.checkout() as graph:
+            graph.process.assert_called_once()
+
+    def test_pool_is_bounded(self, factory):
+        """Test that the pool never builds more graphs than its size."""
+        pool = FaceDetectionGraphPool(factory=factory, size=2, checkout_timeout=0.05)
+
+        with pool.checkout(), pool.checkout():
+            with pytest.raises(TimeoutError):
+                with pool.checkout():
+                    pass
+
+        assert factory.call_count == 2
+
+    def test_thread_gets_back_its_last_graph(self, factory):
+        """Test thread affinity when several graphs are idle."""
+        pool = FaceDetectionGraphPool(factory=factory, size=2)
+        with pool.checkout() as first, pool.checkout() as second:
+            assert first is not second
+
+        # Plain LIFO order would hand out ``first`` here
+        with pool.checkout() as graph:
+            assert graph is second
+
+    def test_checked_out_graph_is_exclusive(self, factory):
+        """Test that concurrent threads never share a graph."""
+        pool = FaceDetectionGraphPool(factory=factory, size=2)
+        in_use = set()
+        lock = threading.Lock()
+        errors = []
+
+        def worker():
+            for _ in range(50):
+                with pool.checkout() as graph:
+                    with lock:
+                        if id(graph) in in_use:
+                            errors.append("shared")
+                        in_use.add(id(graph))
+                    with lock:
+                        in_use.discard(id(graph))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert pool.created <= 2
+
+    def test_failed_graph_is_rebuilt(self, factory):
+        """Test that a graph raising during use is replaced."""
+        pool = FaceDetectionGraphPool(factory=factory, size=1)
+
+        with pytest.raises(RuntimeError):
+            with pool.checkout() as broken:
+                raise RuntimeError("graph failure")
+
+        broken.close.assert_called_once()
+        with pool.checkout() as graph:
+            assert graph is not broken
+        assert factory.call_count == 2
+
+    def test_close_closes_idle_graphs(self, factory):
+        """Test closing the pool closes graphs and rejects checkouts."""
+        pool = FaceDetectionGraphPool(factory=factory, size=1)
+        with pool.checkout() as graph:
+            pass
+
+        pool.close()
+
+        graph.close.assert_called_once()
+        with pytest.raises(RuntimeError, match="closed"):
+            with pool.checkout():
+                pass
+
+    def test_invalid_size(self, factory):
+        """Test that a pool needs room for at least one graph."""
+        with pytest.raises(ValueError):
+            FaceDetectionGraphPool(factory=factory, size=0)
+
+
+class TestProcessPoolFaceDetector:
+    """Test cases for ProcessPoolFaceDetector."""
+
+    @pytest.fixture(scope="class")
+    def detector(self):
+        """Create a detector with a single worker process."""
+        detector = ProcessPoolFaceDetector(min_detection_confidence=0.5, num_workers=1)
+        yield detector
+        detector.close()
+
+    def _create_test_image(self, width=100, height=100) -> bytes:
+        """Create a simple test image."""
+        image = Image.new("RGB", (width, height), (0, 128, 255))
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def test_detect_with_valid_image(self, detector):
+        """Test detection runs on the worker process."""
+        result = detector.detect_face(self._create_test_image())
+
+        assert isinstance(result, FaceDetectionResult)
+        assert result.face_detected is False
+
+    def test_detections_cross_the_process_boundary(self, detector, face_image_bytes):
+        """Test boxes computed on the worker reach the parent."""
+        result = detector.detect_face(face_image_bytes)
+
+        assert result.face_detected is True
+        assert len(result.detections) == 1
+        assert result.detections[0].score == result.confidence
+
+    def test_frames_larger_than_buffer(self, detector):
+        """Test that the shared buffer grows for large frames."""
+        result = detector.detect_face(self._create_test_image(1600, 1200))
+
+        assert result.face_detected is False
+
+    def test_detect_with_invalid_image_data(self, detector):
+        """Test that decode errors surface as ValueError."""
+        with pytest.raises(ValueError, match="Invalid image data"):
+            detector.detect_face(b"not_an_image")
+
+    def test_dead_worker_is_restarted(self, detector):
+        """Test crash recovery when a worker process dies."""
+        restarts = detector.restarts
+        process = detector._slots[0].process
+        process.kill()
+        process.join()
+
+        result = detector.detect_face(self._create_test_image())
+
+        assert result.face_detected is False
+        assert detector.restarts == restarts + 1
+        assert detector._slots[0].process.is_alive()
+
+    def test_idle_worker_is_restarted_without_a_request(self, detector):
+        """Test a worker that dies while idle is replaced straight away."""
+        restarts = detector.restarts
+        process = detector._slots[0].process
+        process.kill()
+
+        deadline = time.monotonic() + 30
+        while detector.restarts == restarts and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert detector.restarts == restarts + 1
+        assert detector._slots[0].process is not process
+        assert detector._slots[0].process.is_alive()
+
+    def test_close_stops_workers(self):
+        """Test closing the detector stops worker processes."""
+        detector = ProcessPoolFaceDetector(num_workers=1)
+        process = detector._slots[0].process
+
+        detector.close()
+
+        assert not process.is_alive()
+        with pytest.raises(RuntimeError, match="closed"):
+            detector.detect_face(self._create_test_image())
+
+
+class TestSqliteResultStore:
+    """Test cases for SqliteResultStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a store in a temporary directory."""
+        store = SqliteResultStore(str(tmp_path / "cache.sqlite3"))
+        yield store
+        store.close()
+
+    def test_round_trip(self, store):
+        """Test results survive storage."""
+        store.put("key", FaceDetectionResult(face_detected=True, confidence=0.75), 60)
+
+        assert store.get("key") == FaceDetectionResult(
+            face_detected=True, confidence=0.75
+        )
+        assert store.get("missing") is None
+
+    def test_round_trip_keeps_detections(self, store):
+        """Test boxes and keypoints survive storage."""
+        result = FaceDetectionResult(
+            face_detected=True,
+            confidence=0.9,
+            detections=(
+                FaceDetection(
+                    score=0.9, box=(0.1, 0.2, 0.3, 0.4), keypoints=((0.5, 0.25),) * 6
+                ),
+            ),
+        )
+
+        store.put("key", result, 60)
+
+        assert store.get("key") == result
+
+    def test_expired_results_are_ignored(self, store):
+        """Test TTL is enforced on read."""
+        store.put("key", FaceDetectionResult(face_detected=False), -1)
+
+        assert store.get("key") is None
+
+    def test_results_are_shared_between_instances(self, store, tmp_path):
+        """Test a second store on the same file sees the results."""
+        store.put("key", FaceDetectionResult(face_detected=True), 60)
+        other = SqliteResultStore(str(tmp_path / "cache.sqlite3"))
+
+        assert other.get("key").face_detected is True
+        other.close()
+
+    def test_usable_from_several_threads(self, store):
+        """Test each thread gets a working connection."""
+        errors = []
+
+        def worker(index):
+            try:
+                store.put(f"key{index}", FaceDetectionResult(face_detected=True), 60)
+                assert store.get(f"key{index}") is not None
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+
+class TestSqliteJobStore:
+    """Test cases for SqliteJobStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a store in a temporary directory."""
+        store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+        yield store
+        store.close()
+
+    def test_create_and_page_pending_items(self, store):
+        """Test a new job lists every source as pending, page by page."""
+        job = store.create_job(f"img{i}.jpg" for i in range(5))
+
+        assert store.get_job(job.job_id) == job
+        assert job.status == JOB_QUEUED
+        assert job.total == 5
+        assert store.pending_items(job.job_id, -1, 3) == [
+            (0, "img0.jpg"),
+            (1, "img1.jpg"),
+            (2, "img2.jpg"),
+        ]
+        assert store.pending_items(job.job_id, 2, 3) == [
+            (3, "img3.jpg"),
+            (4, "img4.jpg"),
+        ]
+        assert store.get_job("missing") is None
+
+    def test_failing_manifest_leaves_no_job(self, store):
+        """Test an error while reading sources discards the whole job."""
+
+        def sources():
+            yield "img0.jpg"
+            raise ValueError("Manifest line 2 is not valid UTF-8")
+
+        with pytest.raises(ValueError, match="line 2"):
+            store.create_job(sources())
+
+        assert store.unfinished_jobs() == []
+
+    def test_save_results_updates_counters_and_completes(self, store):
+        """Test outcomes are counted once and the last one completes the job."""
+        job = store.create_job(["a.jpg", "b.jpg", "c.jpg"])
+        store.start_job(job.job_id)
+
+        progress = store.save_results(
+            job.job_id,
+            [
+                JobItemResult(index=2, source="c.jpg", face_detected=True),
+                JobItemResult(index=0, source="a.jpg", error="Invalid image"),
+            ],
+        )
+        assert (progress.status, progress.done, progress.failed) == (JOB_RUNNING, 2, 1)
+        assert store.pending_items(job.job_id, -1, 10) == [(1, "b.jpg")]
+
+        store.save_results(
+            job.job_id, [JobItemResult(index=2, source="c.jpg", face_detected=True)]
+        )
+        progress = store.save_results(
+            job.job_id,
+            [JobItemResult(index=1, source="b.jpg", face_detected=False)],
+        )
+
+        assert progress.status == JOB_COMPLETED
+        assert (progress.done, progress.failed, progress.faces) == (3, 1, 1)
+        assert progress.finished_at is not None
+        assert store.unfinished_jobs() == []
+
+    def test_results_page_in_recording_order(self, store):
+        """Test results come back by sequence and resume after a cursor."""
+        job = store.create_job(["a.jpg", "b.jpg", "c.jpg"])
+        store.save_results(
+            job.job_id,
+            [
+                JobItemResult(
+                    index=1, source="b.jpg", face_detected=True, confidence=0.9
+                ),
+                JobItemResult(index=0, source="a.jpg", face_detected=False),
+            ],
+        )
+        store.save_results(job.job_id, [JobItemResult(index=2, source="c.jpg")])
+
+        first = store.results(job.job_id, 0, 2)
+        rest = store.results(job.job_id, first[-1][0], 2)
+
+        assert [sequence for sequence, _ in first + rest] == [1, 2, 3]
+        assert first[0][1] == JobItemResult(
+            index=1, source="b.jpg", face_detected=True, confidence=0.9
+        )
+        assert [item.index for _, item in first + rest] == [1, 0, 2]
+
+    def test_progress_survives_reopening(self, store, tmp_path):
+        """Test a second store on the same file resumes unfinished jobs."""
+        finished = store.create_job(["a.jpg"])
+        store.save_results(finished.job_id, [JobItemResult(index=0, source="a.jpg")])
+        unfinished = store.create_job(["b.jpg", "c.jpg"])
+        store.save_results(
+            unfinished.job_id, [JobItemResult(index=0, source="b.jpg", error="x")]
+        )
+        store.close()
+
+        reopened = SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+        assert reopened.unfinished_jobs() == [unfinished.job_id]
+        assert reopened.pending_items(unfinished.job_id, -1, 10) == [(1, "c.jpg")]
+        assert reopened.get_job(unfinished.job_id).done == 1
+        reopened.close()
+
+
+class TestLocalImageReader:
+    """Test cases for LocalImageReader."""
+
+    @pytest.fixture
+    def root(self, tmp_path):
+        """Image root holding one small file."""
+        root = tmp_path / "images"
+        (root / "sub").mkdir(parents=True)
+        (root / "sub" / "a.jpg").write_bytes(b"image")
+        return root
+
+    async def test_reads_relative_and_absolute_paths(self, root):
+        """Test paths resolve against the root or may name it directly."""
+        reader = LocalImageReader(str(root))
+
+        assert await reader.fetch("sub/a.jpg") == b"image"
+        assert await reader.fetch(str(root / "sub" / "a.jpg")) == b"image"
+
+    async def test_paths_outside_root_are_refused(self, root, tmp_path):
+        """Test parent references and symlinks cannot leave the root."""
+        (tmp_path / "secret.txt").write_bytes(b"secret")
+        (root / "link.jpg").symlink_to(tmp_path / "secret.txt")
+        reader = LocalImageReader(str(root))
+
+        for path in ("../secret.txt", str(tmp_path / "secret.txt"), "link.jpg"):
+            with pytest.raises(ImageFetchError, match="outside the image root"):
+                await reader.fetch(path)
+
+    async def test_missing_and_oversized_files(self, root):
+        """Test unreadable files and files over the limit raise."""
+        reader = LocalImageReader(str(root), max_bytes=4)
+
+        with pytest.raises(ImageFetchError, match="Cannot read file"):
+            await reader.fetch("missing.jpg")
+        with pytest.raises(ImageTooLargeError, match="4 byte limit"):
+            await reader.fetch("sub/a.jpg")
+
+    def test_root_must_exist(self, tmp_path):
+        """Test a missing root is rejected at construction."""
+        with pytest.raises(ValueError, match="not a directory"):
+            LocalImageReader(str(tmp_path / "missing"))
+
+
+class TestDHashHasher:
+    """Test cases for DHashHasher."""
+
+    @staticmethod
+    def _distance(a, b):
+        return bin(a ^ b).count("1")
+
+    @staticmethod
+    def _reencode(image_data, fmt, scale=1.0, **options):
+        image = Image.open(BytesIO(image_data))
+        if scale != 1.0:
+            image = image.resize((int(image.width * scale), int(image.height * scale)))
+        buffer = BytesIO()
+        image.save(buffer, format=fmt, **options)
+        return buffer.getvalue()
+
+    def test_copies_hash_close_together(self, face_image_bytes):
+        """Test re-encoded and resized copies stay within a few bits."""
+        hasher = DHashHasher()
+        original = hasher.perceptual_hash(face_image_bytes)
+
+        copies = [
+            self._reencode(face_image_bytes, "JPEG", quality=60),
+            self._reencode(face_image_bytes, "JPEG", scale=0.5, quality=85),
+            self._reencode(face_image_bytes, "PNG", scale=0.75),
+        ]
+
+        for copy in copies:
+            assert self._distance(original, hasher.perceptual_hash(copy)) <= 4
+
+    def test_different_images_hash_far_apart(self, face_image_bytes):
+        """Test unrelated images are not near duplicates."""
+        hasher = DHashHasher()
+        flipped = Image.open(BytesIO(face_image_bytes)).transpose(Image.FLIP_LEFT_RIGHT)
+        buffer = BytesIO()
+        flipped.save(buffer, format="JPEG")
+
+        distance = self._distance(
+            hasher.perceptual_hash(face_image_bytes),
+            hasher.perceptual_hash(buffer.getvalue()),
+        )
+        assert distance > 16
+
+    def test_decoded_pixels_hash_like_the_bytes(self, face_image_bytes):
+        """Test array hashes match byte hashes of the same image."""
+        hasher = DHashHasher()
+        png = self._reencode(face_image_bytes, "PNG")
+
+        assert hasher.hashes_cheaply(face_image_bytes)
+        assert not hasher.hashes_cheaply(png)
+        from_array = hasher.perceptual_hash_of_array(decode_to_rgb(png, 512))
+        assert self._distance(from_array, hasher.perceptual_hash(png)) <= 4
+        assert self._distance(from_array, hasher.perceptual_hash(face_image_bytes)) <= 4
+
+    def test_thumbnail_is_reduced_for_jpeg(self, face_image_bytes):
+        """Test JPEG thumbnails come from a 1/8 scale decode."""
+        thumbnail = decode_grayscale_thumbnail(face_image_bytes)
+        width, height = Image.open(BytesIO(face_image_bytes)).size
+
+        assert thumbnail.ndim == 2
+        assert thumbnail.shape == ((height + 7) // 8, (width + 7) // 8)
+
+    def test_invalid_data_raises(self):
+        """Test undecodable bytes raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid image data"):
+            DHashHasher().perceptual_hash(b"not an image")
+
+
+class TestArchiveReader:
+    """Test cases for ArchiveReader."""
+
+    MEMBERS = {"a.jpg": b"a" * 10, "dir/b.png": b"b" * 20}
+
+    def test_reads_zip_members(self):
+        """Test regular zip entries are yielded and directories skipped."""
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("dir/", b"")
+            for name, data in self.MEMBERS.items():
+                archive.writestr(name, data)
+
+        reader = ArchiveReader(buffer, max_member_bytes=100)
+
+        assert reader.format == "zip"
+        assert dict(reader.members()) == self.MEMBERS
+        reader.close()
+
+    @pytest.mark.parametrize("mode", ["w", "w:gz", "w:bz2", "w:xz"])
+    def test_reads_tar_members(self, mode):
+        """Test plain and compressed tar archives."""
+        buffer = BytesIO()
+        with tarfile.open(fileobj=buffer, mode=mode) as archive:
+            for name, data in self.MEMBERS.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, BytesIO(data))
+            link = tarfile.TarInfo("link.jpg")
+            link.type = tarfile.SYMTYPE
+            link.linkname = "a.jpg"
+            archive.addfile(link)
+
+        reader = ArchiveReader(buffer, max_member_bytes=100)
+
+        assert reader.format == "tar"
+        assert dict(reader.members()) == self.MEMBERS
+
+    def test_large_members_are_cut_short(self):
+        """Test members over the limit are not read in full."""
+        buffer = BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("big.jpg", b"x" * 1000)
+
+        reader = ArchiveReader(buffer, max_member_bytes=15)
+
+        assert [len(data) for _, data in reader.members()] == [16]
+
+    def test_invalid_archive_raises(self):
+        """Test non-archives raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid archive"):
+            ArchiveReader(BytesIO(b"not an archive" * 100), max_member_bytes=100)
+
+
+class TestMediaPipeVideoFaceDetector:
+    """Test cases for MediaPipeVideoFaceDetector."""
+
+    def test_timeline_follows_face(self, face_video_path):
+        """Test segments line up with the frames showing a face."""
+        detector = MediaPipeVideoFaceDetector(sample_fps=5)
+
+        result = detector.detect_faces_in_video(face_video_path)
+
+        assert result.face_detected is True
+        assert result.stopped_early is False
+        assert (result.frames_read, result.frames_sampled) == (30, 15)
+        assert [(s.start_ms, s.end_ms, s.face_detected) for s in result.segments] == [
+            (0.0, 1000.0, False),
+            (1000.0, 2000.0, True),
+            (2000.0, 3000.0, False),
+        ]
+        assert result.segments[1].max_confidence > 0.5
+
+    def test_early_exit_stops_decoding(self, face_video_path):
+        """Test decoding stops at the first face."""
+        detector = MediaPipeVideoFaceDetector(frame_stride=1)
+
+        result = detector.detect_faces_in_video(
+            face_video_path, stop_at_first_face=True
+        )
+
+        assert result.face_detected is True
+        assert result.stopped_early is True
+        assert result.frames_read == 11
+        assert result.segments[-1].face_detected is True
+
+    def test_max_samples_bounds_work(self, face_video_path):
+        """Test sampling stops at the configured limit."""
+        detector = MediaPipeVideoFaceDetector(frame_stride=1, max_samples=5)
+
+        result = detector.detect_faces_in_video(face_video_path)
+
+        assert result.frames_sampled == 5
+        assert result.face_detected is False
+
+    def test_invalid_video_raises(self, tmp_path):
+        """Test unreadable files raise ValueError."""
+        path = tmp_path / "broken.mp4"
+        path.write_bytes(b"not a video" * 100)
+
+        with pytest.raises(ValueError, match="Invalid video data"):
+            MediaPipeVideoFaceDetector().detect_faces_in_video(str(path))
+
+    def test_build_segments_keeps_best_score(self):
+        """Test adjacent samples merge and keep the highest confidence."""
+        segments = build_segments(
+            [(0, True, 0.6), (100, True, 0.9), (200, False, None)], end_ms=300
+        )
+
+        assert [(s.start_ms, s.end_ms, s.max_confidence) for s in segments] == [
+            (0, 200, 0.9),
+            (200, 300, None),
+        ]
+
+
+class TestMicroBatcher:
+    """Test cases for MicroBatcher."""
+
+    def test_concurrent_submits_share_a_batch(self):
+        """Test items arriving within the wait window run together."""
+        batches = []
+        batcher = MicroBatcher(
+            lambda items: batches.append(list(items)) or [i * 2 for i in items],
+            max_batch_size=4,
+            max_wait=0.5,
+        )
+        results = {}
+
+        def call(value):
+            results[value] = batcher.submit(value)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.close()
+
+        assert results == {0: 0, 1: 2, 2: 4, 3: 6}
+        assert sorted(batches[0]) == [0, 1, 2, 3]
+        assert batcher.stats().avg_batch_size == 4
+
+    def test_lone_item_runs_after_wait(self):
+        """Test a single item is not held waiting for a full batch."""
+        batcher = MicroBatcher(lambda items: items, max_batch_size=8, max_wait=0.01)
+
+        assert batcher.submit("a") == "a"
+        assert batcher.submit("b") == "b"
+        stats = batcher.stats()
+        batcher.close()
+
+        assert (stats.batches, stats.items) == (2, 2)
+
+    def test_batch_error_reaches_every_caller(self):
+        """Test an exception from the batch function is raised to callers."""
+
+        def fail(items):
+            raise ValueError("bad batch")
+
+        batcher = MicroBatcher(fail, max_wait=0)
+
+        with pytest.raises(ValueError, match="bad batch"):
+            batcher.submit(1)
+        batcher.close()
+
+    def test_submit_after_close_raises(self):
+        """Test a closed batcher rejects new items."""
+        batcher = MicroBatcher(lambda items: items)
+        batcher.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.submit(1)
+
+    def test_submits_racing_close_never_hang(self):
+        """Test every submit racing close is either served or refused."""
+        batcher = MicroBatcher(lambda items: items, max_batch_size=2, max_wait=0)
+        outcomes = []
+
+        def submit(value):
+            try:
+                outcomes.append(batcher.submit(value, timeout=5))
+            except RuntimeError:
+                outcomes.append("refused")
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(50)]
+        for index, thread in enumerate(threads):
+            thread.start()
+            if index == 25:
+                batcher.close()
+        for thread in threads:
+            thread.join()
+
+        assert len(outcomes) == 50
+        assert "refused" in outcomes
+
+
+class TestBatchedBlazeFaceDetector:
+    """Test cases for BatchedBlazeFaceDetector."""
+
+    @pytest.fixture
+    def detector(self):
+        """Create a batched detector and stop it afterwards."""
+        detector = BatchedBlazeFaceDetector(max_batch_size=4, max_batch_wait=0.05)
+        yield detector
+        detector.close()
+
+    def test_detects_face(self, detector, face_image_bytes):
+        """Test the face fixture is detected with high confidence."""
+        result = detector.detect_face(face_image_bytes)
+
+        assert result.face_detected is True
+        assert result.confidence > 0.5
+
+    def test_blank_image_has_no_face(self, detector):
+        """Test a blank image yields no detection."""
+        result = detector.detect_face_in_array(np.zeros((240, 320, 3), np.uint8))
+
+        assert result.face_detected is False
+        assert result.confidence is None
+
+    def test_batched_scores_match_single_scores(self, detector, face_image_bytes):
+        """Test images scored in one batch match their solo scores."""
+        face = decode_to_rgb(face_image_bytes)
+        blank = np.zeros_like(face)
+        solo = [detector.detect_face_in_array(image) for image in (face, blank)]
+        results = [None] * 4
+
+        def call(index, image):
+            results[index] = detector.detect_face_in_array(image)
+
+        threads = [
+            threading.Thread(target=call, args=(i, face if i % 2 == 0 else blank))
+            for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert detector.batch_stats().items == 6
+        assert detector.batch_stats().batches < 6
+        for index, result in enumerate(results):
+            expected = solo[index % 2]
+            assert result.face_detected == expected.face_detected
+            if expected.confidence is not None:
+                assert result.confidence == pytest.approx(expected.confidence, 1e-4)
+
+    def test_boxes_match_mediapipe(self, detector, face_image_bytes):
+        """Test decoded boxes land where MediaPipe puts them."""
+        image = np.pad(decode_to_rgb(face_image_bytes), ((0, 0), (150, 0), (0, 0)))
+        reference = MediaPipeFaceDetector()
+
+        (expected,) = reference.detect_face_in_array(image).detections
+        (face,) = detector.detect_face_in_array(image).detections
+        reference.close()
+
+        assert face.box == pytest.approx(expected.box, abs=0.03)
+        for point, expected_point in zip(face.keypoints, expected.keypoints):
+            assert point == pytest.approx(expected_point, abs=0.03)
+
+    def test_invalid_image_raises(self, detector):
+        """Test undecodable bytes raise ValueError."""
+        with pytest.raises(ValueError, match="Failed to process image"):
+            detector.detect_face(b"not an image")
+
+    def test_settings_key(self):
+        """Test the settings key names the backend and its settings."""
+        detector = BatchedBlazeFaceDetector(
+            min_detection_confidence=0.7, max_image_side=512
+        )
+        detector.close()
+
+        assert (
+            detector.settings_key == "blazeface_dnn:short_range:conf=0.7:max_side=512"
+        )
+
+
+class TestCascadeFaceDetector:
+    """Test cases for CascadeFaceDetector."""
+
+    def test_clear_face_exits_at_thumbnail(self, face_image_bytes):
+        """Test a confident thumbnail answer skips the final stage."""
+        detector = CascadeFaceDetector()
+
+        result = detector.detect_face(face_image_bytes)
+        thumbnail, final = detector.stats().stages
+        detector.close()
+
+        assert result.face_detected is True
+        assert result.confidence >= 0.8
+        assert (thumbnail.entered, thumbnail.accepted) == (1, 1)
+        assert final.entered == 0
+
+    def test_blank_image_exits_at_thumbnail(self):
+        """Test an image without any detection is rejected early."""
+        detector = CascadeFaceDetector()
+
+        result = detector.detect_face_in_array(np.zeros((480, 640, 3), np.uint8))
+        thumbnail, final = detector.stats().stages
+        detector.close()
+
+        assert result.face_detected is False
+        assert (thumbnail.rejected, thumbnail.exit_rate) == (1, 1.0)
+        assert final.entered == 0
+
+    def test_uncertain_score_escalates(self, face_image_bytes):
+        """Test scores inside the bands are decided by the final stage."""
+        detector = CascadeFaceDetector(accept_above=1.0, final_model="full_range")
+
+        result = detector.detect_face(face_image_bytes)
+        thumbnail, final = detector.stats().stages
+        detector.close()
+
+        assert result.face_detected is True
+        assert (thumbnail.escalated, thumbnail.exit_rate) == (1, 0.0)
+        assert (final.name, final.entered, final.accepted) == ("full_range", 1, 1)
+
+    def test_bands_must_bracket_threshold(self):
+        """Test bands that exclude the threshold are rejected."""
+        with pytest.raises(ValueError, match="bands"):
+            CascadeFaceDetector(min_detection_confidence=0.5, reject_below=0.6)
+
+    def test_unknown_final_model_raises(self):
+        """Test an unknown final model is rejected."""
+        with pytest.raises(ValueError, match="final model"):
+            CascadeFaceDetector(final_model="long_range")
+
+    def test_invalid_image_raises(self):
+        """Test undecodable bytes raise ValueError."""
+        detector = CascadeFaceDetector()
+
+        with pytest.raises(ValueError, match="Failed to process image"):
+            detector.detect_face(b"not an image")
+        detector.close()
+
+    def test_settings_key_covers_bands(self):
+        """Test the settings key changes with the cascade configuration."""
+        first = CascadeFaceDetector(max_image_side=1024)
+        second = CascadeFaceDetector(accept_above=0.9, max_image_side=1024)
+
+        assert first.settings_key != second.settings_key
+        assert first.settings_key.startswith("cascade:thumb=256:bands=0.3-0.8")
+        first.close()
+        second.close()
+
+
+class TestTiledFaceDetector:
+    """Test cases for TiledFaceDetector."""
+
+    @pytest.fixture
+    def group_photo(self, face_image_bytes):
+        """
+        2400x1600 JPEG with one 64-pixel face inside its first 512 tile.
+
+        Shrunk to 1024 pixels the face is too small for the short-range
+        model, so only tiles can find it.
+        """
+        face = Image.open(BytesIO(face_image_bytes)).crop((80, 0, 400, 320))
+        canvas = Image.new("RGB", (2400, 1600), (120, 120, 120))
+        canvas.paste(face.resize((200, 200)), (300, 250))
+        buffer = BytesIO()
+        canvas.save(buffer, format="JPEG", quality=90)
+        return buffer.getvalue()
+
+    def _detector(self, **options) -> TiledFaceDetector:
+        """Create a detector that tiles the group photo into 512 tiles."""
+        options = {
+            "max_image_side": 1024,
+            "min_pixels": 1_000_000,
+            "tile_size": 512,
+            "tile_overlap": 128,
+            **options,
+        }
+        return TiledFaceDetector(**options)
+
+    def _count_tiles(self, detector: TiledFaceDetector) -> list:
+        """Record the tiles the detector processes."""
+        seen = []
+        detect_tile = detector._detect_tile
+
+        def counting(source, tile):
+            seen.append(tile)
+            return detect_tile(source, tile)
+
+        detector._detect_tile = counting
+        return seen
+
+    def test_tile_grid_covers_image_with_overlap(self):
+        """Test tiles have full size, overlap and end on the border."""
+        tiles = tile_grid(1000, 700, 400, 100)
+
+        assert [(left, top) for left, top, _, _ in tiles] == [
+            (0, 0),
+            (300, 0),
+            (600, 0),
+            (0, 300),
+            (300, 300),
+            (600, 300),
+        ]
+        assert all(
+            right - left == 400 and bottom - top == 400
+            for left, top, right, bottom in tiles
+        )
+
+    def test_tile_grid_keeps_small_image_whole(self):
+        """Test an image smaller than a tile is a single tile."""
+        assert tile_grid(300, 200, 640, 160) == [(0, 0, 300, 200)]
+
+    def test_tile_overlap_must_leave_a_step(self):
+        """Test an overlap as large as the tile is rejected."""
+        with pytest.raises(ValueError, match="overlap"):
+            tile_grid(1000, 1000, 400, 400)
+        with pytest.raises(ValueError, match="overlap"):
+            TiledFaceDetector(tile_size=400, tile_overlap=400)
+
+    def test_non_max_suppression_keeps_best_box(self):
+        """Test overlapping boxes collapse to the highest score."""
+        best = FaceDetection(0.9, (0.1, 0.1, 0.2, 0.2), ())
+        duplicate = FaceDetection(0.6, (0.12, 0.1, 0.2, 0.2), ())
+        elsewhere = FaceDetection(0.7, (0.6, 0.6, 0.2, 0.2), ())
+
+        kept = non_max_suppression([duplicate, elsewhere, best], iou_threshold=0.3)
+
+        assert kept == (best, elsewhere)
+
+    def test_finds_small_face_missed_whole(self, group_photo):
+        """Test tiling finds a face the whole-image pass misses."""
+        whole = MediaPipeFaceDetector(max_image_side=1024)
+        detector = self._detector(pool_size=2)
+
+        baseline = whole.detect_face(group_photo)
+        result = detector.detect_face(group_photo)
+        whole.close()
+        detector.close()
+
+        assert baseline.face_detected is False
+        assert result.face_detected is True
+        assert len(result.detections) == 1
+        xmin, ymin, width, height = result.detections[0].box
+        # The pasted face is centred near (400, 330) in the 2400x1600 photo
+        assert xmin * 2400 < 400 < (xmin + width) * 2400
+        assert ymin * 1600 < 330 < (ymin + height) * 1600
+        for x, y in result.detections[0].keypoints:
+            assert 300 < x * 2400 < 500 and 250 < y * 1600 < 450
+
+    def test_decoded_array_is_tiled(self, group_photo):
+        """Test detect_face_in_array tiles like detect_face."""
+        detector = self._detector()
+
+        result = detector.detect_face_in_array(decode_to_rgb(group_photo))
+        expected = detector.detect_face(group_photo)
+        detector.close()
+
+        assert result.face_detected is True
+        assert result.detections == expected.detections
+
+    def test_small_image_is_not_tiled(self, face_image_bytes):
+        """Test images up to min_pixels are processed whole."""
+        detector = self._detector(min_pixels=20_000_000)
+        tiles = self._count_tiles(detector)
+
+        result = detector.detect_face(face_image_bytes)
+        detector.close()
+
+        assert result.face_detected is True
+        assert tiles == []
+
+    def test_early_exit_stops_at_confident_tile(self, group_photo):
+        """Test early exit skips the tiles after the first confident one."""
+        full = self._detector()
+        early = self._detector(early_exit=True, early_exit_score=0.5)
+        scanned = self._count_tiles(full)
+        stopped = self._count_tiles(early)
+
+        assert full.detect_face(group_photo, stop_at_first_face=True).face_detected
+        result = early.detect_face(group_photo, stop_at_first_face=True)
+        full.close()
+        early.close()
+
+        assert result.face_detected is True
+        assert result.stopped_early is True
+        assert len(scanned) == len(tile_grid(2400, 1600, 512, 128))
+        assert len(stopped) < len(scanned)
+
+    def test_early_exit_only_when_caller_allows(self, group_photo):
+        """Test callers that want every face get the full scan."""
+        detector = self._detector(early_exit=True, early_exit_score=0.5)
+        scanned = self._count_tiles(detector)
+
+        result = detector.detect_face(group_photo)
+        detector.close()
+
+        assert result.stopped_early is False
+        assert len(scanned) == len(tile_grid(2400, 1600, 512, 128))
+
+    def test_invalid_image_raises(self):
+        """Test undecodable bytes raise ValueError."""
+        detector = self._detector()
+
+        with pytest.raises(ValueError, match="Failed to process image"):
+            detector.detect_face(b"not an image")
+        detector.close()
+
+    def test_settings_key_covers_tiling(self):
+        """Test the settings key changes with tiling but not early exit."""
+        first = self._detector()
+        second = self._detector(early_exit=True)
+        third = self._detector(tile_size=384)
+
+        assert first.settings_key == second.settings_key
+        assert first.settings_key != third.settings_key
+        assert first.settings_key.startswith("tiled:mediapipe:short_range")
+        first.close()
+        second.close()
+        third.close()
+
+
+class TestHttpImageFetcher:
+    """Test cases for HttpImageFetcher against a local HTTP server."""
+
+    async def test_fetches_over_pooled_connection(self, image_server):
+        """Test images are downloaded and the connection is kept alive."""
+        fetcher = HttpImageFetcher(allowed_hosts=frozenset({"127.0.0.1"}))
+
+        bodies = [await fetcher.fetch(image_server.url("/face.jpg")) for _ in range(3)]
+        await fetcher.close()
+
+        assert bodies[0] == image_server.routes["/face.jpg"][1]
+        assert len(set(bodies)) == 1
+        assert image_server.requests == 3
+        assert len(image_server.client_ports) == 1
+
+    async def test_error_status_raises(self, image_server):
+        """Test a non-200 answer raises ImageFetchError."""
+        fetcher = HttpImageFetcher()
+
+        with pytest.raises(ImageFetchError, match="HTTP 404"):
+            await fetcher.fetch(image_server.url("/missing.jpg"))
+        await fetcher.close()
+
+    async def test_disallowed_urls_are_not_fetched(self, image_server):
+        """Test other hosts and schemes are refused without a request."""
+        fetcher = HttpImageFetcher(allowed_hosts=frozenset({"storage.example"}))
+
+        with pytest.raises(ImageFetchError, match="Host not allowed"):
+            await fetcher.fetch(image_server.url("/face.jpg"))
+        with pytest.raises(ImageFetchError, match="http and https"):
+            await fetcher.fetch("file:///etc/passwd")
+        await fetcher.close()
+
+        assert image_server.requests == 0
+
+    async def test_size_cap_applies_while_streaming(self, image_server):
+        """Test bodies over the limit fail with or without a declared length."""
+        image_server.routes["/big.jpg"] = (200, b"x" * 5000, 0.0)
+        image_server.routes["/big-unsized.jpg"] = (200, b"x" * 5000, 0.0)
+        image_server.unsized.add("/big-unsized.jpg")
+        fetcher = HttpImageFetcher(max_bytes=1000)
+
+        for path in ("/big.jpg", "/big-unsized.jpg"):
+            with pytest.raises(ImageTooLargeError, match="1000 byte limit"):
+                await fetcher.fetch(image_server.url(path))
+        await fetcher.close()
+
+    async def test_slow_fetch_times_out(self, image_server):
+        """Test a fetch longer than the timeout raises ImageFetchError."""
+        image_server.routes["/slow.jpg"] = (200, b"late", 1.0)
+        fetcher = HttpImageFetcher(timeout=0.2)
+
+        with pytest.raises(ImageFetchError, match="timed out"):
+            await fetcher.fetch(image_server.url("/slow.jpg"))
+        await fetcher.close()
+
+    async def test_per_host_concurrency_is_limited(self, image_server):
+        """Test no more than max_per_host requests reach one host at once."""
+        image_server.routes["/slow.jpg"] = (200, b"image", 0.1)
+        fetcher = HttpImageFetcher(max_per_host=2)
+
+        bodies = await asyncio.gather(
+            *(fetcher.fetch(image_server.url("/slow.jpg")) for _ in range(6))
+        )
+        await fetcher.close()
+
+        assert bodies == [b"image"] * 6
+        assert image_server.peak_concurrency == 2
+
+
+class TestPipelineMetrics:
+    """Test cases for the pipeline metrics hooks."""
+
+    @pytest.fixture
+    def pipeline_metrics(self):
+        """Install fresh metrics, restoring whatever was installed before."""
+        previous = metrics._active
+        pipeline_metrics = PipelineMetrics(queue_depth=lambda: 3)
+        metrics.install(pipeline_metrics)
+        yield pipeline_metrics
+        metrics.install(previous)
+
+    def _sample(self, pipeline_metrics, name, **labels):
+        """Read one sample from the metrics registry."""
+        return pipeline_metrics.registry.get_sample_value(name, labels) or 0
+
+    def test_hooks_are_no_ops_when_not_installed(self):
+        """Test disabled hooks hand back a shared null context."""
+        previous = metrics._active
+        metrics.install(None)
+        try:
+            assert metrics.time_stage("decode") is metrics.time_stage("process")
+            with metrics.track_request():
+                metrics.record_detection(True)
+                metrics.observe_input(1024, 100)
+        finally:
+            metrics.install(previous)
+
+    def test_decode_stages_are_timed(self, pipeline_metrics):
+        """Test a JPEG decode records decode, colour conversion and resize."""
+        image = Image.new("RGB", (400, 300), color=(200, 30, 10))
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG")
+
+        decode_to_rgb(buffer.getvalue(), max_side=150)
+
+        for stage in ("decode", "cvtColor", "resize"):
+            count = self._sample(
+                pipeline_metrics, "face_detection_stage_seconds_count", stage=stage
+            )
+            assert count == 1, stage
+
+    def test_request_outcomes_and_inputs(self, pipeline_metrics):
+        """Test outcome counters, input histograms and the queue gauge."""
+        with metrics.track_request():
+            metrics.observe_input(5000, 640 * 480)
+            metrics.record_detection(False)
+        with pytest.raises(ValueError):
+            with metrics.track_request():
+                raise ValueError("bad image")
+
+        assert (
+            self._sample(
+                pipeline_metrics, "face_detection_requests_total", outcome="no_face"
+            )
+            == 1
+        )
+        assert (
+            self._sample(
+                pipeline_metrics, "face_detection_requests_total", outcome="error"
+            )
+            == 1
+        )
+        assert self._sample(pipeline_metrics, "face_detection_input_bytes_sum") == 5000
+        assert self._sample(pipeline_metrics, "face_detection_input_pixels_count") == 1
+        assert self._sample(pipeline_metrics, "face_detection_requests_in_flight") == 0
+        assert self._sample(pipeline_metrics, "face_detection_tasks_queued") == 3
+        assert b"face_detection_stage_seconds_bucket" in pipeline_metrics.render()